@@ -47,7 +47,7 @@ class EpilogueDirectorAgent:
         original_ref = self.config.get_original_ref(5)
         
         # TTS 글자수 제한
-        tts_config = self.config._config.get("tts", {})
+        tts_config = self.config.get_tts_settings()
         target_chars = tts_config.get("target_chars", 250)
         
         prompt = f"""
@@ -97,7 +97,7 @@ Create a meaningful, educational ending for Act 5 that:
                 
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("epilogue"),
                     contents=[prompt],
                     config=types.GenerateContentConfig(response_mime_type="application/json")
                 )
@@ -213,7 +213,7 @@ Create 2 meaningful ending options that:
                 
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("epilogue_options"),
                     contents=[prompt],
                     config=types.GenerateContentConfig(response_mime_type="application/json")
                 )
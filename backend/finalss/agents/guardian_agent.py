@@ -83,7 +83,7 @@ Output: "흥부가 전서구를 보내 놀부에게 양식을 빌려달라고 
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("guardian"),
                     contents=[prompt]
                 )
                 
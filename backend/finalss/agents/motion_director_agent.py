@@ -38,6 +38,9 @@ class MotionDirectorAgent:
         """
         if blocked_words is None:
             blocked_words = self.config.get_blocked_words()
+            blocked_lower = self.config.get_blocked_words_lower()
+        else:
+            blocked_lower = {w.lower() for w in blocked_words}
         
         # 스타일별 키워드 매핑
         style_keywords = {
@@ -82,15 +85,15 @@ Output ONLY the English motion description (1-2 sentences).
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("motion_prompt"),
                     contents=[prompt]
                 )
                 motion = response.text.strip()
                 
                 # 금지 단어 체크
                 motion_lower = motion.lower()
-                for word in blocked_words:
-                    if word.lower() in motion_lower:
+                for word in blocked_lower:
+                    if word in motion_lower:
                         print(f"   ⚠️ Motion Director: 금지어 '{word}' 감지, 기본값 사용")
                         return f"{style_keyword}, character standing calmly with a gentle expression, camera slowly zooming in"
                 
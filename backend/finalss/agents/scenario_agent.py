@@ -44,7 +44,7 @@ class ScenarioAgent:
         original_ref = self.config.get_original_ref(stage_no)
         
         # TTS 글자수 제한
-        tts_config = self.config._config.get("tts", {})
+        tts_config = self.config.get_tts_settings()
         target_chars = tts_config.get("target_chars", 250)
         min_chars = tts_config.get("min_chars", 200)
         max_chars = tts_config.get("max_chars", 300)
@@ -119,7 +119,7 @@ Expand the selected option into a complete story AND divide it into exactly 3 vi
                 
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("scenario"),
                     contents=[prompt],
                     config=types.GenerateContentConfig(response_mime_type="application/json")
                 )
@@ -199,7 +199,7 @@ Expand the selected option into a complete story AND divide it into exactly 3 vi
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("scenario_expand"),
                     contents=prompt
                 )
                 
@@ -249,7 +249,7 @@ Expand the selected option into a complete story AND divide it into exactly 3 vi
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("scenario_summarize"),
                     contents=prompt
                 )
                 
@@ -0,0 +1,284 @@
+# ==================================================================================
+# batch.py - 동화 대량 생성 (입력 없이 여러 동화를 프로세스 풀로 동시에 생성)
+# ==================================================================================
+#
+# 사용법:
+#   python batch.py catalog.jsonl --workers 4                 # output/batch/catalog/ 에 생성
+#   python batch.py catalog.jsonl --workers 4 --out output/batch/night1
+#   같은 --out으로 다시 실행하면 완료된 동화는 건너뛰고, 중단된 동화는 끝난 단계부터 이어서 생성
+#
+# 목록 파일 (JSONL 한 줄에 하나, 또는 YAML 목록 / {"stories": [...]}):
+#   {"id": "pixar_fixed1", "tale": "흥부와 놀부", "art_style": "pixar", "choice": "fixed:1"}
+#   {"tale": "흥부와 놀부", "art_style": "ghibli", "choice": "random", "seed": 7, "count": 20}
+#   {"tale": "흥부와 놀부", "art_style": "pixar", "choice": "llm"}
+#
+#   choice: fixed:N (매 막 N번 선택지) | random (seed 기준, 이어서 실행해도 같은 선택) | llm (LLM이 고름)
+#   count : 같은 설정으로 여러 편 (id 뒤에 _001, _002 ...)
+#
+# 출력:
+#   <out>/stories/<id>/   동화별 출력 디렉토리 (작업 매니페스트, 막별 산출물, 최종 영상)
+#   <out>/results.jsonl   동화별 결과 (이어서 실행할 때 완료 여부 판단)
+#   <out>/report.json     처리량 보고서 (편/시간, 동화별 소요 시간 p50/p95, 단계별 평균, 분기 재사용)
+#
+# 워커 프로세스마다 API 키를 다른 순서로 쓰고(set_api_key_offset) 요청 속도 한도는 워커 수로 나눔
+# (set_rate_limit_share), 공유 분기 저장소는 기본 출력 디렉토리(output/branches)를 함께 쓰므로
+# 같은 경로의 막은 한 번만 생성됨. 영상 생성은 기본 출력 디렉토리의 공유 대기열(output/video_scheduler.db)로
+# 웹 서버와 우선순위를 맞추므로 배치 워커가 웹 사용자의 영상 생성을 밀어내지 않음
+
+import os
+import re
+import sys
+import json
+import time
+import yaml
+import random
+import argparse
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+DEFAULT_CONFIG = os.path.join(SCRIPT_DIR, "config", "default_config.yaml")
+CHOICE_POLICY = re.compile(r"^(fixed:[1-3]|random|llm)$")
+
+
+# ============== 목록 ==============
+
+def load_entries(path: str) -> List[Dict[str, Any]]:
+    """목록 파일 → 동화 항목 (count 펼침, id 부여, 형식 검사)"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            data = yaml.safe_load(f) or []
+            raw = data.get("stories", []) if isinstance(data, dict) else data
+        else:
+            raw = [json.loads(line) for line in f if line.strip()]
+
+    entries = []
+    for index, item in enumerate(raw, 1):
+        choice = str(item.get("choice", "fixed:1"))
+        if not CHOICE_POLICY.match(choice):
+            raise ValueError(f"{index}번 항목: 알 수 없는 choice '{choice}' (fixed:N | random | llm)")
+        base = {
+            "tale": item.get("tale", ""),
+            "art_style": item.get("art_style", "pixar"),
+            "choice": choice,
+        }
+        base_id = item.get("id") or f"{index:04d}_{base['art_style']}_{choice.replace(':', '')}"
+        seed = item.get("seed", base_id)
+        count = int(item.get("count", 1))
+        for k in range(1, count + 1):
+            story_id = base_id if count == 1 else f"{base_id}_{k:03d}"
+            entries.append(dict(base, id=re.sub(r"[^\w.-]", "_", story_id),
+                                seed=seed if count == 1 else f"{seed}_{k}"))
+
+    ids = [e["id"] for e in entries]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1})
+    if duplicates:
+        raise ValueError(f"id 중복: {duplicates}")
+    return entries
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """동화별 마지막 결과"""
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 중단되며 잘린 마지막 줄
+            results[result["id"]] = result
+    return results
+
+
+# ============== 워커 프로세스 ==============
+
+def _init_worker(counter, workers: int) -> None:
+    """
+    워커마다 다른 API 키부터 사용 (모든 프로세스가 첫 키로 몰리지 않도록)
+    요청 속도 한도는 워커 수로 나눠 씀 (같은 키를 여러 프로세스가 함께 쓰므로)
+    """
+    from managers import set_api_key_offset, set_rate_limit_share
+    with counter.get_lock():
+        offset = counter.value
+        counter.value += 1
+    set_api_key_offset(offset)
+    set_rate_limit_share(workers)
+
+
+def _make_picker(entry: Dict[str, Any], orch) -> Callable[[int, List[str]], str]:
+    """choice 정책 → Orchestrator.run의 선택 함수"""
+    policy = entry["choice"]
+    if policy.startswith("fixed:"):
+        index = int(policy.split(":")[1]) - 1
+        return lambda stage_no, options: options[min(index, len(options) - 1)]
+
+    if policy == "random":
+        def pick_random(stage_no: int, options: List[str]) -> str:
+            # 막별로 seed를 고정 → 이어서 실행해도 같은 선택
+            return random.Random(f"{entry['seed']}:{stage_no}").choice(options)
+        return pick_random
+
+    def pick_llm(stage_no: int, options: List[str]) -> str:
+        return options[orch.story_manager.pick_option(stage_no, options, orch.stage_history(stage_no))]
+    return pick_llm
+
+
+def run_story(config_path: str, out_dir: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """동화 한 편 생성 (워커 프로세스에서 실행, 같은 출력 디렉토리면 이어서 생성)"""
+    from orchestrator import Orchestrator
+    from managers import ConfigManager, FileManager, get_branch_store, get_video_scheduler
+
+    start = time.perf_counter()
+    result: Dict[str, Any] = {
+        "id": entry["id"], "art_style": entry["art_style"], "choice": entry["choice"],
+        "status": "failed", "pid": os.getpid(),
+    }
+    try:
+        # 동화별 출력 디렉토리가 아니라 기본 출력 디렉토리 기준으로 공유 자원을 먼저 생성
+        # (영상 대기열은 프로세스 공용이라 처음 만든 설정의 공유 DB를 웹 서버와 함께 사용)
+        shared = FileManager(ConfigManager(config_path))
+        get_video_scheduler(shared.config)
+        orch = Orchestrator(config_path, art_style=entry["art_style"],
+                            output_base=os.path.join(out_dir, "stories", entry["id"]))
+        orch.media.video_priority = "batch"  # 웹/사전 생성 요청이 먼저 (다른 프로세스 포함)
+        if orch.branches is not None:
+            orch.branches = get_branch_store(shared.config, shared)
+        orch.state.bind_job(entry["id"], art_style=entry["art_style"], tale_title=entry["tale"])
+        resumed = orch.restore_from_manifest(entry["id"])
+        orch.manifest.set_meta(tale_title=entry["tale"])
+
+        orch.run(choose=_make_picker(entry, orch))
+        orch.state.flush()
+
+        completed = orch.manifest.completed_stages()
+        final_path = orch.file_mgr.get_final_video_path()
+        result.update(
+            status="ok" if len(completed) == 5 and os.path.exists(final_path) else "failed",
+            resumed_stages=resumed,
+            completed_stages=completed,
+            final_video=final_path if os.path.exists(final_path) else None,
+            branches_reused=len(orch.state.get_events("branch_reused")),
+            stage_timings=[
+                {"stage": e.get("stage"), "success": e.get("success"), "timings": e.get("timings", {})}
+                for e in orch.state.get_events("stage_pipeline")
+            ],
+        )
+        if result["status"] != "ok":
+            result["error"] = f"완료된 막 {len(completed)}/5"
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        result["error"] = str(e)
+
+    result["seconds"] = round(time.perf_counter() - start, 1)
+    result["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return result
+
+
+# ============== 보고서 ==============
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(round(q * (len(values) - 1))))], 1)
+
+
+def build_report(entries: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]],
+                 wall_s: float, workers: int, ran: int, skipped: int) -> Dict[str, Any]:
+    """처리량 보고서 (이번 실행 + 목록 전체 진행 상황)"""
+    latest = [results[e["id"]] for e in entries if e["id"] in results]
+    ok = [r for r in latest if r["status"] == "ok"]
+    durations = [r["seconds"] for r in ok if r.get("seconds")]
+
+    step_totals: Dict[str, List[float]] = {}
+    for r in ok:
+        for stage in r.get("stage_timings", []):
+            for step, seconds in (stage.get("timings") or {}).items():
+                step_totals.setdefault(step, []).append(seconds)
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "workers": workers,
+        "this_run": {
+            "ran": ran,
+            "skipped_done": skipped,
+            "wall_s": round(wall_s, 1),
+            "stories_per_hour": round(ran / wall_s * 3600, 2) if wall_s > 0 and ran else 0.0,
+        },
+        "catalog": {
+            "total": len(entries),
+            "ok": len(ok),
+            "failed": [r["id"] for r in latest if r["status"] != "ok"],
+            "pending": len(entries) - len(latest),
+        },
+        "story_seconds": {
+            "p50": _percentile(durations, 0.5),
+            "p95": _percentile(durations, 0.95),
+            "mean": round(statistics.mean(durations), 1) if durations else None,
+        },
+        "step_seconds_mean": {step: round(statistics.mean(v), 1) for step, v in sorted(step_totals.items())},
+        "branches_reused": sum(r.get("branches_reused", 0) for r in ok),
+    }
+
+
+# ============== 실행 ==============
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="동화 대량 생성 (헤드리스)")
+    parser.add_argument("catalog", help="동화 목록 파일 (JSONL 또는 YAML)")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 생성할 동화 수 (워커 프로세스)")
+    parser.add_argument("--out", default=None, help="출력 디렉토리 (기본: output/batch/<목록 파일 이름>)")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="설정 파일")
+    args = parser.parse_args()
+
+    entries = load_entries(args.catalog)
+    out_dir = os.path.abspath(args.out or os.path.join(
+        SCRIPT_DIR, "output", "batch", os.path.splitext(os.path.basename(args.catalog))[0]
+    ))
+    os.makedirs(out_dir, exist_ok=True)
+    results_path = os.path.join(out_dir, "results.jsonl")
+
+    results = load_results(results_path)
+    todo = [e for e in entries if results.get(e["id"], {}).get("status") != "ok"]
+    skipped = len(entries) - len(todo)
+    print(f"📚 동화 {len(entries)}편 중 {len(todo)}편 생성 (완료 {skipped}편 건너뜀), 워커 {args.workers}개")
+    print(f"📁 출력: {out_dir}")
+
+    start = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")  # 오케스트레이터 스레드가 있는 상태로 fork하지 않도록
+    counter = ctx.Value("i", 0)
+    done = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), mp_context=ctx,
+                             initializer=_init_worker, initargs=(counter, max(1, args.workers))) as pool:
+        futures = {pool.submit(run_story, args.config, out_dir, entry): entry for entry in todo}
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # 워커 프로세스 비정상 종료
+                result = {"id": entry["id"], "art_style": entry["art_style"], "choice": entry["choice"],
+                          "status": "failed", "error": f"워커 종료: {e}"}
+            results[result["id"]] = result
+            with open(results_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            done += 1
+            mark = "✅" if result["status"] == "ok" else "❌"
+            print(f"{mark} [{done}/{len(todo)}] {result['id']} "
+                  f"({result.get('seconds', 0):.0f}초){' - ' + result['error'] if result.get('error') else ''}")
+
+    report = build_report(entries, results, time.perf_counter() - start, args.workers, len(todo), skipped)
+    from utils.atomic_io import atomic_write_json
+    atomic_write_json(os.path.join(out_dir, "report.json"), report, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if not report["catalog"]["failed"] and not report["catalog"]["pending"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# ==================================================================================
+# bench_startup.py - 콜드 스타트 벤치마크 (import 시간, 첫 작업 준비 시간, 메모리)
+# ==================================================================================
+#
+# 사용법:
+#   python bench_startup.py                       # 5회 측정, 결과를 output/bench_startup.jsonl에 누적
+#   python bench_startup.py --runs 10 --max-import 1.5   # 기준 초과 시 종료 코드 1 (CI용)
+#
+# 측정 항목 (매 회 새 프로세스):
+#   import_s        : import orchestrator_api 시간
+#   heavy_loaded    : import만으로 불러와진 무거운 모듈 (지연 로드가 깨지면 여기에 나타남)
+#   heavy_roots     : import만으로 불러와진 무거운 패키지 (HEAVY_ROOTS, 하위 모듈 하나라도 로드되면 포함)
+#   init_s          : OrchestratorAPI 생성 시간 (/api/story/start 요청이 동기적으로 하는 일)
+#   preload_s       : 무거운 의존성 미리 로드 시간
+#   first_call_s    : 미리 로드 없이 첫 실제 사용(google.genai types) 시간
+#   rss_mb          : 프로세스 최대 메모리
+#
+# tests/test_startup.py가 measure()로 같은 측정을 테스트 스위트에서 실행
+
+import os
+import sys
+import json
+import time
+import yaml
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Any, Dict, List
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# import orchestrator_api 만으로는 로드되면 안 되는 패키지
+HEAVY_ROOTS = ("google.genai", "moviepy", "pydub", "elevenlabs")
+
+_PROBE = r"""
+import os, sys, json, time, resource
+sys.path.insert(0, {script_dir!r})
+
+result = {{}}
+start = time.perf_counter()
+import orchestrator_api
+result["import_s"] = time.perf_counter() - start
+
+from utils.preload import HEAVY_MODULES, preload_modules
+result["heavy_loaded"] = [m for m in HEAVY_MODULES if m in sys.modules]
+result["heavy_roots"] = [r for r in {heavy_roots!r}
+                         if any(m == r or m.startswith(r + ".") for m in sys.modules)]
+
+start = time.perf_counter()
+try:
+    orchestrator_api.OrchestratorAPI({config_path!r}, art_style="pixar", job_id="bench")
+    result["init_s"] = time.perf_counter() - start
+except Exception as e:
+    result["init_s"] = None
+    result["init_error"] = str(e)
+
+if {preload!r}:
+    start = time.perf_counter()
+    preload_modules()
+    result["preload_s"] = time.perf_counter() - start
+else:
+    start = time.perf_counter()
+    try:
+        from google.genai import types
+        types.GenerateContentConfig(response_mime_type="application/json")
+    except Exception:
+        pass
+    result["first_call_s"] = time.perf_counter() - start
+
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+result["rss_mb"] = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+print("BENCH " + json.dumps(result))
+"""
+
+
+def _make_config(work_dir: str) -> str:
+    """출력 경로를 임시 디렉토리로 바꾼 설정 (실제 작업 상태를 건드리지 않도록)"""
+    with open(os.path.join(SCRIPT_DIR, "config", "default_config.yaml"), "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    data["paths"] = {
+        key: os.path.join(work_dir, value) if isinstance(value, str) and value.startswith("output") else value
+        for key, value in data.get("paths", {}).items()
+    }
+    data.setdefault("hot_reload", {})["enabled"] = False
+    path = os.path.join(work_dir, "bench_config.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f, allow_unicode=True)
+    return path
+
+
+def _run_once(config_path: str, preload: bool) -> Dict[str, Any]:
+    code = _PROBE.format(script_dir=SCRIPT_DIR, config_path=config_path, preload=preload,
+                         heavy_roots=HEAVY_ROOTS)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                          cwd=SCRIPT_DIR, timeout=300)
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH "):
+            return json.loads(line[len("BENCH "):])
+    raise RuntimeError(f"벤치마크 프로세스 실패:\n{proc.stderr[-2000:]}")
+
+
+def measure(runs: int = 1, preload: bool = False) -> List[Dict[str, Any]]:
+    """새 프로세스에서 runs회 측정 (임시 출력 디렉토리 사용)"""
+    work_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        config_path = _make_config(work_dir)
+        return [_run_once(config_path, preload=preload) for _ in range(runs)]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _median(runs: List[Dict[str, Any]], key: str):
+    values = [r[key] for r in runs if r.get(key) is not None]
+    return round(statistics.median(values), 4) if values else None
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=SCRIPT_DIR).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="콜드 스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수 (각각 새 프로세스)")
+    parser.add_argument("--history", default=os.path.join(SCRIPT_DIR, "output", "bench_startup.jsonl"),
+                        help="결과 누적 파일 (JSONL)")
+    parser.add_argument("--max-import", type=float, default=None,
+                        help="import 시간 중앙값 기준 (초). 초과하거나 무거운 모듈이 import 시점에 로드되면 실패")
+    args = parser.parse_args()
+
+    cold = measure(args.runs, preload=False)
+    warm = measure(args.runs, preload=True)
+
+    heavy_loaded = sorted({m for r in cold for m in r.get("heavy_loaded", []) + r.get("heavy_roots", [])})
+    summary = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_s": _median(cold, "import_s"),
+        "init_s": _median(cold, "init_s"),
+        "first_call_s": _median(cold, "first_call_s"),
+        "preload_s": _median(warm, "preload_s"),
+        "rss_mb_cold": _median(cold, "rss_mb"),
+        "rss_mb_preloaded": _median(warm, "rss_mb"),
+        "heavy_loaded_on_import": heavy_loaded,
+    }
+    errors = sorted({r["init_error"] for r in cold if r.get("init_error")})
+    if errors:
+        summary["init_errors"] = errors
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    failed = False
+    if heavy_loaded:
+        print(f"❌ import 시점에 무거운 모듈 로드됨: {', '.join(heavy_loaded)}")
+        failed = True
+    if args.max_import is not None and (summary["import_s"] or 0) > args.max_import:
+        print(f"❌ import 시간 {summary['import_s']}초 > 기준 {args.max_import}초")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
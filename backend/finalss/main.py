@@ -5,6 +5,7 @@
 
 import os
 import sys
+import argparse
 
 # Windows 콘솔 UTF-8 인코딩 설정
 if sys.platform == 'win32':
@@ -18,9 +19,18 @@ from orchestrator import Orchestrator
 def main():
     """
     흥부와 놀부 인터랙티브 스토리 메이커 실행
+    --auto N: 매 막 N번 선택지를 자동 선택 (앞 막 렌더링과 다음 막 생성을 겹쳐 실행)
     """
+    parser = argparse.ArgumentParser(description="흥부와 놀부 인터랙티브 스토리 메이커")
+    parser.add_argument("--auto", type=int, choices=[1, 2, 3], default=None,
+                        help="선택지 자동 선택 번호 (입력 없이 5막까지 진행)")
+    args = parser.parse_args()
+    
     orchestrator = Orchestrator()
-    orchestrator.run()
+    if args.auto is None:
+        orchestrator.run()
+    else:
+        orchestrator.run(choose=lambda stage_no, options: options[min(args.auto, len(options)) - 1])
 
 
 if __name__ == "__main__":
@@ -2,19 +2,77 @@
 # managers/__init__.py
 # ==================================================================================
 
-from .config_manager import ConfigManager
+from .config_manager import (
+    ConfigManager, ConfigSnapshot, get_config_snapshot, start_config_watcher, set_api_key_offset,
+)
 from .file_manager import FileManager
 from .state_manager import StateManager
+from .state_journal import StateJournal
+from .state_store import SQLiteStateStore, get_state_store
+from .job_manifest import JobManifest, StageRecord
+from .artifact_manifest import ArtifactManifest, get_artifact_manifest
+from .build_graph import BuildGraph, get_build_graph
+from .storage import StorageBackend, LocalStorage, S3Storage, create_storage
+from .retention_manager import RetentionManager, get_retention_manager
+from .stage_pipeline import StagePipeline, PipelineStep, PipelineResult, StepFailed
+from .stage_pool import StagePool, get_stage_pool
+from .branch_store import BranchStore, get_branch_store
+from .video_scheduler import VideoScheduler, VideoTicket, get_video_scheduler
+from .video_leases import VideoLeaseBoard
+from .rate_limiter import (
+    RateLimiter, RateLimitedClient, RateLimitExceeded, get_rate_limiter, set_rate_limit_share,
+)
+from .model_router import ModelRouter, TimedClient, get_model_router
 from .story_manager import StoryManager
 from .media_generator import MediaGenerator
 from .merge_manager import MergeManager, VideoMerger, AudioMerger, AVMuxer
 from .story_helper import StoryHelper
 from .subtitle_manager import SubtitleManager
+from .media_info import MediaInfo, MediaInfoService, ProbeUnavailable, get_media_info_service
 
 __all__ = [
     "ConfigManager",
+    "ConfigSnapshot",
+    "get_config_snapshot",
+    "start_config_watcher",
+    "set_api_key_offset",
     "FileManager",
     "StateManager",
+    "StateJournal",
+    "SQLiteStateStore",
+    "get_state_store",
+    "JobManifest",
+    "StageRecord",
+    "ArtifactManifest",
+    "get_artifact_manifest",
+    "BuildGraph",
+    "get_build_graph",
+    "StorageBackend",
+    "LocalStorage",
+    "S3Storage",
+    "create_storage",
+    "RetentionManager",
+    "get_retention_manager",
+    "StagePipeline",
+    "PipelineStep",
+    "PipelineResult",
+    "StepFailed",
+    "StagePool",
+    "get_stage_pool",
+    "BranchStore",
+    "get_branch_store",
+    "VideoScheduler",
+    "VideoTicket",
+    "get_video_scheduler",
+    "VideoLeaseBoard",
+    "RateLimiter",
+    "RateLimitedClient",
+    "RateLimitExceeded",
+    "get_rate_limiter",
+    "set_rate_limit_share",
+    "ModelRouter",
+    "TimedClient",
+    "get_model_router",
     "StoryManager",
     "MediaGenerator",
     "MergeManager",
@@ -23,4 +81,8 @@ __all__ = [
     "AVMuxer",
     "StoryHelper",
     "SubtitleManager", 
+    "MediaInfo",
+    "MediaInfoService",
+    "ProbeUnavailable",
+    "get_media_info_service",
 ]
\ No newline at end of file
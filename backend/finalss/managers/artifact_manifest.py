@@ -0,0 +1,198 @@
+# ==================================================================================
+# managers/artifact_manifest.py - 산출물 검증 매니페스트 (크기, 해시, probe 결과)
+# ==================================================================================
+
+import os
+import json
+import shutil
+import threading
+from typing import Any, Dict, Optional
+
+from utils.atomic_io import atomic_write_json
+from .job_manifest import file_sha256
+from .media_info import MediaInfoService, ProbeUnavailable, get_media_info_service
+
+
+# 이미지 파일 시그니처
+_IMAGE_MAGIC = (
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"\xff\xd8\xff",       # JPEG
+    b"RIFF",               # WEBP (RIFF....WEBP)
+)
+
+# ffprobe가 없거나 실행에 실패해 검증하지 못한 경우 (파일이 손상됐다는 뜻은 아님)
+_UNVERIFIED = {"unverified": True}
+
+
+class ArtifactManifest:
+    """
+    산출물 유효성 매니페스트 (output/artifacts.json)
+    - 파일별 크기, mtime, SHA-256, probe 결과(길이, 스트림 유무) 기록
+    - "파일이 있음" 대신 "검증을 통과한 파일"만 완료로 인정
+    - 크기/mtime이 기록과 같으면 재검증 생략, 다르면 다시 probe
+    - 검증에 실패한 파일은 삭제 → 다음 실행에서 자동으로 다시 생성
+      (빈 파일, ffprobe가 읽고 거부한 파일, 스트림/길이가 없는 파일만.
+       ffprobe 시간 초과 등으로 검증하지 못한 파일은 그대로 두고 다음에 다시 검증)
+    """
+
+    def __init__(self, manifest_path: str, media_info: MediaInfoService = None):
+        self.manifest_path = manifest_path
+        self.media_info = media_info or get_media_info_service()
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    # ============== 검증 ==============
+
+    def is_valid(self, path: Optional[str], kind: str, discard_invalid: bool = True) -> bool:
+        """
+        산출물 유효 여부
+        kind: "image" | "video" | "audio" | "file"
+        discard_invalid: 검증 실패 파일 삭제 (잘린 MP4 등이 캐시로 남지 않도록)
+        """
+        if not path:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._forget(path)
+            return False
+
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime \
+                and entry["kind"] == kind:
+            return True
+
+        if self.record(path, kind):
+            return True
+
+        if discard_invalid:
+            print(f"      🗑️ 손상된 산출물 삭제: {os.path.basename(path)}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return False
+
+    def record(self, path: str, kind: str) -> bool:
+        """파일을 검증하고 통과하면 기록 (쓰기 완료 직후 호출)"""
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+
+        probe = self._validate(path, kind, st.st_size)
+        if probe is None:
+            self._forget(path)
+            return False
+        if probe is _UNVERIFIED:
+            # 도구가 없거나 실행에 실패하면 존재 여부로만 판단하고 기록하지 않음 (다음에 다시 검증)
+            return True
+
+        entry = {
+            "kind": kind,
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "sha256": file_sha256(path),
+            "probe": probe,
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._save()
+        return True
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """기록된 검증 정보"""
+        with self._lock:
+            return self._entries.get(os.path.abspath(path))
+
+    def get_duration(self, path: str) -> float:
+        """검증 시 기록된 길이 (기록이 없으면 ffprobe 캐시 조회, 실패 시 0.0)"""
+        entry = self.get(path)
+        duration = (entry or {}).get("probe", {}).get("duration")
+        if duration is None:
+            duration = self.media_info.get_duration(path)
+        return duration or 0.0
+
+    def invalidate(self, path: str) -> None:
+        """기록 제거 (파일을 다시 만들 때)"""
+        self._forget(path)
+
+    # ============== 내부 ==============
+
+    def _validate(self, path: str, kind: str, size: int) -> Optional[Dict[str, Any]]:
+        """종류별 검증. 통과하면 probe 요약, 실패하면 None"""
+        if size <= 0:
+            return None
+
+        if kind == "image":
+            with open(path, "rb") as f:
+                head = f.read(12)
+            if not any(head.startswith(m) for m in _IMAGE_MAGIC):
+                return None
+            if head.startswith(b"RIFF") and head[8:12] != b"WEBP":
+                return None
+            return {"format": "image"}
+
+        if kind in ("video", "audio"):
+            if shutil.which(self.media_info.ffprobe_bin) is None:
+                return _UNVERIFIED
+            try:
+                info = self.media_info.probe_strict(path)
+            except ProbeUnavailable:
+                return _UNVERIFIED
+            if info is None or info.duration <= 0:
+                return None
+            if kind == "video" and not info.has_video:
+                return None
+            if kind == "audio" and not info.has_audio:
+                return None
+            return {
+                "duration": info.duration,
+                "format": info.format_name,
+                "has_video": info.has_video,
+                "has_audio": info.has_audio,
+            }
+
+        return {}
+
+    def _forget(self, path: str) -> None:
+        key = os.path.abspath(path)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # 매니페스트가 없으면 파일을 다시 검증하면 되므로 치명적이지 않음
+            print(f"⚠️ 산출물 매니페스트 로드 실패, 재검증합니다: {e}")
+            self._entries = {}
+
+    def _save(self) -> None:
+        try:
+            atomic_write_json(self.manifest_path, self._entries, indent=2)
+        except Exception as e:
+            print(f"⚠️ 산출물 매니페스트 저장 실패: {e}")
+
+
+# ============== 프로세스 공용 인스턴스 ==============
+
+_manifests: Dict[str, ArtifactManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_artifact_manifest(manifest_path: str) -> ArtifactManifest:
+    """경로별로 공유되는 ArtifactManifest 반환 (생성기와 병합기가 같은 기록을 보도록)"""
+    key = os.path.abspath(manifest_path)
+    with _manifests_lock:
+        if key not in _manifests:
+            _manifests[key] = ArtifactManifest(manifest_path)
+        return _manifests[key]
@@ -0,0 +1,224 @@
+# ==================================================================================
+# managers/branch_store.py - 공유 분기 저장소 (사용자 간에 같은 이야기 분기의 막 재사용)
+# ==================================================================================
+
+import os
+import re
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from utils.atomic_io import atomic_write_json, link_or_copy
+from .config_manager import ConfigManager
+from .file_manager import FileManager
+from .stage_pool import BUNDLE_FILE, load_bundle, relative_files
+
+
+def _sha(*parts: Any) -> str:
+    encoded = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class BranchStore:
+    """
+    공유 분기 저장소
+    - 이야기는 한 동화 위의 5막 트리: 같은 이전 막들에서 같은 선택을 하면 같은 막이 나와도 됨
+    - 1막은 동화 + art_style마다 하나인 뿌리 분기 → 같은 동화/스타일의 작업은 같은 1막에서 시작
+    - 2막부터 분기 키 = (동화, art_style, 부모 분기 해시, 정규화된 선택)
+      부모 분기 해시 = 동화 + art_style + 지금까지의 막 스토리 (저장된 분기를 받으면 스토리가 같으므로 계속 이어짐)
+    - 분기마다 막 번들(스토리, 장면, 이미지/영상, 병합본, TTS, 합성본) 보관 → 다른 사용자는 링크/복사만 하면 됨
+    - 분기 지점의 선택지도 보관 → 같은 경로의 사용자는 같은 선택지를 보게 되어 적중률이 올라감
+    - 깊이(막 번호)별 적중/실패 횟수 기록
+    - 모델/인코딩/TTS 설정이 바뀌면 기존 분기는 쓰지 않음, max_branches를 넘으면 오래 안 쓰인 분기부터 삭제
+    """
+
+    def __init__(self, config: ConfigManager, file_mgr: FileManager, max_branches: int = 500):
+        self.config = config
+        self.root = file_mgr.get_branch_dir()
+        self.options_dir = os.path.join(self.root, "options")
+        self.stats_path = os.path.join(self.root, "stats.json")
+        self.max_branches = max_branches
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = self._load_stats()
+
+    # ============== 키 ==============
+
+    @staticmethod
+    def normalize_choice(choice: str) -> str:
+        """선택 텍스트 정규화 (유니코드/대소문자/공백/앞뒤 문장부호 차이 무시)"""
+        text = unicodedata.normalize("NFKC", choice or "").lower()
+        text = re.sub(r"\s+", " ", text).strip()
+        return text.strip(" .,!?~\"'“”‘’")
+
+    @staticmethod
+    def path_hash(tale: str, art_style: str, stories: List[str]) -> str:
+        """지금까지 진행한 경로(동화, 스타일, 막 스토리들)의 해시 = 다음 막의 부모 분기"""
+        return _sha("path", tale, art_style, list(stories))
+
+    @staticmethod
+    def root_key(tale: str, art_style: str) -> str:
+        """1막 뿌리 분기 키 (선택 없이 동화와 스타일만으로 결정)"""
+        return _sha("root", tale, art_style)
+
+    def branch_key(self, tale: str, art_style: str, parent_hash: str, choice: str) -> str:
+        return _sha("branch", tale, art_style, parent_hash, self.normalize_choice(choice))
+
+    def _branch_dir(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    # ============== 막 번들 ==============
+
+    def lookup(self, key: str, depth: int) -> Optional[Dict[str, Any]]:
+        """
+        저장된 분기 번들 (없거나 설정이 바뀌었으면 None)
+        번들 파일은 저장소 소유 → 받는 쪽은 링크/복사해서 사용
+        """
+        bundle = load_bundle(self._branch_dir(key))
+        if bundle is not None and bundle.get("fingerprint") != self.config.get_media_fingerprint():
+            bundle = None
+        self._count(depth, "hits" if bundle is not None else "misses")
+        if bundle is not None:
+            try:
+                os.utime(os.path.join(bundle["dir"], BUNDLE_FILE))  # 최근 사용 (정리 순서)
+            except OSError:
+                pass
+            print(f"🌳 공유 분기 적중: {depth}막 {key[:12]}")
+        return bundle
+
+    def has(self, key: str) -> bool:
+        """현재 설정으로 쓸 수 있는 분기가 있는지 (적중 통계에는 세지 않음)"""
+        bundle = load_bundle(self._branch_dir(key))
+        return bundle is not None and bundle.get("fingerprint") == self.config.get_media_fingerprint()
+
+    def record(self, key: str, depth: int, bundle: Dict[str, Any]) -> bool:
+        """
+        막 번들을 분기로 저장 (파일은 링크/복사, 이미 있으면 그대로 둠)
+        임시 디렉토리에 만든 뒤 bundle.json을 마지막에 쓰고 이름 변경
+        """
+        branch_dir = self._branch_dir(key)
+        if os.path.exists(os.path.join(branch_dir, BUNDLE_FILE)):
+            return True
+
+        staging = f"{branch_dir}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            files = {}
+            for step, paths in bundle["files"].items():
+                copied = []
+                for i, src in enumerate(paths if isinstance(paths, list) else [paths]):
+                    dst = os.path.join(staging, f"{step}_{i}{os.path.splitext(src)[1]}")
+                    os.makedirs(staging, exist_ok=True)
+                    link_or_copy(src, dst)
+                    copied.append(dst)
+                files[step] = copied if isinstance(paths, list) else copied[0]
+
+            data = dict(bundle, depth=depth, fingerprint=self.config.get_media_fingerprint(),
+                        created_at=time.time(), files=relative_files(files, staging))
+            data.pop("dir", None)
+            atomic_write_json(os.path.join(staging, BUNDLE_FILE), data, indent=2)
+            try:
+                os.rename(staging, branch_dir)
+            except OSError:
+                return True  # 다른 작업이 먼저 저장함
+            self._count(depth, "recorded")
+        except Exception as e:
+            print(f"⚠️ 공유 분기 저장 실패: {e}")
+            return False
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self._evict()
+        return True
+
+    # ============== 선택지 ==============
+
+    def get_options(self, path_hash: str, stage_no: int) -> Optional[List[str]]:
+        """이 경로에서 이미 만들어 둔 다음 막 선택지"""
+        path = os.path.join(self.options_dir, f"{path_hash}_{stage_no}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if data.get("fingerprint") != self.config.get_media_fingerprint():
+            return None
+        return list(data.get("options", [])) or None
+
+    def put_options(self, path_hash: str, stage_no: int, options: List[str]) -> None:
+        path = os.path.join(self.options_dir, f"{path_hash}_{stage_no}.json")
+        if os.path.exists(path):
+            return
+        atomic_write_json(path, {
+            "options": list(options),
+            "fingerprint": self.config.get_media_fingerprint(),
+            "created_at": time.time(),
+        })
+
+    # ============== 통계 / 정리 ==============
+
+    def _load_stats(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _count(self, depth: int, field: str) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(str(depth), {"hits": 0, "misses": 0, "recorded": 0})
+            entry[field] = entry.get(field, 0) + 1
+            try:
+                atomic_write_json(self.stats_path, self._stats, indent=2)
+            except OSError as e:
+                print(f"⚠️ 공유 분기 통계 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """깊이(막 번호)별 적중/실패/저장 횟수와 적중률"""
+        with self._lock:
+            result = {}
+            for depth, entry in sorted(self._stats.items()):
+                lookups = entry.get("hits", 0) + entry.get("misses", 0)
+                result[depth] = dict(entry, hit_rate=round(entry.get("hits", 0) / lookups, 3) if lookups else 0.0)
+            return result
+
+    def _branches(self) -> List[str]:
+        dirs = []
+        for prefix in os.listdir(self.root) if os.path.isdir(self.root) else []:
+            prefix_dir = os.path.join(self.root, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if os.path.exists(os.path.join(prefix_dir, name, BUNDLE_FILE)):
+                    dirs.append(os.path.join(prefix_dir, name))
+        return dirs
+
+    def _evict(self) -> None:
+        """max_branches를 넘으면 오래 안 쓰인 분기부터 삭제"""
+        branches = self._branches()
+        excess = len(branches) - self.max_branches
+        if excess <= 0:
+            return
+        branches.sort(key=lambda d: os.path.getmtime(os.path.join(d, BUNDLE_FILE)))
+        for branch_dir in branches[:excess]:
+            shutil.rmtree(branch_dir, ignore_errors=True)
+        print(f"🗑️ 오래된 공유 분기 {excess}개 삭제")
+
+
+# ============== 프로세스 공용 저장소 ==============
+
+_stores: Dict[str, BranchStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_branch_store(config: ConfigManager, file_mgr: FileManager) -> BranchStore:
+    """분기 디렉토리별로 공유되는 BranchStore (통계 카운터를 작업 간에 공유)"""
+    key = os.path.abspath(file_mgr.get_branch_dir())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = BranchStore(config, file_mgr,
+                                       max_branches=config.get_branch_store_config()["max_branches"])
+        return _stores[key]
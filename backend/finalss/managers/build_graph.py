@@ -0,0 +1,134 @@
+# ==================================================================================
+# managers/build_graph.py - 입력 해시 기반 증분 빌드 (이미지 → 영상 → 병합 → 최종)
+# ==================================================================================
+
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from utils.atomic_io import atomic_write_json
+from .artifact_manifest import ArtifactManifest
+from .job_manifest import file_sha256
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """빌드 파라미터(프롬프트, 인코딩 설정 등) 해시"""
+    data = json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class BuildGraph:
+    """
+    make/ninja 방식의 산출물 의존성 기록 (output/build_graph.json)
+    - 산출물마다 입력 파일 해시 + 파라미터 해시를 기록
+    - is_fresh: 산출물이 유효하고 입력/파라미터가 기록과 같으면 True → 재실행 생략
+    - 입력이 다시 만들어지면(해시 변경) 그 아래 단계가 모두 stale 처리되어
+      image → video → merged → final → complete 순으로 필요한 것만 다시 빌드
+    """
+
+    def __init__(self, graph_path: str, artifacts: ArtifactManifest):
+        self.graph_path = graph_path
+        self.artifacts = artifacts
+        self._lock = threading.RLock()
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    # ============== 조회 ==============
+
+    def is_fresh(self, output: str, inputs: Iterable[str], params: Dict[str, Any],
+                 kind: str, adopt_untracked: bool = False) -> bool:
+        """
+        산출물이 최신인지 확인
+        adopt_untracked: 기록이 없는 기존 산출물을 현재 입력 기준으로 인정
+          (영상 생성처럼 비싸고 결과가 매번 다른 단계용. ffmpeg 단계는 그냥 다시 빌드)
+        """
+        if not self.artifacts.is_valid(output, kind):
+            return False
+
+        key = os.path.abspath(output)
+        with self._lock:
+            node = self._nodes.get(key)
+
+        inputs = [p for p in inputs if p]
+        if node is None:
+            if adopt_untracked:
+                self.record(output, inputs, params)
+                return True
+            return False
+
+        if node.get("params") != params_hash(params):
+            print(f"      🔁 파라미터 변경: {os.path.basename(output)}")
+            return False
+
+        recorded = node.get("inputs", {})
+        current = {os.path.abspath(p): self._input_hash(p) for p in inputs}
+        if current != recorded:
+            changed = [os.path.basename(p) for p in current if current[p] != recorded.get(p)]
+            print(f"      🔁 입력 변경 ({', '.join(changed) or '입력 목록'}): {os.path.basename(output)}")
+            return False
+        return True
+
+    # ============== 기록 ==============
+
+    def record(self, output: str, inputs: Iterable[str], params: Dict[str, Any]) -> None:
+        """빌드 성공 후 입력/파라미터 해시 기록"""
+        node = {
+            "inputs": {os.path.abspath(p): self._input_hash(p) for p in inputs if p},
+            "params": params_hash(params),
+        }
+        with self._lock:
+            self._nodes[os.path.abspath(output)] = node
+            self._save()
+
+    def invalidate(self, output: str) -> None:
+        """산출물 기록 제거 (강제 재빌드)"""
+        with self._lock:
+            if self._nodes.pop(os.path.abspath(output), None) is not None:
+                self._save()
+
+    # ============== 내부 ==============
+
+    def _input_hash(self, path: str) -> Optional[str]:
+        """입력 파일 해시 (검증 매니페스트에 기록된 값 우선)"""
+        if not os.path.exists(path):
+            return None
+        entry = self.artifacts.get(path)
+        if entry:
+            st = os.stat(path)
+            if entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+                return entry["sha256"]
+        return file_sha256(path)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.graph_path):
+            return
+        try:
+            with open(self.graph_path, "r", encoding="utf-8") as f:
+                self._nodes = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # 기록이 없으면 모두 다시 빌드될 뿐이므로 치명적이지 않음
+            print(f"⚠️ 빌드 그래프 로드 실패, 전체 재빌드합니다: {e}")
+            self._nodes = {}
+
+    def _save(self) -> None:
+        try:
+            atomic_write_json(self.graph_path, self._nodes, indent=2)
+        except Exception as e:
+            print(f"⚠️ 빌드 그래프 저장 실패: {e}")
+
+
+# ============== 프로세스 공용 인스턴스 ==============
+
+_graphs: Dict[str, BuildGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_build_graph(graph_path: str, artifacts: ArtifactManifest) -> BuildGraph:
+    """경로별로 공유되는 BuildGraph 반환 (생성기와 병합기가 같은 기록을 보도록)"""
+    key = os.path.abspath(graph_path)
+    with _graphs_lock:
+        if key not in _graphs:
+            _graphs[key] = BuildGraph(graph_path, artifacts)
+        return _graphs[key]
@@ -3,51 +3,330 @@
 # ==================================================================================
 
 import os
+import json
+import hashlib
+import threading
 import yaml
-from typing import Any, Dict, List
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
 from pathlib import Path
 
 
+_DEFAULT_CONFIG_PATH = r"C:\Users\Admin\Desktop\2ndTeamWork\workspace\backend\finalss\config\default_config.yaml"
+_ENV_PATH = r"C:\Users\Admin\Desktop\2ndTeamWork\workspace\backend\finalss\.env"
+
+
+def _freeze(value: Any) -> Any:
+    """YAML 값을 읽기 전용으로 변환 (dict → MappingProxyType, list → tuple)"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# ============== 설정 스냅샷 ==============
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    한 번 파싱한 설정 (읽기 전용)
+    - 자주 쓰는 조회(막 정보, 금지어, 경로, 인코딩 프로필 등)는 미리 계산
+    - 프로세스 전체가 공유하고, 파일이 바뀌면 새 스냅샷으로 통째로 교체
+    """
+    config_path: str
+    mtime: float
+    raw: Mapping[str, Any]
+    story_structure: Mapping[int, Mapping[str, Any]]
+    original_refs: Mapping[int, str]
+    blocked_words: Tuple[str, ...]
+    blocked_words_lower: FrozenSet[str]
+    sanitize_mappings: Mapping[str, str]
+    tts_char_limits: Mapping[str, int]
+    models: Mapping[str, str]
+    encoding_base: Mapping[str, Any]
+    encoding_profiles: Mapping[str, Mapping[str, Any]]
+    paths: Mapping[str, str]
+
+    @classmethod
+    def parse(cls, config_path: str) -> "ConfigSnapshot":
+        """YAML 파싱 + 조회용 값 미리 계산"""
+        path = Path(config_path)
+        if not path.exists():
+            raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {path}")
+        mtime = path.stat().st_mtime
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+
+        story = data.get("story", {}) or {}
+        media = data.get("media", {}) or {}
+        content_filter = data.get("content_filter", {}) or {}
+        tts = data.get("tts", {}) or {}
+        blocked = [str(w) for w in content_filter.get("blocked_words", []) or []]
+
+        refs = story.get("original_refs", {}) or {}
+        original_refs = {int(k): v for k, v in refs.items()}
+
+        # 인코딩 프로필: media.video의 codec/preset/crf를 기본값으로 하고 프로필 값으로 덮어씀
+        video = media.get("video", {}) or {}
+        profiles = media.get("encoding_profiles", {}) or {}
+        encoding_base = {
+            "codec": video.get("codec", "libx264"),
+            "preset": video.get("preset", "medium"),
+            "crf": video.get("crf", 23),
+            "height": 0,
+            "audio_bitrate": "128k",
+        }
+        encoding_profiles = {}
+        for name in set(profiles) | {"preview", "final"}:
+            profile = dict(encoding_base)
+            profile.update(profiles.get(name, {}) or {})
+            profile["name"] = name
+            encoding_profiles[name] = profile
+
+        # 상대 경로는 config 파일 위치 기준 절대 경로로 변환 (parent: finalss 폴더)
+        paths = {}
+        for key, path_str in (data.get("paths", {}) or {}).items():
+            if not path_str:
+                continue
+            paths[key] = path_str if os.path.isabs(path_str) else \
+                str((path.parent.parent / path_str).resolve())
+
+        return cls(
+            config_path=str(path),
+            mtime=mtime,
+            raw=_freeze(data),
+            story_structure=_freeze({int(k): v for k, v in (story.get("structure", {}) or {}).items()}),
+            original_refs=MappingProxyType(original_refs),
+            blocked_words=tuple(blocked),
+            blocked_words_lower=frozenset(w.lower() for w in blocked),
+            sanitize_mappings=_freeze(content_filter.get("sanitize_mappings", {}) or {}),
+            tts_char_limits=MappingProxyType({
+                "min": tts.get("min_chars", 200),
+                "max": tts.get("max_chars", 300),
+                "target": tts.get("target_chars", 250),
+            }),
+            models=_freeze(media.get("models", {}) or {}),
+            encoding_base=_freeze(encoding_base),
+            encoding_profiles=_freeze(encoding_profiles),
+            paths=MappingProxyType(paths),
+        )
+
+
+    def with_output_base(self, output_base: str) -> "ConfigSnapshot":
+        """output 아래 경로만 output_base 아래로 옮긴 스냅샷 (config/characters 등은 그대로)"""
+        old_base = self.paths.get("output_base", "")
+        output_base = os.path.abspath(output_base)
+        paths = {}
+        for key, value in self.paths.items():
+            rel = os.path.relpath(value, old_base) if old_base else ".."
+            if rel == ".":
+                paths[key] = output_base
+            elif rel.startswith(".."):
+                paths[key] = value
+            else:
+                paths[key] = os.path.join(output_base, rel)
+        return replace(self, paths=MappingProxyType(paths))
+
+
+# ============== 프로세스 공용 스냅샷 ==============
+
+_snapshots: Dict[str, ConfigSnapshot] = {}
+_snapshots_lock = threading.Lock()
+_env_loaded = False
+
+
+def _load_env_once() -> None:
+    """.env 로드 (프로세스당 한 번: 명시적 경로 + 현재 디렉토리 탐색)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=Path(_ENV_PATH))
+    load_dotenv()
+    _env_loaded = True
+
+
+_api_keys: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+
+
+def _get_api_keys() -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """(Google 키, ElevenLabs 키) - 쉼표로 여러 개 지정 가능"""
+    global _api_keys
+    if _api_keys is None:
+        # 배치 워커 초기화처럼 ConfigManager보다 먼저 불릴 수 있으므로 .env부터 로드
+        _load_env_once()
+        g_keys = os.getenv("GOOGLE_API_KEYS", "") or os.getenv("GOOGLE_API_KEY", "")
+        e_keys = os.getenv("ELEVENLABS_API_KEYS", "") or os.getenv("ELEVENLABS_API_KEY", "")
+        _api_keys = (
+            tuple(k.strip() for k in g_keys.split(",") if k.strip()),
+            tuple(k.strip() for k in e_keys.split(",") if k.strip()),
+        )
+        print(f"🔑 Google API Keys: {len(_api_keys[0])}개 로드됨")
+        print(f"🔑 ElevenLabs Keys: {len(_api_keys[1])}개 로드됨")
+    return _api_keys
+
+
+def set_api_key_offset(offset: int) -> None:
+    """
+    이 프로세스의 키 순서를 offset만큼 회전 (배치 워커 프로세스마다 다른 키부터 사용)
+    이후 생성되는 ConfigManager부터 적용
+    """
+    global _api_keys
+    def _rotate(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+        if not keys:
+            return keys
+        start = offset % len(keys)
+        return keys[start:] + keys[:start]
+    google_keys, eleven_keys = _get_api_keys()
+    _api_keys = (_rotate(google_keys), _rotate(eleven_keys))
+
+
+def get_config_snapshot(config_path: str) -> ConfigSnapshot:
+    """경로별 현재 스냅샷 (처음 한 번만 파싱)"""
+    key = os.path.abspath(config_path)
+    snapshot = _snapshots.get(key)
+    if snapshot is not None:
+        return snapshot
+    with _snapshots_lock:
+        if key not in _snapshots:
+            _snapshots[key] = ConfigSnapshot.parse(config_path)
+            print(f"✅ 설정 로드 완료: {config_path}")
+        return _snapshots[key]
+
+
+def reload_config_snapshot(config_path: str) -> Optional[ConfigSnapshot]:
+    """
+    파일이 바뀌었으면 다시 파싱해서 교체 (바뀐 스냅샷 반환, 그대로면 None)
+    파싱에 실패하면 기존 스냅샷 유지
+    """
+    key = os.path.abspath(config_path)
+    current = _snapshots.get(key)
+    try:
+        if current is not None and os.path.getmtime(config_path) == current.mtime:
+            return None
+        snapshot = ConfigSnapshot.parse(config_path)
+    except Exception as e:
+        print(f"⚠️ 설정 다시 읽기 실패, 기존 설정 유지: {e}")
+        return None
+    with _snapshots_lock:
+        _snapshots[key] = snapshot
+    print(f"🔄 설정 변경 반영: {config_path}")
+    return snapshot
+
+
+class ConfigWatcher:
+    """
+    설정 파일 감시 (mtime 폴링, 데몬 스레드)
+    - 바뀌면 새 스냅샷으로 교체 → 이후 생성되는 작업부터 새 설정 사용
+    - 진행 중인 작업은 시작할 때의 스냅샷을 그대로 사용 (막 도중 설정이 바뀌지 않도록)
+    """
+
+    def __init__(self, config_path: str, interval: float = 2.0):
+        self.config_path = config_path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            reload_config_snapshot(self.config_path)
+
+
+_watchers: Dict[str, ConfigWatcher] = {}
+
+
+def start_config_watcher(config_path: str, interval: float = 2.0) -> ConfigWatcher:
+    """경로별 감시 스레드 시작 (이미 있으면 기존 것 반환)"""
+    key = os.path.abspath(config_path)
+    with _snapshots_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = _watchers[key] = ConfigWatcher(config_path, interval)
+    watcher.start()
+    return watcher
+
+
 class ConfigManager:
-    """YAML 설정 파일 관리"""
+    """
+    YAML 설정 파일 관리
+    - 프로세스 공용 스냅샷을 사용하므로 생성 비용 없음 (YAML/.env는 처음 한 번만 읽음)
+    - live=False: 생성 시점 스냅샷 고정 (작업 하나 동안 설정 일관성 유지)
+    - live=True: 항상 최신 스냅샷 사용 (웹 서버 전역 설정 등)
+    """
     
-    def __init__(self, config_path: str = r"C:\Users\Admin\Desktop\2ndTeamWork\workspace\backend\finalss\config\default_config.yaml"):
+    def __init__(self, config_path: str = _DEFAULT_CONFIG_PATH, live: bool = False):
         self.config_path = Path(config_path)
-        self._config: Dict[str, Any] = {}
+        self.live = live
         
-        # .env 파일 명시적 로드
-        from dotenv import load_dotenv
-        env_path = Path(r"C:\Users\Admin\Desktop\2ndTeamWork\workspace\backend\finalss\.env")
-        load_dotenv(dotenv_path=env_path)
-        
-        self._load_config()
+        _load_env_once()
+        self._snapshot = get_config_snapshot(str(self.config_path))
         self._load_api_keys()
     
-    def _load_config(self) -> None:
-        """메인 설정 파일 로드"""
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {self.config_path}")
-## 
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            self._config = yaml.safe_load(f)
-        
-        print(f"✅ 설정 로드 완료: {self.config_path}")
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        if self.live:
+            return get_config_snapshot(str(self.config_path))
+        return self._snapshot
+    
+    @property
+    def _config(self) -> Mapping[str, Any]:
+        """원본 설정 (읽기 전용)"""
+        return self.snapshot.raw
+    
+    def with_output_base(self, output_base: str) -> "ConfigManager":
+        """
+        출력 디렉토리만 바꾼 설정 (사전 생성 풀 등 다른 작업과 파일이 겹치면 안 될 때)
+        스냅샷은 현재 것으로 고정
+        """
+        scoped = ConfigManager.__new__(ConfigManager)
+        scoped.config_path = self.config_path
+        scoped.live = False
+        scoped._snapshot = self.snapshot.with_output_base(output_base)
+        scoped._load_api_keys()
+        return scoped
+    
+    def refresh(self) -> bool:
+        """최신 스냅샷으로 갱신 (바뀌었으면 True)"""
+        latest = get_config_snapshot(str(self.config_path))
+        changed = latest is not self._snapshot
+        self._snapshot = latest
+        return changed
+    
+    def get_hot_reload_config(self) -> Dict[str, Any]:
+        """설정 파일 감시 설정 (enabled, interval)"""
+        reload = self._config.get("hot_reload", {}) or {}
+        return {"enabled": reload.get("enabled", True), "interval": reload.get("interval", 2.0)}
+    
+    def get_startup_config(self) -> Dict[str, Any]:
+        """웹 서버 시작 설정 (preload: 무거운 의존성 미리 로드)"""
+        startup = self._config.get("startup", {}) or {}
+        return {"preload": startup.get("preload", True)}
     
     # ==============스토리 설정 ==============
     
     def get_initial_context(self) -> str:
         return self._config.get("story", {}).get("initial_context", "")
     
-    def get_story_structure(self) -> Dict[int, Dict[str, Any]]:
-        structure = self._config.get("story", {}).get("structure", {})
-        return {int(k): v for k, v in structure.items()}
+    def get_story_structure(self) -> Mapping[int, Mapping[str, Any]]:
+        return self.snapshot.story_structure
     
-    def get_stage_info(self, stage_no: int) -> Dict[str, Any]:
-        return self.get_story_structure().get(stage_no, {})
+    def get_stage_info(self, stage_no: int) -> Mapping[str, Any]:
+        return self.snapshot.story_structure.get(stage_no, {})
     
     def get_original_ref(self, stage_no: int) -> str:
-        refs = self._config.get("story", {}).get("original_refs", {})
-        return refs.get(stage_no, refs.get(str(stage_no), ""))
+        return self.snapshot.original_refs.get(stage_no, "")
     
     # ============== TTS 설정 ==============
     
@@ -63,24 +342,31 @@ class ConfigManager:
         """TTS 목표 글자수"""
         return self._config.get("tts", {}).get("target_chars", 250)
     
-    def get_tts_char_limits(self) -> Dict[str, int]:
+    def get_tts_char_limits(self) -> Mapping[str, int]:
         """TTS 글자수 제한 반환"""
-        tts = self._config.get("tts", {})
-        return {
-            "min": tts.get("min_chars", 200),
-            "max": tts.get("max_chars", 300),
-            "target": tts.get("target_chars", 250)
-        }
+        return self.snapshot.tts_char_limits
+    
+    def get_tts_settings(self) -> Mapping[str, Any]:
+        """tts 섹션 전체 (글자수, 자동 조정 등)"""
+        return self._config.get("tts", {})
+    
+    def get_tts_align_final_to_video(self) -> bool:
+        """전체 TTS 병합 시 각 막 오디오를 막 영상 길이에 맞출지 여부"""
+        return bool(self._config.get("tts", {}).get("final_align_to_video", False))
     
     # ============== 필터링 설정 ==============
     
-    def get_sanitize_mappings(self) -> Dict[str, str]:
+    def get_sanitize_mappings(self) -> Mapping[str, str]:
         """폭력적 표현 → 순화 표현 매핑"""
-        return self._config.get("content_filter", {}).get("sanitize_mappings", {})
+        return self.snapshot.sanitize_mappings
     
-    def get_blocked_words(self) -> List[str]:
+    def get_blocked_words(self) -> Tuple[str, ...]:
         """금지 단어 목록"""
-        return self._config.get("content_filter", {}).get("blocked_words", [])
+        return self.snapshot.blocked_words
+    
+    def get_blocked_words_lower(self) -> FrozenSet[str]:
+        """금지 단어 (소문자, 포함 여부 검사용)"""
+        return self.snapshot.blocked_words_lower
     
     # ============== 미디어 설정 ==============
     
@@ -88,8 +374,36 @@ class ConfigManager:
         return self._config.get("media", {}).get("art_style", "")
     
     def get_model(self, media_type: str) -> str:
-        models = self._config.get("media", {}).get("models", {})
-        return models.get(media_type, "")
+        return self.snapshot.models.get(media_type, "")
+    
+    def get_model_routing_config(self) -> Dict[str, Any]:
+        """작업별 텍스트 모델 규칙 (enabled, tasks, fallback, latency = ModelRouter 생성 인자)"""
+        routing = self._config.get("model_routing", {}) or {}
+        latency = routing.get("latency", {}) or {}
+        return {
+            "enabled": routing.get("enabled", False),
+            "tasks": dict(routing.get("tasks", {}) or {}),
+            "fallback": dict(routing.get("fallback", {}) or {}),
+            "latency": {
+                "p95_threshold": latency.get("p95_threshold", 30.0),
+                "window": latency.get("window", 40),
+                "min_samples": latency.get("min_samples", 10),
+                "hold_seconds": latency.get("hold_seconds", 300.0),
+            },
+        }
+    
+    def get_text_model(self, task: str) -> str:
+        """
+        작업(guardian, scene_split, scenario ...)에 쓸 텍스트 모델
+        model_routing.tasks에 없으면 media.models.text, 그 모델이 느리면(p95) fallback 모델
+        """
+        primary = self.get_model("text")
+        routing = self.get_model_routing_config()
+        if not routing["enabled"]:
+            return primary
+        primary = routing["tasks"].get(task) or primary
+        from .model_router import get_model_router
+        return get_model_router(self).route(task, primary, routing["fallback"].get(primary))
     
     def get_tts_config(self) -> Dict[str, str]:
         return self._config.get("media", {}).get("tts", {})
@@ -97,23 +411,72 @@ class ConfigManager:
     def get_video_config(self) -> Dict[str, Any]:
         return self._config.get("media", {}).get("video", {})
     
+    def get_encoding_profile(self, name: str) -> Dict[str, Any]:
+        """
+        인코딩 프로필 반환 ("preview" | "final")
+        media.video의 codec/preset/crf를 기본값으로 하고 프로필 값으로 덮어씀
+        """
+        profile = self.snapshot.encoding_profiles.get(name)
+        if profile is None:
+            return {**self.snapshot.encoding_base, "name": name}
+        return dict(profile)
+    
+    def get_media_fingerprint(self) -> str:
+        """
+        생성 결과에 영향을 주는 설정(모델, 작업별 텍스트 모델, 미리보기 인코딩, TTS)의 해시
+        미리 만들어 둔 산출물(사전 생성 풀, 공유 분기)을 지금 설정에서 써도 되는지 판단
+        """
+        data = {
+            "models": self.snapshot.models,
+            "text_routes": self.get_model_routing_config()["tasks"],
+            "encoding": self.get_encoding_profile("preview"),
+            "tts": self.get_tts_config(),
+        }
+        encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=dict)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def get_abr_ladder_config(self) -> Dict[str, Any]:
+        """최종 영상 HLS 다중 화질 사다리 설정"""
+        return self._config.get("media", {}).get("abr_ladder", {})
+    
+    def get_final_render_config(self) -> Dict[str, Any]:
+        """최종 화질 재렌더 설정"""
+        return self._config.get("media", {}).get("final_render", {})
+    
+    def get_ffmpeg_config(self) -> Dict[str, Any]:
+        """FFmpeg 실행 풀 설정 (동시 실행 수, 작업당 스레드, 타임아웃)"""
+        return self._config.get("media", {}).get("ffmpeg", {})
+    
+    def get_state_config(self) -> Dict[str, Any]:
+        """상태 저장 설정 (StateManager 생성 인자: flush_interval, compact_every, archive_max_bytes)"""
+        state = self._config.get("state", {})
+        return {
+            "flush_interval": state.get("flush_interval", 1.0),
+            "compact_every": state.get("compact_every", 200),
+            "archive_max_bytes": int(state.get("archive_max_mb", 10) * 1024 ** 2),
+        }
+    
+    def get_state_backend(self) -> str:
+        """씬/막 상태 저장소 ("sqlite" | "json")"""
+        return self._config.get("state", {}).get("backend", "sqlite")
+    
+    def get_storage_config(self) -> Dict[str, Any]:
+        """산출물 저장소 설정 (backend: "local" | "s3", s3: bucket/endpoint_url/...)"""
+        storage = self._config.get("storage", {}) or {}
+        return {
+            "backend": os.getenv("STORAGE_BACKEND", storage.get("backend", "local")),
+            "s3": storage.get("s3", {}) or {},
+        }
+    
+    def get_retention_config(self) -> Dict[str, Any]:
+        """산출물 보존 설정 (중간 산출물 정리, 디스크 한도)"""
+        return self._config.get("retention", {}) or {}
+    
     # ============== 경로 설정 ==============
     
     def get_path(self, key: str) -> str:
-        """경로 반환 (상대 경로를 절대 경로로 변환)"""
-        path_str = self._config.get("paths", {}).get(key, "")
-        
-        if not path_str:
-            return ""
-        
-        # 이미 절대 경로인 경우 그대로 반환
-        if os.path.isabs(path_str):
-            return path_str
-        
-        # 상대 경로를 config 파일 위치 기준 절대 경로로 변환
-        config_dir = self.config_path.parent
-        abs_path = (config_dir.parent / path_str).resolve()  # parent: finalss 폴더
-        return str(abs_path)
+        """경로 반환 (상대 경로는 config 파일 위치 기준 절대 경로로 미리 변환됨)"""
+        return self.snapshot.paths.get(key, "")
     
     # ============== 파일명 패턴 ==============
     
@@ -122,6 +485,66 @@ class ConfigManager:
     
     # ============== 재시도 설정 ==============
     
+    def get_pipeline_config(self) -> Dict[str, Any]:
+        """막 파이프라인 설정 (max_workers, step_retries, retry_delay, scene_retry)"""
+        pipeline = self._config.get("pipeline", {}) or {}
+        scene_retry = pipeline.get("scene_retry", {}) or {}
+        return {
+            "max_workers": pipeline.get("max_workers", 3),
+            "step_retries": pipeline.get("step_retries", 1),
+            "retry_delay": pipeline.get("retry_delay", 2.0),
+            "scene_retry": {
+                "max_attempts": scene_retry.get("max_attempts", 3),
+                "regenerate_image_after": scene_retry.get("regenerate_image_after", 2),
+            },
+        }
+    
+    def get_stage_pool_config(self) -> Dict[str, Any]:
+        """1막 사전 생성 풀 설정 (enabled, styles, depth, workers, check_interval, retry_after)"""
+        pool = self._config.get("stage_pool", {}) or {}
+        return {
+            "enabled": pool.get("enabled", False),
+            "styles": list(pool.get("styles", ["pixar"]) or []),
+            "depth": pool.get("depth", 2),
+            "workers": pool.get("workers", 1),
+            "check_interval": pool.get("check_interval", 30.0),
+            "retry_after": pool.get("retry_after", 300.0),
+        }
+    
+    def get_video_scheduler_config(self) -> Dict[str, Any]:
+        """영상 생성 스케줄러 설정 (VideoScheduler 생성 인자)"""
+        scheduler = self._config.get("video_scheduler", {}) or {}
+        return {
+            "per_key_concurrency": scheduler.get("per_key_concurrency", 2),
+            "aging_seconds": scheduler.get("aging_seconds", 600.0),
+            "default_duration": scheduler.get("default_duration", 90.0),
+            # 출력 디렉토리의 공유 대기열 (웹 서버와 배치 워커 프로세스가 함께 사용)
+            "shared_db": (os.path.join(self.get_path("output_base"), "video_scheduler.db")
+                          if scheduler.get("shared", True) else ""),
+            "lease_ttl": scheduler.get("lease_ttl", 30.0),
+        }
+    
+    def get_rate_limit_config(self) -> Dict[str, Any]:
+        """Google API 요청 속도 제한 설정 (enabled + RateLimiter 생성 인자)"""
+        limits = self._config.get("rate_limits", {}) or {}
+        return {
+            "enabled": limits.get("enabled", False),
+            "limits": {name: dict(v or {}) for name, v in (limits.get("limits", {}) or {}).items()},
+            "headroom": limits.get("headroom", 0.9),
+            "burst_seconds": limits.get("burst_seconds", 6.0),
+            "max_wait": limits.get("max_wait", 120.0),
+            "cooldown": limits.get("cooldown", 30.0),
+            "recover_seconds": limits.get("recover_seconds", 60.0),
+        }
+    
+    def get_branch_store_config(self) -> Dict[str, Any]:
+        """공유 분기 저장소 설정 (enabled, max_branches)"""
+        branches = self._config.get("branch_store", {}) or {}
+        return {
+            "enabled": branches.get("enabled", False),
+            "max_branches": branches.get("max_branches", 500),
+        }
+    
     def get_retry_config(self) -> Dict[str, int]:
         """재시도 설정 반환"""
         return self._config.get("retry", {})
@@ -129,28 +552,15 @@ class ConfigManager:
     # ============== API Key 관리 ==============
     
     def _load_api_keys(self) -> None:
-        """환경 변수에서 API 키들 로드"""
-        # Google API Keys
-        g_keys = os.getenv("GOOGLE_API_KEYS", "")
-        if not g_keys:
-            g_keys = os.getenv("GOOGLE_API_KEY", "")
-        
-        self.google_keys = [k.strip() for k in g_keys.split(",") if k.strip()]
+        """환경 변수에서 API 키들 로드 (파싱은 프로세스당 한 번, 교체 위치는 인스턴스별)"""
+        google_keys, eleven_keys = _get_api_keys()
+        self.google_keys = list(google_keys)
         self.current_google_idx = 0
-        
-        # ElevenLabs API Keys
-        e_keys = os.getenv("ELEVENLABS_API_KEYS", "")
-        if not e_keys:
-            e_keys = os.getenv("ELEVENLABS_API_KEY", "")
-        
-        self.eleven_keys = [k.strip() for k in e_keys.split(",") if k.strip()]
+        self.eleven_keys = list(eleven_keys)
         self.current_eleven_idx = 0
-        
-        print(f"🔑 Google API Keys: {len(self.google_keys)}개 로드됨")
-        print(f"🔑 ElevenLabs Keys: {len(self.eleven_keys)}개 로드됨")
 
-    def get_google_client(self):
-        """현재 Google 키로 클라이언트 반환"""
+    def get_google_client(self, key_index: Optional[int] = None):
+        """현재 Google 키(key_index를 주면 그 키)로 클라이언트 반환"""
         if not hasattr(self, 'google_keys'):
             self._load_api_keys()
             
@@ -158,8 +568,17 @@ class ConfigManager:
             raise ValueError("Google API Key가 설정되지 않았습니다.")
             
         from google import genai
-        current_key = self.google_keys[self.current_google_idx]
-        return genai.Client(api_key=current_key)
+        current_key = self.google_keys[self.current_google_idx if key_index is None else key_index]
+        client = genai.Client(api_key=current_key)
+        if self.get_model_routing_config()["enabled"]:
+            # 모델별 지연 시간 측정 (p95가 높으면 작업별 대체 모델로 전환)
+            from .model_router import TimedClient, get_model_router
+            client = TimedClient(client, get_model_router(self))
+        if not self.get_rate_limit_config()["enabled"]:
+            return client
+        # 키 x 모델별 요청 속도 제한 (한도에 닿으면 429를 받기 전에 대기)
+        from .rate_limiter import RateLimitedClient, get_rate_limiter
+        return RateLimitedClient(client, get_rate_limiter(self), self, current_key)
 
     def rotate_google_key(self) -> bool:
         """Google 키 교체. 다음 키가 있으면 True, 없으면 False"""
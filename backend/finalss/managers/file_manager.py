@@ -4,10 +4,11 @@
 
 import os
 import shutil
-from typing import List
+from typing import List, Optional
 from pathlib import Path
 
 from .config_manager import ConfigManager
+from .storage import StorageBackend, create_storage
 
 
 class FileManager:
@@ -15,6 +16,61 @@ class FileManager:
     
     def __init__(self, config: ConfigManager):
         self.config = config
+        self._storage: Optional[StorageBackend] = None
+    
+    # ============== 저장소 ==============
+    
+    @property
+    def storage(self) -> StorageBackend:
+        """산출물 저장소 (첫 사용 시 생성)"""
+        if self._storage is None:
+            self._storage = create_storage(
+                self.config.get_storage_config(),
+                self.config.get_path("output_base"),
+            )
+        return self._storage
+    
+    def get_storage_key(self, path: str) -> str:
+        """로컬 경로 → 저장소 키 (output 디렉토리 기준 상대 경로, "/" 구분)"""
+        rel = os.path.relpath(os.path.abspath(path), self.config.get_path("output_base"))
+        if rel.startswith(".."):
+            raise ValueError(f"output 디렉토리 밖의 파일은 게시할 수 없습니다: {path}")
+        return rel.replace(os.sep, "/")
+    
+    def publish(self, path: Optional[str]) -> Optional[str]:
+        """
+        완성된 산출물을 저장소에 게시하고 키 반환
+        - local: 파일이 이미 제자리에 있으므로 아무 작업 없음
+        - s3: 스트리밍 멀티파트 업로드 (로컬 파일은 작업 디렉토리에 그대로 유지)
+        """
+        if not path or not os.path.exists(path):
+            return None
+        key = self.get_storage_key(path)
+        try:
+            self.storage.put_file(path, key)
+        except Exception as e:
+            # 게시 실패는 생성 결과에 영향을 주지 않음 (다음 게시 때 다시 업로드)
+            print(f"⚠️ 산출물 게시 실패 ({key}): {e}")
+            return None
+        return key
+    
+    def publish_dir(self, dir_path: str) -> List[str]:
+        """디렉토리 안의 파일 전체 게시 (HLS 세그먼트 등)"""
+        keys = []
+        if not dir_path or not os.path.isdir(dir_path):
+            return keys
+        for root, _, files in os.walk(dir_path):
+            for name in sorted(files):
+                key = self.publish(os.path.join(root, name))
+                if key:
+                    keys.append(key)
+        return keys
+    
+    def get_public_url(self, path: Optional[str]) -> Optional[str]:
+        """클라이언트용 URL (local: /stages/..., s3: 서명 URL)"""
+        if not path:
+            return None
+        return self.storage.get_url(self.get_storage_key(path))
     
     def ensure_all_directories(self) -> None:
         """필요한 모든 출력 디렉토리 생성"""
@@ -22,6 +78,7 @@ class FileManager:
             self.config.get_path("output_base"),
             self.config.get_path("stages"),
             self.config.get_path("tts"),
+            self.config.get_path("temp"),
         ]
         
         for dir_path in directories:
@@ -42,9 +99,11 @@ class FileManager:
         filename = pattern.format(stage=stage_no, scene=scene)
         return os.path.join(self.config.get_path("stages"), filename)
     
-    def get_stage_merged_video_path(self, stage_no: int) -> str:
-        """스테이지 병합 영상 파일 경로"""
-        pattern = self.config.get_file_pattern("stage_merged_video")
+    def get_stage_merged_video_path(self, stage_no: int, tier: str = "preview") -> str:
+        """스테이지 병합 영상 파일 경로 (tier: "preview" | "final")"""
+        pattern = self.config.get_file_pattern(
+            "stage_merged_video_hq" if tier == "final" else "stage_merged_video"
+        )
         filename = pattern.format(stage=stage_no)
         return os.path.join(self.config.get_path("stages"), filename)
     
@@ -54,9 +113,11 @@ class FileManager:
         filename = pattern.format(stage=stage_no)
         return os.path.join(self.config.get_path("tts"), filename)
     
-    def get_stage_final_path(self, stage_no: int) -> str:
-        """스테이지 최종 파일 경로"""
-        pattern = self.config.get_file_pattern("stage_final")
+    def get_stage_final_path(self, stage_no: int, tier: str = "preview") -> str:
+        """스테이지 최종 파일 경로 (tier: "preview" | "final")"""
+        pattern = self.config.get_file_pattern(
+            "stage_final_hq" if tier == "final" else "stage_final"
+        )
         filename = pattern.format(stage=stage_no)
         return os.path.join(self.config.get_path("stages"), filename)
     
@@ -73,6 +134,14 @@ class FileManager:
         """최종 완성 영상 파일 경로"""
         return self.config.get_path("final_video_file")
     
+    def get_final_hls_dir(self) -> str:
+        """최종 영상 HLS 사다리 디렉토리"""
+        return self.config.get_path("final_hls_dir")
+    
+    def get_final_hls_master_path(self) -> str:
+        """최종 영상 HLS master 플레이리스트 경로"""
+        return os.path.join(self.get_final_hls_dir(), "master.m3u8")
+    
     def get_final_story_path(self) -> str:
         """최종 스토리 텍스트 파일 경로"""
         return self.config.get_path("final_story_file")
@@ -81,10 +150,74 @@ class FileManager:
         """최종 TTS 파일 경로"""
         return self.config.get_path("final_tts_file")
     
-    def get_state_file_path(self) -> str:
-        """상태 저장 파일 경로"""
-        return os.path.join(self.config.get_path("output_base"), "state.json")
+    def get_library_dir(self) -> str:
+        """완성된 동화 보관 디렉토리 (작업별 하위 디렉토리)"""
+        return os.path.join(self.config.get_path("output_base"), "library")
+    
+    def get_library_index_path(self) -> str:
+        """보관본 목록 (작업별 크기, 마지막 조회 시각, 고정 여부)"""
+        return os.path.join(self.config.get_path("output_base"), "library_index.json")
+    
+    def get_pool_dir(self) -> str:
+        """1막 사전 생성 풀 디렉토리 (art_style별 하위 디렉토리)"""
+        return os.path.join(self.config.get_path("output_base"), "pool")
+    
+    def get_branch_dir(self) -> str:
+        """공유 분기 저장소 디렉토리 (분기 키별 하위 디렉토리)"""
+        return os.path.join(self.config.get_path("output_base"), "branches")
+    
+    def get_temp_dir(self) -> str:
+        """임시 작업 디렉토리 (concat 목록, 무음 구간 등)"""
+        return self.config.get_path("temp")
+    
+    def get_state_file_path(self, job_id: Optional[str] = None) -> str:
+        """상태 저장 파일 경로 (job_id가 있으면 작업별 디렉토리)"""
+        return self._job_scoped_path("state.json", job_id)
+    
+    def get_progress_file_path(self, job_id: Optional[str] = None) -> str:
+        """진행 상황 파일 경로 (job_id가 있으면 작업별 디렉토리)"""
+        return self._job_scoped_path("progress.json", job_id)
+    
+    def get_manifest_file_path(self, job_id: Optional[str] = None) -> str:
+        """
+        작업 매니페스트 경로 (스토리, 프롬프트, 산출물 해시, 단계 상태)
+        job_id가 있으면 작업별 파일 (같은 출력 디렉토리를 쓰는 웹 작업끼리 덮어쓰지 않도록)
+        """
+        return self._job_scoped_path("job_manifest.json", job_id)
+    
+    def get_job_manifest_dir(self) -> str:
+        """작업별 디렉토리 (jobs/<job_id>/: 매니페스트, 상태 스냅샷, 이벤트 저널)"""
+        return os.path.join(self.config.get_path("output_base"), "jobs")
+    
+    def get_job_manifest_paths(self) -> List[str]:
+        """디스크에 남은 작업별 매니페스트 경로 (서버 재시작 후 작업 복원용)"""
+        root = self.get_job_manifest_dir()
+        if not os.path.isdir(root):
+            return []
+        paths = [os.path.join(root, name, "job_manifest.json") for name in sorted(os.listdir(root))]
+        return [p for p in paths if os.path.exists(p)]
+    
+    def get_artifact_manifest_path(self) -> str:
+        """산출물 검증 매니페스트 경로 (크기, 해시, probe 결과)"""
+        return os.path.join(self.config.get_path("output_base"), "artifacts.json")
+    
+    def get_build_graph_path(self) -> str:
+        """증분 빌드 의존성 기록 경로 (산출물별 입력/파라미터 해시)"""
+        return os.path.join(self.config.get_path("output_base"), "build_graph.json")
+    
+    def get_state_db_path(self) -> str:
+        """SQLite 상태 저장소 경로 (모든 작업 공용)"""
+        return os.path.join(self.config.get_path("output_base"), "state.db")
+    
+    def get_journal_file_path(self, job_id: Optional[str] = None) -> str:
+        """
+        상태 변경 이벤트 저널 경로 (append-only JSONL)
+        job_id가 있으면 작업별 디렉토리 (저널 seq/압축은 작업마다 따로 관리됨)
+        """
+        return self._job_scoped_path("state.journal.jsonl", job_id)
     
-    def get_progress_file_path(self) -> str:
-        """진행 상황 파일 경로"""
-        return os.path.join(self.config.get_path("output_base"), "progress.json")
\ No newline at end of file
+    def _job_scoped_path(self, filename: str, job_id: Optional[str]) -> str:
+        """jobs/<job_id>/<filename> (job_id가 없으면 output 디렉토리 바로 아래)"""
+        if job_id:
+            return os.path.join(self.get_job_manifest_dir(), job_id, filename)
+        return os.path.join(self.config.get_path("output_base"), filename)
\ No newline at end of file
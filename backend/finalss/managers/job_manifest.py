@@ -0,0 +1,244 @@
+# ==================================================================================
+# managers/job_manifest.py - 재시작 후 이어서 생성하기 위한 작업 매니페스트
+# ==================================================================================
+
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Union
+
+from utils.atomic_io import atomic_write_json
+
+
+# 막 단위 단계 (실행 순서)
+STAGE_STEPS = ("story", "images", "videos", "merge", "tts", "mux")
+
+ArtifactPaths = Union[str, List[str]]
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 SHA-256 (큰 영상도 메모리에 다 올리지 않도록 청크 단위)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class StageRecord:
+    """막 하나의 생성 기록"""
+    story: str = ""
+    scene_texts: List[str] = field(default_factory=list)
+    prompts: Dict[str, str] = field(default_factory=dict)          # "image", "video_1" ...
+    artifacts: Dict[str, ArtifactPaths] = field(default_factory=dict)  # 단계 → 경로(들)
+    steps: Dict[str, str] = field(default_factory=dict)            # 단계 → "done"
+    extra: Dict[str, Any] = field(default_factory=dict)            # moral_lesson, subtitle_duration 등
+
+
+class JobManifest:
+    """
+    작업 매니페스트 (output/job_manifest.json)
+    - 막별 스토리, 장면 텍스트, 프롬프트, 산출물 경로와 해시, 단계 상태 기록
+    - 복원 시 해시가 일치하는 산출물의 단계만 완료로 인정 → 빠진 작업만 다시 실행
+    - 파일 크기/mtime이 그대로면 해시 재계산 생략
+    """
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self._lock = threading.RLock()
+        self.meta: Dict[str, Any] = {}
+        self.stages: Dict[int, StageRecord] = {}
+        self.final: Dict[str, Any] = {}
+        self.hashes: Dict[str, Dict[str, Any]] = {}  # 경로 → {size, mtime, sha256}
+
+    # ============== 저장/로드 ==============
+
+    def load(self) -> bool:
+        """매니페스트 로드. 파일이 없거나 손상되었으면 False"""
+        if not os.path.exists(self.manifest_path):
+            return False
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ 작업 매니페스트 로드 실패: {e}")
+            return False
+
+        with self._lock:
+            self.meta = data.get("meta", {})
+            self.stages = {
+                int(k): StageRecord(**v) for k, v in data.get("stages", {}).items()
+            }
+            self.final = data.get("final", {})
+            self.hashes = data.get("hashes", {})
+        return True
+
+    def save(self) -> None:
+        """매니페스트 원자적 저장"""
+        with self._lock:
+            self.meta["updated_at"] = time.time()
+            data = {
+                "meta": self.meta,
+                "stages": {str(k): asdict(v) for k, v in sorted(self.stages.items())},
+                "final": self.final,
+                "hashes": self.hashes,
+            }
+            try:
+                atomic_write_json(self.manifest_path, data, indent=2)
+            except Exception as e:
+                print(f"⚠️ 작업 매니페스트 저장 실패: {e}")
+
+    def reset(self, **meta: Any) -> None:
+        """새 작업으로 초기화"""
+        with self._lock:
+            self.meta = {"created_at": time.time(), **meta}
+            self.stages = {}
+            self.final = {}
+            self.hashes = {}
+            self.save()
+
+    @property
+    def job_id(self) -> Optional[str]:
+        return self.meta.get("job_id")
+
+    def set_meta(self, **meta: Any) -> None:
+        with self._lock:
+            self.meta.update(meta)
+            self.save()
+
+    # ============== 기록 ==============
+
+    def get_stage(self, stage_no: int) -> StageRecord:
+        """막 기록 조회 (없으면 생성)"""
+        with self._lock:
+            if stage_no not in self.stages:
+                self.stages[stage_no] = StageRecord()
+            return self.stages[stage_no]
+
+    def set_story(self, stage_no: int, story: str, scene_texts: List[str], **extra: Any) -> None:
+        """스토리/장면 텍스트 기록. 스토리가 바뀌면 이후 단계는 모두 무효화"""
+        with self._lock:
+            record = self.get_stage(stage_no)
+            if record.story != story or record.scene_texts != list(scene_texts):
+                self.stages[stage_no] = record = StageRecord()
+            record.story = story
+            record.scene_texts = list(scene_texts)
+            record.extra.update(extra)
+            record.steps["story"] = "done"
+            # 뒤쪽 막은 이 스토리를 바탕으로 다시 만들어져야 함
+            for later in [k for k in self.stages if k > stage_no]:
+                del self.stages[later]
+            self.final = {}
+            self.save()
+
+    def set_prompt(self, stage_no: int, key: str, prompt: str) -> None:
+        with self._lock:
+            self.get_stage(stage_no).prompts[key] = prompt
+            self.save()
+
+    def record_artifact(self, stage_no: int, step: str, paths: ArtifactPaths) -> bool:
+        """
+        단계 산출물 기록 + 완료 표시
+        경로가 하나라도 비었거나 없으면 기록하지 않고 False
+        """
+        path_list = paths if isinstance(paths, list) else [paths]
+        if not path_list or not all(p and os.path.exists(p) for p in path_list):
+            return False
+
+        with self._lock:
+            for p in path_list:
+                self._remember_hash(p)
+            record = self.get_stage(stage_no)
+            record.artifacts[step] = list(paths) if isinstance(paths, list) else paths
+            record.steps[step] = "done"
+            self.save()
+        return True
+
+    def record_final(self, path: str, **extra: Any) -> bool:
+        """최종 영상 기록"""
+        if not path or not os.path.exists(path):
+            return False
+        with self._lock:
+            self._remember_hash(path)
+            self.final = {"path": path, **extra}
+            self.save()
+        return True
+
+    def clear_final(self) -> None:
+        """최종 영상 기록 삭제 (완성 후 막 영상이 바뀌어 다시 병합해야 할 때)"""
+        with self._lock:
+            if self.final:
+                self.final = {}
+                self.save()
+
+    # ============== 조회 ==============
+
+    def get_artifact(self, stage_no: int, step: str) -> Optional[ArtifactPaths]:
+        """완료되고 해시가 일치하는 단계 산출물 (아니면 None)"""
+        with self._lock:
+            record = self.stages.get(stage_no)
+            if record is None or record.steps.get(step) != "done":
+                return None
+            paths = record.artifacts.get(step)
+        if not paths:
+            return None
+        path_list = paths if isinstance(paths, list) else [paths]
+        if not all(self.verify(p) for p in path_list):
+            return None
+        return paths
+
+    def is_step_done(self, stage_no: int, step: str) -> bool:
+        """단계 완료 여부 (story는 텍스트, 나머지는 산출물 검증까지)"""
+        if step == "story":
+            record = self.stages.get(stage_no)
+            return bool(record and record.steps.get("story") == "done" and record.story)
+        return self.get_artifact(stage_no, step) is not None
+
+    def completed_stages(self) -> List[int]:
+        """1막부터 연속으로 합성(mux)까지 끝난 막 번호 목록"""
+        done = []
+        for stage_no in sorted(self.stages):
+            if stage_no != len(done) + 1 or not self.is_step_done(stage_no, "mux"):
+                break
+            done.append(stage_no)
+        return done
+
+    def get_final(self) -> Optional[str]:
+        path = self.final.get("path")
+        return path if path and self.verify(path) else None
+
+    # ============== 해시 ==============
+
+    def verify(self, path: str) -> bool:
+        """기록된 해시와 현재 파일 비교"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        with self._lock:
+            known = self.hashes.get(path)
+        if known is None or known.get("size") != st.st_size:
+            return False
+        if known.get("mtime") == st.st_mtime:
+            return True
+        # mtime만 바뀐 경우 내용 비교
+        if file_sha256(path) != known.get("sha256"):
+            return False
+        with self._lock:
+            known["mtime"] = st.st_mtime
+        return True
+
+    def _remember_hash(self, path: str) -> None:
+        st = os.stat(path)
+        known = self.hashes.get(path)
+        if known and known.get("size") == st.st_size and known.get("mtime") == st.st_mtime:
+            return
+        self.hashes[path] = {
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "sha256": file_sha256(path),
+        }
@@ -4,14 +4,17 @@
 
 import os
 import time
-from typing import List, Optional
-from pathlib import Path
-
-from google.genai import types
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
 
 from .config_manager import ConfigManager
 from .file_manager import FileManager
 from .state_manager import StateManager
+from .artifact_manifest import get_artifact_manifest
+from .build_graph import get_build_graph
+from .video_scheduler import get_video_scheduler
+from utils.atomic_io import AtomicOutput
 
 
 class MediaGenerator:
@@ -32,13 +35,37 @@ class MediaGenerator:
     }
     
     def __init__(self, config, file_mgr, state, art_style="pixar", 
-                 art_director=None, motion_director=None):
+                 art_director=None, motion_director=None, manifest=None):
         self.config = config
         self.file_mgr = file_mgr
         self.state = state
         self.art_style = art_style
         self.art_director = art_director
         self.motion_director = motion_director
+        self.manifest = manifest
+        self.artifacts = get_artifact_manifest(file_mgr.get_artifact_manifest_path())
+        self.builds = get_build_graph(file_mgr.get_build_graph_path(), self.artifacts)
+        # (art_style, scene_text) → 모션 프롬프트 (이미지 생성과 병렬로 미리 만든 것 재사용)
+        self._motion_prompts: Dict[Tuple[str, str], str] = {}
+        self._motion_lock = threading.Lock()
+        # 영상 생성 우선순위 (interactive | speculative | batch, VideoScheduler)
+        self.video_priority = "interactive"
+    
+    def _mark_scene(self, stage_no: int, scene_idx: int, media_type: str,
+                    path: Optional[str], error: str = "") -> None:
+        """씬 상태 기록 (전역 씬 번호 = (막 - 1) * 3 + 씬 번호)"""
+        if self.state is None:
+            return
+        global_idx = (stage_no - 1) * 3 + scene_idx
+        if path:
+            self.state.mark_scene_complete(global_idx, media_type)
+        else:
+            self.state.mark_scene_failed(global_idx, media_type, error or f"{media_type} 생성 실패")
+    
+    def _record_prompt(self, stage_no: int, key: str, prompt: str) -> None:
+        """사용한 프롬프트를 작업 매니페스트에 기록"""
+        if self.manifest is not None:
+            self.manifest.set_prompt(stage_no, key, prompt)
     
     # ============== 배치 이미지 생성 ==============
     
@@ -51,25 +78,24 @@ class MediaGenerator:
         """이미지 3개를 배치 생성"""
         print(f"\n📸 [{stage_no}막] 이미지 3개 배치 생성 중...")
         
-        # 이미 존재하면 스킵
+        # 배치 프롬프트 생성
+        batch_prompt = self._create_batch_prompt(scene_texts)
+        self._record_prompt(stage_no, "image", batch_prompt)
+        image_refs = prev_stage_images if prev_stage_images else []
+        
+        # 프롬프트/레퍼런스 이미지가 그대로면 스킵
         existing_images = []
-        all_exist = True
         for i in range(1, 4):
             path = self.file_mgr.get_stage_image_path(stage_no, i)
-            if os.path.exists(path):
-                existing_images.append(path)
-            else:
-                all_exist = False
+            if not self.builds.is_fresh(path, image_refs, self._image_params(batch_prompt, i),
+                                        "image", adopt_untracked=True):
                 break
+            existing_images.append(path)
         
-        if all_exist:
+        if len(existing_images) == 3:
             print(f"   ⭐ 이미 모두 존재함, 스킵")
             return existing_images
         
-        # 배치 프롬프트 생성
-        batch_prompt = self._create_batch_prompt(scene_texts)
-        image_refs = prev_stage_images if prev_stage_images else []
-        
         # API 호출
         generated_images = self._generate_batch_images(
             prompt=batch_prompt,
@@ -79,6 +105,35 @@ class MediaGenerator:
         
         return generated_images
     
+    def _image_params(self, prompt: str, scene_idx: int) -> dict:
+        """이미지 빌드 파라미터 (바뀌면 이미지와 그 아래 영상/병합본 재생성)"""
+        return {"prompt": prompt, "scene": scene_idx, "model": self.config.get_model("image")}
+    
+    def _video_params(self, scene_text: str) -> dict:
+        """영상 빌드 파라미터"""
+        return {
+            "scene_text": scene_text,
+            "art_style": self.art_style,
+            "model": self.config.get_model("video"),
+        }
+    
+    def adopt_stage_media(self, stage_no: int, scene_texts: List[str], images: List[str],
+                          videos: List[str], prev_stage_images: List[str] = None) -> bool:
+        """
+        다른 곳에서 만든 장면 이미지/영상(사전 생성 풀 등)을 이 작업에서 생성한 것으로 기록
+        → 재시도/장면 재생성 시 최신 산출물로 인정되어 다시 만들지 않음
+        """
+        image_refs = prev_stage_images if prev_stage_images else []
+        batch_prompt = self._create_batch_prompt(scene_texts)
+        for scene_idx, (image_path, video_path) in enumerate(zip(images, videos), 1):
+            if not self.artifacts.record(image_path, "image") or not self.artifacts.record(video_path, "video"):
+                return False
+            self.builds.record(image_path, image_refs, self._image_params(batch_prompt, scene_idx))
+            self.builds.record(video_path, [image_path], self._video_params(scene_texts[scene_idx - 1]))
+            self._mark_scene(stage_no, scene_idx, "image", image_path)
+            self._mark_scene(stage_no, scene_idx, "video", video_path)
+        return True
+    
     def _create_batch_prompt(self, scene_texts: List[str]) -> str:
         """3개 씬을 위한 통합 프롬프트"""
         style_desc = self.STYLE_PROMPTS.get(self.art_style, self.STYLE_PROMPTS["pixar"])
@@ -114,7 +169,8 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
         for scene_idx in range(1, 4):
             output_path = self.file_mgr.get_stage_image_path(stage_no, scene_idx)
             
-            if os.path.exists(output_path):
+            params = self._image_params(prompt, scene_idx)
+            if self.builds.is_fresh(output_path, image_refs, params, "image", adopt_untracked=True):
                 print(f"   ⭐ 씬 {scene_idx} 이미 존재함")
                 images.append(output_path)
                 continue
@@ -126,7 +182,9 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
                 scene_idx=scene_idx
             )
             
+            self._mark_scene(stage_no, scene_idx, "image", image_path)
             if image_path:
+                self.builds.record(image_path, image_refs, params)
                 images.append(image_path)
                 print(f"   ✅ 씬 {scene_idx} 생성 완료")
             else:
@@ -145,6 +203,7 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
         """단일 이미지 API 호출"""
         while True:
             try:
+                from google.genai import types
                 client = self.config.get_google_client()
                 
                 # 이미지 레퍼런스 준비
@@ -172,8 +231,12 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
                 for part in response.parts:
                     if hasattr(part, 'inline_data') and part.inline_data:
                         image_obj = part.as_image()
-                        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                        image_obj.save(output_path)
+                        with AtomicOutput(output_path) as out:
+                            image_obj.save(out.tmp_path)
+                            out.commit()
+                        if not self.artifacts.record(output_path, "image"):
+                            print(f"      ❌ 저장된 이미지 검증 실패")
+                            return None
                         return output_path
                 
                 print(f"      ❌ inline_data 없음")
@@ -208,42 +271,193 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
         self,
         stage_no: int,
         scene_texts: List[str],
-        stage_images: List[str]
+        stage_images: List[str],
+        prev_stage_images: List[str] = None,
+        on_progress=None
     ) -> List[str]:
-        """영상 3개 생성"""
+        """
+        영상 3개 생성 (장면 단위 재시도)
+        - 실패한 장면만 다시 시도, 이미 성공한 클립은 그대로 사용
+        - 같은 이미지로 regenerate_image_after번 실패하면 그 장면 이미지만 다시 생성
+        - stage_images는 다시 만든 이미지 경로로 갱신됨
+        """
         print(f"\n🎥 [{stage_no}막] 영상 3개 생성 중...")
         videos = []
         for scene_idx in range(3):
-            video_path = self._generate_single_video(
+            video_path = self._generate_scene_video(
                 stage_no=stage_no,
                 scene_idx=scene_idx + 1,
-                scene_text=scene_texts[scene_idx],
-                image_path=stage_images[scene_idx]
+                scene_texts=scene_texts,
+                stage_images=stage_images,
+                prev_stage_images=prev_stage_images
             )
             videos.append(video_path)
+            self._mark_scene(stage_no, scene_idx + 1, "video", video_path)
             if video_path:
                 print(f"   ✅ 장면 {scene_idx + 1} 영상 완료")
             else:
-                print(f"   ❌ 장면 {scene_idx + 1} 영상 실패")
+                print(f"   ❌ 장면 {scene_idx + 1} 영상 실패 (재시도 한도 초과, 대기 중)")
+            if on_progress:
+                on_progress((scene_idx + 1) / 3)
         return videos
     
-    def _generate_single_video(
+    def _generate_scene_video(
         self,
         stage_no: int,
         scene_idx: int,
-        scene_text: str,
-        image_path: str
+        scene_texts: List[str],
+        stage_images: List[str],
+        prev_stage_images: List[str] = None
     ) -> Optional[str]:
-        """단일 영상 생성 (스타일 적용!)"""
-        output_path = self.file_mgr.get_stage_video_path(stage_no, scene_idx)
-        
-        if os.path.exists(output_path):
-            print(f"      ⭐ 이미 존재함, 스킵")
-            return output_path
+        """장면 하나의 영상 생성 (장면별 시도 한도 안에서 재시도, 필요하면 이미지 재생성)"""
+        retry = self.config.get_pipeline_config()["scene_retry"]
+        max_attempts = max(1, retry["max_attempts"])
+        regenerate_after = retry["regenerate_image_after"]
+        scene_text = scene_texts[scene_idx - 1]
         
+        image_path = stage_images[scene_idx - 1]
         if not image_path or not os.path.exists(image_path):
-            print(f"      ❌ 레퍼런스 이미지 없음")
-            return None
+            print(f"      🔁 장면 {scene_idx} 레퍼런스 이미지 없음, 이미지 다시 생성")
+            image_path = self.regenerate_scene_image(stage_no, scene_idx, scene_texts, prev_stage_images)
+            if not image_path:
+                return None
+            stage_images[scene_idx - 1] = image_path
+        
+        image_attempts = 0
+        for attempt in range(1, max_attempts + 1):
+            video_path = self._generate_single_video(
+                stage_no=stage_no,
+                scene_idx=scene_idx,
+                scene_text=scene_text,
+                image_path=image_path
+            )
+            if video_path:
+                return video_path
+            
+            image_attempts += 1
+            if attempt == max_attempts:
+                break
+            
+            regenerate = regenerate_after > 0 and image_attempts >= regenerate_after
+            self._mark_scene(stage_no, scene_idx, "video", None,
+                             f"재시도 대기 ({attempt}/{max_attempts})")
+            if self.state is not None:
+                self.state.record_event("scene_retry", stage=stage_no, scene=scene_idx,
+                                        attempt=attempt, regenerate_image=regenerate)
+            
+            if regenerate:
+                print(f"      🔁 장면 {scene_idx} 같은 이미지로 {image_attempts}회 실패, 이미지 다시 생성")
+                new_image = self.regenerate_scene_image(stage_no, scene_idx, scene_texts, prev_stage_images)
+                if new_image:
+                    image_path = stage_images[scene_idx - 1] = new_image
+                    image_attempts = 0
+            else:
+                print(f"      🔁 장면 {scene_idx} 영상 재시도 ({attempt + 1}/{max_attempts}, 같은 이미지)")
+        
+        return None
+    
+    def regenerate_scene_image(
+        self,
+        stage_no: int,
+        scene_idx: int,
+        scene_texts: List[str],
+        prev_stage_images: List[str] = None,
+        prompt_tweak: str = ""
+    ) -> Optional[str]:
+        """
+        장면 하나의 이미지만 다시 생성 (다른 장면 이미지/영상은 그대로)
+        실패하면 기존 이미지를 그대로 둠 (임시 파일에 저장 후 교체)
+        prompt_tweak이 있어도 빌드 기록은 기본 프롬프트 기준 → 이후 막 재실행 때 다시 만들지 않음
+        """
+        base_prompt = self._create_batch_prompt(scene_texts)
+        prompt = base_prompt
+        if prompt_tweak:
+            prompt = f"{base_prompt}\nAdjustment for Scene {scene_idx}: {prompt_tweak}\n"
+            self._record_prompt(stage_no, f"image_{scene_idx}", prompt)
+        image_refs = prev_stage_images if prev_stage_images else []
+        output_path = self.file_mgr.get_stage_image_path(stage_no, scene_idx)
+        
+        image_path = self._call_image_api(
+            prompt=prompt,
+            image_refs=image_refs,
+            output_path=output_path,
+            scene_idx=scene_idx
+        )
+        self._mark_scene(stage_no, scene_idx, "image", image_path)
+        if image_path:
+            self.builds.record(image_path, image_refs, self._image_params(base_prompt, scene_idx))
+            print(f"   ✅ 씬 {scene_idx} 이미지 다시 생성 완료")
+        return image_path
+    
+    def regenerate_scene(
+        self,
+        stage_no: int,
+        scene_idx: int,
+        scene_texts: List[str],
+        prev_stage_images: List[str] = None,
+        regenerate_image: bool = False,
+        prompt_tweak: str = ""
+    ) -> Optional[str]:
+        """
+        사용자 요청으로 장면 하나를 새로 생성 (이미 있는 영상도 다시 생성)
+        - regenerate_image: 이미지부터 다시 생성, 아니면 기존 이미지로 영상만
+        - 영상 생성이 실패하면 이미지도 원래대로 되돌려 기존 클립을 계속 쓸 수 있게 함
+        """
+        print(f"\n🔁 [{stage_no}막] 장면 {scene_idx} 다시 생성 중..."
+              + (f" (요청: {prompt_tweak})" if prompt_tweak else ""))
+        image_path = self.file_mgr.get_stage_image_path(stage_no, scene_idx)
+        backup = None
+        
+        if regenerate_image or not os.path.exists(image_path):
+            if os.path.exists(image_path):
+                os.makedirs(self.file_mgr.get_temp_dir(), exist_ok=True)
+                backup = os.path.join(self.file_mgr.get_temp_dir(),
+                                      f"regen_backup_{os.path.basename(image_path)}")
+                shutil.copy2(image_path, backup)
+            if not self.regenerate_scene_image(stage_no, scene_idx, scene_texts,
+                                               prev_stage_images, prompt_tweak=prompt_tweak):
+                if backup:
+                    os.remove(backup)
+                return None
+        
+        try:
+            video_path = self._generate_single_video(
+                stage_no=stage_no,
+                scene_idx=scene_idx,
+                scene_text=scene_texts[scene_idx - 1],
+                image_path=image_path,
+                prompt_tweak=prompt_tweak,
+                force=True
+            )
+            self._mark_scene(stage_no, scene_idx, "video", video_path)
+            if video_path is None and backup:
+                # 기존 이미지 복원 → 기존 영상이 다시 최신으로 인정됨
+                os.replace(backup, image_path)
+                backup = None
+                self.artifacts.record(image_path, "image")
+                self.builds.record(image_path, prev_stage_images or [],
+                                   self._image_params(self._create_batch_prompt(scene_texts), scene_idx))
+                print(f"   ↩️ 장면 {scene_idx} 영상 생성 실패, 기존 이미지/영상 유지")
+            return video_path
+        finally:
+            if backup and os.path.exists(backup):
+                os.remove(backup)
+    
+    def prepare_motion_prompts(self, stage_no: int, scene_texts: List[str]) -> List[str]:
+        """
+        영상 모션 프롬프트를 미리 생성 (이미지 생성과 동시에 실행)
+        영상 생성은 레퍼런스 이미지를 기다려야 하지만 프롬프트는 장면 텍스트만 있으면 됨
+        """
+        print(f"\n🎬 [{stage_no}막] 모션 프롬프트 {len(scene_texts)}개 미리 생성 중...")
+        return [self._motion_prompt(scene_text) for scene_text in scene_texts]
+    
+    def _motion_prompt(self, scene_text: str) -> str:
+        """장면 모션 프롬프트 (미리 만든 것이 있으면 재사용)"""
+        key = (self.art_style, scene_text)
+        with self._motion_lock:
+            cached = self._motion_prompts.get(key)
+        if cached:
+            return cached
         
         # 프롬프트 생성 (핵심: art_style 전달!)
         if self.motion_director:
@@ -257,51 +471,61 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
             style_prefix = self.STYLE_PROMPTS.get(self.art_style, self.STYLE_PROMPTS["pixar"])
             vid_prompt = f"{style_prefix}\nScene: {scene_text}"
         
+        with self._motion_lock:
+            self._motion_prompts[key] = vid_prompt
+        return vid_prompt
+    
+    def _generate_single_video(
+        self,
+        stage_no: int,
+        scene_idx: int,
+        scene_text: str,
+        image_path: str,
+        prompt_tweak: str = "",
+        force: bool = False
+    ) -> Optional[str]:
+        """
+        단일 영상 생성 (스타일 적용!)
+        force: 최신 영상이 있어도 새로 생성 (사용자 재생성 요청)
+        prompt_tweak: 모션 프롬프트에 덧붙일 사용자 요청
+        """
+        output_path = self.file_mgr.get_stage_video_path(stage_no, scene_idx)
+        
+        if not image_path or not os.path.exists(image_path):
+            print(f"      ❌ 레퍼런스 이미지 없음")
+            return None
+        
+        # 레퍼런스 이미지가 다시 만들어졌으면 영상도 다시 생성
+        build_params = self._video_params(scene_text)
+        if not force and self.builds.is_fresh(output_path, [image_path], build_params, "video",
+                                              adopt_untracked=True):
+            print(f"      ⭐ 이미 존재함, 스킵")
+            return output_path
+        
+        vid_prompt = self._motion_prompt(scene_text)
+        if prompt_tweak:
+            vid_prompt = f"{vid_prompt}\nAdditional direction: {prompt_tweak}"
+        self._record_prompt(stage_no, f"video_{scene_idx}", vid_prompt)
         print(f"      🎨 영상 스타일: {self.art_style}")
         
+        scheduler = get_video_scheduler(self.config)
+        job_id = getattr(self.state, "job_id", None) or "local"
+        
+        def _on_wait(position: int, eta_s: float) -> None:
+            print(f"      🚦 영상 생성 대기 중: {position + 1}번째 (약 {eta_s:.0f}초 후 시작)")
+        
         while True:
+            slot = None
             try:
-                client = self.config.get_google_client()
-                
-                # 이미지 레퍼런스
-                mime_type = "image/png" if image_path.endswith('.png') else "image/jpeg"
-                with open(image_path, "rb") as f:
-                    image_bytes = f.read()
-                
-                ref_image = types.Image(image_bytes=image_bytes, mime_type=mime_type)
-                ref_obj = types.VideoGenerationReferenceImage(
-                    image=ref_image,
-                    reference_type="asset"
-                )
-                
-                # API 호출
-                operation = client.models.generate_videos(
-                    model=self.config.get_model("video"),
-                    prompt=vid_prompt,
-                    config=types.GenerateVideosConfig(
-                        reference_images=[ref_obj]
+                from google.genai import types
+                # 아직 한도 초과가 안 난 키 중 자리가 빈 키로 실행 (요청이 몰리면 우선순위 순으로 대기)
+                first = self.config.current_google_idx
+                keys = range(first, max(first + 1, len(getattr(self.config, "google_keys", []))))
+                with scheduler.slot(job_id, self.video_priority, keys=keys, on_wait=_on_wait) as slot:
+                    return self._run_video_operation(
+                        self.config.get_google_client(slot.key), types,
+                        image_path, vid_prompt, output_path, build_params
                     )
-                )
-                
-                # 폴링
-                print(f"      ⏳ 렌더링 시작...")
-                wait_count = 0
-                while not operation.done:
-                    wait_count += 1
-                    if wait_count % 6 == 0:
-                        print(f"      ⏳ 렌더링 중... ({wait_count * 10}초)")
-                    time.sleep(10)
-                    operation = client.operations.get(operation)
-                
-                if operation.response and operation.response.generated_videos:
-                    video = operation.response.generated_videos[0]
-                    client.files.download(file=video.video)
-                    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                    video.video.save(output_path)
-                    return output_path
-                else:
-                    print(f"      ❌ 영상 생성 실패")
-                    return None
                     
             except Exception as e:
                 error_str = str(e)
@@ -316,6 +540,8 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
                 
                 if is_quota_error:
                     print(f"      🔄 할당량 초과, API 키 교체...")
+                    if slot is not None and slot.key is not None:
+                        self.config.current_google_idx = max(self.config.current_google_idx, slot.key)
                     if self.config.rotate_google_key():
                         print(f"      ✅ 다음 API 키로 재시도")
                         continue
@@ -326,20 +552,74 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
                     print(f"      ❌ 복구 불가능한 오류")
                     return None
     
+    def _run_video_operation(self, client, types, image_path: str, vid_prompt: str,
+                             output_path: str, build_params: Dict) -> Optional[str]:
+        """Veo 요청 → 완료까지 폴링 → 다운로드 (스케줄러 자리를 잡은 상태에서 호출)"""
+        # 이미지 레퍼런스
+        mime_type = "image/png" if image_path.endswith('.png') else "image/jpeg"
+        with open(image_path, "rb") as f:
+            image_bytes = f.read()
+        
+        ref_image = types.Image(image_bytes=image_bytes, mime_type=mime_type)
+        ref_obj = types.VideoGenerationReferenceImage(
+            image=ref_image,
+            reference_type="asset"
+        )
+        
+        # API 호출
+        operation = client.models.generate_videos(
+            model=self.config.get_model("video"),
+            prompt=vid_prompt,
+            config=types.GenerateVideosConfig(
+                reference_images=[ref_obj]
+            )
+        )
+        
+        # 폴링
+        print(f"      ⏳ 렌더링 시작...")
+        wait_count = 0
+        while not operation.done:
+            wait_count += 1
+            if wait_count % 6 == 0:
+                print(f"      ⏳ 렌더링 중... ({wait_count * 10}초)")
+            time.sleep(10)
+            operation = client.operations.get(operation)
+        
+        if operation.response and operation.response.generated_videos:
+            video = operation.response.generated_videos[0]
+            client.files.download(file=video.video)
+            # 다운로드 중 중단돼도 잘린 MP4가 캐시로 남지 않도록 임시 파일에 저장 후 교체
+            with AtomicOutput(output_path) as out:
+                video.video.save(out.tmp_path)
+                out.commit()
+            if not self.artifacts.record(output_path, "video"):
+                print(f"      ❌ 저장된 영상 검증 실패 (손상된 파일)")
+                return None
+            self.builds.record(output_path, [image_path], build_params)
+            return output_path
+        else:
+            print(f"      ❌ 영상 생성 실패")
+            return None
+    
     # ============== TTS 생성 ==============
     
     def generate_stage_tts(self, text: str, stage_no: int) -> Optional[str]:
         """TTS 생성"""
         output_path = self.file_mgr.get_stage_tts_path(stage_no)
         
-        if os.path.exists(output_path):
+        tts_config = self.config.get_tts_config()
+        build_params = {
+            "text": text,
+            "voice_id": tts_config.get("voice_id", ""),
+            "model_id": tts_config.get("model_id", "eleven_multilingual_v2"),
+        }
+        
+        if self.builds.is_fresh(output_path, [], build_params, "audio", adopt_untracked=True):
             print(f"   ⭐ TTS 이미 존재함, 스킵")
             return output_path
         
         print(f"\n🔊 [{stage_no}막] TTS 생성 중...")
         
-        tts_config = self.config.get_tts_config()
-        
         while True:
             client = self.config.get_eleven_client()
             if not client:
@@ -355,15 +635,22 @@ STYLE CONSISTENCY: All 3 images must look like they belong to the same animation
                 
                 audio_bytes = b"".join(chunk for chunk in audio_generator)
                 
-                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(audio_bytes)
+                with AtomicOutput(output_path) as out:
+                    with open(out.tmp_path, "wb") as f:
+                        f.write(audio_bytes)
+                    out.commit()
+                if not self.artifacts.record(output_path, "audio"):
+                    print(f"   ❌ 저장된 TTS 검증 실패")
+                    return None
+                self.builds.record(output_path, [], build_params)
                 
                 from pydub import AudioSegment
                 audio = AudioSegment.from_mp3(output_path)
                 tts_duration = len(audio) / 1000.0
                 
                 print(f"   🎵 TTS {tts_duration:.1f}초 ({len(text)}자)")
+                for scene_idx in range(1, 4):
+                    self._mark_scene(stage_no, scene_idx, "tts", output_path)
                 return output_path
                     
             except Exception as e:
@@ -0,0 +1,295 @@
+# ==================================================================================
+# managers/media_info.py - FFprobe 메타데이터 캐시 (길이/코덱/타임베이스/프레임레이트)
+# ==================================================================================
+
+import os
+import json
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class ProbeUnavailable(Exception):
+    """ffprobe를 실행하지 못함 (시간 초과, 실행 오류, 출력 파싱 실패) - 파일 손상 여부는 알 수 없음"""
+
+
+def _parse_rate(value: Optional[str]) -> float:
+    """'24000/1001' 형식의 비율 문자열을 float로 변환"""
+    if not value:
+        return 0.0
+    try:
+        if "/" in value:
+            num, den = value.split("/", 1)
+            den_f = float(den)
+            return float(num) / den_f if den_f else 0.0
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _to_float(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    """개별 스트림 정보 (ffprobe streams 항목)"""
+    index: int
+    codec_type: str          # "video" | "audio" | ...
+    codec_name: str
+    time_base: str = ""
+    frame_rate: float = 0.0  # r_frame_rate (영상만)
+    width: int = 0
+    height: int = 0
+    pix_fmt: str = ""
+    sample_rate: int = 0     # 오디오만
+    channels: int = 0
+    bit_rate: int = 0
+    duration: float = 0.0
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """파일 단위 미디어 정보 (ffprobe -show_format -show_streams)"""
+    path: str
+    size: int
+    mtime: float
+    duration: float
+    format_name: str
+    bit_rate: int
+    streams: Tuple[StreamInfo, ...]
+
+    @property
+    def video(self) -> Optional[StreamInfo]:
+        """첫 번째 영상 스트림"""
+        for s in self.streams:
+            if s.codec_type == "video":
+                return s
+        return None
+
+    @property
+    def audio(self) -> Optional[StreamInfo]:
+        """첫 번째 오디오 스트림"""
+        for s in self.streams:
+            if s.codec_type == "audio":
+                return s
+        return None
+
+    @property
+    def has_video(self) -> bool:
+        return self.video is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio is not None
+
+    @classmethod
+    def from_ffprobe(cls, path: str, size: int, mtime: float, data: dict) -> "MediaInfo":
+        """ffprobe JSON 출력에서 생성"""
+        fmt = data.get("format", {}) or {}
+        streams = []
+        for s in data.get("streams", []) or []:
+            streams.append(StreamInfo(
+                index=_to_int(s.get("index")),
+                codec_type=s.get("codec_type", ""),
+                codec_name=s.get("codec_name", ""),
+                time_base=s.get("time_base", ""),
+                frame_rate=_parse_rate(s.get("r_frame_rate")) if s.get("codec_type") == "video" else 0.0,
+                width=_to_int(s.get("width")),
+                height=_to_int(s.get("height")),
+                pix_fmt=s.get("pix_fmt", ""),
+                sample_rate=_to_int(s.get("sample_rate")),
+                channels=_to_int(s.get("channels")),
+                bit_rate=_to_int(s.get("bit_rate")),
+                duration=_to_float(s.get("duration")),
+            ))
+
+        duration = _to_float(fmt.get("duration"))
+        if duration <= 0 and streams:
+            # 일부 컨테이너는 format duration이 없음 → 가장 긴 스트림 기준
+            duration = max(s.duration for s in streams)
+
+        return cls(
+            path=path,
+            size=size,
+            mtime=mtime,
+            duration=duration,
+            format_name=fmt.get("format_name", ""),
+            bit_rate=_to_int(fmt.get("bit_rate")),
+            streams=tuple(streams),
+        )
+
+
+class MediaInfoService:
+    """
+    FFprobe 결과를 파일 단위로 캐싱하는 메타데이터 서비스
+    - ffprobe JSON 전체(format + streams)를 파일당 한 번만 파싱
+    - (path, size, mtime) 키로 캐싱 → 파일이 바뀌면 자동 무효화
+    - probe_many: 캐시 미스 파일만 모아 병렬로 한 번에 조회
+    - 실패 시 None 반환 (임의의 기본값으로 대체하지 않음)
+    """
+
+    def __init__(self, ffprobe_bin: str = "ffprobe", max_workers: int = 4, timeout: float = 30.0):
+        self.ffprobe_bin = ffprobe_bin
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._cache: Dict[str, Tuple[Tuple[int, float], MediaInfo]] = {}
+        self._lock = threading.Lock()
+
+    # ============== 조회 ==============
+
+    def probe(self, path: str) -> Optional[MediaInfo]:
+        """단일 파일 메타데이터 (캐시 우선)"""
+        return self.probe_many([path]).get(path)
+
+    def probe_many(self, paths: Iterable[str]) -> Dict[str, Optional[MediaInfo]]:
+        """
+        여러 파일 메타데이터를 한 번에 조회
+        ffprobe는 호출당 입력 1개만 받으므로, 캐시 미스 파일들을 모아
+        스레드 풀에서 동시에 실행한다.
+        """
+        results: Dict[str, Optional[MediaInfo]] = {}
+        misses: List[Tuple[str, Tuple[int, float]]] = []
+
+        for path in paths:
+            if not path or path in results:
+                continue
+            key = self._file_key(path)
+            if key is None:
+                results[path] = None
+                continue
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached and cached[0] == key:
+                results[path] = cached[1]
+            else:
+                misses.append((path, key))
+
+        if not misses:
+            return results
+
+        if len(misses) == 1:
+            probed = [self._run_ffprobe(*misses[0])]
+        else:
+            workers = min(self.max_workers, len(misses))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                probed = list(pool.map(lambda m: self._run_ffprobe(*m), misses))
+
+        for (path, key), info in zip(misses, probed):
+            results[path] = info
+            if info is not None:
+                with self._lock:
+                    self._cache[path] = (key, info)
+
+        return results
+
+    def probe_strict(self, path: str) -> Optional[MediaInfo]:
+        """
+        캐시 없이 다시 조회 (산출물 검증용)
+        ffprobe가 파일을 읽고 거부했거나 파일이 없으면 None,
+        ffprobe 자체를 실행하지 못했으면 ProbeUnavailable (파일 삭제 판단에 쓰지 않도록)
+        """
+        key = self._file_key(path)
+        if key is None:
+            return None
+        info = self._run_ffprobe(path, key, strict=True)
+        if info is not None:
+            with self._lock:
+                self._cache[path] = (key, info)
+        return info
+
+    def get_duration(self, path: str) -> Optional[float]:
+        """파일 길이 (초). 조회 실패 시 None"""
+        info = self.probe(path)
+        if info is None or info.duration <= 0:
+            return None
+        return info.duration
+
+    def get_durations(self, paths: Iterable[str]) -> Dict[str, Optional[float]]:
+        """여러 파일 길이를 한 번에 조회"""
+        infos = self.probe_many(paths)
+        return {
+            p: (info.duration if info is not None and info.duration > 0 else None)
+            for p, info in infos.items()
+        }
+
+    # ============== 캐시 관리 ==============
+
+    def invalidate(self, path: str) -> None:
+        """특정 파일 캐시 제거 (덮어쓰기 직후 등)"""
+        with self._lock:
+            self._cache.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    # ============== 내부 ==============
+
+    @staticmethod
+    def _file_key(path: str) -> Optional[Tuple[int, float]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime)
+
+    def _run_ffprobe(self, path: str, key: Tuple[int, float],
+                     strict: bool = False) -> Optional[MediaInfo]:
+        """strict: 실행 실패(시간 초과 등)를 None 대신 ProbeUnavailable로 알림"""
+        cmd = [
+            self.ffprobe_bin, "-v", "error",
+            "-print_format", "json",
+            "-show_format", "-show_streams",
+            path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"      ⚠️ ffprobe 실행 실패 ({os.path.basename(path)}): {e}")
+            if strict:
+                raise ProbeUnavailable(str(e)) from e
+            return None
+
+        if result.returncode != 0:
+            err = (result.stderr or "").strip()[:200]
+            print(f"      ⚠️ ffprobe 오류 ({os.path.basename(path)}): {err or result.returncode}")
+            return None
+
+        try:
+            data = json.loads(result.stdout or "{}")
+        except json.JSONDecodeError:
+            print(f"      ⚠️ ffprobe 출력 파싱 실패 ({os.path.basename(path)})")
+            if strict:
+                raise ProbeUnavailable("ffprobe 출력 파싱 실패")
+            return None
+
+        return MediaInfo.from_ffprobe(path, key[0], key[1], data)
+
+
+# ============== 프로세스 공용 인스턴스 ==============
+
+_default_service: Optional[MediaInfoService] = None
+_default_lock = threading.Lock()
+
+
+def get_media_info_service() -> MediaInfoService:
+    """프로세스 전역에서 공유하는 MediaInfoService 반환"""
+    global _default_service
+    if _default_service is None:
+        with _default_lock:
+            if _default_service is None:
+                _default_service = MediaInfoService()
+    return _default_service
@@ -3,159 +3,398 @@
 # ==================================================================================
 
 import os
-import subprocess
 import shutil
-from io import BytesIO
-from typing import List, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-from moviepy.video.io.VideoFileClip import VideoFileClip
-from moviepy.audio.io.AudioFileClip import AudioFileClip
-from moviepy.video.fx.all import speedx
 from .config_manager import ConfigManager
 from .file_manager import FileManager
 from .state_manager import StateManager
+from .media_info import MediaInfo, MediaInfoService, get_media_info_service
+from .artifact_manifest import ArtifactManifest, get_artifact_manifest
+from .build_graph import get_build_graph
+from utils.atomic_io import AtomicOutput
+from utils.ffmpeg_runner import FFmpegRunner, ProgressCallback, get_ffmpeg_runner
+
+
+def _concat_quote(path: str) -> str:
+    """concat demuxer 목록용 경로 인용 (작은따옴표 이스케이프)"""
+    clean = os.path.abspath(path).replace("\\", "/")
+    return "'" + clean.replace("'", "'\\''") + "'"
 
 
 class VideoMerger:
     """영상 병합 전담 클래스 (FFmpeg 사용)"""
     
-    def __init__(self, config: ConfigManager, file_mgr: FileManager):
+    def __init__(self, config: ConfigManager, file_mgr: FileManager,
+                 media_info: MediaInfoService = None, runner: FFmpegRunner = None,
+                 artifacts: ArtifactManifest = None):
         self.config = config
         self.file_mgr = file_mgr
+        self.media_info = media_info or get_media_info_service()
+        self.runner = runner or get_ffmpeg_runner(config.get_ffmpeg_config())
+        self.artifacts = artifacts or get_artifact_manifest(file_mgr.get_artifact_manifest_path())
+        self.builds = get_build_graph(file_mgr.get_build_graph_path(), self.artifacts)
     
-    def merge_scenes_to_stage(self, stage_no: int, scene_files: List[str]) -> Optional[str]:
+    def merge_scenes_to_stage(self, stage_no: int, scene_files: List[str],
+                              on_progress: ProgressCallback = None,
+                              profile: str = "preview", priority: str = "normal") -> Optional[str]:
         """
         3개 씬 영상을 하나로 합침 (FFmpeg xfade)
         8초 x 3 = 24초 → crossfade 적용 → 23초
+        on_progress: 인코딩 진행률 콜백 (0.0~1.0)
+        profile: 인코딩 프로필 ("preview" | "final")
+        priority: FFmpeg 프로세스 우선순위 ("normal" | "idle")
         """
-        output_path = self.file_mgr.get_stage_merged_video_path(stage_no)
+        output_path = self.file_mgr.get_stage_merged_video_path(stage_no, tier=profile)
         video_config = self.config.get_video_config()
+        encoding = self.config.get_encoding_profile(profile)
         crossfade = video_config.get("crossfade_duration", 0.5)
         
-        print(f"\n🎞️ [FFmpeg] Stage {stage_no} 영상 병합 중...")
+        print(f"\n🎞️ [FFmpeg] Stage {stage_no} 영상 병합 중... ({profile})")
         
         # 파일 검증
-        valid_files = [f for f in scene_files if f and os.path.exists(f)]
+        valid_files = [f for f in scene_files if self.artifacts.is_valid(f, "video")]
         if len(valid_files) != 3:
             print(f"      ⚠️ 유효한 파일 {len(valid_files)}개 (3개 필요)")
             return None
         
+        # 씬 영상과 인코딩 설정이 그대로면 다시 인코딩하지 않음
+        build_params = {"encoding": encoding, "crossfade": crossfade}
+        if self.builds.is_fresh(output_path, valid_files, build_params, "video"):
+            print(f"      ⭐ 입력 변경 없음, 병합 스킵")
+            return output_path
+        
         try:
-            # 각 영상 길이 확인
+            # 각 영상 메타데이터 확인 (캐시된 ffprobe 결과 사용)
+            infos = self.media_info.probe_many(valid_files)
             durations = []
             for vf in valid_files:
-                dur = self._get_video_duration(vf)
-                durations.append(dur)
-                print(f"      📹 {os.path.basename(vf)}: {dur:.2f}초")
+                info = infos.get(vf)
+                if info is None or not info.has_video or info.duration <= 0:
+                    print(f"      ❌ 영상 정보 확인 실패: {os.path.basename(vf)}")
+                    return None
+                durations.append(info.duration)
+                v = info.video
+                print(f"      📹 {os.path.basename(vf)}: {info.duration:.2f}초 "
+                      f"({v.codec_name}, {v.width}x{v.height}, {v.frame_rate:.2f}fps)")
             
             # xfade offset 계산 (각 영상 길이 기반)
             offset1 = durations[0] - crossfade
             offset2 = offset1 + durations[1] - crossfade
             
-            ffmpeg_cmd = [
-                "ffmpeg", "-y",
-                "-i", valid_files[0],
-                "-i", valid_files[1],
-                "-i", valid_files[2],
-                "-filter_complex",
-                f"[0:v][1:v]xfade=transition=fade:duration={crossfade}:offset={offset1:.2f}[v01];"
-                f"[v01][2:v]xfade=transition=fade:duration={crossfade}:offset={offset2:.2f}[vout]",
-                "-map", "[vout]",
-                "-c:v", video_config.get("codec", "libx264"),
-                "-preset", video_config.get("preset", "medium"),
-                "-crf", str(video_config.get("crf", 23)),
-                output_path
-            ]
+            # xfade는 해상도/프레임레이트/타임베이스가 같아야 함 → 다르면 첫 영상 기준으로 정규화
+            prefix, labels = self._build_xfade_inputs([infos[vf] for vf in valid_files])
+            scale = f",scale=-2:{encoding['height']}" if encoding.get("height") else ""
             
-            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+            expected = sum(durations) - crossfade * (len(durations) - 1)
             
-            if os.path.exists(output_path):
-                final_dur = self._get_video_duration(output_path)
-                print(f"      ✅ 병합 완료: {final_dur:.2f}초")
-                return output_path
-            else:
-                print(f"      ❌ 병합 실패: {result.stderr[:200] if result.stderr else 'Unknown error'}")
+            # 임시 파일에 인코딩 후 교체 (중단된 ffmpeg 결과가 남지 않도록)
+            with AtomicOutput(output_path) as out:
+                ffmpeg_cmd = [
+                    "ffmpeg", "-y",
+                    "-i", valid_files[0],
+                    "-i", valid_files[1],
+                    "-i", valid_files[2],
+                    "-filter_complex",
+                    f"{prefix}"
+                    f"{labels[0]}{labels[1]}xfade=transition=fade:duration={crossfade}:offset={offset1:.2f}[v01];"
+                    f"[v01]{labels[2]}xfade=transition=fade:duration={crossfade}:offset={offset2:.2f}{scale}[vout]",
+                    "-map", "[vout]",
+                    "-c:v", encoding["codec"],
+                    "-preset", encoding["preset"],
+                    "-crf", str(encoding["crf"]),
+                    out.tmp_path
+                ]
+                result = self.runner.run(
+                    ffmpeg_cmd, duration=expected, on_progress=on_progress,
+                    label=f"stage {stage_no} merge ({profile})", priority=priority,
+                    timeout=self.runner.final_timeout if profile == "final" else None
+                )
+                if not result.ok:
+                    print(f"      ❌ 병합 실패: {result.stderr[-200:] if result.stderr else 'Unknown error'}")
+                    return None
+                out.commit()
+            
+            if not self.artifacts.record(output_path, "video"):
+                print(f"      ❌ 병합 결과 확인 실패")
                 return None
+            self.builds.record(output_path, valid_files, build_params)
+            final_dur = self.artifacts.get_duration(output_path)
+            print(f"      ✅ 병합 완료: {final_dur:.2f}초")
+            return output_path
                 
         except Exception as e:
             print(f"   ❌ 병합 오류: {e}")
             return None
     
-    def _get_video_duration(self, video_path: str) -> float:
-        """FFprobe로 영상 길이 확인"""
-        try:
-            cmd = [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return float(result.stdout.strip())
-        except:
-            return 8.0  # 기본값
+    def _build_xfade_inputs(self, infos: List[MediaInfo]) -> Tuple[str, List[str]]:
+        """
+        xfade 입력 라벨 구성
+        모든 클립의 해상도/프레임레이트/타임베이스가 같으면 원본 스트림을 그대로 사용하고,
+        하나라도 다르면 첫 번째 클립 기준으로 fps/scale/settb 정규화 필터를 앞에 붙인다.
+        """
+        ref = infos[0].video
+        same = all(
+            i.video.width == ref.width and i.video.height == ref.height
+            and abs(i.video.frame_rate - ref.frame_rate) < 0.01
+            and i.video.time_base == ref.time_base
+            for i in infos[1:]
+        )
+        if same:
+            return "", [f"[{idx}:v]" for idx in range(len(infos))]
+        
+        fps = ref.frame_rate or self.config.get_video_config().get("fps", 24)
+        print(f"      🔧 클립 규격 불일치 → {ref.width}x{ref.height}@{fps:.2f}fps로 정규화")
+        prefix = ""
+        labels = []
+        for idx in range(len(infos)):
+            prefix += (f"[{idx}:v]fps={fps:.3f},scale={ref.width}:{ref.height},"
+                       f"setsar=1,settb=AVTB[n{idx}];")
+            labels.append(f"[n{idx}]")
+        return prefix, labels
 
 
 class AudioMerger:
-    """오디오 병합 전담 클래스"""
+    """오디오 병합 전담 클래스 (FFmpeg concat demuxer + 스트림 복사)"""
+    
+    # 이 값보다 작은 길이 차이는 무시 (MP3 프레임 ≈ 26ms)
+    ALIGN_TOLERANCE = 0.05
     
-    def __init__(self, config: ConfigManager, file_mgr: FileManager):
+    def __init__(self, config: ConfigManager, file_mgr: FileManager,
+                 media_info: MediaInfoService = None, runner: FFmpegRunner = None,
+                 artifacts: ArtifactManifest = None):
         self.config = config
         self.file_mgr = file_mgr
+        self.media_info = media_info or get_media_info_service()
+        self.runner = runner or get_ffmpeg_runner(config.get_ffmpeg_config())
+        self.artifacts = artifacts or get_artifact_manifest(file_mgr.get_artifact_manifest_path())
+        self.builds = get_build_graph(file_mgr.get_build_graph_path(), self.artifacts)
     
-    def merge_stages_to_final(self, num_stages: int = 5) -> Optional[str]:
-        """5개 stage TTS를 하나로 병합"""
+    def merge_stages_to_final(self, num_stages: int = 5, align_to_video: bool = None) -> Optional[str]:
+        """
+        5개 stage TTS를 하나로 병합
+        - 파일을 메모리에 올리지 않고 ffmpeg concat demuxer로 스트림 복사
+        - 출력은 ID3/Xing 헤더가 하나뿐인 정상 MP3 (길이 표시/탐색 정상)
+        - align_to_video: 각 stage 오디오를 stage 영상 길이에 맞춤
+          (짧으면 무음 추가, 길면 outpoint로 자름). None이면 설정값 사용
+        """
         output_path = self.file_mgr.get_final_tts_path()
+        if align_to_video is None:
+            align_to_video = self.config.get_tts_align_final_to_video()
         
         print("\n🎧 [TTS] 전체 TTS 병합 중...")
         
-        combined = BytesIO()
+        stage_paths = []
         for stage_no in range(1, num_stages + 1):
             path = self.file_mgr.get_stage_tts_path(stage_no)
-            if not os.path.exists(path):
+            if not self.artifacts.is_valid(path, "audio"):
                 print(f"   ⚠️ Stage {stage_no} TTS 없음")
                 continue
-            with open(path, "rb") as f:
-                combined.write(f.read())
+            stage_paths.append((stage_no, path))
         
-        if combined.tell() == 0:
+        if not stage_paths:
             print("   ⚠️ 병합할 TTS 없음")
             return None
         
-        with open(output_path, "wb") as f:
-            f.write(combined.getvalue())
+        # TTS와 길이 기준 영상이 그대로면 다시 병합하지 않음
+        build_inputs = [p for _, p in stage_paths]
+        if align_to_video:
+            build_inputs += [self._stage_video_for_alignment(n) for n, _ in stage_paths]
+        build_params = {"align_to_video": align_to_video, "tolerance": self.ALIGN_TOLERANCE}
+        if self.builds.is_fresh(output_path, build_inputs, build_params, "audio"):
+            print("   ⭐ 입력 변경 없음, TTS 병합 스킵")
+            return output_path
+        
+        temp_dir = self.file_mgr.get_temp_dir()
+        os.makedirs(temp_dir, exist_ok=True)
+        list_path = os.path.join(temp_dir, "tts_concat.txt")
+        silence_files = []
         
-        print(f"   ✅ 전체 TTS 완료: {output_path}")
+        try:
+            infos = self.media_info.probe_many([p for _, p in stage_paths])
+            
+            entries = []
+            for stage_no, path in stage_paths:
+                info = infos.get(path)
+                if info is None or not info.has_audio:
+                    print(f"   ⚠️ Stage {stage_no} TTS 정보 확인 실패, 건너뜀")
+                    continue
+                
+                target = self._get_stage_video_duration(stage_no) if align_to_video else None
+                if target is None:
+                    entries.append((path, None))
+                    continue
+                
+                gap = target - info.duration
+                if gap > self.ALIGN_TOLERANCE:
+                    # 오디오가 짧음 → 같은 규격의 무음 구간 추가
+                    entries.append((path, None))
+                    silence = self._make_silence(info, gap, os.path.join(temp_dir, f"silence_{stage_no}.mp3"))
+                    if silence:
+                        silence_files.append(silence)
+                        entries.append((silence, None))
+                    print(f"   🔇 Stage {stage_no}: 무음 {gap:.2f}초 추가")
+                elif gap < -self.ALIGN_TOLERANCE:
+                    # 오디오가 김 → 영상 길이에서 자름
+                    entries.append((path, target))
+                    print(f"   ✂️ Stage {stage_no}: {info.duration:.2f}초 → {target:.2f}초")
+                else:
+                    entries.append((path, None))
+            
+            if not entries:
+                print("   ⚠️ 병합할 TTS 없음")
+                return None
+            
+            with open(list_path, "w", encoding="utf-8") as f:
+                for path, outpoint in entries:
+                    f.write(f"file {_concat_quote(path)}\n")
+                    if outpoint is not None:
+                        f.write(f"outpoint {outpoint:.3f}\n")
+            
+            with AtomicOutput(output_path) as out:
+                ffmpeg_cmd = [
+                    "ffmpeg", "-y",
+                    "-f", "concat",
+                    "-safe", "0",
+                    "-i", list_path,
+                    "-map", "0:a",
+                    "-c:a", "copy",
+                    "-map_metadata", "-1",
+                    "-write_xing", "1",
+                    out.tmp_path
+                ]
+                result = self.runner.run(ffmpeg_cmd, label="final tts concat")
+                
+                if not result.ok:
+                    print(f"   ❌ TTS 병합 실패: {result.stderr[-200:] if result.stderr else 'Unknown error'}")
+                    return None
+                out.commit()
+            
+            if not self.artifacts.record(output_path, "audio"):
+                print(f"   ❌ TTS 병합 결과 확인 실패")
+                return None
+            self.builds.record(output_path, build_inputs, build_params)
+            duration = self.artifacts.get_duration(output_path)
+            print(f"   ✅ 전체 TTS 완료: {output_path} ({duration:.2f}초)")
+            return output_path
+            
+        except Exception as e:
+            print(f"   ❌ TTS 병합 오류: {e}")
+            return None
+        finally:
+            for tmp in [list_path] + silence_files:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+    
+    def _stage_video_for_alignment(self, stage_no: int) -> Optional[str]:
+        """길이 기준이 되는 stage 영상 (최종 화질본 → 미리보기본 → 병합 영상 순)"""
+        for path in (self.file_mgr.get_stage_final_path(stage_no, tier="final"),
+                     self.file_mgr.get_stage_final_path(stage_no),
+                     self.file_mgr.get_stage_merged_video_path(stage_no)):
+            if self.artifacts.is_valid(path, "video"):
+                return path
+        return None
+    
+    def _get_stage_video_duration(self, stage_no: int) -> Optional[float]:
+        """stage 최종 영상(없으면 병합 영상) 길이"""
+        path = self._stage_video_for_alignment(stage_no)
+        return self.artifacts.get_duration(path) if path else None
+    
+    def _make_silence(self, ref: MediaInfo, duration: float, output_path: str) -> Optional[str]:
+        """참조 MP3와 같은 샘플레이트/채널/비트레이트의 무음 MP3 생성 (스트림 복사 concat용)"""
+        audio = ref.audio
+        sample_rate = audio.sample_rate or 44100
+        layout = "mono" if audio.channels == 1 else "stereo"
+        bitrate = audio.bit_rate or ref.bit_rate or 128000
+        
+        cmd = [
+            "ffmpeg", "-y",
+            "-f", "lavfi",
+            "-i", f"anullsrc=r={sample_rate}:cl={layout}",
+            "-t", f"{duration:.3f}",
+            "-c:a", "libmp3lame",
+            "-b:a", str(bitrate),
+            output_path
+        ]
+        result = self.runner.run(cmd, label="silence")
+        if not result.ok or not os.path.exists(output_path):
+            print(f"   ⚠️ 무음 생성 실패: {result.stderr[-200:] if result.stderr else 'Unknown error'}")
+            return None
         return output_path
 
 
 class AVMuxer:
     """영상+오디오 합성 전담 클래스 (길이 동기화 포함)"""
     
-    def __init__(self, config: ConfigManager, file_mgr: FileManager):
+    def __init__(self, config: ConfigManager, file_mgr: FileManager,
+                 media_info: MediaInfoService = None, runner: FFmpegRunner = None,
+                 artifacts: ArtifactManifest = None):
         self.config = config
         self.file_mgr = file_mgr
+        self.media_info = media_info or get_media_info_service()
+        self.runner = runner or get_ffmpeg_runner(config.get_ffmpeg_config())
+        self.artifacts = artifacts or get_artifact_manifest(file_mgr.get_artifact_manifest_path())
+        self.builds = get_build_graph(file_mgr.get_build_graph_path(), self.artifacts)
     
-    def mux_stage(self, stage_no: int) -> Optional[str]:
+    def mux_stage(self, stage_no: int, profile: str = "preview",
+                  priority: str = "normal") -> Optional[str]:
         """
         stage 영상 + TTS 합성 (길이 동기화)
+        profile: 인코딩 프로필 ("preview" | "final")
+        priority: final 프로필 FFmpeg 프로세스 우선순위 ("normal" | "idle")
         """
-        video_path = self.file_mgr.get_stage_merged_video_path(stage_no)
+        video_path = self.file_mgr.get_stage_merged_video_path(stage_no, tier=profile)
         audio_path = self.file_mgr.get_stage_tts_path(stage_no)
-        output_path = self.file_mgr.get_stage_final_path(stage_no)
+        output_path = self.file_mgr.get_stage_final_path(stage_no, tier=profile)
+        encoding = self.config.get_encoding_profile(profile)
         
-        if not os.path.exists(video_path):
+        if not self.artifacts.is_valid(video_path, "video"):
             print(f"❌ Stage {stage_no}: 영상 없음")
             return None
-        if not os.path.exists(audio_path):
+        has_audio = self.artifacts.is_valid(audio_path, "audio")
+        build_inputs = [video_path, audio_path] if has_audio else [video_path]
+        build_params = {
+            "encoding": encoding,
+            "fps": self.config.get_video_config().get("fps", 24),
+            "has_audio": has_audio,
+        }
+        if self.builds.is_fresh(output_path, build_inputs, build_params, "video"):
+            print(f"   ⭐ Stage {stage_no}: 입력 변경 없음, 합성 스킵")
+            return output_path
+        
+        if not has_audio:
             print(f"⚠️ Stage {stage_no}: 오디오 없음, 영상만 사용")
             # 오디오 없으면 영상만 복사 (Windows 호환)
-            shutil.copy(video_path, output_path)
-            return output_path if os.path.exists(output_path) else None
+            with AtomicOutput(output_path) as out:
+                shutil.copy(video_path, out.tmp_path)
+                out.commit()
+            if not self.artifacts.record(output_path, "video"):
+                return None
+            self.builds.record(output_path, build_inputs, build_params)
+            return output_path
         
-        print(f"\n🎧 Stage {stage_no}: 영상+오디오 합성 중...")
+        print(f"\n🎧 Stage {stage_no}: 영상+오디오 합성 중... ({profile})")
+        
+        if profile == "final":
+            # 최종 화질(slow preset) 인코딩은 이 프로세스 안이 아니라 FFmpeg 풀에서 실행
+            if not self._mux_with_ffmpeg(stage_no, video_path, audio_path, output_path,
+                                         encoding, priority):
+                return None
+            if not self.artifacts.record(output_path, "video"):
+                print(f"   ❌ Stage {stage_no}: 합성 결과 확인 실패")
+                return None
+            self.builds.record(output_path, build_inputs, build_params)
+            print(f"   ✅ Stage {stage_no}: 완료")
+            return output_path
         
         try:
+            # moviepy는 numpy/imageio까지 불러오므로 실제 합성 시점에만 import
+            from moviepy.video.io.VideoFileClip import VideoFileClip
+            from moviepy.audio.io.AudioFileClip import AudioFileClip
+            from moviepy.video.fx.all import speedx
+            
             video_clip = VideoFileClip(video_path)
             audio_clip = AudioFileClip(audio_path)
             
@@ -166,35 +405,39 @@ class AVMuxer:
             print(f"   🔊 오디오: {audio_dur:.2f}초")
             
             # 길이 동기화
-            if abs(video_dur - audio_dur) > 0.5:
-                if audio_dur > video_dur:
-                    # 오디오가 길면 자르기
-                    print(f"   ✂️ 오디오 {audio_dur:.2f}초 → {video_dur:.2f}초로 자름")
-                    audio_clip = audio_clip.subclip(0, video_dur)
-                else:
-                    # 오디오가 짧으면 영상 속도 조절
-                    speed_factor = video_dur / audio_dur
-                    if speed_factor <= 1.15:  # 15% 이내만 조절
-                        print(f"   🔄 영상 속도 {speed_factor:.2f}배로 조절")
-                        video_clip = video_clip.fx(speedx, 1/speed_factor)
-                    else:
-                        print(f"   ⚠️ 속도 차이 과다, 오디오 끝에서 자름")
+            trim_audio, speed_factor = self._sync_plan(video_dur, audio_dur)
+            if trim_audio:
+                audio_clip = audio_clip.subclip(0, video_dur)
+            elif speed_factor:
+                video_clip = video_clip.fx(speedx, 1/speed_factor)
             
             # 합성
             final_clip = video_clip.set_audio(audio_clip)
             
             video_config = self.config.get_video_config()
-            final_clip.write_videofile(
-                output_path, 
-                fps=video_config.get("fps", 24),
-                logger=None  # 로그 숨김
-            )
+            # moviepy도 FFmpeg 풀의 동시 실행 제한/스레드 배분을 따름
+            with self.runner.slot() as threads, AtomicOutput(output_path) as out:
+                final_clip.write_videofile(
+                    out.tmp_path, 
+                    fps=video_config.get("fps", 24),
+                    codec=encoding["codec"],
+                    preset=encoding["preset"],
+                    audio_bitrate=encoding["audio_bitrate"],
+                    ffmpeg_params=["-crf", str(encoding["crf"])],
+                    threads=threads,
+                    logger=None  # 로그 숨김
+                )
+                out.commit()
             
             # 정리
             video_clip.close()
             audio_clip.close()
             final_clip.close()
             
+            if not self.artifacts.record(output_path, "video"):
+                print(f"   ❌ Stage {stage_no}: 합성 결과 확인 실패")
+                return None
+            self.builds.record(output_path, build_inputs, build_params)
             print(f"   ✅ Stage {stage_no}: 완료")
             return output_path
             
@@ -202,29 +445,111 @@ class AVMuxer:
             print(f"   ❌ Stage {stage_no}: 합성 실패: {e}")
             return None
     
-    def build_final_video(self, num_stages: int = 5, srt_path: str = None) -> Optional[str]:  # <-- 인자 추가
-        """5개 stage 최종 영상을 하나로 병합 (FFmpeg concat + 자막)"""
+    @staticmethod
+    def _sync_plan(video_dur: float, audio_dur: float) -> Tuple[bool, Optional[float]]:
+        """길이 동기화 방법 (오디오 자르기 여부, 영상 속도 조절 배율) - 미리보기/최종 화질 공통"""
+        if abs(video_dur - audio_dur) <= 0.5:
+            return False, None
+        if audio_dur > video_dur:
+            # 오디오가 길면 자르기
+            print(f"   ✂️ 오디오 {audio_dur:.2f}초 → {video_dur:.2f}초로 자름")
+            return True, None
+        # 오디오가 짧으면 영상 속도 조절
+        speed_factor = video_dur / audio_dur
+        if speed_factor <= 1.15:  # 15% 이내만 조절
+            print(f"   🔄 영상 속도 {speed_factor:.2f}배로 조절")
+            return False, speed_factor
+        print(f"   ⚠️ 속도 차이 과다, 오디오 끝에서 자름")
+        return False, None
+    
+    def _mux_with_ffmpeg(self, stage_no: int, video_path: str, audio_path: str, output_path: str,
+                         encoding: Dict, priority: str) -> bool:
+        """FFmpeg 풀에서 영상+오디오 합성 (moviepy 경로와 같은 길이 동기화)"""
+        infos = self.media_info.probe_many([video_path, audio_path])
+        video_info, audio_info = infos.get(video_path), infos.get(audio_path)
+        if video_info is None or video_info.duration <= 0 or audio_info is None or audio_info.duration <= 0:
+            print(f"   ❌ Stage {stage_no}: 영상/오디오 정보 확인 실패")
+            return False
+        video_dur, audio_dur = video_info.duration, audio_info.duration
+        print(f"   📹 영상: {video_dur:.2f}초")
+        print(f"   🔊 오디오: {audio_dur:.2f}초")
+        
+        # 출력 길이는 항상 (속도 조절 후) 영상 길이 → 긴 오디오는 -t로 잘림
+        _, speed_factor = self._sync_plan(video_dur, audio_dur)
+        output_dur = video_dur * speed_factor if speed_factor else video_dur
+        video_filter = ["-vf", f"setpts=PTS*{speed_factor:.6f}"] if speed_factor else []
+        
+        with AtomicOutput(output_path) as out:
+            ffmpeg_cmd = [
+                "ffmpeg", "-y",
+                "-i", video_path,
+                "-i", audio_path,
+                "-map", "0:v:0",
+                "-map", "1:a:0",
+                *video_filter,
+                "-r", str(self.config.get_video_config().get("fps", 24)),
+                "-c:v", encoding["codec"],
+                "-preset", encoding["preset"],
+                "-crf", str(encoding["crf"]),
+                "-c:a", "aac",
+                "-b:a", encoding["audio_bitrate"],
+                "-t", f"{output_dur:.3f}",
+                out.tmp_path
+            ]
+            result = self.runner.run(
+                ffmpeg_cmd, duration=output_dur, label=f"stage {stage_no} mux (final)",
+                priority=priority, timeout=self.runner.final_timeout
+            )
+            if not result.ok:
+                print(f"   ❌ Stage {stage_no}: 합성 실패: "
+                      f"{result.stderr[-200:] if result.stderr else 'Unknown error'}")
+                return False
+            out.commit()
+        return True
+    
+    def build_final_video(self, num_stages: int = 5, srt_path: str = None,
+                          on_progress: ProgressCallback = None,
+                          abr_ladder: bool = None) -> Optional[str]:  # <-- 인자 추가
+        """
+        5개 stage 최종 영상을 하나로 병합 (FFmpeg concat + 자막)
+        abr_ladder: 완성 영상으로 HLS 다중 화질 사다리도 생성 (None이면 설정값 사용)
+        """
         output_path = self.file_mgr.get_final_video_path()
-        list_filename = "inputs.txt"
+        temp_dir = self.file_mgr.get_temp_dir()
+        os.makedirs(temp_dir, exist_ok=True)
+        list_filename = os.path.join(temp_dir, "final_concat.txt")
+        
+        ladder_config = self.config.get_abr_ladder_config()
+        if abr_ladder is None:
+            abr_ladder = bool(ladder_config.get("enabled", False))
+        
+        # 사다리를 만들면 진행률 절반은 concat, 절반은 사다리 인코딩
+        concat_progress = on_progress
+        if abr_ladder and on_progress:
+            concat_progress = lambda f: on_progress(f * 0.5)
         
         print("\n🎬 최종 영상 병합 중...")
         
         try:            
-            # 파일 리스트 생성
-            valid_count = 0
+            # 파일 리스트 생성 (모든 막을 같은 화질로, 섞이면 아래에서 재인코딩)
+            stage_paths, tier = self._pick_stage_finals(num_stages)
+            valid_paths = []
             with open(list_filename, "w", encoding="utf-8") as f:
                 for stage_no in range(1, num_stages + 1):
-                    path = self.file_mgr.get_stage_final_path(stage_no)
-                    if os.path.exists(path):
-                        f.write(f"file '{path}'\n")
-                        valid_count += 1
+                    path = stage_paths.get(stage_no)
+                    if path:
+                        f.write(f"file {_concat_quote(path)}\n")
+                        valid_paths.append(path)
                     else:
                         print(f"   ⚠️ Stage {stage_no} 최종 영상 없음")
+            valid_count = len(valid_paths)
             
             if valid_count == 0:
                 print("   ❌ 병합할 영상 없음")
                 return None
             
+            out = AtomicOutput(output_path)
+            
             # FFmpeg 명령어 구성
             ffmpeg_cmd = [
                 "ffmpeg", "-y",
@@ -233,6 +558,18 @@ class AVMuxer:
                 "-i", list_filename,
             ]
 
+            build_inputs = list(valid_paths)
+            build_params = {"subtitles": None, "tier": tier}
+            
+            # 화질이 섞였으면 막마다 해상도/오디오 규격이 달라 스트림 복사 불가 → 첫 막 기준으로 재인코딩
+            filters = []
+            if tier == "mixed":
+                first = self.media_info.probe(valid_paths[0])
+                height = first.video.height if first is not None and first.has_video else 0
+                fps = self.config.get_video_config().get("fps", 24)
+                filters.append(f"fps={fps},scale=-2:{height},setsar=1" if height else f"fps={fps}")
+                print(f"   🔧 미리보기/최종 화질 막이 섞임 → 재인코딩")
+            
             # [추가] 자막이 있으면 필터 적용
             if srt_path and os.path.exists(srt_path):
                 # 윈도우 경로 역슬래시(\)를 슬래시(/)로 변경해야 FFmpeg가 인식함
@@ -240,31 +577,62 @@ class AVMuxer:
                 
                 # 자막 스타일 설정 (맑은고딕, 노란색, 검은테두리)
                 style = "FontName=Malgun Gothic,FontSize=24,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,BorderStyle=1,Outline=2,Shadow=0,MarginV=30"
-                
+                filters.append(f"subtitles='{clean_srt_path}':force_style='{style}'")
+                build_inputs.append(srt_path)
+                build_params["subtitles"] = style
+            
+            if filters:
+                encoding = self.config.get_encoding_profile("final")
                 ffmpeg_cmd.extend([
-                    "-vf", f"subtitles='{clean_srt_path}':force_style='{style}'",
-                    "-c:v", "libx264",  # 자막을 구우려면 재인코딩 필수
-                    "-c:a", "copy",
-                    "-preset", "fast",
-                    "-crf", "23"
+                    "-vf", ",".join(filters),
+                    "-c:v", encoding["codec"],  # 자막/규격 맞춤은 재인코딩 필수
+                    "-preset", encoding["preset"],
+                    "-crf", str(encoding["crf"])
                 ])
+                if tier == "mixed":
+                    ffmpeg_cmd.extend(["-c:a", "aac", "-b:a", encoding["audio_bitrate"]])
+                else:
+                    ffmpeg_cmd.extend(["-c:a", "copy"])
+                build_params["encoding"] = encoding
             else:
                 # 자막 없으면 그냥 복사 (기존 방식)
                 ffmpeg_cmd.extend(["-c", "copy"])
 
-            ffmpeg_cmd.append(output_path)
+            ffmpeg_cmd.append(out.tmp_path)
+            
+            # 막 영상/자막이 그대로면 다시 병합하지 않음
+            if self.builds.is_fresh(output_path, build_inputs, build_params, "video"):
+                print("   ⭐ 입력 변경 없음, 최종 병합 스킵")
+                os.remove(list_filename)
+                if abr_ladder and not os.path.exists(self.file_mgr.get_final_hls_master_path()):
+                    self.build_abr_ladder(output_path, on_progress=on_progress)
+                return output_path
             
-            # 실행
-            subprocess.run(ffmpeg_cmd, capture_output=True)
+            # 실행 (진행률 계산용 총 길이는 캐시된 ffprobe 결과 사용)
+            expected = sum(d or 0.0 for d in self.media_info.get_durations(valid_paths).values())
+            with out:
+                result = self.runner.run(
+                    ffmpeg_cmd, duration=expected, on_progress=concat_progress,
+                    label="final concat", timeout=self.runner.final_timeout
+                )
+                if result.ok:
+                    out.commit()
+                else:
+                    print(f"   ❌ 최종 병합 실패: {result.stderr[-200:] if result.stderr else 'Unknown error'}")
             
             # 정리
             if os.path.exists(list_filename):
                 os.remove(list_filename)
             
-            if os.path.exists(output_path):
+            if out.committed and self.artifacts.record(output_path, "video"):
+                self.builds.record(output_path, build_inputs, build_params)
                 # 최종 길이 확인
                 dur = self._get_duration(output_path)
                 print(f"   🎉 최종 완성: {output_path} ({dur:.2f}초)")
+                
+                if abr_ladder:
+                    ladder_progress = (lambda f: on_progress(0.5 + f * 0.5)) if on_progress else None
+                    self.build_abr_ladder(output_path, on_progress=ladder_progress)
                 return output_path
             
             return None
@@ -273,42 +641,211 @@ class AVMuxer:
             print(f"   ❌ 최종 병합 오류: {e}")
             return None
     
-    def _get_duration(self, file_path: str) -> float:
-        """파일 길이 확인"""
-        try:
-            cmd = [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                file_path
+    def build_abr_ladder(self, source_path: str,
+                         on_progress: ProgressCallback = None) -> Optional[str]:
+        """
+        완성 영상 → HLS 다중 화질 사다리 (360p/540p/720p 등)
+        - FFmpeg 한 번 실행: 한 번 디코딩 후 split으로 나눠 화질별 인코더에 전달
+        - 세그먼트 경계를 맞추기 위해 모든 화질에 같은 GOP 적용
+        - master.m3u8 + 화질별 index.m3u8/세그먼트 생성
+        
+        Returns:
+            master 플레이리스트 경로 (실패 시 None)
+        """
+        ladder_config = self.config.get_abr_ladder_config()
+        info = self.media_info.probe(source_path)
+        if info is None or not info.has_video:
+            print("   ❌ ABR 사다리: 원본 영상 정보 확인 실패")
+            return None
+        
+        # 원본보다 큰 화질은 만들지 않음 (업스케일 방지)
+        renditions = [
+            r for r in ladder_config.get("renditions", [])
+            if not info.video.height or r.get("height", 0) <= info.video.height
+        ]
+        if not renditions:
+            print("   ⚠️ ABR 사다리: 생성할 화질 없음")
+            return None
+        
+        print(f"\n📶 ABR 사다리 생성 중... ({', '.join(r['name'] for r in renditions)})")
+        
+        hls_dir = self.file_mgr.get_final_hls_dir()
+        build_dir = hls_dir + ".tmp"
+        if os.path.exists(build_dir):
+            shutil.rmtree(build_dir)
+        os.makedirs(build_dir, exist_ok=True)
+        
+        encoding = self.config.get_encoding_profile("final")
+        fps = info.video.frame_rate or self.config.get_video_config().get("fps", 24)
+        segment = ladder_config.get("segment_duration", 4)
+        gop = max(1, int(round(fps * segment)))
+        has_audio = info.has_audio
+        
+        count = len(renditions)
+        graph = f"[0:v]split={count}" + "".join(f"[s{i}]" for i in range(count)) + ";"
+        graph += ";".join(
+            f"[s{i}]scale=-2:{r['height']}[v{i}]" for i, r in enumerate(renditions)
+        )
+        
+        cmd = ["ffmpeg", "-y", "-i", source_path, "-filter_complex", graph]
+        stream_map = []
+        for i, r in enumerate(renditions):
+            cmd += ["-map", f"[v{i}]"]
+            if has_audio:
+                cmd += ["-map", "0:a:0"]
+            cmd += [
+                f"-c:v:{i}", encoding["codec"],
+                f"-b:v:{i}", r["video_bitrate"],
+                f"-maxrate:v:{i}", r.get("maxrate", r["video_bitrate"]),
+                f"-bufsize:v:{i}", r.get("bufsize", r["video_bitrate"]),
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return float(result.stdout.strip())
-        except:
-            return 0.0
+            if has_audio:
+                cmd += [f"-c:a:{i}", "aac", f"-b:a:{i}", r.get("audio_bitrate", "128k")]
+            stream_map.append(f"v:{i},a:{i},name:{r['name']}" if has_audio else f"v:{i},name:{r['name']}")
+        
+        cmd += [
+            "-preset", encoding["preset"],
+            "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+            "-f", "hls",
+            "-hls_time", str(segment),
+            "-hls_playlist_type", "vod",
+            "-hls_flags", "independent_segments",
+            "-hls_segment_filename", os.path.join(build_dir, "%v", "seg_%03d.ts"),
+            "-master_pl_name", "master.m3u8",
+            "-var_stream_map", " ".join(stream_map),
+            os.path.join(build_dir, "%v", "index.m3u8"),
+        ]
+        
+        result = self.runner.run(
+            cmd, duration=info.duration, on_progress=on_progress, label="abr ladder",
+            timeout=self.runner.final_timeout
+        )
+        master_tmp = os.path.join(build_dir, "master.m3u8")
+        if not result.ok or not os.path.exists(master_tmp):
+            print(f"   ❌ ABR 사다리 실패: {result.stderr[-200:] if result.stderr else 'Unknown error'}")
+            shutil.rmtree(build_dir, ignore_errors=True)
+            return None
+        
+        # 완성된 사다리로 교체 (이전 사다리 제거)
+        if os.path.exists(hls_dir):
+            shutil.rmtree(hls_dir)
+        os.replace(build_dir, hls_dir)
+        
+        master_path = self.file_mgr.get_final_hls_master_path()
+        print(f"   ✅ ABR 사다리 완료: {master_path}")
+        return master_path
+    
+    def _pick_stage_finals(self, num_stages: int) -> Tuple[Dict[int, str], str]:
+        """
+        최종 병합에 쓸 막 영상과 화질 ("final" | "preview" | "mixed")
+        - 모든 막에 최종 화질본이 있으면 최종 화질, 아니면 모든 막을 미리보기본으로 통일
+        - 어느 쪽으로도 통일할 수 없을 때만 막마다 있는 쪽을 쓰고 "mixed" (스트림 복사 불가)
+        """
+        hq: Dict[int, str] = {}
+        if self.config.get_final_render_config().get("enabled", True):
+            for stage_no in range(1, num_stages + 1):
+                path = self.file_mgr.get_stage_final_path(stage_no, tier="final")
+                if self.artifacts.is_valid(path, "video"):
+                    hq[stage_no] = path
+        preview: Dict[int, str] = {}
+        for stage_no in range(1, num_stages + 1):
+            path = self.file_mgr.get_stage_final_path(stage_no)
+            if self.artifacts.is_valid(path, "video"):
+                preview[stage_no] = path
+        
+        available = set(hq) | set(preview)
+        if hq and set(hq) == available:
+            return hq, "final"
+        if not hq or set(preview) == available:
+            return preview, "preview"
+        return {**preview, **hq}, "mixed"
+    
+    def _get_duration(self, file_path: str) -> float:
+        """파일 길이 확인 (MediaInfoService 캐시 사용, 실패 시 0.0)"""
+        duration = self.media_info.get_duration(file_path)
+        return duration if duration is not None else 0.0
 
 
 class MergeManager:
     """병합 작업 통합 인터페이스"""
     
+    # 최종 화질 재렌더 전용 백그라운드 레인 (프로세스 전체에서 한 번에 하나씩)
+    _final_render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="final-render")
+    
     def __init__(self, config: ConfigManager, file_mgr: FileManager, state: StateManager):
         self.config = config
         self.file_mgr = file_mgr
         self.state = state
+        self._final_renders: Dict[int, Future] = {}
+        self._final_lock = threading.Lock()
         
-        self.video = VideoMerger(config, file_mgr)
-        self.audio = AudioMerger(config, file_mgr)
-        self.muxer = AVMuxer(config, file_mgr)
+        self.media_info = get_media_info_service()
+        self.runner = get_ffmpeg_runner(config.get_ffmpeg_config())
+        self.artifacts = get_artifact_manifest(file_mgr.get_artifact_manifest_path())
+        self.video = VideoMerger(config, file_mgr, self.media_info, self.runner, self.artifacts)
+        self.audio = AudioMerger(config, file_mgr, self.media_info, self.runner, self.artifacts)
+        self.muxer = AVMuxer(config, file_mgr, self.media_info, self.runner, self.artifacts)
     
-    def process_final(self, srt_path: str = None) -> bool:  # <-- 인자 추가
+    def process_final(self, srt_path: str = None,
+                      on_progress: ProgressCallback = None) -> bool:  # <-- 인자 추가
         """전체 완료 시 호출: 최종 영상 빌드"""
         print(f"\n{'='*60}")
         print(f"🎬 최종 영상 생성")
         print(f"{'='*60}")
         
+        # 최종 화질 막 영상 확보 (백그라운드 작업 대기 또는 즉시 렌더)
+        self.ensure_final_renders()
+        
         # 전체 TTS 병합
         self.audio.merge_stages_to_final()
         
         # 전체 영상 빌드 (자막 경로 전달)
-        result = self.muxer.build_final_video(srt_path=srt_path)  # <-- 인자 전달
-        return result is not None
\ No newline at end of file
+        result = self.muxer.build_final_video(srt_path=srt_path, on_progress=on_progress)  # <-- 인자 전달
+        return result is not None
+    
+    # ============== 최종 화질 재렌더 ==============
+    
+    def render_final_quality(self, stage_no: int, priority: str = "normal") -> Optional[str]:
+        """막 영상을 final 프로필로 재렌더 (씬 병합 + TTS 합성)"""
+        scene_files = [self.file_mgr.get_stage_video_path(stage_no, i) for i in range(1, 4)]
+        merged = self.video.merge_scenes_to_stage(
+            stage_no, scene_files, profile="final", priority=priority
+        )
+        if not merged:
+            print(f"   ⚠️ Stage {stage_no}: 최종 화질 병합 실패 (미리보기본 사용)")
+            return None
+        return self.muxer.mux_stage(stage_no, profile="final", priority=priority)
+    
+    def schedule_final_render(self, stage_no: int) -> None:
+        """막 완료 직후 최종 화질 재렌더를 백그라운드(idle 우선순위)로 예약"""
+        render_config = self.config.get_final_render_config()
+        if not render_config.get("enabled", True) or not render_config.get("background", True):
+            return
+        
+        with self._final_lock:
+            pending = self._final_renders.get(stage_no)
+            if pending is not None and not pending.done():
+                return
+            self._final_renders[stage_no] = self._final_render_executor.submit(
+                self.render_final_quality, stage_no, render_config.get("priority", "idle")
+            )
+        print(f"   🕒 Stage {stage_no}: 최종 화질 재렌더 예약")
+    
+    def ensure_final_renders(self, num_stages: int = 5) -> None:
+        """최종 병합 전에 모든 막의 최종 화질본을 확보"""
+        render_config = self.config.get_final_render_config()
+        if not render_config.get("enabled", True):
+            return
+        
+        for stage_no in range(1, num_stages + 1):
+            with self._final_lock:
+                pending = self._final_renders.pop(stage_no, None)
+            if pending is not None:
+                try:
+                    pending.result()
+                except Exception as e:
+                    print(f"   ⚠️ Stage {stage_no}: 백그라운드 재렌더 오류: {e}")
+            
+            # 씬 영상이 바뀌었으면 다시 렌더 (그대로면 빌드 그래프가 스킵)
+            if os.path.exists(self.file_mgr.get_stage_video_path(stage_no, 1)):
+                self.render_final_quality(stage_no, render_config.get("priority", "idle"))
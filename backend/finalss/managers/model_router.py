@@ -0,0 +1,123 @@
+# ==================================================================================
+# managers/model_router.py - 작업별 텍스트 모델 선택 (설정 규칙 + 지연 시간 기반 대체 모델)
+# ==================================================================================
+
+import time
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .config_manager import ConfigManager
+
+
+def _percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class ModelRouter:
+    """
+    프로세스 공용 텍스트 모델 라우터
+    - 작업(guardian, scene_split, scenario ...)별 모델은 model_routing.tasks 설정, 없으면 media.models.text
+    - 모델별 최근 window개 호출의 지연 시간을 기록, p95가 p95_threshold를 넘으면
+      hold_seconds 동안 그 모델 대신 model_routing.fallback의 더 빠른 모델 사용
+    - hold_seconds가 지나면 원래 모델로 돌아가서 새로 측정
+    """
+
+    def __init__(self, p95_threshold: float = 30.0, window: int = 40, min_samples: int = 10,
+                 hold_seconds: float = 300.0):
+        self.p95_threshold = p95_threshold
+        self.window = max(1, int(window))
+        self.min_samples = max(1, int(min_samples))
+        self.hold_seconds = hold_seconds
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._slow_until: Dict[str, float] = {}
+        self._routed: Dict[str, Dict[str, int]] = {}
+
+    # ============== 선택 ==============
+
+    def route(self, task: str, primary: str, fallback: Optional[str] = None) -> str:
+        """작업에 쓸 모델 (primary가 느린 상태면 fallback)"""
+        with self._lock:
+            model = primary
+            if fallback and self._slow_until.get(primary, 0) > time.time():
+                model = fallback
+            counts = self._routed.setdefault(task, {})
+            counts[model] = counts.get(model, 0) + 1
+            return model
+
+    # ============== 측정 ==============
+
+    def observe(self, model: str, seconds: float) -> None:
+        """성공한 호출의 지연 시간 기록 → p95가 기준을 넘으면 대체 모델로 전환"""
+        with self._lock:
+            samples = self._latencies.setdefault(model, deque(maxlen=self.window))
+            samples.append(seconds)
+            if len(samples) < self.min_samples or self._slow_until.get(model, 0) > time.time():
+                return
+            p95 = _percentile(samples, 0.95)
+            if p95 <= self.p95_threshold:
+                return
+            self._slow_until[model] = time.time() + self.hold_seconds
+            samples.clear()  # 돌아온 뒤에는 새로 측정
+        print(f"🐢 {model} p95 {p95:.1f}초 > {self.p95_threshold:.0f}초, "
+              f"{self.hold_seconds:.0f}초 동안 대체 모델 사용")
+
+    def stats(self) -> Dict[str, Any]:
+        """모델별 지연 시간(p50/p95)과 대체 상태, 작업별 모델 사용 횟수"""
+        now = time.time()
+        with self._lock:
+            models = {}
+            for model in set(self._latencies) | set(self._slow_until):
+                samples = list(self._latencies.get(model, ()))
+                models[model] = {
+                    "samples": len(samples),
+                    "p50_s": round(_percentile(samples, 0.5), 2) if samples else None,
+                    "p95_s": round(_percentile(samples, 0.95), 2) if samples else None,
+                    "fallback_for_s": round(max(0.0, self._slow_until.get(model, 0) - now)),
+                }
+            return {"models": models, "tasks": {task: dict(c) for task, c in self._routed.items()}}
+
+
+# ============== 클라이언트 래퍼 ==============
+
+class _TimedModels:
+    def __init__(self, models, router: ModelRouter):
+        self._models = models
+        self._router = router
+
+    def generate_content(self, *, model: str, **kwargs):
+        start = time.perf_counter()
+        response = self._models.generate_content(model=model, **kwargs)
+        self._router.observe(model, time.perf_counter() - start)
+        return response
+
+    def __getattr__(self, name: str):
+        return getattr(self._models, name)
+
+
+class TimedClient:
+    """genai.Client 래퍼: models.generate_content 지연 시간을 라우터에 기록 (속도 제한 대기 시간은 제외)"""
+
+    def __init__(self, client, router: ModelRouter):
+        self._client = client
+        self.models = _TimedModels(client.models, router)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+# ============== 프로세스 공용 라우터 ==============
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router(config: ConfigManager) -> ModelRouter:
+    """프로세스 공용 ModelRouter (처음 만들 때의 model_routing.latency 설정 사용)"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(**config.get_model_routing_config()["latency"])
+        return _router
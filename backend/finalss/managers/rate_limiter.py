@@ -0,0 +1,348 @@
+# ==================================================================================
+# managers/rate_limiter.py - Google API 요청 속도 제한 (API 키 x 모델별 토큰 버킷)
+# ==================================================================================
+
+import re
+import time
+import hashlib
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .config_manager import ConfigManager
+
+
+# 요청 형식별 기본 버킷 (models 설정의 키와 같음)
+KINDS = ("text", "image", "video")
+
+# 이미지 한 장의 입력 토큰 수 (Gemini 기준 고정값)
+IMAGE_TOKENS = 258
+
+_RETRY_DELAY = re.compile(r"retry[_ ]?delay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", re.IGNORECASE)
+
+
+class RateLimitExceeded(Exception):
+    """한도 초과가 확실해서 요청을 보내지 않음 (호출하는 쪽의 429 처리 = API 키 교체로 이어짐)"""
+    pass
+
+
+class _Bucket:
+    """
+    API 키 하나 x 모델 하나의 분당 요청 수(rpm) / 분당 토큰 수(tpm) 버킷
+    - 용량은 burst_seconds 만큼만 (한 번에 몰아 보내 분 단위 한도를 넘지 않도록)
+    - 429를 받으면 넘은 한도(rpm 또는 tpm)를 직전 1분 동안 보낸 양의 90%로 낮추고,
+      recover_seconds 동안 429가 없으면 10%씩 복구
+    """
+
+    def __init__(self, rpm: float, tpm: float, burst_seconds: float):
+        self.configured_rpm = rpm
+        self.configured_tpm = tpm
+        self.rpm = rpm
+        self.tpm = tpm
+        self.burst_seconds = burst_seconds
+        self.requests = self._capacity(rpm)
+        self.tokens = self._capacity(tpm)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_limited = 0.0
+        self.sent: Deque[Tuple[float, float]] = deque()  # (시각, 토큰) 최근 1분
+        self.limited_count = 0
+        self.waited_s = 0.0
+
+    def _capacity(self, per_minute: float) -> float:
+        return max(1.0, per_minute * self.burst_seconds / 60.0) if per_minute else 0.0
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.updated = now
+        if self.rpm:
+            self.requests = min(self._capacity(self.rpm), self.requests + elapsed * self.rpm / 60.0)
+        if self.tpm:
+            self.tokens = min(self._capacity(self.tpm), self.tokens + elapsed * self.tpm / 60.0)
+        while self.sent and self.sent[0][0] < now - 60.0:
+            self.sent.popleft()
+
+    def wait_time(self, now: float, tokens: float) -> float:
+        """지금 요청하려면 기다려야 하는 시간 (0이면 바로)"""
+        wait = max(0.0, self.blocked_until - now)
+        if self.rpm and self.requests < 1.0:
+            wait = max(wait, (1.0 - self.requests) * 60.0 / self.rpm)
+        if self.tpm and tokens:
+            # 버킷보다 큰 요청은 버킷이 가득 찼을 때 보냄
+            need = min(tokens, self._capacity(self.tpm))
+            if self.tokens < need:
+                wait = max(wait, (need - self.tokens) * 60.0 / self.tpm)
+        return wait
+
+    def take(self, now: float, tokens: float) -> None:
+        if self.rpm:
+            self.requests -= 1.0
+        if self.tpm:
+            self.tokens -= tokens
+        self.sent.append((now, tokens))
+
+    def limited(self, now: float, retry_after: Optional[float], cooldown: float, tokens: bool) -> None:
+        """429 → 잠시 멈추고 넘은 한도(tokens=True면 tpm, 아니면 rpm)를 실제로 통과한 양에 맞춰 낮춤"""
+        self.refill(now)
+        self.limited_count += 1
+        self.last_limited = now
+        self.blocked_until = max(self.blocked_until, now + (retry_after if retry_after is not None else cooldown))
+        sent_requests = len(self.sent)
+        sent_tokens = sum(t for _, t in self.sent)
+        if tokens and sent_tokens:
+            self.tpm = max(1.0, min(self.tpm or sent_tokens, sent_tokens) * 0.9)
+        elif not tokens and sent_requests:
+            self.rpm = max(1.0, min(self.rpm or sent_requests, sent_requests) * 0.9)
+        self.requests = min(self.requests, 0.0)
+        self.tokens = min(self.tokens, 0.0)
+
+    def recover(self, now: float, recover_seconds: float) -> None:
+        """429 없이 recover_seconds가 지나면 낮춘 한도를 설정값 쪽으로 10%씩 복구"""
+        if not self.last_limited or now - self.last_limited < recover_seconds:
+            return
+        self.last_limited = now
+        if self.configured_rpm:
+            self.rpm = min(self.configured_rpm, self.rpm + max(1.0, self.configured_rpm * 0.1))
+        elif self.rpm:
+            self.rpm += max(1.0, self.rpm * 0.1)  # 설정이 없으면 다시 올려 보며 한도를 찾음
+        if self.configured_tpm:
+            self.tpm = min(self.configured_tpm, self.tpm + self.configured_tpm * 0.1)
+        elif self.tpm:
+            self.tpm += self.tpm * 0.1
+
+
+class RateLimiter:
+    """
+    프로세스 공용 Google API 요청 속도 제한
+    - API 키 x 모델(text/image/video, 또는 limits에 따로 적은 모델 이름)별 토큰 버킷
+    - 한도에 닿으면 요청을 실패시키지 않고 자리가 날 때까지 대기 (max_wait를 넘으면 RateLimitExceeded → 키 교체)
+    - tpm은 입력 토큰 추정치로 먼저 차감하고 응답의 usage_metadata로 보정
+    - 429 / retryDelay를 받으면 한도를 학습해서 낮추고, 429가 없으면 설정값까지 서서히 복구
+    - share: 같은 키를 쓰는 프로세스 수 (배치 워커), 한도를 그만큼 나눔
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, float]] = None, headroom: float = 0.9,
+                 burst_seconds: float = 6.0, max_wait: float = 120.0, cooldown: float = 30.0,
+                 recover_seconds: float = 60.0, share: int = 1):
+        self.limits = {name: dict(v or {}) for name, v in (limits or {}).items()}
+        self.headroom = headroom
+        self.burst_seconds = burst_seconds
+        self.max_wait = max_wait
+        self.cooldown = cooldown
+        self.recover_seconds = recover_seconds
+        self.share = max(1, int(share))
+        self._cond = threading.Condition()
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+
+    # ============== 버킷 ==============
+
+    def bucket_name(self, model: str, kind: str) -> str:
+        """모델 이름으로 따로 설정한 한도가 있으면 그 모델, 아니면 요청 형식(text/image/video)"""
+        return model if model in self.limits else kind
+
+    def _bucket(self, key_id: str, name: str) -> _Bucket:
+        bucket = self._buckets.get((key_id, name))
+        if bucket is None:
+            limit = self.limits.get(name, {})
+            scale = self.headroom / self.share
+            bucket = _Bucket(rpm=(limit.get("rpm") or 0) * scale, tpm=(limit.get("tpm") or 0) * scale,
+                             burst_seconds=self.burst_seconds)
+            self._buckets[(key_id, name)] = bucket
+        return bucket
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        """버킷 / 통계용 키 식별자 (키 원문은 남기지 않음)"""
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:10]
+
+    # ============== 요청 ==============
+
+    def acquire(self, key_id: str, name: str, tokens: float = 0.0) -> float:
+        """요청 자리 확보 (필요하면 대기) → 기다린 시간"""
+        start = time.monotonic()
+        announced = False
+        with self._cond:
+            bucket = self._bucket(key_id, name)
+            while True:
+                now = time.monotonic()
+                bucket.refill(now)
+                bucket.recover(now, self.recover_seconds)
+                wait = bucket.wait_time(now, tokens)
+                if wait <= 0:
+                    bucket.take(now, tokens)
+                    waited = now - start
+                    bucket.waited_s += waited
+                    return waited
+                if now - start + wait > self.max_wait:
+                    raise RateLimitExceeded(
+                        f"429 RESOURCE_EXHAUSTED (client rate limit: {name}, {wait:.0f}초 대기 필요)"
+                    )
+                if not announced and wait >= 1.0:
+                    announced = True
+                    print(f"      ⏳ 요청 속도 제한 대기 ({name}, 약 {wait:.0f}초)")
+                self._cond.wait(timeout=wait)
+
+    def settle(self, key_id: str, name: str, estimated: float, actual: Optional[float]) -> None:
+        """추정 토큰 수와 실제 사용량의 차이 보정"""
+        if actual is None or actual == estimated:
+            return
+        with self._cond:
+            bucket = self._bucket(key_id, name)
+            if bucket.tpm:
+                bucket.tokens -= actual - estimated
+            if bucket.sent:
+                at, _ = bucket.sent[-1]
+                bucket.sent[-1] = (at, actual)
+            self._cond.notify_all()
+
+    def report_limited(self, key_id: str, name: str, error: Exception) -> None:
+        """429 응답 → 한도 학습"""
+        retry_after = self.retry_after(error)
+        # 오류 본문의 quota 이름으로 구분 (예: ...InputTokensPerModelPerMinute / ...RequestsPerMinute)
+        tokens = "token" in str(error).lower()
+        with self._cond:
+            bucket = self._bucket(key_id, name)
+            bucket.limited(time.monotonic(), retry_after, self.cooldown, tokens)
+            print(f"      📉 요청 한도 조정 ({name}): rpm {bucket.rpm:.0f}, tpm {bucket.tpm:.0f}"
+                  f", {retry_after if retry_after is not None else self.cooldown:.0f}초 멈춤")
+
+    @staticmethod
+    def is_limited(error: Exception) -> bool:
+        if isinstance(error, RateLimitExceeded):
+            return False  # 보내지 않은 요청
+        return getattr(error, "code", None) == 429 or "RESOURCE_EXHAUSTED" in str(error)
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """Retry-After 헤더 또는 오류 본문의 retryDelay (초)"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            value = headers.get("Retry-After") or headers.get("retry-after")
+            if value:
+                return float(value)
+        except (TypeError, ValueError, AttributeError):
+            pass
+        match = _RETRY_DELAY.search(str(error))
+        return float(match.group(1)) if match else None
+
+    # ============== 상태 ==============
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """키별 / 버킷별 현재 한도(학습 반영), 최근 1분 사용량, 429 횟수, 누적 대기 시간"""
+        now = time.monotonic()
+        with self._cond:
+            result: Dict[str, Dict[str, Any]] = {}
+            for (key_id, name), bucket in sorted(self._buckets.items()):
+                bucket.refill(now)
+                result.setdefault(key_id, {})[name] = {
+                    "rpm": round(bucket.rpm, 1),
+                    "tpm": round(bucket.tpm),
+                    "configured_rpm": round(bucket.configured_rpm, 1),
+                    "configured_tpm": round(bucket.configured_tpm),
+                    "sent_last_minute": len(bucket.sent),
+                    "tokens_last_minute": round(sum(t for _, t in bucket.sent)),
+                    "limited": bucket.limited_count,
+                    "blocked_s": round(max(0.0, bucket.blocked_until - now), 1),
+                    "waited_s": round(bucket.waited_s, 1),
+                }
+            return result
+
+
+# ============== 클라이언트 래퍼 ==============
+
+def estimate_tokens(contents: Any) -> float:
+    """입력 토큰 수 추정 (문자열 3자당 1토큰, 이미지 258토큰) → 응답 후 실제 값으로 보정"""
+    if contents is None:
+        return 0.0
+    if isinstance(contents, str):
+        return len(contents) / 3.0
+    if isinstance(contents, (list, tuple)):
+        return sum(estimate_tokens(c) for c in contents)
+    text = getattr(contents, "text", None)
+    if isinstance(text, str):
+        return len(text) / 3.0
+    parts = getattr(contents, "parts", None)
+    if isinstance(parts, (list, tuple)):
+        return estimate_tokens(parts)
+    return float(IMAGE_TOKENS)  # 이미지 / 파일 파트
+
+
+class _RateLimitedModels:
+    def __init__(self, models, limiter: RateLimiter, config: ConfigManager, key_id: str):
+        self._models = models
+        self._limiter = limiter
+        self._config = config
+        self._key_id = key_id
+
+    def _kind(self, model: str, default: str) -> str:
+        for kind in KINDS:
+            if self._config.get_model(kind) == model:
+                return kind
+        return default
+
+    def _call(self, func, name: str, tokens: float, **kwargs):
+        self._limiter.acquire(self._key_id, name, tokens)
+        try:
+            response = func(**kwargs)
+        except Exception as e:
+            if self._limiter.is_limited(e):
+                self._limiter.report_limited(self._key_id, name, e)
+            raise
+        usage = getattr(response, "usage_metadata", None)
+        actual = getattr(usage, "prompt_token_count", None) if usage is not None else None
+        self._limiter.settle(self._key_id, name, tokens, actual)
+        return response
+
+    def generate_content(self, *, model: str, contents: Any, **kwargs):
+        name = self._limiter.bucket_name(model, self._kind(model, "text"))
+        return self._call(self._models.generate_content, name, estimate_tokens(contents),
+                          model=model, contents=contents, **kwargs)
+
+    def generate_videos(self, *, model: str, **kwargs):
+        name = self._limiter.bucket_name(model, "video")
+        return self._call(self._models.generate_videos, name, 0.0, model=model, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._models, name)
+
+
+class RateLimitedClient:
+    """
+    genai.Client 래퍼: models.generate_content / generate_videos 호출 전에 버킷에서 자리 확보
+    나머지(operations, files 등)는 원래 클라이언트 그대로
+    """
+
+    def __init__(self, client, limiter: RateLimiter, config: ConfigManager, api_key: str):
+        self._client = client
+        self.models = _RateLimitedModels(client.models, limiter, config, RateLimiter.key_id(api_key))
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+# ============== 프로세스 공용 제한기 ==============
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+_share = 1
+
+
+def set_rate_limit_share(share: int) -> None:
+    """
+    같은 API 키를 함께 쓰는 프로세스 수 (배치 워커 수) → 이 프로세스는 한도를 그만큼 나눠 씀
+    이후 처음 만들어지는 RateLimiter부터 적용
+    """
+    global _share
+    _share = max(1, int(share))
+
+
+def get_rate_limiter(config: ConfigManager) -> RateLimiter:
+    """프로세스 공용 RateLimiter (처음 만들 때의 rate_limits 설정 사용)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            settings = config.get_rate_limit_config()
+            settings.pop("enabled", None)
+            _limiter = RateLimiter(share=_share, **settings)
+        return _limiter
@@ -0,0 +1,274 @@
+# ==================================================================================
+# managers/retention_manager.py - 산출물 보존 정책 (중간 산출물 정리, 용량 한도 LRU 삭제)
+# ==================================================================================
+
+import os
+import json
+import time
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+
+from utils.atomic_io import atomic_write_json, link_or_copy
+from .config_manager import ConfigManager
+from .file_manager import FileManager
+from .artifact_manifest import ArtifactManifest
+from .job_manifest import JobManifest
+
+
+class RetentionManager:
+    """
+    작업별 산출물 보존 관리
+    - 완성된 동화(최종 영상/오디오/스토리)를 output/library/<job_id>/ 에 보관
+      (하드 링크 우선 → 추가 용량 없이, 다음 작업이 output/final을 덮어써도 유지)
+    - 최종 영상이 나오면 그 작업의 병합 클립 삭제 (작업 매니페스트에 기록된 것만)
+      장면 이미지/클립, 막 TTS는 장면 재생성에 필요하므로 drop_scene_sources일 때만 삭제
+    - 디스크 사용량이 한도를 넘으면 가장 오래 안 본 보관본부터 삭제 (LRU)
+    - 고정(pinned, 내 책장에 저장한) 동화와 진행 중인 작업은 삭제하지 않음
+    """
+
+    def __init__(self, config: ConfigManager, file_mgr: FileManager,
+                 artifacts: ArtifactManifest = None):
+        self.config = config
+        self.file_mgr = file_mgr
+        self.artifacts = artifacts
+        self.library_dir = file_mgr.get_library_dir()
+        self.index_path = file_mgr.get_library_index_path()
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    @property
+    def max_bytes(self) -> int:
+        """디스크 사용 한도 (0 = 제한 없음)"""
+        gb = self.config.get_retention_config().get("max_disk_gb", 0) or 0
+        return int(gb * 1024 ** 3)
+
+    # ============== 작업 완료 ==============
+
+    def on_job_finalized(self, job_id: str, manifest: JobManifest = None,
+                         **meta: Any) -> Optional[str]:
+        """
+        최종 영상 완성 후 호출: 보관 → 중간 산출물 정리 → 용량 한도 적용
+        manifest: 완료한 작업의 매니페스트 (없으면 중간 산출물은 정리하지 않음)
+        """
+        retention = self.config.get_retention_config()
+        if not retention.get("enabled", True):
+            return None
+
+        archive_dir = self.archive_job(job_id, **meta)
+        if retention.get("drop_intermediates", True) and manifest is not None:
+            self.drop_intermediates(manifest, retention.get("drop_scene_sources", False))
+        self.enforce_budget(protect=[job_id])
+        return archive_dir
+
+    def archive_job(self, job_id: str, **meta: Any) -> Optional[str]:
+        """최종 산출물을 작업별 보관 디렉토리로 링크/복사"""
+        sources = [
+            self.file_mgr.get_final_video_path(),
+            self.file_mgr.get_final_tts_path(),
+            self.file_mgr.get_final_story_path(),
+        ]
+        sources = [p for p in sources if p and os.path.exists(p)]
+        if not sources:
+            return None
+
+        job_dir = os.path.join(self.library_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        files = []
+        for src in sources:
+            dst = os.path.join(job_dir, os.path.basename(src))
+            link_or_copy(src, dst)
+            files.append(os.path.basename(dst))
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(job_id, {"pinned": False, "created_at": now})
+            entry.update({
+                "files": files,
+                "size": sum(os.path.getsize(os.path.join(job_dir, f)) for f in files),
+                "last_access": now,
+                "meta": {**entry.get("meta", {}), **meta},
+            })
+            self._entries[job_id] = entry
+            self._save()
+
+        print(f"📚 보관 완료: {job_id} ({entry['size'] / 1024 ** 2:.1f}MB)")
+        return job_dir
+
+    def drop_intermediates(self, manifest: JobManifest, scene_sources: bool = False) -> int:
+        """
+        최종 영상이 있을 때 이 작업의 중간 산출물 삭제 (삭제한 바이트 수 반환)
+        - 다른 작업과 경로를 함께 쓰므로 매니페스트 해시와 일치하는 파일(이 작업이 만든 내용)만 삭제
+        - 막 최종 영상(stage_N_final.mp4)은 화면에서 계속 쓰므로 유지
+        - scene_sources: 장면 이미지/클립, 막 TTS도 삭제 (이후 장면 재생성 불가)
+        """
+        if not os.path.exists(self.file_mgr.get_final_video_path()):
+            return 0
+
+        freed = 0
+        for path in self._intermediate_paths(manifest, scene_sources):
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            freed += size
+            if self.artifacts is not None:
+                self.artifacts.invalidate(path)
+
+        if freed:
+            print(f"🧹 중간 산출물 정리: {freed / 1024 ** 2:.1f}MB 확보")
+        return freed
+
+    # ============== LRU ==============
+
+    def touch(self, job_id: str) -> None:
+        """보관본 조회 시각 갱신"""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is not None:
+                entry["last_access"] = time.time()
+                self._save()
+
+    def pin(self, job_id: str, pinned: bool = True) -> bool:
+        """고정 설정 (내 책장에 저장한 동화는 용량 한도로 삭제하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None:
+                return False
+            entry["pinned"] = pinned
+            entry["last_access"] = time.time()
+            self._save()
+        return True
+
+    def enforce_budget(self, protect: List[str] = None) -> List[str]:
+        """
+        디스크 사용량이 한도를 넘으면 오래된 보관본부터 삭제
+        protect: 삭제하지 않을 작업 ID (진행 중/방금 완료한 작업)
+        """
+        limit = self.max_bytes
+        if limit <= 0:
+            return []
+
+        protect = set(protect or [])
+        evicted = []
+        usage = self.disk_usage()
+        with self._lock:
+            candidates = sorted(
+                (e["last_access"], job_id) for job_id, e in self._entries.items()
+                if not e.get("pinned") and job_id not in protect
+            )
+            for _, job_id in candidates:
+                if usage <= limit:
+                    break
+                usage -= self._evict(job_id)
+                evicted.append(job_id)
+            if evicted:
+                self._save()
+
+        if usage > limit:
+            print(f"⚠️ 용량 한도 초과 ({usage / 1024 ** 3:.2f}GB > {limit / 1024 ** 3:.2f}GB), "
+                  f"더 삭제할 수 있는 보관본이 없습니다 (고정/진행 중)")
+        return evicted
+
+    # ============== 조회 ==============
+
+    def disk_usage(self) -> int:
+        """output 디렉토리 전체 사용량 (하드 링크는 한 번만 계산)"""
+        seen = set()
+        total = 0
+        for root, _, files in os.walk(self.config.get_path("output_base")):
+            for name in files:
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                if (st.st_dev, st.st_ino) in seen:
+                    continue
+                seen.add((st.st_dev, st.st_ino))
+                total += st.st_size
+        return total
+
+    def usage(self) -> Dict[str, Any]:
+        """작업별 보관 용량 + 전체 사용량"""
+        with self._lock:
+            jobs = {job_id: {"size": e["size"], "pinned": e.get("pinned", False),
+                             "last_access": e["last_access"]}
+                    for job_id, e in self._entries.items()}
+        return {"total": self.disk_usage(), "limit": self.max_bytes, "jobs": jobs}
+
+    def get_archived_files(self, job_id: str) -> List[str]:
+        """보관된 파일 경로 목록"""
+        with self._lock:
+            entry = self._entries.get(job_id)
+        if entry is None:
+            return []
+        job_dir = os.path.join(self.library_dir, job_id)
+        return [os.path.join(job_dir, f) for f in entry["files"]
+                if os.path.exists(os.path.join(job_dir, f))]
+
+    # ============== 내부 ==============
+
+    def _intermediate_paths(self, manifest: JobManifest, scene_sources: bool) -> List[str]:
+        """작업 매니페스트에 기록된 병합 클립 (+ 장면 이미지/클립, 막 TTS)"""
+        steps = ("merge", "images", "videos", "tts") if scene_sources else ("merge",)
+        paths = []
+        for stage_no in sorted(manifest.stages):
+            for step in steps:
+                recorded = manifest.stages[stage_no].artifacts.get(step)
+                if not recorded:
+                    continue
+                paths.extend(recorded if isinstance(recorded, list) else [recorded])
+        # 그 뒤 다른 작업이 같은 경로에 쓴 파일은 건드리지 않음
+        return [p for p in paths if p and manifest.verify(p)]
+
+    def _evict(self, job_id: str) -> int:
+        """보관본 삭제 후 확보한 바이트 수 (다른 곳에 링크가 남은 파일은 0으로 계산)"""
+        entry = self._entries.pop(job_id, None) or {}
+        job_dir = os.path.join(self.library_dir, job_id)
+        freed = 0
+        for name in entry.get("files", []):
+            try:
+                st = os.stat(os.path.join(job_dir, name))
+            except OSError:
+                continue
+            if st.st_nlink <= 1:
+                freed += st.st_size
+        shutil.rmtree(job_dir, ignore_errors=True)
+        # 작업별 매니페스트도 삭제 (서버 재시작 때 지워진 작업을 복원하지 않도록)
+        shutil.rmtree(os.path.dirname(self.file_mgr.get_manifest_file_path(job_id)), ignore_errors=True)
+        print(f"🗑️ 오래된 보관본 삭제: {job_id} ({freed / 1024 ** 2:.1f}MB)")
+        return freed
+
+    def _load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ 보관 목록 로드 실패: {e}")
+            self._entries = {}
+
+    def _save(self) -> None:
+        try:
+            atomic_write_json(self.index_path, self._entries, indent=2)
+        except Exception as e:
+            print(f"⚠️ 보관 목록 저장 실패: {e}")
+
+
+# ============== 프로세스 공용 인스턴스 ==============
+
+_managers: Dict[str, RetentionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_retention_manager(config: ConfigManager, file_mgr: FileManager,
+                          artifacts: ArtifactManifest = None) -> RetentionManager:
+    """보관 디렉토리별로 공유되는 RetentionManager (작업들이 같은 목록을 보도록)"""
+    key = os.path.abspath(file_mgr.get_library_dir())
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = RetentionManager(config, file_mgr, artifacts)
+        return _managers[key]
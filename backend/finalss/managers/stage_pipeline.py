@@ -0,0 +1,222 @@
+# ==================================================================================
+# managers/stage_pipeline.py - 막 단위 작업 의존성 그래프 실행기 (독립 단계 병렬 실행)
+# ==================================================================================
+
+import time
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+
+# (message, percent)
+ProgressHook = Callable[[str, int], None]
+# (step name, result) - 단계가 성공할 때마다 호출 (다른 막이 이 단계 결과를 기다릴 때 등)
+StepDoneHook = Callable[[str, Any], None]
+# step.run(results, report): results = 끝난 단계 결과, report(fraction) = 단계 내부 진행률 (0.0~1.0)
+StepFunc = Callable[[Dict[str, Any], Callable[[float], None]], Any]
+
+
+class StepFailed(Exception):
+    """단계 실패 (재시도 대상, 메시지는 그대로 사용자에게 표시)"""
+    pass
+
+
+@dataclass
+class PipelineStep:
+    """
+    파이프라인 단계 하나
+    - deps: 먼저 끝나야 하는 단계 이름들 (결과는 results[이름]으로 전달)
+    - check: 결과 검증 함수, 문제가 있으면 오류 메시지 반환 → 재시도
+    - required=False: 재시도까지 실패해도 결과 None으로 다음 단계 진행 (TTS 등)
+    - weight: 전체 진행률에서 차지하는 비중
+    """
+    name: str
+    run: StepFunc
+    deps: Tuple[str, ...] = ()
+    label: str = ""
+    retries: int = 0
+    required: bool = True
+    check: Optional[Callable[[Any], Optional[str]]] = None
+    weight: float = 1.0
+
+
+@dataclass
+class PipelineResult:
+    """파이프라인 실행 결과"""
+    success: bool
+    results: Dict[str, Any] = field(default_factory=dict)
+    failed_step: Optional[str] = None
+    error: str = ""
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class StagePipeline:
+    """
+    단계 의존성 그래프(DAG) 실행기
+    - 의존 단계가 모두 끝난 단계부터 스레드 풀에서 동시에 실행
+      (예: 이미지 생성 중에 모션 프롬프트/TTS 생성, 영상 생성 중에도 TTS 계속)
+    - 단계별 재시도 (지수 백오프), 필수 단계가 최종 실패하면 새 단계는 시작하지 않고
+      실행 중인 단계만 마무리한 뒤 실패 반환
+    - 진행률: 끝난 단계 비중 + 실행 중 단계의 내부 진행률 → [start, end] 구간으로 환산
+      (동시 실행이라도 진행률은 줄어들지 않음)
+    - max_workers=1이면 선언 순서대로 하나씩 실행
+    - on_step_done: 단계 성공 즉시 알림 (막 전체가 끝나기 전에 다음 막을 시작할 때)
+    """
+
+    def __init__(self, steps: Sequence[PipelineStep], max_workers: int = 3,
+                 retry_delay: float = 2.0, on_progress: Optional[ProgressHook] = None,
+                 progress_range: Tuple[int, int] = (0, 100),
+                 on_step_done: Optional[StepDoneHook] = None):
+        self.steps = list(steps)
+        self.max_workers = max(1, int(max_workers))
+        self.retry_delay = retry_delay
+        self.on_progress = on_progress
+        self.on_step_done = on_step_done
+        self.progress_start, self.progress_end = progress_range
+        self._validate()
+
+        self._lock = threading.Lock()
+        self._weights = {step.name: step.weight for step in self.steps}
+        self._total_weight = sum(self._weights.values()) or 1.0
+        self._done_weight = 0.0
+        self._partial: Dict[str, float] = {}
+        self._last_percent = -1
+
+    def _validate(self) -> None:
+        """이름 중복, 없는 의존 단계, 순환 의존 확인"""
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"단계 이름 중복: {names}")
+
+        deps = {step.name: set(step.deps) for step in self.steps}
+        for name, required in deps.items():
+            unknown = required - deps.keys()
+            if unknown:
+                raise ValueError(f"'{name}' 단계의 의존 단계 없음: {sorted(unknown)}")
+
+        resolved: set = set()
+        while len(resolved) < len(deps):
+            ready = [name for name, required in deps.items()
+                     if name not in resolved and required <= resolved]
+            if not ready:
+                raise ValueError(f"순환 의존: {sorted(deps.keys() - resolved)}")
+            resolved.update(ready)
+
+    # ============== 진행률 ==============
+
+    def _report(self, message: str) -> None:
+        if self.on_progress is None:
+            return
+        with self._lock:
+            done = self._done_weight + sum(
+                fraction * self._weights[name] for name, fraction in self._partial.items()
+            )
+            percent = self.progress_start + int(
+                (self.progress_end - self.progress_start) * min(1.0, done / self._total_weight)
+            )
+            percent = max(percent, self._last_percent)
+            self._last_percent = percent
+        self.on_progress(message, percent)
+
+    def _step_reporter(self, step: PipelineStep) -> Callable[[float], None]:
+        """단계 내부 진행률 콜백 (같은 퍼센트는 한 번만 보고)"""
+        last = {"percent": None}
+
+        def _on_progress(fraction: float) -> None:
+            fraction = max(0.0, min(1.0, fraction))
+            percent = int(fraction * 100)
+            if percent == last["percent"]:
+                return
+            last["percent"] = percent
+            with self._lock:
+                self._partial[step.name] = fraction
+            self._report(f"{step.label or step.name} 중 ({percent}%)")
+
+        return _on_progress
+
+    # ============== 실행 ==============
+
+    def _run_step(self, step: PipelineStep, results: Dict[str, Any]) -> Tuple[bool, Any, str]:
+        """단계 하나 실행 (재시도 포함) → (성공 여부, 결과, 오류 메시지)"""
+        label = step.label or step.name
+        inputs = {name: results.get(name) for name in step.deps}
+        error = ""
+        value = None
+
+        for attempt in range(step.retries + 1):
+            if attempt:
+                delay = self.retry_delay * (2 ** (attempt - 1))
+                print(f"   🔁 {label} 재시도 ({attempt}/{step.retries}), {delay:.0f}초 후: {error}")
+                self._report(f"{label} 재시도 중 ({attempt}/{step.retries})")
+                time.sleep(delay)
+            else:
+                self._report(f"{label} 중...")
+
+            try:
+                value = step.run(inputs, self._step_reporter(step))
+                error = step.check(value) if step.check else ""
+            except StepFailed as e:
+                value, error = None, str(e)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                value, error = None, f"{label} 오류: {e}"
+
+            if not error:
+                return True, value, ""
+
+        return False, value, error
+
+    def run(self) -> PipelineResult:
+        """그래프 실행 (모든 단계 완료 또는 필수 단계 실패까지 대기)"""
+        pending = {step.name: step for step in self.steps}
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        started: Dict[str, float] = {}
+        running = {}
+        failed: Optional[Tuple[str, str]] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="stage-step") as pool:
+            while pending or running:
+                if failed is None:
+                    for name, step in list(pending.items()):
+                        if len(running) >= self.max_workers:
+                            break
+                        if all(dep in results for dep in step.deps):
+                            del pending[name]
+                            started[name] = time.perf_counter()
+                            running[pool.submit(self._run_step, step, results)] = step
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    timings[step.name] = round(time.perf_counter() - started[step.name], 3)
+                    ok, value, error = future.result()
+                    label = step.label or step.name
+
+                    with self._lock:
+                        self._partial.pop(step.name, None)
+                        self._done_weight += step.weight
+
+                    if ok:
+                        results[step.name] = value
+                        self._report(f"{label} 완료")
+                        if self.on_step_done is not None:
+                            self.on_step_done(step.name, value)
+                    elif not step.required:
+                        results[step.name] = None
+                        print(f"   ⚠️ {error or label + ' 실패'} (계속 진행)")
+                        self._report(f"{label} 실패 (계속 진행)")
+                    elif failed is None:
+                        failed = (step.name, error or f"{label} 실패")
+                        print(f"   ❌ {failed[1]}")
+
+        if failed is not None:
+            return PipelineResult(False, results, failed_step=failed[0],
+                                  error=failed[1], timings=timings)
+        return PipelineResult(True, results, timings=timings)
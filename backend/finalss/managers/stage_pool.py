@@ -0,0 +1,262 @@
+# ==================================================================================
+# managers/stage_pool.py - 1막 사전 생성 풀 (art_style별로 미리 만들어 둔 1막 번들)
+# ==================================================================================
+
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.atomic_io import atomic_write_json
+from .config_manager import ConfigManager
+from .file_manager import FileManager
+
+
+# producer(art_style, bundle_dir) → 번들 {'story', 'scene_texts', 'extra', 'files'} 또는 None
+# (Orchestrator.export_stage_bundle 형식, files는 bundle_dir 아래 절대 경로)
+BundleProducer = Callable[[str, str], Optional[Dict[str, Any]]]
+
+BUNDLE_FILE = "bundle.json"
+
+
+def _paths(files: Any) -> List[str]:
+    return files if isinstance(files, list) else [files]
+
+
+def relative_files(files: Dict[str, Any], base_dir: str) -> Dict[str, Any]:
+    """번들 파일 경로를 번들 디렉토리 기준 상대 경로로 (디렉토리 이름이 바뀌어도 유효하도록)"""
+    return {
+        step: [os.path.relpath(p, base_dir) for p in paths] if isinstance(paths, list)
+        else os.path.relpath(paths, base_dir)
+        for step, paths in files.items()
+    }
+
+
+def load_bundle(bundle_dir: str) -> Optional[Dict[str, Any]]:
+    """bundle.json 로드 + 파일 경로를 절대 경로로 변환 (파일이 하나라도 없으면 None)"""
+    try:
+        with open(os.path.join(bundle_dir, BUNDLE_FILE), "r", encoding="utf-8") as f:
+            bundle = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    files = {}
+    for step, paths in bundle.get("files", {}).items():
+        files[step] = ([os.path.join(bundle_dir, p) for p in paths] if isinstance(paths, list)
+                       else os.path.join(bundle_dir, paths))
+        if not all(os.path.exists(p) for p in _paths(files[step])):
+            return None
+    bundle["files"] = files
+    bundle["dir"] = bundle_dir
+    return bundle
+
+
+class StagePool:
+    """
+    1막 사전 생성 풀
+    - 1막은 사용자 입력 없이 같은 원작 참조로 만들어지므로 미리 만들어 두고 새 작업에 바로 배정
+    - output/pool/<art_style>/<bundle_id>/ 에 1막 전체(스토리, 장면 이미지/영상, 병합본, TTS, 합성본) 보관
+    - bundle.json은 생성이 끝난 뒤 마지막에 기록 → 있으면 완성된 번들
+    - 스타일별 목표 개수(depth)보다 적으면 워커가 채움, 실패하면 retry_after 동안 그 스타일은 쉼
+    - 모델/인코딩/1막 원작 참조가 바뀌면 기존 번들은 버림 (fingerprint)
+    - take: 디렉토리 이름을 바꿔 선점 → 여러 서버 프로세스가 같은 번들을 가져가지 않음
+    """
+
+    def __init__(self, config: ConfigManager, file_mgr: FileManager, producer: BundleProducer,
+                 styles: List[str] = None, depth: int = 2, workers: int = 1,
+                 retry_after: float = 300.0):
+        self.config = config
+        self.file_mgr = file_mgr
+        self.producer = producer
+        self.styles = list(styles or [])
+        self.depth = max(0, int(depth))
+        self.retry_after = retry_after
+        self.pool_dir = file_mgr.get_pool_dir()
+
+        self._lock = threading.Lock()
+        self._building: Dict[str, int] = {}
+        self._backoff_until: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)),
+                                            thread_name_prefix="stage-pool")
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ============== 번들 목록 ==============
+
+    def fingerprint(self) -> str:
+        """번들 호환성 키 (바뀌면 기존 번들은 새 작업에 쓰지 않음)"""
+        key = f"{self.config.get_media_fingerprint()}:{self.config.get_original_ref(1)}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _style_dir(self, art_style: str) -> str:
+        return os.path.join(self.pool_dir, art_style)
+
+    def _ready_dirs(self, art_style: str) -> List[str]:
+        """완성된 번들 디렉토리 (오래된 것부터)"""
+        style_dir = self._style_dir(art_style)
+        if not os.path.isdir(style_dir):
+            return []
+        ready = []
+        for name in os.listdir(style_dir):
+            path = os.path.join(style_dir, name)
+            if "." not in name and os.path.exists(os.path.join(path, BUNDLE_FILE)):
+                ready.append(path)
+        return sorted(ready, key=os.path.getmtime)
+
+    def count(self, art_style: str) -> int:
+        return len(self._ready_dirs(art_style))
+
+    # ============== 배정 ==============
+
+    def take(self, art_style: str) -> Optional[Dict[str, Any]]:
+        """
+        완성된 번들 하나 선점 (없으면 None)
+        받은 쪽은 파일을 옮긴 뒤 release() 호출
+        """
+        fingerprint = self.fingerprint()
+        with self._lock:
+            stats = self._stats.setdefault(art_style, {"hits": 0, "misses": 0, "built": 0, "failed": 0})
+            for bundle_dir in self._ready_dirs(art_style):
+                claimed = f"{bundle_dir}.claimed"
+                try:
+                    os.rename(bundle_dir, claimed)
+                except OSError:
+                    continue  # 다른 프로세스가 먼저 가져감
+                bundle = load_bundle(claimed)
+                if bundle is None or bundle.get("fingerprint") != fingerprint:
+                    print(f"🗑️ 사전 생성 번들 폐기 (설정 변경 또는 손상): {os.path.basename(bundle_dir)}")
+                    shutil.rmtree(claimed, ignore_errors=True)
+                    continue
+                stats["hits"] += 1
+                self._wake.set()  # 빈자리 채우기
+                print(f"⚡ 사전 생성 1막 배정: {art_style}/{os.path.basename(bundle_dir)}")
+                return bundle
+            stats["misses"] += 1
+        self._wake.set()
+        return None
+
+    def release(self, bundle: Dict[str, Any]) -> None:
+        """사용한 번들 디렉토리 삭제"""
+        shutil.rmtree(bundle["dir"], ignore_errors=True)
+
+    # ============== 채우기 ==============
+
+    def refill(self) -> int:
+        """목표 개수보다 모자란 만큼 생성 예약 → 예약한 개수"""
+        scheduled = 0
+        now = time.time()
+        for art_style in self.styles:
+            with self._lock:
+                if self._backoff_until.get(art_style, 0) > now:
+                    continue
+                need = self.depth - self.count(art_style) - self._building.get(art_style, 0)
+                for _ in range(max(0, need)):
+                    self._building[art_style] = self._building.get(art_style, 0) + 1
+                    self._executor.submit(self._build, art_style)
+                    scheduled += 1
+        return scheduled
+
+    def _build(self, art_style: str) -> None:
+        """번들 하나 생성 (.building 디렉토리에서 만든 뒤 bundle.json 기록 후 이름 변경)"""
+        bundle_id = uuid.uuid4().hex[:12]
+        final_dir = os.path.join(self._style_dir(art_style), bundle_id)
+        building_dir = f"{final_dir}.building"
+        ok = False
+        try:
+            fingerprint = self.fingerprint()
+            print(f"\n🏭 사전 생성 1막 시작: {art_style}/{bundle_id}")
+            start = time.perf_counter()
+            bundle = self.producer(art_style, building_dir)
+            if bundle is not None:
+                bundle = dict(bundle, art_style=art_style, fingerprint=fingerprint, created_at=time.time(),
+                              files=relative_files(bundle["files"], building_dir))
+                atomic_write_json(os.path.join(building_dir, BUNDLE_FILE), bundle, indent=2)
+                os.rename(building_dir, final_dir)
+                ok = True
+                print(f"🏭 사전 생성 1막 완료: {art_style}/{bundle_id} ({time.perf_counter() - start:.0f}초)")
+        except Exception as e:
+            print(f"⚠️ 사전 생성 1막 실패 ({art_style}): {e}")
+        finally:
+            with self._lock:
+                self._building[art_style] -= 1
+                stats = self._stats.setdefault(art_style, {"hits": 0, "misses": 0, "built": 0, "failed": 0})
+                if ok:
+                    stats["built"] += 1
+                else:
+                    stats["failed"] += 1
+                    self._backoff_until[art_style] = time.time() + self.retry_after
+            if not ok:
+                shutil.rmtree(building_dir, ignore_errors=True)
+
+    # ============== 백그라운드 유지 ==============
+
+    def _cleanup_stale(self) -> None:
+        """이전 실행에서 중단된 생성/배정 디렉토리 정리"""
+        for art_style in os.listdir(self.pool_dir) if os.path.isdir(self.pool_dir) else []:
+            style_dir = self._style_dir(art_style)
+            for name in os.listdir(style_dir) if os.path.isdir(style_dir) else []:
+                if name.endswith((".building", ".claimed")):
+                    shutil.rmtree(os.path.join(style_dir, name), ignore_errors=True)
+
+    def start(self, check_interval: float = 30.0) -> threading.Thread:
+        """풀 유지 스레드 시작 (주기적으로, 그리고 번들이 배정될 때마다 채우기)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._cleanup_stale()
+
+        def _run() -> None:
+            while True:
+                try:
+                    self.refill()
+                except Exception as e:
+                    print(f"⚠️ 사전 생성 풀 확인 실패: {e}")
+                self._wake.wait(check_interval)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=_run, name="stage-pool-refill", daemon=True)
+        self._thread.start()
+        print(f"🏭 1막 사전 생성 풀 시작: {', '.join(self.styles)} (스타일별 {self.depth}개)")
+        return self._thread
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """스타일별 준비된 번들 수, 생성 중인 수, 배정 적중/실패 횟수"""
+        now = time.time()
+        with self._lock:
+            return {
+                art_style: {
+                    "ready": self.count(art_style),
+                    "building": self._building.get(art_style, 0),
+                    "paused": self._backoff_until.get(art_style, 0) > now,
+                    **self._stats.get(art_style, {"hits": 0, "misses": 0, "built": 0, "failed": 0}),
+                }
+                for art_style in self.styles
+            }
+
+
+# ============== 프로세스 공용 풀 ==============
+
+_pools: Dict[str, StagePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_stage_pool(config: ConfigManager, file_mgr: FileManager,
+                   producer: BundleProducer) -> StagePool:
+    """풀 디렉토리별로 공유되는 StagePool (설정의 stage_pool 섹션 사용)"""
+    key = os.path.abspath(file_mgr.get_pool_dir())
+    with _pools_lock:
+        if key not in _pools:
+            pool_config = config.get_stage_pool_config()
+            _pools[key] = StagePool(
+                config, file_mgr, producer,
+                styles=pool_config["styles"],
+                depth=pool_config["depth"],
+                workers=pool_config["workers"],
+                retry_after=pool_config["retry_after"],
+            )
+        return _pools[key]
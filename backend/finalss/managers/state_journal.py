@@ -0,0 +1,136 @@
+# ==================================================================================
+# managers/state_journal.py - 상태 변경 이벤트 저널 (append-only JSONL)
+# ==================================================================================
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List
+
+from utils.atomic_io import atomic_write_text
+
+
+class StateJournal:
+    """
+    상태 변경 이벤트를 한 줄씩 추가만 하는 JSONL 저널
+    - append: 이벤트 하나 = 작은 한 줄 쓰기 (seq, ts 자동 부여)
+    - read: 스냅샷 이후(seq 초과) 이벤트만 재생용으로 읽기
+    - compact: 스냅샷에 반영된 이벤트를 아카이브로 옮기고 저널을 비움
+    - 아카이브가 max_archive_bytes를 넘으면 .1로 교체 (이전 세대 하나만 유지 → 크기 상한)
+    - 마지막 줄이 쓰다 만 상태(프로세스 강제 종료)면 무시
+    """
+
+    def __init__(self, journal_path: str, archive_path: str = None, fsync: bool = False,
+                 max_archive_bytes: int = 0):
+        self.journal_path = journal_path
+        self.archive_path = archive_path or journal_path.replace(".jsonl", ".archive.jsonl")
+        self.fsync = fsync
+        self.max_archive_bytes = max_archive_bytes  # 0 = 제한 없음
+        self._lock = threading.Lock()
+        self._last_seq = 0
+        self._pending_count = 0
+
+        dir_path = os.path.dirname(os.path.abspath(journal_path))
+        os.makedirs(dir_path, exist_ok=True)
+
+        events = self.read()
+        if events:
+            self._last_seq = events[-1]["seq"]
+            self._pending_count = len(events)
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def pending_count(self) -> int:
+        """마지막 압축 이후 쌓인 이벤트 수"""
+        return self._pending_count
+
+    def ensure_seq_at_least(self, seq: int) -> None:
+        """스냅샷의 seq보다 작은 번호를 다시 쓰지 않도록 보정"""
+        with self._lock:
+            self._last_seq = max(self._last_seq, seq)
+
+    # ============== 쓰기 ==============
+
+    def append(self, event_type: str, **data: Any) -> Dict[str, Any]:
+        """이벤트 추가 후 기록된 이벤트 반환"""
+        with self._lock:
+            self._last_seq += 1
+            event = {"seq": self._last_seq, "ts": time.time(), "type": event_type}
+            event.update(data)
+            line = json.dumps(event, ensure_ascii=False) + "\n"
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._pending_count += 1
+            return event
+
+    # ============== 읽기 ==============
+
+    def read(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """after_seq 이후 이벤트 목록 (손상된 줄은 건너뜀)"""
+        return self._read_file(self.journal_path, after_seq)
+
+    def read_archive(self) -> List[Dict[str, Any]]:
+        """압축으로 옮겨진 과거 이벤트 목록 (교체된 이전 세대 포함)"""
+        return self._read_file(self._rotated_path, 0) + self._read_file(self.archive_path, 0)
+
+    @property
+    def _rotated_path(self) -> str:
+        return self.archive_path + ".1"
+
+    @staticmethod
+    def _read_file(path: str, after_seq: int) -> List[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return []
+        events = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 쓰다 만 마지막 줄
+                if event.get("seq", 0) > after_seq:
+                    events.append(event)
+        return events
+
+    # ============== 압축 ==============
+
+    def compact(self, through_seq: int) -> None:
+        """
+        through_seq까지의 이벤트를 아카이브로 옮기고 저널에는 이후 이벤트만 남김
+        (호출 전에 through_seq까지 반영된 스냅샷이 저장되어 있어야 함)
+        """
+        with self._lock:
+            events = self.read()
+            done = [e for e in events if e["seq"] <= through_seq]
+            remaining = [e for e in events if e["seq"] > through_seq]
+
+            if done:
+                with open(self.archive_path, "a", encoding="utf-8") as f:
+                    for e in done:
+                        f.write(json.dumps(e, ensure_ascii=False) + "\n")
+                if self.max_archive_bytes and os.path.getsize(self.archive_path) > self.max_archive_bytes:
+                    os.replace(self.archive_path, self._rotated_path)
+
+            atomic_write_text(
+                self.journal_path,
+                "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in remaining)
+            )
+            self._pending_count = len(remaining)
+
+    def clear(self) -> None:
+        """저널/아카이브 삭제"""
+        with self._lock:
+            for path in (self.journal_path, self.archive_path, self._rotated_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._pending_count = 0
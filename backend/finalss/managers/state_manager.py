@@ -4,10 +4,18 @@
 
 import os
 import json
+import time
+import atexit
+import weakref
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
+from utils.atomic_io import atomic_write_json
+from .state_journal import StateJournal
+from .state_store import SQLiteStateStore
+
 
 @dataclass
 class SceneState:
@@ -26,17 +34,47 @@ class StageState:
     final_muxed: str = "pending"
 
 
+def _flush_at_exit(ref: "weakref.ref") -> None:
+    """인터프리터 종료 시 남은 상태 저장"""
+    manager = ref()
+    if manager is not None:
+        manager.flush()
+
+
 class StateManager:
     """
     스토리 진행 상황 및 미디어 생성 상태를 관리하는 클래스.
     - 기존 save_progress / load_progress 기능 포함
     - 씬별, 스테이지별 세부 상태 추적 추가
+    - 모든 상태 변경은 append-only 저널(JSONL)에 이벤트 한 줄로 기록
+      (씬 이미지 완료, 영상 실패, 막 합성 완료, 선택지 선택 등 + 타임스탬프)
+    - 현재 상태 = 스냅샷(state.json) + 스냅샷 이후 저널 이벤트 재생
+    - 저널이 compact_every개 이상 쌓이면 백그라운드에서 스냅샷을 쓰고 저널을 압축
+      (flush()로 즉시 압축 - 스테이지 경계에서 호출)
+    - 저널은 단계별 소요 시간 기록(get_step_timings)으로도 사용
+    - store(SQLiteStateStore)가 있으면 씬/막 상태를 (작업, 막, 씬) 테이블에도 반영하고
+      get_pending_scenes / get_failed_scenes는 인덱스 조회로 처리
     """
     
     def __init__(self, state_file: str = "output/state.json", 
-                 progress_file: str = "output/story_progress.json"):
+                 progress_file: str = "output/story_progress.json",
+                 flush_interval: float = 1.0,
+                 journal_file: str = None,
+                 compact_every: int = 200,
+                 store: SQLiteStateStore = None,
+                 job_id: str = "local",
+                 archive_max_bytes: int = 0):
         self.state_file = state_file
         self.progress_file = progress_file  # 기존 호환용
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.store = store
+        self.job_id = job_id
+        
+        # 지연 저장(압축) 상태
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.RLock()
         
         # 스토리 상태
         self.history: str = ""
@@ -51,6 +89,15 @@ class StateManager:
         
         # 초기 로드 시도
         self._ensure_directory()
+        
+        # 이벤트 저널
+        if journal_file is None:
+            journal_file = os.path.splitext(state_file)[0] + ".journal.jsonl"
+        self.journal = StateJournal(journal_file, max_archive_bytes=archive_max_bytes)
+        self.journal.ensure_seq_at_least(self._peek_snapshot_seq())
+        
+        # 종료 시 남은 변경사항 저장 (인스턴스 수명은 막지 않도록 weakref 사용)
+        atexit.register(_flush_at_exit, weakref.ref(self))
     
     def _ensure_directory(self) -> None:
         """상태 파일 저장할 디렉토리 확인"""
@@ -65,7 +112,7 @@ class StateManager:
         """
         현재 진행 상황을 JSON 파일로 저장 (기존 함수 대체)
         - progress_file: 기존 호환용 (history, choices, turn)
-        - state_file: 확장된 상태 (씬별, 스테이지별)
+        - state_file: 확장된 상태 스냅샷 (씬별, 스테이지별) + 저널 압축
         """
         # 1) 기존 형식 저장 (호환용)
         progress_data = {
@@ -74,39 +121,50 @@ class StateManager:
             "current_turn": self.current_turn
         }
         try:
-            with open(self.progress_file, "w", encoding="utf-8") as f:
-                json.dump(progress_data, f, ensure_ascii=False, indent=4)
+            atomic_write_json(self.progress_file, progress_data, indent=4)
             print(f"💾 진행 상황 저장 완료: {self.progress_file} (턴: {self.current_turn})")
         except Exception as e:
             print(f"❌ 진행 상황 저장 실패: {e}")
         
-        # 2) 확장된 상태 저장
-        self._save_full_state()
+        # 2) 확장된 상태 즉시 저장
+        self._dirty = True
+        self.flush()
     
     def load_progress(self, initial_turn: int = 1) -> Tuple[str, List[str], int]:
         """
-        JSON 파일에서 진행 상황 로드 (기존 함수 대체)
+        스냅샷 + 저널 재생으로 진행 상황 복원 (기존 함수 대체)
         반환: (history, selected_choices, current_turn)
         """
-        # 먼저 확장된 상태 로드 시도
+        snapshot_seq = None
+        
+        # 1) 스냅샷 로드
         if os.path.exists(self.state_file):
-            self._load_full_state()
+            snapshot_seq = self._load_full_state()
         
-        # 기존 형식 파일도 확인 (호환용)
-        if os.path.exists(self.progress_file):
-            try:
-                with open(self.progress_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.history = data.get("history", self.history or "")
-                self.selected_choices = data.get("selected_choices", self.selected_choices or [])
-                self.current_turn = data.get("current_turn", self.current_turn or initial_turn)
-                print(f"✅ 진행 상황 로드 완료 (시작 턴: {self.current_turn})")
-            except Exception as e:
-                print(f"❌ 진행 상황 로드 실패 ({e}). 초기값으로 시작합니다.")
+        # 2) 스냅샷이 없으면 기존 형식 파일 확인 (호환용)
+        if snapshot_seq is None:
+            if os.path.exists(self.progress_file):
+                try:
+                    with open(self.progress_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    self.history = data.get("history", self.history or "")
+                    self.selected_choices = data.get("selected_choices", self.selected_choices or [])
+                    self.current_turn = data.get("current_turn", self.current_turn or initial_turn)
+                    print(f"✅ 진행 상황 로드 완료 (시작 턴: {self.current_turn})")
+                except Exception as e:
+                    print(f"❌ 진행 상황 로드 실패 ({e}). 초기값으로 시작합니다.")
+                    self._set_initial_state(initial_turn)
+            elif not self.journal.pending_count:
+                print("💡 저장된 진행 상황 파일이 없습니다. 초기값으로 시작합니다.")
                 self._set_initial_state(initial_turn)
-        else:
-            print("💡 저장된 진행 상황 파일이 없습니다. 초기값으로 시작합니다.")
-            self._set_initial_state(initial_turn)
+        
+        # 3) 스냅샷 이후 저널 꼬리만 재생
+        tail = self.journal.read(after_seq=snapshot_seq or 0)
+        for event in tail:
+            self._apply_event(event)
+        if tail:
+            self._dirty = True
+            print(f"🔁 저널 이벤트 {len(tail)}개 재생 (턴: {self.current_turn})")
         
         return self.history, self.selected_choices, self.current_turn
     
@@ -116,11 +174,135 @@ class StateManager:
         self.selected_choices = []
         self.current_turn = initial_turn
     
-    # ============== 확장된 상태 저장/로드 ==============
+    # ============== 이벤트 저널 ==============
+    
+    def _record(self, event_type: str, **data: Any) -> Dict[str, Any]:
+        """상태 변경 이벤트를 저널에 기록하고 메모리 상태에 반영"""
+        with self._flush_lock:
+            event = self.journal.append(event_type, **data)
+            self._apply_event(event)
+            self._save_full_state()
+            return event
+    
+    def _apply_event(self, event: Dict[str, Any]) -> None:
+        """이벤트 하나를 메모리 상태에 반영 (fold)"""
+        etype = event.get("type")
+        if etype == "scene_done":
+            self._mirror_scene(event["scene"], event.get("media"), "done")
+            state = self.get_scene_state(event["scene"])
+            media = event.get("media")
+            if media == "all":
+                state.image = state.video = state.tts = "done"
+            elif media in ("image", "video", "tts"):
+                setattr(state, media, "done")
+        elif etype == "scene_failed":
+            self._mirror_scene(event["scene"], event.get("media"), "failed", event.get("error", ""))
+            state = self.get_scene_state(event["scene"])
+            media = event.get("media")
+            if media in ("image", "video", "tts"):
+                setattr(state, media, "failed")
+            state.error_message = event.get("error", "")
+        elif etype == "stage_done":
+            if self.store is not None:
+                self.store.set_stage_merge(self.job_id, event["stage"], event.get("merge"))
+            state = self.get_stage_state(event["stage"])
+            field_name = {
+                "scenes": "scenes_merged",
+                "tts": "tts_merged",
+                "final": "final_muxed",
+            }.get(event.get("merge"))
+            if field_name:
+                setattr(state, field_name, "done")
+        elif etype == "choice_selected":
+            self.selected_choices.append(event.get("choice", ""))
+        elif etype == "history_set":
+            self.history = event.get("text", "")
+        elif etype == "history_appended":
+            self.history += f" {event.get('text', '')}"
+        elif etype == "turn_set":
+            self.current_turn = event.get("turn", self.current_turn)
+        # 그 밖의 이벤트(progress, step_* 등)는 기록 전용
+    
+    def _mirror_scene(self, scene_idx: int, media_type: str, status: str, error: str = None) -> None:
+        """씬 상태를 SQLite 저장소에 반영 (전역 씬 번호 → 막/씬 번호)"""
+        if self.store is None or not media_type:
+            return
+        stage_no, scene_no = (scene_idx - 1) // 3 + 1, (scene_idx - 1) % 3 + 1
+        self.store.set_scene_media(self.job_id, stage_no, scene_no, media_type, status, error)
+    
+    def record_event(self, event_type: str, **data: Any) -> None:
+        """상태에 영향 없는 기록용 이벤트 추가 (진행률, 단계 시작/완료 등)"""
+        self.journal.append(event_type, **data)
+    
+    def get_events(self, event_type: str = None, include_archive: bool = True) -> List[Dict[str, Any]]:
+        """기록된 이벤트 목록 (압축된 과거 이벤트 포함)"""
+        events = (self.journal.read_archive() if include_archive else []) + self.journal.read()
+        if event_type:
+            events = [e for e in events if e.get("type") == event_type]
+        return events
+    
+    def get_step_timings(self) -> List[Dict[str, Any]]:
+        """
+        단계별 소요 시간
+        - step_done 이벤트: 기록된 duration 사용
+        - progress 이벤트: 다음 progress 이벤트까지의 간격
+        """
+        timings = []
+        progress_events = []
+        for e in self.get_events():
+            if e.get("type") == "step_done":
+                timings.append({
+                    "label": f"{e.get('stage', '')}막 {e.get('step', '')}",
+                    "start": e["ts"] - e.get("duration", 0.0),
+                    "duration": e.get("duration", 0.0),
+                })
+            elif e.get("type") == "progress":
+                progress_events.append(e)
+        
+        for cur, nxt in zip(progress_events, progress_events[1:]):
+            timings.append({
+                "label": cur.get("message", ""),
+                "start": cur["ts"],
+                "duration": nxt["ts"] - cur["ts"],
+            })
+        return sorted(timings, key=lambda t: t["start"])
+    
+    # ============== 스냅샷 저장/로드 ==============
     
     def _save_full_state(self) -> None:
-        """전체 상태 저장 (씬별, 스테이지별 포함)"""
+        """
+        스냅샷 저장(저널 압축) 예약
+        저널이 compact_every개 이상 쌓였을 때만 flush_interval 뒤 백그라운드에서 압축
+        """
+        with self._flush_lock:
+            self._dirty = True
+            if self.journal.pending_count < self.compact_every:
+                return
+            if self.flush_interval <= 0:
+                self.flush()
+                return
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """스냅샷을 즉시 저장하고 반영된 저널 이벤트를 압축 (스테이지 경계에서 호출)"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            seq = self.journal.last_seq
+            if self._write_full_state(seq):
+                self.journal.compact(seq)
+    
+    def _write_full_state(self, journal_seq: int = 0) -> bool:
+        """전체 상태 스냅샷을 원자적으로 기록"""
         state_data = {
+            "journal_seq": journal_seq,
             "story": {
                 "history": self.history,
                 "selected_choices": self.selected_choices,
@@ -134,13 +316,23 @@ class StateManager:
             }
         }
         try:
-            with open(self.state_file, "w", encoding="utf-8") as f:
-                json.dump(state_data, f, ensure_ascii=False, indent=4)
+            atomic_write_json(self.state_file, state_data, indent=4)
+            return True
         except Exception as e:
+            self._dirty = True  # 다음 flush에서 재시도
             print(f"⚠️ 전체 상태 저장 실패: {e}")
+            return False
     
-    def _load_full_state(self) -> None:
-        """전체 상태 로드"""
+    def _peek_snapshot_seq(self) -> int:
+        """스냅샷에 반영된 저널 seq (압축 후 seq 번호 재사용 방지용)"""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("journal_seq", 0))
+        except Exception:
+            return 0
+    
+    def _load_full_state(self) -> Optional[int]:
+        """전체 상태 스냅샷 로드. 반영된 저널 seq 반환 (실패 시 None)"""
         try:
             with open(self.state_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
@@ -161,9 +353,21 @@ class StateManager:
             for k, v in stages.items():
                 self.stage_states[int(k)] = StageState(**v)
             
+            journal_seq = data.get("journal_seq", 0)
+            self.journal.ensure_seq_at_least(journal_seq)
             print(f"✅ 전체 상태 로드 완료")
+            return journal_seq
+        except (json.JSONDecodeError, TypeError) as e:
+            # 손상된 파일은 덮어쓰지 않도록 보존 후 저널만으로 복원
+            corrupt_path = f"{self.state_file}.corrupt-{int(time.time())}"
+            try:
+                os.replace(self.state_file, corrupt_path)
+            except OSError:
+                corrupt_path = self.state_file
+            print(f"❌ 전체 상태 파일 손상 ({e}). 보존 위치: {corrupt_path}")
         except Exception as e:
             print(f"⚠️ 전체 상태 로드 실패: {e}")
+        return None
     
     # ============== 씬 상태 관리 ==============
     
@@ -178,30 +382,11 @@ class StateManager:
         씬 미디어 생성 완료 표시
         media_type: "image" | "video" | "tts" | "all"
         """
-        state = self.get_scene_state(scene_idx)
-        if media_type == "all":
-            state.image = "done"
-            state.video = "done"
-            state.tts = "done"
-        elif media_type == "image":
-            state.image = "done"
-        elif media_type == "video":
-            state.video = "done"
-        elif media_type == "tts":
-            state.tts = "done"
-        self._save_full_state()
+        self._record("scene_done", scene=scene_idx, media=media_type)
     
     def mark_scene_failed(self, scene_idx: int, media_type: str, error: str = "") -> None:
         """씬 미디어 생성 실패 표시"""
-        state = self.get_scene_state(scene_idx)
-        if media_type == "image":
-            state.image = "failed"
-        elif media_type == "video":
-            state.video = "failed"
-        elif media_type == "tts":
-            state.tts = "failed"
-        state.error_message = error
-        self._save_full_state()
+        self._record("scene_failed", scene=scene_idx, media=media_type, error=error)
     
     def is_scene_complete(self, scene_idx: int) -> bool:
         """씬의 모든 미디어가 완료되었는지 확인"""
@@ -210,6 +395,9 @@ class StateManager:
     
     def get_pending_scenes(self) -> List[int]:
         """아직 완료되지 않은 씬 목록"""
+        if self.store is not None:
+            return [(r["stage_no"] - 1) * 3 + r["scene_no"]
+                    for r in self.store.get_pending_scenes(self.job_id)]
         pending = []
         for idx, state in self.scene_states.items():
             if state.image != "done" or state.video != "done" or state.tts != "done":
@@ -218,6 +406,9 @@ class StateManager:
     
     def get_failed_scenes(self) -> List[int]:
         """실패한 씬 목록"""
+        if self.store is not None:
+            return [(r["stage_no"] - 1) * 3 + r["scene_no"]
+                    for r in self.store.get_failed_scenes(self.job_id)]
         failed = []
         for idx, state in self.scene_states.items():
             if "failed" in [state.image, state.video, state.tts]:
@@ -237,14 +428,7 @@ class StateManager:
         스테이지 병합 완료 표시
         merge_type: "scenes" | "tts" | "final"
         """
-        state = self.get_stage_state(stage_no)
-        if merge_type == "scenes":
-            state.scenes_merged = "done"
-        elif merge_type == "tts":
-            state.tts_merged = "done"
-        elif merge_type == "final":
-            state.final_muxed = "done"
-        self._save_full_state()
+        self._record("stage_done", stage=stage_no, merge=merge_type)
     
     def can_merge_stage(self, stage_no: int, start_turn: int, end_turn: int) -> bool:
         """스테이지 병합 가능 여부 (모든 씬 완료 확인)"""
@@ -263,15 +447,19 @@ class StateManager:
     def set_initial_context(self, context: str) -> None:
         """초기 컨텍스트 설정"""
         if not self.history:
-            self.history = context
+            self._record("history_set", text=context)
+    
+    def set_history(self, text: str) -> None:
+        """히스토리 전체 교체"""
+        self._record("history_set", text=text)
     
     def append_to_history(self, text: str) -> None:
         """히스토리에 텍스트 추가"""
-        self.history += f" {text}"
+        self._record("history_appended", text=text)
     
     def add_choice(self, choice: str) -> None:
         """선택 기록 추가"""
-        self.selected_choices.append(choice)
+        self._record("choice_selected", choice=choice)
     
     def get_history(self) -> str:
         """현재 히스토리 반환"""
@@ -283,20 +471,56 @@ class StateManager:
     
     def increment_turn(self) -> int:
         """턴 증가 후 현재 턴 반환"""
-        self.current_turn += 1
+        self._record("turn_set", turn=self.current_turn + 1)
         return self.current_turn
     
+    # ============== 작업 정보 (SQLite 저장소) ==============
+    
+    def bind_job(self, job_id: str, **meta: Any) -> None:
+        """이 상태가 속한 작업 ID 지정 (art_style, tale_title 등 함께 기록)"""
+        self.job_id = job_id
+        if self.store is not None:
+            self.store.upsert_job(job_id, **meta)
+    
+    def set_current_step(self, step: str, stage_no: int = None) -> None:
+        """현재 진행 단계 기록 (저널 + 멈춘 작업 조회용 저장소)"""
+        self.record_event("step_started", step=step, stage=stage_no)
+        if self.store is not None:
+            self.store.set_job_step(self.job_id, step)
+    
+    def record_artifact(self, path: str, kind: str, stage_no: int = 0, sha256: str = "") -> None:
+        """산출물 기록 (SQLite 저장소가 있을 때만)"""
+        if self.store is None or not path or not os.path.exists(path):
+            return
+        self.store.record_artifact(self.job_id, path, kind, stage_no,
+                                   os.path.getsize(path), sha256)
+    
+    def set_job_status(self, status: str) -> None:
+        """작업 상태 기록 ("running" | "stage{n}_complete" | "complete" | "error")"""
+        self.record_event("job_status", status=status)
+        if self.store is not None:
+            self.store.upsert_job(self.job_id, status=status)
+    
     # ============== 초기화 ==============
     
     def reset(self) -> None:
         """모든 상태 초기화"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._dirty = False
+        
         self.history = ""
         self.selected_choices = []
         self.current_turn = 1
         self.scene_states = {}
         self.stage_states = {}
         
-        # 파일도 삭제
+        # 저널, 저장소 기록 및 파일도 삭제
+        self.journal.clear()
+        if self.store is not None:
+            self.store.delete_job(self.job_id)
         for file_path in [self.state_file, self.progress_file]:
             if os.path.exists(file_path):
                 os.remove(file_path)
@@ -0,0 +1,267 @@
+# ==================================================================================
+# managers/state_store.py - SQLite 상태 저장소 (작업/막/씬/산출물 테이블)
+# ==================================================================================
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id          TEXT PRIMARY KEY,
+    status          TEXT NOT NULL DEFAULT 'running',
+    current_step    TEXT NOT NULL DEFAULT '',
+    step_started_at REAL NOT NULL DEFAULT 0,
+    art_style       TEXT NOT NULL DEFAULT '',
+    tale_title      TEXT NOT NULL DEFAULT '',
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_step ON jobs(current_step, step_started_at);
+
+CREATE TABLE IF NOT EXISTS stages (
+    job_id        TEXT NOT NULL,
+    stage_no      INTEGER NOT NULL,
+    scenes_merged TEXT NOT NULL DEFAULT 'pending',
+    tts_merged    TEXT NOT NULL DEFAULT 'pending',
+    final_muxed   TEXT NOT NULL DEFAULT 'pending',
+    updated_at    REAL NOT NULL,
+    PRIMARY KEY (job_id, stage_no)
+);
+CREATE INDEX IF NOT EXISTS idx_stages_muxed ON stages(final_muxed);
+
+CREATE TABLE IF NOT EXISTS scenes (
+    job_id        TEXT NOT NULL,
+    stage_no      INTEGER NOT NULL,
+    scene_no      INTEGER NOT NULL,
+    image         TEXT NOT NULL DEFAULT 'pending',
+    video         TEXT NOT NULL DEFAULT 'pending',
+    tts           TEXT NOT NULL DEFAULT 'pending',
+    status        TEXT NOT NULL DEFAULT 'pending',  -- 'pending' | 'failed' | 'done' (세 미디어 종합)
+    error_message TEXT NOT NULL DEFAULT '',
+    updated_at    REAL NOT NULL,
+    PRIMARY KEY (job_id, stage_no, scene_no)
+);
+CREATE INDEX IF NOT EXISTS idx_scenes_status ON scenes(status);
+CREATE INDEX IF NOT EXISTS idx_scenes_job_status ON scenes(job_id, status);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    job_id     TEXT NOT NULL,
+    path       TEXT NOT NULL,
+    stage_no   INTEGER NOT NULL DEFAULT 0,
+    kind       TEXT NOT NULL,
+    size       INTEGER NOT NULL DEFAULT 0,
+    sha256     TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, path)
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind ON artifacts(kind);
+"""
+
+_MEDIA_COLUMNS = ("image", "video", "tts")
+_MERGE_COLUMNS = {"scenes": "scenes_merged", "tts": "tts_merged", "final": "final_muxed"}
+
+
+class SQLiteStateStore:
+    """
+    (작업, 막, 씬) 단위 상태 저장소
+    - 표준 라이브러리 sqlite3 사용 (WAL 모드, 프로세스 내 스레드 공유)
+    - 상태 컬럼 인덱스 → "모든 작업의 실패 씬", "영상 단계에서 10분 넘게 멈춘 작업" 같은
+      조회를 전체 스캔 없이 처리
+    - StateManager가 같은 변경을 이 저장소에도 반영 (기존 메서드는 그대로 사용)
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    # ============== 작업 ==============
+
+    def upsert_job(self, job_id: str, **fields: Any) -> None:
+        """작업 생성/갱신 (status, art_style, tale_title 등)"""
+        now = time.time()
+        self._execute(
+            "INSERT OR IGNORE INTO jobs (job_id, created_at, updated_at) VALUES (?, ?, ?)",
+            (job_id, now, now)
+        )
+        fields = {k: v for k, v in fields.items()
+                  if k in ("status", "art_style", "tale_title") and v is not None}
+        if fields:
+            assignments = ", ".join(f"{k} = ?" for k in fields)
+            self._execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE job_id = ?",
+                (*fields.values(), now, job_id)
+            )
+
+    def set_job_step(self, job_id: str, step: str) -> None:
+        """작업의 현재 단계 기록 (멈춘 작업 조회용 시작 시각 포함)"""
+        now = time.time()
+        self.upsert_job(job_id)
+        self._execute(
+            "UPDATE jobs SET status = 'running', current_step = ?, step_started_at = ?, updated_at = ? "
+            "WHERE job_id = ?",
+            (step, now, now, job_id)
+        )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def delete_job(self, job_id: str) -> None:
+        """작업과 딸린 막/씬/산출물 기록 삭제"""
+        with self._lock:
+            for table in ("scenes", "stages", "artifacts", "jobs"):
+                self._conn.execute(f"DELETE FROM {table} WHERE job_id = ?", (job_id,))
+
+    # ============== 씬 / 막 ==============
+
+    def set_scene_media(self, job_id: str, stage_no: int, scene_no: int,
+                        media_type: str, status: str, error: str = None) -> None:
+        """
+        씬 미디어 상태 갱신
+        media_type: "image" | "video" | "tts" | "all"
+        """
+        columns = _MEDIA_COLUMNS if media_type == "all" else (media_type,)
+        if not set(columns) <= set(_MEDIA_COLUMNS):
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO scenes (job_id, stage_no, scene_no, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, stage_no, scene_no, now)
+            )
+            assignments = ", ".join(f"{c} = ?" for c in columns)
+            params: list = [status] * len(columns)
+            if error is not None:
+                assignments += ", error_message = ?"
+                params.append(error)
+            self._conn.execute(
+                f"UPDATE scenes SET {assignments}, updated_at = ? "
+                "WHERE job_id = ? AND stage_no = ? AND scene_no = ?",
+                (*params, now, job_id, stage_no, scene_no)
+            )
+            # 종합 상태: 하나라도 실패면 failed, 모두 완료면 done
+            self._conn.execute(
+                "UPDATE scenes SET status = CASE "
+                "  WHEN 'failed' IN (image, video, tts) THEN 'failed' "
+                "  WHEN image = 'done' AND video = 'done' AND tts = 'done' THEN 'done' "
+                "  ELSE 'pending' END "
+                "WHERE job_id = ? AND stage_no = ? AND scene_no = ?",
+                (job_id, stage_no, scene_no)
+            )
+
+    def set_stage_merge(self, job_id: str, stage_no: int, merge_type: str,
+                        status: str = "done") -> None:
+        """막 병합 상태 갱신 (merge_type: "scenes" | "tts" | "final")"""
+        column = _MERGE_COLUMNS.get(merge_type)
+        if column is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO stages (job_id, stage_no, updated_at) VALUES (?, ?, ?)",
+                (job_id, stage_no, now)
+            )
+            self._conn.execute(
+                f"UPDATE stages SET {column} = ?, updated_at = ? WHERE job_id = ? AND stage_no = ?",
+                (status, now, job_id, stage_no)
+            )
+
+    def record_artifact(self, job_id: str, path: str, kind: str, stage_no: int = 0,
+                        size: int = 0, sha256: str = "") -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO artifacts (job_id, path, stage_no, kind, size, sha256, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, path, stage_no, kind, size, sha256, time.time())
+        )
+
+    # ============== 조회 ==============
+
+    def get_scenes(self, job_id: str, status: str = None) -> List[Dict[str, Any]]:
+        """작업의 씬 목록 (status 지정 시 해당 상태만)"""
+        if status is None:
+            return self._query(
+                "SELECT * FROM scenes WHERE job_id = ? ORDER BY stage_no, scene_no", (job_id,)
+            )
+        return self._query(
+            "SELECT * FROM scenes WHERE job_id = ? AND status = ? ORDER BY stage_no, scene_no",
+            (job_id, status)
+        )
+
+    def get_pending_scenes(self, job_id: str) -> List[Dict[str, Any]]:
+        """완료되지 않은 씬 (실패 포함)"""
+        return self._query(
+            "SELECT * FROM scenes WHERE job_id = ? AND status != 'done' ORDER BY stage_no, scene_no",
+            (job_id,)
+        )
+
+    def get_failed_scenes(self, job_id: str = None) -> List[Dict[str, Any]]:
+        """실패한 씬 (job_id가 없으면 모든 작업 대상)"""
+        if job_id is None:
+            return self._query(
+                "SELECT * FROM scenes WHERE status = 'failed' ORDER BY updated_at DESC"
+            )
+        return self.get_scenes(job_id, status="failed")
+
+    def get_stuck_jobs(self, step: str = None, older_than: float = 600.0) -> List[Dict[str, Any]]:
+        """
+        같은 단계에 older_than초 넘게 머문 진행 중 작업
+        예) get_stuck_jobs("videos", 600) → 영상 생성에서 10분 넘게 멈춘 작업
+        """
+        cutoff = time.time() - older_than
+        sql = ("SELECT * FROM jobs WHERE status = 'running' AND current_step != '' "
+               "AND step_started_at < ?")
+        params: tuple = (cutoff,)
+        if step:
+            sql += " AND current_step = ?"
+            params += (step,)
+        return self._query(sql + " ORDER BY step_started_at", params)
+
+    def get_jobs(self, status: str = None) -> List[Dict[str, Any]]:
+        if status is None:
+            return self._query("SELECT * FROM jobs ORDER BY updated_at DESC")
+        return self._query("SELECT * FROM jobs WHERE status = ? ORDER BY updated_at DESC", (status,))
+
+    def get_artifacts(self, job_id: str, kind: str = None) -> List[Dict[str, Any]]:
+        if kind is None:
+            return self._query("SELECT * FROM artifacts WHERE job_id = ? ORDER BY created_at", (job_id,))
+        return self._query(
+            "SELECT * FROM artifacts WHERE job_id = ? AND kind = ? ORDER BY created_at", (job_id, kind)
+        )
+
+
+# ============== 프로세스 공용 인스턴스 ==============
+
+_stores: Dict[str, SQLiteStateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_state_store(db_path: str) -> SQLiteStateStore:
+    """DB 경로별로 공유되는 저장소 (작업마다 연결을 새로 열지 않도록)"""
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SQLiteStateStore(db_path)
+        return _stores[key]
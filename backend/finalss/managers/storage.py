@@ -0,0 +1,193 @@
+# ==================================================================================
+# managers/storage.py - 산출물 저장소 백엔드 (로컬 디스크 / S3 호환)
+# ==================================================================================
+
+import os
+import shutil
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+
+_CONTENT_TYPES = {
+    ".mp4": "video/mp4",
+    ".mp3": "audio/mpeg",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+    ".srt": "application/x-subrip",
+    ".txt": "text/plain; charset=utf-8",
+}
+
+
+class StorageBackend(ABC):
+    """
+    산출물 저장소 인터페이스
+    - 키는 output 디렉토리 기준 상대 경로 ("stages/stage_1_final.mp4")
+    - 생성은 항상 로컬 작업 디렉토리에서 하고, 완성된 파일을 put_file로 게시
+    """
+
+    # True면 웹 서버가 StaticFiles로 직접 제공, False면 get_url로 리다이렉트
+    serves_locally = True
+
+    @abstractmethod
+    def put_file(self, local_path: str, key: str) -> str:
+        """로컬 파일 게시 후 키 반환"""
+
+    @abstractmethod
+    def get_file(self, key: str, local_path: str) -> Optional[str]:
+        """게시된 파일을 로컬로 가져옴 (다른 노드에서 만든 산출물 사용 시)"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """게시된 키가 있는지"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """게시된 파일 삭제 (없으면 무시)"""
+
+    @abstractmethod
+    def get_url(self, key: str, expires: int = None) -> str:
+        """클라이언트가 받을 수 있는 URL"""
+
+
+class LocalStorage(StorageBackend):
+    """로컬 디스크 (기존 동작: output 디렉토리를 웹 서버가 그대로 제공)"""
+
+    serves_locally = True
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put_file(self, local_path: str, key: str) -> str:
+        target = self._path(key)
+        if os.path.abspath(target) != os.path.abspath(local_path):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = target + ".part"
+            shutil.copyfile(local_path, tmp)
+            os.replace(tmp, target)
+        return key
+
+    def get_file(self, key: str, local_path: str) -> Optional[str]:
+        source = self._path(key)
+        if not os.path.exists(source):
+            return None
+        if os.path.abspath(source) != os.path.abspath(local_path):
+            os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+            shutil.copyfile(source, local_path)
+        return local_path
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get_url(self, key: str, expires: int = None) -> str:
+        # /stages, /final 마운트와 같은 경로 체계
+        return "/" + key
+
+
+class S3Storage(StorageBackend):
+    """
+    S3 호환 오브젝트 스토리지 (AWS S3, MinIO 등)
+    - boto3 upload_file: 임계값 이상이면 디스크에서 스트리밍 멀티파트 업로드
+    - 서명된 URL로 클라이언트가 스토리지에서 직접 다운로드 (앱 서버 우회)
+    - endpoint_url을 지정하면 로컬 MinIO 등으로 테스트 가능
+    """
+
+    serves_locally = False
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: str = None,
+                 region: str = None, url_expires: int = 3600,
+                 multipart_threshold_mb: int = 16, multipart_chunksize_mb: int = 8,
+                 max_concurrency: int = 4):
+        if not BOTO3_AVAILABLE:
+            raise ImportError("S3 저장소를 사용하려면 boto3가 필요합니다: pip install boto3")
+        if not bucket:
+            raise ValueError("S3 저장소 bucket 설정이 없습니다")
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.url_expires = url_expires
+        self._client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None)
+        self._transfer = TransferConfig(
+            multipart_threshold=multipart_threshold_mb * 1024 * 1024,
+            multipart_chunksize=multipart_chunksize_mb * 1024 * 1024,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_file(self, local_path: str, key: str) -> str:
+        content_type = _CONTENT_TYPES.get(os.path.splitext(local_path)[1].lower(), "application/octet-stream")
+        self._client.upload_file(
+            local_path, self.bucket, self._object_key(key),
+            ExtraArgs={"ContentType": content_type},
+            Config=self._transfer,
+        )
+        return key
+
+    def get_file(self, key: str, local_path: str) -> Optional[str]:
+        if not self.exists(key):
+            return None
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        tmp = local_path + ".part"
+        self._client.download_file(self.bucket, self._object_key(key), tmp, Config=self._transfer)
+        os.replace(tmp, local_path)
+        return local_path
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except Exception:
+            return False
+
+    def delete(self, key: str) -> None:
+        self._client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def get_url(self, key: str, expires: int = None) -> str:
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=expires or self.url_expires,
+        )
+
+
+def create_storage(storage_config: Dict[str, Any], output_root: str) -> StorageBackend:
+    """
+    설정으로 저장소 생성
+    storage_config: ConfigManager.get_storage_config() (backend: "local" | "s3")
+    """
+    backend = storage_config.get("backend", "local")
+    if backend == "local":
+        return LocalStorage(output_root)
+    if backend == "s3":
+        s3 = storage_config.get("s3", {})
+        return S3Storage(
+            bucket=os.getenv("S3_BUCKET", s3.get("bucket", "")),
+            prefix=s3.get("prefix", ""),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL", s3.get("endpoint_url", "")),
+            region=s3.get("region", ""),
+            url_expires=s3.get("url_expires", 3600),
+            multipart_threshold_mb=s3.get("multipart_threshold_mb", 16),
+            multipart_chunksize_mb=s3.get("multipart_chunksize_mb", 8),
+            max_concurrency=s3.get("max_concurrency", 4),
+        )
+    raise ValueError(f"알 수 없는 저장소 백엔드: {backend}")
@@ -4,7 +4,6 @@
 
 from typing import List, Dict
 import json
-from google.genai import types
 
 
 class StoryHelper:
@@ -65,7 +64,7 @@ Output ONLY the story text in Korean. No JSON, no formatting, no character count
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("stage_story"),
                     contents=[prompt]
                 )
                 story = response.text.strip()
@@ -113,7 +112,7 @@ Output ONLY the story text in Korean. No JSON, no formatting, no character count
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("stage_story_expand"),
                     contents=[prompt]
                 )
                 return response.text.strip()
@@ -176,9 +175,10 @@ Output JSON format: {{"scenes": ["장면1 (행동/상황만)", "장면2 (행동/
         
         while True:
             try:
+                from google.genai import types
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("scene_split"),
                     contents=[prompt],
                     config=types.GenerateContentConfig(response_mime_type="application/json")
                 )
@@ -263,15 +263,15 @@ Output ONLY the English motion description (1-2 sentences).
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("motion_prompt"),
                     contents=[prompt]
                 )
                 motion = response.text.strip()
                 
                 # 금지 단어 체크
                 motion_lower = motion.lower()
-                for word in blocked_words:
-                    if word.lower() in motion_lower:
+                for word in self.config.get_blocked_words_lower():
+                    if word in motion_lower:
                         print(f"   ⚠️ 금지 단어 감지: {word}, 기본값 사용")
                         return f"{main_character} standing calmly with a gentle expression"
                 
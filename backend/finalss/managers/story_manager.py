@@ -5,9 +5,6 @@
 import json
 from typing import Any, Dict, List, Optional
 
-from google.genai import types
-from google.genai import errors
-
 from .config_manager import ConfigManager
 from .state_manager import StateManager
 
@@ -83,9 +80,10 @@ Output JSON format: {{"options": ["옵션 1", "옵션 2", "옵션 3"]}}
         
         while True:
             try:
+                from google.genai import types
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("options"),
                     contents=[prompt],
                     config=types.GenerateContentConfig(response_mime_type="application/json")
                 )
@@ -96,7 +94,7 @@ Output JSON format: {{"options": ["옵션 1", "옵션 2", "옵션 3"]}}
                 else:
                     raise ValueError("Invalid options returned")
                     
-            except (errors.APIError, Exception) as e:
+            except Exception as e:
                 print(f"   ⚠️ API 호출 오류: {e}")
                 if self.config.rotate_google_key():
                     continue
@@ -126,9 +124,10 @@ Output JSON format: {{"main_character": "Heungbu or Nolbu", "image_description":
         
         while True:
             try:
+                from google.genai import types
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("scene_prompts"),
                     contents=[prompt],
                     config=types.GenerateContentConfig(response_mime_type="application/json")
                 )
@@ -147,7 +146,7 @@ Output JSON format: {{"main_character": "Heungbu or Nolbu", "image_description":
                 
                 return data
 
-            except (errors.APIError, Exception) as e:
+            except Exception as e:
                 print(f"   ⚠️ 콘티 생성 오류: {e}")
                 if self.config.rotate_google_key():
                     continue
@@ -160,6 +159,50 @@ Output JSON format: {{"main_character": "Heungbu or Nolbu", "image_description":
     
     # ============== 선택 처리 ==============
     
+    def pick_option(self, stage_no: int, options: List[str], history: str = "") -> int:
+        """
+        LLM이 이야기 흐름에 가장 어울리는 선택지를 고름 (배치 자동 진행용)
+        
+        Returns:
+            선택지 인덱스 (실패 시 0)
+        """
+        stage_info = self.config.get_stage_info(stage_no)
+        numbered = "\n".join(f"{i}. {option}" for i, option in enumerate(options, 1))
+        prompt = f"""
+You are an editor for a children's interactive fairytale based on "Heungbu and Nolbu".
+
+**이전 막들의 스토리:**
+{history or "(없음)"}
+
+***NEXT STAGE***: {stage_info.get('name', '')} ({stage_info.get('description', '')})
+
+Candidate options:
+{numbered}
+
+Pick the single option that makes the most engaging, coherent and child-friendly continuation.
+
+Output JSON format: {{"choice": <option number>}}
+"""
+        while True:
+            try:
+                from google.genai import types
+                client = self.config.get_google_client()
+                response = client.models.generate_content(
+                    model=self.config.get_text_model("pick_option"),
+                    contents=[prompt],
+                    config=types.GenerateContentConfig(response_mime_type="application/json")
+                )
+                choice = int(json.loads(response.text)["choice"])
+                if 1 <= choice <= len(options):
+                    return choice - 1
+                raise ValueError(f"Invalid choice: {choice}")
+                
+            except Exception as e:
+                print(f"   ⚠️ 선택지 고르기 오류: {e}")
+                if self.config.rotate_google_key():
+                    continue
+                return 0
+    
     def select_option(self, option_idx: int, options: List[str]) -> str:
         """사용자가 선택한 옵션을 처리하고 상태에 기록"""
         if option_idx < 0 or option_idx >= len(options):
@@ -177,7 +220,7 @@ Output JSON format: {{"main_character": "Heungbu or Nolbu", "image_description":
         original_ref = self.config.get_original_ref(stage_no)
         
         # TTS 글자수 제한
-        tts_config = self.config._config.get("tts", {})
+        tts_config = self.config.get_tts_settings()
         target_chars = tts_config.get("target_chars", 160)
         min_chars = tts_config.get("min_chars", 150)
         max_chars = tts_config.get("max_chars", 170)
@@ -212,7 +255,7 @@ Output ONLY the expanded story text in Korean.
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("stage_story"),
                     contents=[prompt]
                 )
                 story = response.text.strip()
@@ -225,7 +268,7 @@ Output ONLY the expanded story text in Korean.
                 print(f"   ✅ 스토리 확장 완료 ({len(story)}자)")
                 return story
                 
-            except (errors.APIError, Exception) as e:
+            except Exception as e:
                 print(f"   ⚠️ 스토리 확장 오류: {e}")
                 if self.config.rotate_google_key():
                     continue
@@ -275,12 +318,12 @@ Output the complete story in Korean.
             try:
                 client = self.config.get_google_client()
                 response = client.models.generate_content(
-                    model=self.config.get_model("text"),
+                    model=self.config.get_text_model("full_story"),
                     contents=[prompt],
                 )
                 return response.text
                 
-            except (errors.APIError, Exception) as e:
+            except Exception as e:
                 print(f"   ⚠️ 스토리 생성 오류: {e}")
                 if self.config.rotate_google_key():
                     continue
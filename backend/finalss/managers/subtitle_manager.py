@@ -27,6 +27,11 @@ class SubtitleManager:
         # 다음 막 시작 시간 갱신
         self.current_time = end
 
+    def truncate(self, num_stages: int):
+        """앞의 num_stages개 막 자막만 남김 (같은 막을 다시 실행하거나 복원할 때)"""
+        del self.subtitles[num_stages:]
+        self.current_time = self.subtitles[-1]["end"] if self.subtitles else 0.0
+
     def save_srt(self):
         """SRT 파일로 저장"""
         os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
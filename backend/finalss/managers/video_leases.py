@@ -0,0 +1,124 @@
+# ==================================================================================
+# managers/video_leases.py - 프로세스 간 영상 생성 대기열 공유 (SQLite)
+# ==================================================================================
+
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from typing import Iterable, Optional
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS owners (
+    owner     TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tickets (
+    owner       TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    job_id      TEXT NOT NULL,
+    priority    INTEGER NOT NULL,             -- PRIORITIES 값 (aging 전)
+    enqueued_at REAL NOT NULL,
+    running     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (owner, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority, enqueued_at);
+"""
+
+
+class VideoLeaseBoard:
+    """
+    여러 프로세스(웹 서버, 배치 워커)의 VideoScheduler가 함께 보는 대기/실행 목록
+    - 프로세스마다 자기 요청(우선순위, 대기 시작 시각, 실행 여부)을 게시
+    - 다른 프로세스에 더 높은 우선순위의 요청이 대기/실행 중이면 낮은 우선순위 요청은 시작하지 않음
+      → 배치 워커가 웹 사용자의 영상 생성을 밀어내지 않음 (aging으로 배치도 결국 실행)
+    - 하트비트가 lease_ttl 동안 없는 프로세스(비정상 종료)의 요청은 무시하고 삭제
+    """
+
+    def __init__(self, db_path: str, lease_ttl: float = 30.0):
+        self.db_path = db_path
+        self.lease_ttl = lease_ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                                     timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.heartbeat()
+
+        self._stopped = threading.Event()
+        thread = threading.Thread(target=self._beat, name="video-leases", daemon=True)
+        thread.start()
+
+    # ============== 게시 ==============
+
+    def publish(self, waiting: Iterable, running: Iterable) -> None:
+        """이 프로세스의 대기/실행 요청 목록을 통째로 교체 (VideoTicket 목록)"""
+        rows = [(self.owner, t.seq, t.job_id, t.priority_value, t.enqueued_at, 0) for t in waiting]
+        rows += [(self.owner, t.seq, t.job_id, t.priority_value, t.enqueued_at, 1) for t in running]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM tickets WHERE owner = ?", (self.owner,))
+                self._conn.executemany(
+                    "INSERT INTO tickets (owner, seq, job_id, priority, enqueued_at, running) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def best_foreign_class(self, now: float, aging_seconds: float) -> Optional[int]:
+        """다른 살아 있는 프로세스의 요청 중 가장 높은 우선순위(aging 반영, 작을수록 높음)"""
+        with self._lock:
+            self._purge_stale(now)
+            rows = self._conn.execute(
+                "SELECT priority, enqueued_at FROM tickets WHERE owner != ?", (self.owner,)
+            ).fetchall()
+        best = None
+        for priority, enqueued_at in rows:
+            aged = int((now - enqueued_at) // aging_seconds) if aging_seconds > 0 else 0
+            value = max(0, priority - aged)
+            best = value if best is None else min(best, value)
+        return best
+
+    # ============== 하트비트 ==============
+
+    def heartbeat(self) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO owners (owner, heartbeat) VALUES (?, ?) "
+                "ON CONFLICT(owner) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (self.owner, time.time())
+            )
+
+    def close(self) -> None:
+        """이 프로세스의 요청을 지우고 연결 종료"""
+        self._stopped.set()
+        with self._lock:
+            self._conn.execute("DELETE FROM tickets WHERE owner = ?", (self.owner,))
+            self._conn.execute("DELETE FROM owners WHERE owner = ?", (self.owner,))
+            self._conn.close()
+
+    def _beat(self) -> None:
+        while not self._stopped.wait(self.lease_ttl / 3):
+            try:
+                self.heartbeat()
+            except sqlite3.Error as e:
+                print(f"⚠️ 영상 대기열 하트비트 실패: {e}")
+
+    def _purge_stale(self, now: float) -> None:
+        stale = [row[0] for row in self._conn.execute(
+            "SELECT owner FROM owners WHERE heartbeat < ?", (now - self.lease_ttl,)
+        ).fetchall()]
+        for owner in stale:
+            self._conn.execute("DELETE FROM tickets WHERE owner = ?", (owner,))
+            self._conn.execute("DELETE FROM owners WHERE owner = ?", (owner,))
+        # 하트비트 기록 없이 남은 요청 (기록 전에 종료된 프로세스)
+        self._conn.execute("DELETE FROM tickets WHERE owner NOT IN (SELECT owner FROM owners)")
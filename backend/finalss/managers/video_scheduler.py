@@ -0,0 +1,227 @@
+# ==================================================================================
+# managers/video_scheduler.py - 영상 생성(Veo) 요청 스케줄러 (우선순위 + 키별 동시 실행 제한)
+# ==================================================================================
+
+import time
+import sqlite3
+import itertools
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config_manager import ConfigManager
+from .video_leases import VideoLeaseBoard
+
+
+# 우선순위 클래스 (숫자가 작을수록 먼저)
+# interactive: 웹 사용자가 기다리는 작업, speculative: 사전 생성 풀, batch: 대량 생성
+PRIORITIES = {"interactive": 0, "speculative": 1, "batch": 2}
+
+# (queue position, estimated seconds until start)
+WaitHook = Callable[[int, float], None]
+
+
+@dataclass
+class VideoTicket:
+    """영상 생성 요청 하나 (대기 → 키 배정 → 실행 → 반납)"""
+    job_id: str
+    priority: str
+    keys: Tuple[int, ...]          # 쓸 수 있는 API 키 인덱스
+    seq: int
+    enqueued_at: float
+    key: Optional[int] = None      # 배정된 키
+    started_at: Optional[float] = None
+    position: int = 0              # 대기열 순번 (0 = 다음 차례)
+    eta_s: float = 0.0             # 시작까지 예상 시간
+
+    @property
+    def priority_value(self) -> int:
+        return PRIORITIES[self.priority]
+
+
+class VideoScheduler:
+    """
+    프로세스 공용 영상 생성 스케줄러
+    - 키별 동시 실행 수 제한 (per_key_concurrency), 자리가 나면 대기 요청 중 우선순위 순으로 배정
+    - 우선순위: interactive > speculative > batch, aging_seconds마다 한 단계씩 올라감 (무한 대기 방지)
+    - 같은 우선순위 안에서는 지금 실행 중인 요청이 적은 작업부터 (작업 간 공정 분배), 그다음 먼저 온 순서
+    - 대기 순번/예상 시작 시간: 최근 영상 생성 소요 시간(지수 이동 평균)으로 추정
+    - shared_db가 있으면 다른 프로세스(웹 서버, 배치 워커)와 대기 목록을 공유 (VideoLeaseBoard):
+      다른 프로세스에 더 높은 우선순위 요청이 대기/실행 중이면 낮은 우선순위 요청은 시작하지 않음
+      (키 인덱스는 프로세스마다 순서가 달라서 per_key_concurrency는 프로세스 안에서만 적용)
+    """
+
+    def __init__(self, per_key_concurrency: int = 2, aging_seconds: float = 600.0,
+                 default_duration: float = 90.0, shared_db: str = "", lease_ttl: float = 30.0,
+                 poll_interval: float = 2.0):
+        self.per_key_concurrency = max(1, int(per_key_concurrency))
+        self.aging_seconds = aging_seconds
+        self.poll_interval = poll_interval
+        self._board = VideoLeaseBoard(shared_db, lease_ttl) if shared_db else None
+        self._avg_duration = default_duration
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: List[VideoTicket] = []
+        self._running: List[VideoTicket] = []
+
+    # ============== 배정 ==============
+
+    @contextmanager
+    def slot(self, job_id: str, priority: str = "interactive", keys: Iterable[int] = (0,),
+             on_wait: Optional[WaitHook] = None) -> Iterator[VideoTicket]:
+        """
+        영상 생성 자리 확보 (블록을 나가면 반납)
+
+        with scheduler.slot(job_id, "batch", keys=range(2)) as ticket:
+            client = config.get_google_client(ticket.key)
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"알 수 없는 우선순위: {priority}")
+        ticket = VideoTicket(job_id=job_id, priority=priority, keys=tuple(keys) or (0,),
+                             seq=next(self._seq), enqueued_at=time.time())
+        with self._cond:
+            self._waiting.append(ticket)
+            self._dispatch()
+        try:
+            self._wait(ticket, on_wait)
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    def _wait(self, ticket: VideoTicket, on_wait: Optional[WaitHook]) -> None:
+        last_position = None
+        while True:
+            with self._cond:
+                if ticket.key is None:
+                    # 다른 프로세스의 반납은 알림이 오지 않으므로 공유 대기열을 주기적으로 다시 확인
+                    self._cond.wait(timeout=self.poll_interval if self._board else 5.0)
+                    if ticket.key is None and self._board is not None:
+                        self._dispatch()
+                if ticket.key is not None:
+                    return
+                position, eta = ticket.position, ticket.eta_s
+            if on_wait is not None and position != last_position:
+                last_position = position
+                on_wait(position, eta)
+
+    def _release(self, ticket: VideoTicket) -> None:
+        with self._cond:
+            if ticket in self._running:
+                self._running.remove(ticket)
+                duration = time.time() - ticket.started_at
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+            elif ticket in self._waiting:
+                self._waiting.remove(ticket)
+            self._dispatch()
+
+    def _effective_class(self, ticket: VideoTicket, now: float) -> int:
+        aged = int((now - ticket.enqueued_at) // self.aging_seconds) if self.aging_seconds > 0 else 0
+        return max(0, PRIORITIES[ticket.priority] - aged)
+
+    def _ordered(self, now: float) -> List[VideoTicket]:
+        running_per_job: Dict[str, int] = {}
+        for ticket in self._running:
+            running_per_job[ticket.job_id] = running_per_job.get(ticket.job_id, 0) + 1
+        return sorted(self._waiting, key=lambda t: (
+            self._effective_class(t, now), running_per_job.get(t.job_id, 0), t.seq
+        ))
+
+    def _dispatch(self) -> None:
+        """빈 자리에 대기 요청 배정 + 남은 요청의 순번/예상 시간 갱신 (잠금 상태에서 호출)"""
+        now = time.time()
+        load: Dict[int, int] = {}
+        for ticket in self._running:
+            load[ticket.key] = load.get(ticket.key, 0) + 1
+        floor = self._foreign_floor(now)
+
+        granted = False
+        for ticket in self._ordered(now):
+            if floor is not None and self._effective_class(ticket, now) > floor:
+                continue  # 다른 프로세스에 더 급한 요청이 있음
+            free = [k for k in ticket.keys if load.get(k, 0) < self.per_key_concurrency]
+            if not free:
+                continue
+            key = min(free, key=lambda k: load.get(k, 0))
+            load[key] = load.get(key, 0) + 1
+            ticket.key, ticket.started_at = key, now
+            self._waiting.remove(ticket)
+            self._running.append(ticket)
+            granted = True
+
+        capacity = max(1, self.per_key_concurrency * len({k for t in self._running + self._waiting
+                                                          for k in t.keys}))
+        remaining = sorted(max(0.0, self._avg_duration - (now - t.started_at)) for t in self._running)
+        remaining += [0.0] * (capacity - len(remaining))
+        for position, ticket in enumerate(self._ordered(now)):
+            ticket.position = position
+            ticket.eta_s = round(remaining[position % capacity]
+                                 + (position // capacity) * self._avg_duration, 1)
+
+        self._publish()
+        if granted:
+            self._cond.notify_all()
+
+    def _foreign_floor(self, now: float) -> Optional[int]:
+        """다른 프로세스 요청 중 가장 높은 우선순위 (공유 대기열이 없거나 오류면 None = 제한 없음)"""
+        if self._board is None:
+            return None
+        try:
+            return self._board.best_foreign_class(now, self.aging_seconds)
+        except sqlite3.Error as e:
+            print(f"⚠️ 공유 영상 대기열 조회 실패 (이 프로세스 기준으로 배정): {e}")
+            return None
+
+    def _publish(self) -> None:
+        if self._board is None:
+            return
+        try:
+            self._board.publish(self._waiting, self._running)
+        except sqlite3.Error as e:
+            print(f"⚠️ 공유 영상 대기열 게시 실패: {e}")
+
+    # ============== 상태 ==============
+
+    def job_status(self, job_id: str) -> Dict[str, Any]:
+        """작업의 영상 생성 대기 상황 (작업 상태 응답용)"""
+        with self._cond:
+            waiting = [t for t in self._waiting if t.job_id == job_id]
+            running = sum(1 for t in self._running if t.job_id == job_id)
+            status: Dict[str, Any] = {"waiting": len(waiting), "running": running}
+            if waiting:
+                first = min(waiting, key=lambda t: t.position)
+                status.update(position=first.position, eta_s=first.eta_s, priority=first.priority)
+            return status
+
+    def stats(self) -> Dict[str, Any]:
+        """우선순위별 대기/실행 수, 키별 실행 수, 평균 소요 시간"""
+        with self._cond:
+            by_class = {name: {"waiting": 0, "running": 0} for name in PRIORITIES}
+            for ticket in self._waiting:
+                by_class[ticket.priority]["waiting"] += 1
+            keys: Dict[int, int] = {}
+            for ticket in self._running:
+                by_class[ticket.priority]["running"] += 1
+                keys[ticket.key] = keys.get(ticket.key, 0) + 1
+            return {
+                "classes": by_class,
+                "running_per_key": keys,
+                "per_key_concurrency": self.per_key_concurrency,
+                "avg_duration_s": round(self._avg_duration, 1),
+                "shared": self._board is not None,
+            }
+
+
+# ============== 프로세스 공용 스케줄러 ==============
+
+_scheduler: Optional[VideoScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_video_scheduler(config: ConfigManager) -> VideoScheduler:
+    """프로세스 공용 VideoScheduler (처음 만들 때의 video_scheduler 설정 사용)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = VideoScheduler(**config.get_video_scheduler_config())
+        return _scheduler
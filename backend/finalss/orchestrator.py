@@ -3,27 +3,32 @@
 # ==================================================================================
 
 import os
-from typing import List, Optional
-from dotenv import load_dotenv
-from google import genai
-
-try:
-    from elevenlabs.client import ElevenLabs
-    ELEVENLABS_AVAILABLE = True
-except ImportError:
-    ELEVENLABS_AVAILABLE = False
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from managers.subtitle_manager import SubtitleManager
 from managers import (
     ConfigManager,
     FileManager,
     StateManager,
+    JobManifest,
+    get_state_store,
+    get_retention_manager,
+    get_branch_store,
+    BranchStore,
     MediaGenerator,
     MergeManager,
     StoryHelper,
     StoryManager,
+    StagePipeline,
+    PipelineStep,
+    StepFailed,
 )
+from managers.stage_pipeline import ProgressHook, StepDoneHook
 from utils.user_interaction import UserInteraction
+from utils.atomic_io import link_or_copy
 
 from agents import (
     GuardianAgent,
@@ -34,26 +39,37 @@ from agents import (
 )
 
 
+# (stage_no, options) → 고른 선택지 텍스트 (자동 진행: 배치, CLI --auto)
+ChoicePicker = Callable[[int, List[str]], str]
+
+
 class Orchestrator:
     """
     새로운 5막 워크플로우 오케스트레이터
     - 웹에서 선택한 art_style 동적 적용
     """
     
-    def __init__(self, config_path: str = "config/default_config.yaml", art_style: str = "pixar"):
-        load_dotenv()
-        
+    def __init__(self, config_path: str = "config/default_config.yaml", art_style: str = "pixar",
+                 output_base: Optional[str] = None, job_id: Optional[str] = None):
         # 웹에서 선택한 스타일 저장
         self.art_style = art_style
         print(f"🎨 선택된 스타일: {art_style}")
         
-        # 설정 및 매니저
+        # 설정 및 매니저 (output_base: 다른 작업과 겹치지 않는 별도 출력 디렉토리, 사전 생성 풀 등)
         self.config = ConfigManager(config_path)
+        if output_base:
+            self.config = self.config.with_output_base(output_base)
         self.file_mgr = FileManager(self.config)
         self.state = StateManager(
-            state_file=self.file_mgr.get_state_file_path(),
-            progress_file=self.file_mgr.get_progress_file_path()
+            state_file=self.file_mgr.get_state_file_path(job_id),
+            progress_file=self.file_mgr.get_progress_file_path(job_id),
+            journal_file=self.file_mgr.get_journal_file_path(job_id),
+            store=(get_state_store(self.file_mgr.get_state_db_path())
+                   if self.config.get_state_backend() == "sqlite" else None),
+            **self.config.get_state_config()
         )
+        # job_id가 있으면 작업별 매니페스트 (웹 작업들은 같은 출력 디렉토리를 함께 씀)
+        self.manifest = JobManifest(self.file_mgr.get_manifest_file_path(job_id))
         
         # AI 에이전트
         self.guardian = GuardianAgent(self.config)
@@ -67,25 +83,44 @@ class Orchestrator:
             self.config, self.file_mgr, self.state,
             art_style=self.art_style,  # 핵심: 웹에서 선택한 스타일 전달
             art_director=self.art_director,
-            motion_director=self.motion_director
+            motion_director=self.motion_director,
+            manifest=self.manifest
         )
         self.merger = MergeManager(self.config, self.file_mgr, self.state)
+        self.retention = get_retention_manager(self.config, self.file_mgr, self.media.artifacts)
         self.story_helper = StoryHelper(self.config)
         self.story_manager = StoryManager(self.config, self.state)
         self.ui = UserInteraction(self.config)
-        self.subtitle_mgr = SubtitleManager()
+        self.subtitle_mgr = SubtitleManager(
+            os.path.join(os.path.dirname(self.file_mgr.get_final_video_path()), "subtitles.srt")
+        )
+        # 공유 분기 저장소 (같은 경로 + 같은 선택의 막 재사용, 배치는 작업 간 공유 저장소로 교체)
+        self.branches: Optional[BranchStore] = (
+            get_branch_store(self.config, self.file_mgr)
+            if self.config.get_branch_store_config()["enabled"] else None
+        )
         
         print("✅ 5막 워크플로우 오케스트레이터 초기화 완료")
         
         self.stage_stories: List[str] = []
         self.stage_images: List[List[str]] = []
+        # 막 스토리/이미지/자막 목록 보호 (자동 선택 모드에서는 여러 막이 동시에 진행)
+        self._stage_lock = threading.RLock()
+        # 막 완료 후 최종 화질 재렌더 예약 여부 (사전 생성 풀은 끔)
+        self.background_render = True
     
     def _init_api_clients(self) -> None:
         """API 클라이언트 초기화 (더 이상 사용 안 함)"""
         pass
     
-    def run(self) -> None:
-        """전체 파이프라인 실행"""
+    def run(self, choose: Optional[ChoicePicker] = None) -> None:
+        """
+        전체 파이프라인 실행
+        
+        Args:
+            choose: 선택지 자동 선택 함수 (없으면 매 막 사용자에게 입력 받음)
+                    자동 선택이면 앞 막 이미지가 나오는 대로 다음 막을 겹쳐 실행
+        """
         try:
             self.file_mgr.ensure_all_directories()
             
@@ -99,23 +134,10 @@ class Orchestrator:
             print("   - 총 길이: 약 115초 (2분)")
             print("="*60)
             
-            # 5막 순차 실행
-            for stage_no in range(1, 6):
-                stage_info = self.config.get_stage_info(stage_no)
-                
-                print(f"\n{'='*60}")
-                print(f"📖 {stage_no}막: {stage_info.get('name', '')} - {stage_info.get('description', '')}")
-                print(f"{'='*60}")
-                
-                success = self._run_stage(stage_no)
-                
-                if not success:
-                    print(f"\n❌ {stage_no}막 실패. 중단합니다.")
-                    self._save_progress()
-                    return
-                
-                print(f"\n✅ {stage_no}막 완료!")
-                self._save_progress()
+            completed = (self._run_stages_overlapped(choose) if choose is not None
+                         else self._run_stages_sequential())
+            if not completed:
+                return
             
             # 최종 병합
             print("\n" + "="*60)
@@ -138,99 +160,594 @@ class Orchestrator:
             traceback.print_exc()
             self._save_progress()
     
+    # ============== 막 실행 ==============
+    
+    def _run_stages_sequential(self) -> bool:
+        """5막 순차 실행 (대화형: 매 막 선택지 입력)"""
+        for stage_no in range(1, 6):
+            stage_info = self.config.get_stage_info(stage_no)
+            
+            print(f"\n{'='*60}")
+            print(f"📖 {stage_no}막: {stage_info.get('name', '')} - {stage_info.get('description', '')}")
+            print(f"{'='*60}")
             
-            choice = self.ui.get_choice(valid_options=["1", "2", "3", "4"])
+            success = self._run_stage(stage_no)
+            
+            if not success:
+                print(f"\n❌ {stage_no}막 실패. 중단합니다.")
+                self._save_progress()
+                return False
             
-            if choice == "4":
+            print(f"\n✅ {stage_no}막 완료!")
+            self._save_progress()
+        return True
+    
+    def _run_stage(self, stage_no: int) -> bool:
+        """CLI 막 실행 (선택지 입력 → 공통 파이프라인)"""
+        history = self.stage_history(stage_no)
+        choice = None
+        
+        if stage_no > 1:
+            options = self.story_manager.get_next_options(stage_no, history)
+            self.ui.display_options(options, self.config.get_stage_info(stage_no), turn=stage_no)
+            selected = self.ui.get_choice()
+            
+            # 5: 저장 후 종료, 4: 입력 중 Ctrl+C
+            if selected in ("4", "5") or len(options) < 3:
                 print("\n💾 진행 상황을 저장하고 종료합니다...")
                 self._save_progress()
                 return False
-            elif choice == "3":
-                custom_text = input("\n✍️ 원하는 전개를 입력하세요: ").strip()
-                if not custom_text:
-                    story = self.story_helper.generate_stage_story(stage_no, history)
-                else:
-                    validated_text = self.guardian.validate_and_sanitize(
-                        custom_text, stage_no, self.config.get_blocked_words()
-                    )
-                    story_data = self.scenario_agent.generate_3_scene_story(
-                        validated_text, stage_no, history
-                    )
-                    story = story_data["full_script"]
+            choice = options[int(selected) - 1]
+            self.ui.show_selected(choice)
+        
+        result = self.run_stage(stage_no, self._story_producer(stage_no, choice), user_choice=choice)
+        if not result["success"]:
+            print(f"   ❌ {result['error']}")
+        return result["success"]
+    
+    def stage_history(self, stage_no: int) -> str:
+        """stage_no 막 직전까지의 스토리 (다음 막 생성 맥락)"""
+        with self._stage_lock:
+            return " ".join(self.stage_stories[:stage_no - 1])
+    
+    def _story_producer(self, stage_no: int,
+                        choice: Optional[str]) -> Callable[[], Tuple[str, List[str], Dict[str, Any]]]:
+        """CLI/자동 진행 막 스토리 생성 함수 (히스토리는 실행 시점의 앞 막 스토리)"""
+        def produce_story():
+            history = self.stage_history(stage_no)
+            print(f"\n1️⃣ {stage_no}막 스토리 생성 중...")
+            if not choice:
+                story = self.story_helper.generate_stage_story(stage_no, history)
             else:
-                option_idx = int(choice) - 1
-                selected_text = options[option_idx]
-                print(f"\n📝 선택된 스토리: {selected_text}")
-                story_data = self.scenario_agent.generate_3_scene_story(
-                    selected_text, stage_no, history
+                validated_text = self.guardian.validate_and_sanitize(
+                    choice, stage_no, self.config.get_blocked_words()
                 )
-                story = story_data["full_script"]
+                story = self.scenario_agent.generate_3_scene_story(
+                    validated_text, stage_no, history
+                )["full_script"]
+            if not story:
+                raise StepFailed("스토리 생성 실패")
+            
+            print(f"   📝 스토리 ({len(story)}자): {story[:80]}...")
+            print(f"\n2️⃣ {stage_no}막 스토리를 3개 장면으로 분할 중...")
+            scene_texts = self.story_helper.split_story_into_scenes(story)
+            if len(scene_texts) != 3:
+                raise StepFailed(f"장면 분할 실패 (3개 필요, {len(scene_texts)}개 생성)")
+            for i, scene in enumerate(scene_texts, 1):
+                print(f"   🎬 장면 {i}: {scene[:50]}...")
+            return story, scene_texts, {}
         
-        if not story:
-            print("   ❌ 스토리 생성 실패")
-            return False
+        return produce_story
+    
+    def _run_stages_overlapped(self, choose: ChoicePicker) -> bool:
+        """
+        자동 선택 모드 막 실행 (배치, CLI --auto)
+        - 다음 막에 필요한 건 앞 막 스토리(히스토리)와 이미지(레퍼런스)뿐
+          → N막 이미지가 나오면 바로 N+1막 선택/스토리/이미지 시작 (N막 영상/병합/합성과 겹침)
+        - 자막 추가/최종 렌더 예약(finish)은 막 순서대로: N+1막 finish는 N막이 끝날 때까지 대기
+        - 앞 막이 실패하면 아직 시작 안 한 막은 시작하지 않고, 진행 중인 막은 finish에서 실패 처리
+        """
+        stages = range(1, 6)
+        images_ready = {n: threading.Event() for n in stages}  # 이미지 완료 또는 막 종료
+        finished = {n: threading.Event() for n in stages}
+        images_ok: Dict[int, bool] = {}
+        success: Dict[int, bool] = {}
+        
+        def previous_ok(stage_no: int) -> bool:
+            finished[stage_no - 1].wait()
+            return success.get(stage_no - 1, False)
+        
+        def run_one(stage_no: int) -> None:
+            try:
+                if stage_no > 1:
+                    images_ready[stage_no - 1].wait()
+                    if not images_ok.get(stage_no - 1) or False in success.values():
+                        success[stage_no] = False
+                        return
+                
+                # 이어서 실행: 이미 스토리가 있는 막은 그때 고른 선택 그대로
+                choice = None
+                if self.manifest.is_step_done(stage_no, "story"):
+                    choice = self.manifest.get_stage(stage_no).extra.get("user_choice")
+                if stage_no > 1 and choice is None:
+                    history = self.stage_history(stage_no)
+                    options = self.next_options(
+                        stage_no, lambda: self.story_manager.get_next_options(stage_no, history)
+                    )
+                    if not options:
+                        print(f"   ❌ {stage_no}막 선택지 생성 실패")
+                        success[stage_no] = False
+                        return
+                    choice = choose(stage_no, options)
+                    print(f"\n🤖 {stage_no}막 자동 선택: {choice}")
+                
+                def on_step_done(name: str, value: Any) -> None:
+                    if name == "images":
+                        images_ok[stage_no] = True
+                        images_ready[stage_no].set()
+                
+                result = self.run_stage(
+                    stage_no, self._story_producer(stage_no, choice), user_choice=choice,
+                    on_step_done=on_step_done,
+                    finish_after=(lambda: previous_ok(stage_no)) if stage_no > 1 else None,
+                )
+                success[stage_no] = result["success"]
+                if not result["success"]:
+                    print(f"   ❌ {stage_no}막: {result['error']}")
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                print(f"   ❌ {stage_no}막 오류: {e}")
+                success[stage_no] = False
+            finally:
+                images_ready[stage_no].set()
+                finished[stage_no].set()
         
-        print(f"   📝 스토리 ({len(story)}자): {story[:80]}...")
-        self.stage_stories.append(story)
+        with ThreadPoolExecutor(max_workers=len(stages), thread_name_prefix="stage") as pool:
+            for stage_no in stages:
+                pool.submit(run_one, stage_no)
+            
+            for stage_no in stages:
+                finished[stage_no].wait()
+                if not success.get(stage_no):
+                    print(f"\n❌ {stage_no}막 실패. 중단합니다.")
+                    self._save_progress()
+                    return False
+                print(f"\n✅ {stage_no}막 완료!")
+                self._save_progress()
+        return True
+    
+    def run_stage(self, stage_no: int,
+                  produce_story: Callable[[], Tuple[str, List[str], Dict[str, Any]]],
+                  user_choice: Optional[str] = None,
+                  on_progress: Optional[ProgressHook] = None,
+                  progress_range: Tuple[int, int] = (10, 95),
+                  on_step_done: Optional[StepDoneHook] = None,
+                  finish_after: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """
+        막 하나 실행 (CLI와 웹 API가 함께 쓰는 단계 그래프)
         
-        # 나머지 로직 (이미지/영상/TTS 생성)은 그대로...
-        print("\n2️⃣ 스토리를 3개 장면으로 분할 중...")
-        scene_texts = self.story_helper.split_story_into_scenes(story)
+            story ─┬─ images ─┬─ videos ── merge ─┬─ mux ── finish
+                   ├─ motion ─┘                   │
+                   └─ tts ────────────────────────┘
         
-        if len(scene_texts) != 3:
-            print(f"   ❌ 장면 분할 실패")
-            return False
+        - 이미지와 모션 프롬프트/TTS는 동시에, TTS는 영상 생성이 끝날 때까지 계속 진행
+        - 매니페스트에 검증된 산출물이 있는 단계는 건너뜀 (작업 복원)
         
-        for i, scene in enumerate(scene_texts, 1):
-            print(f"   🎬 장면 {i}: {scene[:50]}...")
+        Args:
+            produce_story: 새 스토리 생성 → (story, scene_texts, extra). 실패 시 StepFailed
+            user_choice: 매니페스트의 스토리를 재사용할 때 비교할 선택 (None이면 비교 안 함)
+            on_progress: (message, percent) 진행 상황 콜백
+            on_step_done: (step, result) 단계 완료 콜백 (앞 막 이미지를 기다리는 다음 막 시작용)
+            finish_after: finish 전에 기다릴 조건 (앞 막 완료, False면 실패 처리)
         
-        print("\n3️⃣ 이미지 3개 배치 생성 중...")
-        prev_images = self._get_previous_stage_images(stage_no)
+        Returns:
+            {'success', 'story_text', 'video_path', 'images', 'extra'}
+            실패 시 {'success': False, 'error', 'failed_step', ('pending_scenes')}
+        """
+        pipeline_config = self.config.get_pipeline_config()
+        retries = pipeline_config["step_retries"]
+        branch_key = (self._serve_branch(stage_no, user_choice)
+                      if user_choice is not None or stage_no == 1 else None)
         
-        if prev_images:
-            print(f"   📎 이전 막 이미지 {len(prev_images)}개 레퍼런스로 사용")
+        def story_step(results, report):
+            restored = self._restored_story(stage_no, user_choice)
+            if restored:
+                story, scene_texts, extra = restored
+                print(f"   ♻️ {stage_no}막 스토리 복원됨, 남은 작업만 진행")
+            else:
+                story, scene_texts, extra = produce_story()
+                if user_choice is not None:
+                    extra = dict(extra, user_choice=user_choice)
+            self._keep_story(stage_no, story, scene_texts, restored=bool(restored), **extra)
+            return {"story": story, "scene_texts": scene_texts, "extra": extra}
         
-        images = self.media.generate_stage_images(
-            stage_no=stage_no,
-            scene_texts=scene_texts,
-            prev_stage_images=prev_images
-        )
+        def images_step(results, report):
+            scene_texts = results["story"]["scene_texts"]
+            prev_images = self._get_previous_stage_images(stage_no)
+            if prev_images:
+                print(f"   📎 이전 막 이미지 {len(prev_images)}개 레퍼런스로 사용")
+            images = self._cached_step(stage_no, "images", lambda: self.media.generate_stage_images(
+                stage_no=stage_no,
+                scene_texts=scene_texts,
+                prev_stage_images=prev_images
+            ))
+            with self._stage_lock:
+                self.stage_images[stage_no - 1:] = [images]
+            return images
         
-        self.stage_images.append(images)
+        def motion_step(results, report):
+            # 영상이 이미 복원되면 프롬프트도 필요 없음
+            if self.manifest.get_artifact(stage_no, "videos") is not None:
+                return []
+            return self.media.prepare_motion_prompts(stage_no, results["story"]["scene_texts"])
         
-        print("\n4️⃣ 영상 3개 생성 중...")
-        videos = self.media.generate_stage_videos(
-            stage_no=stage_no,
-            scene_texts=scene_texts,
-            stage_images=images
+        def tts_step(results, report):
+            story = results["story"]["story"]
+            return self._cached_step(stage_no, "tts", lambda: self.media.generate_stage_tts(story, stage_no))
+        
+        def videos_step(results, report):
+            images = results["images"]
+            videos = self._cached_step(stage_no, "videos", lambda: self.media.generate_stage_videos(
+                stage_no=stage_no,
+                scene_texts=results["story"]["scene_texts"],
+                stage_images=images,
+                prev_stage_images=self._get_previous_stage_images(stage_no),
+                on_progress=report
+            ))
+            # 장면 재시도 중 다시 만든 이미지 반영 (경로는 같고 내용만 바뀜)
+            if all(images) and self.manifest.get_artifact(stage_no, "images") is None:
+                if self.manifest.record_artifact(stage_no, "images", images):
+                    for path in images:
+                        self.file_mgr.publish(path)
+            return videos
+        
+        def merge_step(results, report):
+            return self._cached_step(stage_no, "merge", lambda: self.merger.video.merge_scenes_to_stage(
+                stage_no, results["videos"], on_progress=report
+            ))
+        
+        def mux_step(results, report):
+            return self._cached_step(stage_no, "mux", lambda: self.merger.muxer.mux_stage(stage_no))
+        
+        def finish_step(results, report):
+            # 자막은 막 순서대로 쌓이므로 앞 막이 끝난 뒤에 마무리
+            if finish_after is not None and not finish_after():
+                raise StepFailed(f"{stage_no - 1}막 실패로 {stage_no}막 마무리 중단")
+            if self.background_render:
+                self.merger.schedule_final_render(stage_no)
+            final_path = results["mux"]
+            if not final_path:
+                print("   ⚠️ 합성 실패, 영상만 저장")
+                merged_video = results["merge"]
+                final_path = self.file_mgr.get_stage_final_path(stage_no)
+                if merged_video and os.path.exists(merged_video):
+                    shutil.copy(merged_video, final_path)
+                    self.file_mgr.publish(final_path)
+            
+            with self._stage_lock:
+                self.subtitle_mgr.truncate(stage_no - 1)
+                self.subtitle_mgr.add_stage_subtitle(results["story"]["story"], duration=23.0)
+            return final_path
+        
+        pending_scenes: List[int] = []
+        
+        def _check_videos(videos) -> Optional[str]:
+            videos = list(videos or []) + [None] * (3 - len(videos or []))
+            pending_scenes[:] = [i for i, v in enumerate(videos, 1) if not v or not os.path.exists(v)]
+            if not pending_scenes:
+                return None
+            return (f"영상 생성 실패 ({3 - len(pending_scenes)}/3), "
+                    f"장면 {', '.join(map(str, pending_scenes))} 대기 중 (완료된 장면은 보관됨)")
+        
+        steps = [
+            PipelineStep("story", story_step, label=f"{stage_no}막 스토리 생성",
+                         retries=retries, weight=15),
+            PipelineStep("images", images_step, deps=("story",), label="이미지 3개 생성",
+                         retries=retries, weight=20,
+                         check=lambda images: None if images and any(images) else "이미지 생성 실패"),
+            PipelineStep("motion", motion_step, deps=("story",), label="모션 프롬프트 생성",
+                         required=False, weight=2),
+            PipelineStep("tts", tts_step, deps=("story",), label="TTS 생성",
+                         retries=retries, required=False, weight=8,
+                         check=lambda path: None if path else "TTS 생성 실패 (영상만 계속)"),
+            # 재시도는 장면 단위로 (MediaGenerator, pipeline.scene_retry)
+            PipelineStep("videos", videos_step, deps=("story", "images", "motion"), label="영상 3개 생성",
+                         weight=35, check=_check_videos),
+            PipelineStep("merge", merge_step, deps=("videos",), label="영상 병합",
+                         retries=retries, weight=10,
+                         check=lambda path: None if path else "영상 병합 실패"),
+            PipelineStep("mux", mux_step, deps=("merge", "tts"), label="영상+TTS 합성",
+                         retries=retries, required=False, weight=8,
+                         check=lambda path: None if path else "합성 실패"),
+            PipelineStep("finish", finish_step, deps=("story", "merge", "mux"), label="자막 정리", weight=2),
+        ]
+        
+        pipeline = StagePipeline(
+            steps,
+            max_workers=pipeline_config["max_workers"],
+            retry_delay=pipeline_config["retry_delay"],
+            on_progress=on_progress,
+            progress_range=progress_range,
+            on_step_done=on_step_done,
         )
+        outcome = pipeline.run()
+        self.state.record_event("stage_pipeline", stage=stage_no, success=outcome.success,
+                                failed_step=outcome.failed_step, timings=outcome.timings)
         
-        valid_videos = [v for v in videos if v and os.path.exists(v)]
-        if len(valid_videos) < 3:
-            print(f"   ❌ 영상 생성 실패 ({len(valid_videos)}/3)")
-            return False
+        if not outcome.success:
+            failure = {'success': False, 'error': outcome.error, 'failed_step': outcome.failed_step}
+            if outcome.failed_step == "videos":
+                failure['pending_scenes'] = list(pending_scenes)
+            return failure
         
-        print("\n5️⃣ 영상 병합 중...")
-        merged_video = self.merger.video.merge_scenes_to_stage(stage_no, videos)
+        if branch_key:
+            self._store_branch(stage_no, branch_key)
+        story = outcome.results["story"]
+        return {
+            'success': True,
+            'story_text': story["story"],
+            'video_path': outcome.results["finish"],
+            'images': outcome.results["images"],
+            'extra': story["extra"],
+        }
+    
+    def regenerate_scene(self, stage_no: int, scene_idx: int, regenerate_image: bool = False,
+                         prompt_tweak: str = "",
+                         on_progress: Optional[ProgressHook] = None) -> Dict[str, Any]:
+        """
+        완성된 막의 장면 하나만 다시 생성
+        - 그 장면의 영상(필요하면 이미지)만 새로 만들고 병합/합성은 다시 실행
+        - 다른 장면 클립과 막 TTS, 자막은 그대로 재사용
+        - 이미 최종 영상이 있으면 최종 기록을 지움 (다시 마무리해야 반영됨)
         
-        if not merged_video:
-            print("   ❌ 영상 병합 실패")
-            return False
+        Returns:
+            {'success', 'video_path', 'scene_video_path', 'image_path', 'final_invalidated'}
+            실패 시 {'success': False, 'error'}
+        """
+        progress = on_progress or (lambda message, percent: None)
+        
+        if not self.manifest.is_step_done(stage_no, "mux"):
+            return {'success': False, 'error': f'{stage_no}막이 아직 완성되지 않았습니다'}
+        scene_texts = list(self.manifest.get_stage(stage_no).scene_texts)
+        if len(scene_texts) != 3 or not 1 <= scene_idx <= 3:
+            return {'success': False, 'error': f'잘못된 장면 번호: {scene_idx}'}
         
-        print("\n6️⃣ TTS 생성 중...")
-        tts_path = self.media.generate_stage_tts(story, stage_no)
+        images = [self.file_mgr.get_stage_image_path(stage_no, i) for i in range(1, 4)]
+        videos = [self.file_mgr.get_stage_video_path(stage_no, i) for i in range(1, 4)]
+        others = [v for i, v in enumerate(videos, 1) if i != scene_idx]
+        if not all(self.media.artifacts.is_valid(v, "video") for v in others):
+            return {'success': False,
+                    'error': '다른 장면 영상이 정리되어 이 막을 다시 병합할 수 없습니다'}
         
-        print("\n7️⃣ 영상+TTS 합성 중...")
+        if prompt_tweak:
+            prompt_tweak = self.guardian.validate_and_sanitize(
+                prompt_tweak, stage_no, self.config.get_blocked_words()
+            )
+        
+        label = f"{stage_no}막 장면 {scene_idx}"
+        self.state.set_current_step(f"scene_{scene_idx}_regenerate", stage_no)
+        progress(f"{label} {'이미지부터 ' if regenerate_image else ''}다시 생성 중...", 10)
+        video = self.media.regenerate_scene(
+            stage_no, scene_idx, scene_texts,
+            prev_stage_images=self._get_previous_stage_images(stage_no),
+            regenerate_image=regenerate_image,
+            prompt_tweak=prompt_tweak
+        )
+        if not video:
+            return {'success': False, 'error': f'{label} 생성 실패 (기존 영상 유지)'}
+        
+        if regenerate_image:
+            self._record_step(stage_no, "images", images)
+            with self._stage_lock:
+                self.stage_images[stage_no - 1:stage_no] = [images]
+        self._record_step(stage_no, "videos", videos)
+        
+        # 병합/합성은 빌드 그래프 기준으로 바뀐 입력만 다시 처리 (TTS는 그대로)
+        progress(f"{label} 반영: 영상 병합 중...", 70)
+        self.state.set_current_step("merge", stage_no)
+        merged = self.merger.video.merge_scenes_to_stage(stage_no, videos)
+        if not self._record_step(stage_no, "merge", merged):
+            return {'success': False, 'error': '영상 병합 실패'}
+        
+        progress(f"{label} 반영: 영상+TTS 합성 중...", 88)
+        self.state.set_current_step("mux", stage_no)
         final_path = self.merger.muxer.mux_stage(stage_no)
+        if not self._record_step(stage_no, "mux", final_path):
+            return {'success': False, 'error': '합성 실패'}
+        self.merger.schedule_final_render(stage_no)
         
-        if not final_path:
-            import shutil
-            final_path = self.file_mgr.get_stage_final_path(stage_no)
-            if merged_video and os.path.exists(merged_video):
-                shutil.copy(merged_video, final_path)
+        final_invalidated = bool(self.manifest.final)
+        self.manifest.clear_final()
+        self.state.record_event("scene_regenerated", stage=stage_no, scene=scene_idx,
+                                regenerate_image=regenerate_image, prompt_tweak=prompt_tweak)
         
-        self.subtitle_mgr.add_stage_subtitle(story, duration=23.0)
+        return {
+            'success': True,
+            'video_path': final_path,
+            'scene_video_path': video,
+            'image_path': images[scene_idx - 1],
+            'final_invalidated': final_invalidated,
+        }
+    
+    # ============== 공유 분기 ==============
+    
+    def _path_hash(self, stage_no: int) -> str:
+        """stage_no 막 직전까지의 경로 해시 (동화, 스타일, 1~(stage_no-1)막 스토리)"""
+        with self._stage_lock:
+            stories = list(self.stage_stories[:stage_no - 1])
+        return self.branches.path_hash(self.manifest.meta.get("tale_title", ""), self.art_style, stories)
+    
+    def next_options(self, stage_no: int, generate: Callable[[], List[str]]) -> List[str]:
+        """
+        stage_no 막 선택지 (같은 경로에서 만든 선택지가 저장되어 있으면 그대로 사용)
+        같은 경로의 사용자가 같은 선택지를 보게 되어 공유 분기 적중률이 올라감
+        """
+        if self.branches is None:
+            return generate()
+        path_hash = self._path_hash(stage_no)
+        cached = self.branches.get_options(path_hash, stage_no)
+        if cached:
+            print(f"🌳 공유 분기 선택지 사용: {stage_no}막")
+            return cached
+        options = generate()
+        if options:
+            self.branches.put_options(path_hash, stage_no, options)
+        return options
+    
+    def _serve_branch(self, stage_no: int, user_choice: Optional[str]) -> Optional[str]:
+        """
+        같은 경로 + 같은 선택의 막이 저장되어 있으면 이 작업으로 가져옴
+        → 이후 파이프라인은 저장된 산출물만 확인하고 끝남
+        1막은 동화 + 스타일의 뿌리 분기 (같은 1막에서 시작해야 뒤 막의 경로 해시가 일치)
+        
+        Returns:
+            분기 키 (저장소 사용 안 함이면 None)
+        """
+        if self.branches is None or len(self.stage_stories) < stage_no - 1:
+            return None
+        tale = self.manifest.meta.get("tale_title", "")
+        if stage_no == 1:
+            key = self.branches.root_key(tale, self.art_style)
+        else:
+            key = self.branches.branch_key(tale, self.art_style, self._path_hash(stage_no), user_choice)
+        if self._restored_story(stage_no, user_choice) is not None:
+            return key  # 이 작업에 이미 있는 막 (재시도, 이어서 실행)
+        
+        bundle = self.branches.lookup(key, depth=stage_no)
+        if bundle is None:
+            return key
+        if user_choice is not None:
+            bundle = dict(bundle, extra=dict(bundle.get("extra", {}), user_choice=user_choice))
+        try:
+            if self.adopt_stage_bundle(stage_no, bundle, move=False):
+                self.state.record_event("branch_reused", stage=stage_no, branch=key[:12])
+        except Exception as e:
+            print(f"⚠️ 공유 분기 적용 실패 (새로 생성): {e}")
+        return key
+    
+    def has_root_branch(self) -> bool:
+        """이 동화/스타일의 1막 뿌리 분기가 저장되어 있는지 (있으면 1막 사전 생성 풀보다 우선)"""
+        if self.branches is None:
+            return False
+        return self.branches.has(self.branches.root_key(self.manifest.meta.get("tale_title", ""),
+                                                        self.art_style))
+    
+    def _store_branch(self, stage_no: int, key: str) -> None:
+        """완성된 막을 공유 분기로 저장 (실패해도 작업에는 영향 없음)"""
+        bundle = self.export_stage_bundle(stage_no)
+        if bundle is not None:
+            self.branches.record(key, stage_no, bundle)
+    
+    # ============== 작업 복원 / 산출물 캐시 ==============
+    
+    # 막 번들에 들어가는 단계 산출물 (사전 생성 풀)
+    BUNDLE_STEPS = ("images", "videos", "merge", "tts", "mux")
+    
+    def export_stage_bundle(self, stage_no: int) -> Optional[Dict[str, Any]]:
+        """완성된 막의 스토리와 산출물 경로 (모든 단계가 검증된 경우만)"""
+        if not self.manifest.is_step_done(stage_no, "story"):
+            return None
+        record = self.manifest.get_stage(stage_no)
+        files = {step: self.manifest.get_artifact(stage_no, step) for step in self.BUNDLE_STEPS}
+        if any(paths is None for paths in files.values()):
+            return None
+        return {
+            "story": record.story,
+            "scene_texts": list(record.scene_texts),
+            "extra": {k: v for k, v in record.extra.items() if k != "user_choice"},
+            "files": files,
+        }
+    
+    def adopt_stage_bundle(self, stage_no: int, bundle: Dict[str, Any], move: bool = True) -> bool:
+        """
+        미리 만든 막 번들을 이 작업의 산출물로 가져옴 (파일 이동 + 매니페스트 기록)
+        이후 run_stage는 모든 단계가 복원되어 자막/상태만 처리하고 바로 끝남
+        move=False: 번들 파일은 그대로 두고 링크/복사 (공유 분기처럼 다른 작업도 쓰는 번들)
+        """
+        scene_texts = list(bundle["scene_texts"])
+        targets = {
+            "images": [self.file_mgr.get_stage_image_path(stage_no, i) for i in range(1, 4)],
+            "videos": [self.file_mgr.get_stage_video_path(stage_no, i) for i in range(1, 4)],
+            "merge": self.file_mgr.get_stage_merged_video_path(stage_no),
+            "tts": self.file_mgr.get_stage_tts_path(stage_no),
+            "mux": self.file_mgr.get_stage_final_path(stage_no),
+        }
+        transfer = shutil.move if move else link_or_copy
+        self.file_mgr.ensure_all_directories()
+        for step in self.BUNDLE_STEPS:
+            sources = bundle["files"][step]
+            sources = sources if isinstance(sources, list) else [sources]
+            dests = targets[step] if isinstance(targets[step], list) else [targets[step]]
+            for src, dst in zip(sources, dests):
+                if not src or not os.path.exists(src):
+                    print(f"   ⚠️ 번들 파일 없음: {src}")
+                    return False
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                transfer(src, dst)
         
+        self._keep_story(stage_no, bundle["story"], scene_texts, **bundle.get("extra", {}))
+        if not self.media.adopt_stage_media(stage_no, scene_texts, targets["images"], targets["videos"],
+                                            prev_stage_images=self._get_previous_stage_images(stage_no)):
+            return False
+        for step, kind in (("merge", "video"), ("tts", "audio"), ("mux", "video")):
+            if not self.media.artifacts.record(targets[step], kind):
+                return False
+        for step in self.BUNDLE_STEPS:
+            if not self._record_step(stage_no, step, targets[step]):
+                return False
+        with self._stage_lock:
+            self.stage_images[stage_no - 1:] = [targets["images"]]
+        print(f"   ⚡ {stage_no}막 미리 만든 번들 사용")
+        return True
+    
+    def _restored_story(self, stage_no: int,
+                        user_choice: Optional[str] = None) -> Optional[Tuple[str, List[str], Dict[str, Any]]]:
+        """
+        매니페스트에 남아 있는 막 스토리 (같은 선택으로 다시 실행할 때만)
+        선택이 다르면 None → 새로 생성
+        """
+        if not self.manifest.is_step_done(stage_no, "story"):
+            return None
+        record = self.manifest.get_stage(stage_no)
+        if len(record.scene_texts) != 3:
+            return None
+        if user_choice is not None and record.extra.get("user_choice") != user_choice:
+            return None
+        return record.story, list(record.scene_texts), dict(record.extra)
+    
+    def _keep_story(self, stage_no: int, story: str, scene_texts: List[str],
+                    restored: bool = False, **extra) -> None:
+        """막 스토리를 누적 목록에 반영 (같은 막을 다시 실행해도 중복되지 않도록)"""
+        with self._stage_lock:
+            del self.stage_stories[stage_no - 1:]
+            del self.stage_images[stage_no - 1:]
+            self.stage_stories.append(story)
+        if not restored:
+            extra.setdefault("subtitle_duration", 23.0)
+            self.manifest.set_story(stage_no, story, scene_texts, **extra)
+    
+    def _cached_step(self, stage_no: int, step: str, produce: Callable[[], Any]) -> Any:
+        """
+        매니페스트에서 검증된 산출물이 있으면 재사용, 없으면 produce() 실행 후 기록
+        """
+        cached = self.manifest.get_artifact(stage_no, step)
+        if cached is not None:
+            print(f"   ♻️ {stage_no}막 {step} 복원됨 (해시 일치), 스킵")
+            return cached
+        self.state.set_current_step(step, stage_no)
+        result = produce()
+        self._record_step(stage_no, step, result)
+        return result
+    
+    def _record_step(self, stage_no: int, step: str, result: Any) -> bool:
+        """단계 산출물을 매니페스트/상태에 기록하고 저장소에 게시"""
+        if not result or not self.manifest.record_artifact(stage_no, step, result):
+            return False
+        for path in (result if isinstance(result, list) else [result]):
+            sha256 = self.manifest.hashes.get(path, {}).get("sha256", "")
+            self.state.record_artifact(path, step, stage_no, sha256)
+            self.file_mgr.publish(path)
         return True
     
     def _get_previous_stage_images(self, stage_no: int) -> List[str]:
@@ -239,17 +756,58 @@ class Orchestrator:
             return []
         
         prev_idx = stage_no - 2
-        if prev_idx >= 0 and prev_idx < len(self.stage_images):
-            prev_images = self.stage_images[prev_idx]
+        with self._stage_lock:
+            prev_images = list(self.stage_images[prev_idx]) if prev_idx < len(self.stage_images) else None
+        if prev_images is not None:
             valid = [img for img in prev_images if img and os.path.exists(img)]
             if valid:
                 return valid
         
         return self.file_mgr.get_stage_images(stage_no - 1)
     
+    def restore_from_manifest(self, job_id: Optional[str] = None) -> List[int]:
+        """
+        작업 매니페스트로부터 막별 스토리/이미지/자막 복원
+        job_id가 주어졌는데 매니페스트의 작업과 다르면 새 작업으로 초기화
+        
+        Returns:
+            합성까지 끝난 막 번호 목록
+        """
+        loaded = self.manifest.load()
+        if not loaded or (job_id is not None and self.manifest.job_id != job_id):
+            self.manifest.reset(job_id=job_id, art_style=self.art_style)
+            return []
+        
+        self.stage_stories = []
+        self.stage_images = []
+        self.subtitle_mgr.truncate(0)
+        
+        for stage_no in sorted(self.manifest.stages):
+            if stage_no != len(self.stage_stories) + 1 or not self.manifest.is_step_done(stage_no, "story"):
+                break
+            record = self.manifest.get_stage(stage_no)
+            self.stage_stories.append(record.story)
+            images = self.manifest.get_artifact(stage_no, "images")
+            if images is None:
+                break
+            self.stage_images.append(images)
+        
+        completed = self.manifest.completed_stages()
+        for stage_no in completed:
+            record = self.manifest.get_stage(stage_no)
+            self.subtitle_mgr.add_stage_subtitle(
+                record.story, duration=record.extra.get("subtitle_duration", 23.0)
+            )
+        
+        if self.stage_stories:
+            print(f"♻️ 작업 복원: 스토리 {len(self.stage_stories)}막, 완료 {len(completed)}막")
+        return completed
+    
     def _save_progress(self) -> None:
         """진행 상황 저장"""
-        self.state.history = " ".join(self.stage_stories)
+        with self._stage_lock:
+            history = " ".join(self.stage_stories)
+        self.state.set_history(history)
         self.state.save_progress()
     
     def _finalize(self) -> None:
@@ -275,4 +833,7 @@ class Orchestrator:
                     f.write("=" * 60 + "\n")
                 print(f"📖 스토리 저장: {story_path}")
             except Exception as e:
-                print(f"⚠️ 스토리 저장 실패: {e}")
\ No newline at end of file
+                print(f"⚠️ 스토리 저장 실패: {e}")
+        
+        # 작업별 보관 + 중간 산출물 정리 + 디스크 한도 적용
+        self.retention.on_job_finalized(self.state.job_id, manifest=self.manifest)
\ No newline at end of file
@@ -4,8 +4,9 @@
 # ==================================================================================
 
 import os
-from typing import Optional, Callable
+from typing import Callable, List, Optional, Tuple
 from orchestrator import Orchestrator
+from managers import StepFailed
 
 
 class OrchestratorAPI:
@@ -15,7 +16,8 @@ class OrchestratorAPI:
     - 진행 상황 콜백 지원
     """
     
-    def __init__(self, config_path: str = "config/default_config.yaml", art_style: str = "pixar"):
+    def __init__(self, config_path: str = "config/default_config.yaml", art_style: str = "pixar",
+                 job_id: Optional[str] = None, output_base: Optional[str] = None):
         # 절대 경로로 변환 (현재 파일 위치 기준)
         script_dir = os.path.dirname(os.path.abspath(__file__))
         abs_config_path = os.path.join(script_dir, config_path)
@@ -24,9 +26,15 @@ class OrchestratorAPI:
             raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {abs_config_path}")
         
         # Orchestrator에 art_style 전달
-        self.orch = Orchestrator(abs_config_path, art_style=art_style)
+        self.orch = Orchestrator(abs_config_path, art_style=art_style, output_base=output_base,
+                                 job_id=job_id)
+        # 작업 ID를 먼저 지정 (재생되는 씬/막 상태가 이 작업으로 저장소에 반영되도록)
+        self.job_id = job_id
+        self.orch.state.bind_job(job_id or "local", art_style=art_style)
         # 상태 로드 (이전 스토리 히스토리 복원)
         self.orch.state.load_progress()
+        # 작업 매니페스트로 막별 스토리/산출물 복원 (완료된 단계는 건너뜀)
+        self.completed_stages = self.orch.restore_from_manifest(job_id)
         self.progress_callback: Optional[Callable] = None
     
     def get_stage_options(self, stage_no: int) -> list:
@@ -34,6 +42,7 @@ class OrchestratorAPI:
         다음 단계 선택지 생성
         - 5막: Epilogue Director (결말 선택지)
         - 2~4막: Story Manager (일반 선택지)
+        - 같은 경로에서 이미 만든 선택지가 공유 분기 저장소에 있으면 그대로 사용 (Orchestrator.next_options)
         
         Args:
             stage_no: 옵션을 생성할 막 번호
@@ -42,23 +51,7 @@ class OrchestratorAPI:
             2개의 옵션 리스트
         """
         try:
-            # 🎬 핵심: 5막 선택지는 Epilogue Director 사용!
-            if stage_no == 5:
-                print(f"\n🎬 Epilogue Director: 5막 결말 선택지 생성 중...")
-                epilogue_data = self.orch.epilogue_director.generate_ending_options(
-                    all_stories=self.orch.stage_stories,  # 1~4막 스토리
-                    user_choices=[]
-                )
-                options = epilogue_data["options"]
-                print(f"   ✅ 결말 선택지 생성 완료")
-                print(f"   📖 교훈: {epilogue_data.get('moral_lesson', '')}")
-                return options
-            
-            # 2~4막: 기존 StoryManager 사용
-            cumulative_history = " ".join(self.orch.stage_stories) if self.orch.stage_stories else ""
-            all_options = self.orch.story_manager.get_next_options(stage_no, cumulative_history)
-            return all_options[:2]
-            
+            return self.orch.next_options(stage_no, lambda: self._generate_stage_options(stage_no))
         except Exception as e:
             print(f"Error generating options: {e}")
             import traceback
@@ -68,6 +61,24 @@ class OrchestratorAPI:
                 "옵션 생성 실패 (기본값 2)"
             ]
     
+    def _generate_stage_options(self, stage_no: int) -> list:
+        # 🎬 핵심: 5막 선택지는 Epilogue Director 사용!
+        if stage_no == 5:
+            print(f"\n🎬 Epilogue Director: 5막 결말 선택지 생성 중...")
+            epilogue_data = self.orch.epilogue_director.generate_ending_options(
+                all_stories=self.orch.stage_stories,  # 1~4막 스토리
+                user_choices=[]
+            )
+            options = epilogue_data["options"]
+            print(f"   ✅ 결말 선택지 생성 완료")
+            print(f"   📖 교훈: {epilogue_data.get('moral_lesson', '')}")
+            return options
+        
+        # 2~4막: 기존 StoryManager 사용
+        cumulative_history = " ".join(self.orch.stage_stories) if self.orch.stage_stories else ""
+        all_options = self.orch.story_manager.get_next_options(stage_no, cumulative_history)
+        return all_options[:2]
+    
     def set_progress_callback(self, callback: Callable[[str, int], None]):
         """
         진행 상황 콜백 설정
@@ -75,119 +86,113 @@ class OrchestratorAPI:
         """
         self.progress_callback = callback
     
-    def _update_progress(self, message: str, progress: int):
-        """진행 상황 업데이트"""
+    def _update_progress(self, message: str, progress: int, record: bool = True):
+        """진행 상황 업데이트 (record=True면 단계 소요 시간 분석용으로 저널에 기록)"""
+        if record:
+            self.orch.state.record_event("progress", message=message, progress=progress)
         if self.progress_callback:
             self.progress_callback(message, progress)
         print(f"[{progress}%] {message}")
     
-    def run_stage_1(self) -> dict:
+    def _progress_range(self, message: str, start: int, end: int) -> Callable[[float], None]:
         """
-        1막 실행 (자동 생성, 사용자 입력 불필요)
+        FFmpeg 진행률(0.0~1.0)을 전체 진행률 구간 [start, end]로 변환하는 콜백 생성
+        같은 퍼센트 값은 한 번만 보고함
+        """
+        last = {"progress": None}
+        
+        def _on_progress(fraction: float) -> None:
+            progress = start + int((end - start) * fraction)
+            if progress == last["progress"]:
+                return
+            last["progress"] = progress
+            self._update_progress(f"{message} ({int(fraction * 100)}%)", progress, record=False)
+        
+        return _on_progress
+    
+    # ============== 작업 복원 ==============
+    
+    @staticmethod
+    def create_file_manager(config_path: str = "config/default_config.yaml"):
+        """작업 없이 경로/저장소만 필요할 때 (웹 서버의 산출물 제공 등)"""
+        from managers import ConfigManager, FileManager
+        
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        return FileManager(ConfigManager(os.path.join(script_dir, config_path), live=True))
+    
+    @staticmethod
+    def load_saved_jobs(config_path: str = "config/default_config.yaml") -> List[dict]:
+        """
+        디스크에 남은 작업별 매니페스트 요약 (서버 재시작 후 작업 목록 복원용)
+        작업별 매니페스트 이전의 공용 job_manifest.json은 작업별 위치로 옮긴 뒤 복원
         
         Returns:
-            {
-                'success': bool,
-                'story_text': str,
-                'video_path': str,
-                'images': list[str]
-            }
+            [{'job_id', 'art_style', 'tale_title', 'completed_stages',
+              'story_text', 'video_path', 'moral_lesson', 'final_video_path'}, ...]
+        """
+        from managers import JobManifest
+        
+        file_mgr = OrchestratorAPI.create_file_manager(config_path)
+        legacy = JobManifest(file_mgr.get_manifest_file_path())
+        if legacy.load() and legacy.job_id:
+            target = file_mgr.get_manifest_file_path(legacy.job_id)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(legacy.manifest_path, target)
+        
+        saved = []
+        for path in file_mgr.get_job_manifest_paths():
+            summary = OrchestratorAPI._summarize_manifest(JobManifest(path))
+            if summary is not None:
+                saved.append(summary)
+        return saved
+    
+    @staticmethod
+    def _summarize_manifest(manifest) -> Optional[dict]:
+        if not manifest.load() or not manifest.job_id:
+            return None
+        
+        completed = manifest.completed_stages()
+        last = manifest.get_stage(completed[-1]) if completed else None
+        return {
+            'job_id': manifest.job_id,
+            'art_style': manifest.meta.get('art_style', 'pixar'),
+            'tale_title': manifest.meta.get('tale_title', ''),
+            'completed_stages': completed,
+            'story_text': last.story if last else '',
+            'video_path': last.artifacts.get('mux') if last else None,
+            'moral_lesson': last.extra.get('moral_lesson', '') if last else '',
+            'final_video_path': manifest.get_final(),
+        }
+    
+    # ============== 막 실행 ==============
+    
+    def _run_stage(self, stage_no: int, produce_story: Callable[[], Tuple[str, List[str], dict]],
+                   user_choice: Optional[str] = None) -> dict:
+        """
+        공통 막 파이프라인 실행 (Orchestrator.run_stage) + 작업 상태/진행률 갱신
+        
+        Returns:
+            {'success', 'story_text', 'video_path', 'images', 'extra'}
+            실패 시 {'success': False, 'error', ('failed_step' | 'error_trace')}
         """
         try:
-            self._update_progress("1막 디렉토리 생성 중...", 5)
-            self.orch.file_mgr.ensure_all_directories()
-            
-            self._update_progress("1막 스토리 생성 중...", 10)
-            history = ""
-            story = self.orch.story_helper.generate_stage_story(1, history)
-            
-            if not story:
-                return {'success': False, 'error': '스토리 생성 실패'}
-            
-            self.orch.stage_stories.append(story)
-            self._update_progress(f"스토리 생성 완료: {story[:50]}...", 20)
-            
-            # 2. 스토리 3분할
-            self._update_progress("스토리를 3개 장면으로 분할 중...", 25)
-            scene_texts = self.orch.story_helper.split_story_into_scenes(story)
-            
-            if len(scene_texts) != 3:
-                return {'success': False, 'error': f'장면 분할 실패 (3개 필요, {len(scene_texts)}개 생성)'}
-            
-            # 3. 이미지 3개 생성
-            self._update_progress("이미지 3개 생성 중...", 30)
-            images = self.orch.media.generate_stage_images(
-                stage_no=1,
-                scene_texts=scene_texts,
-                prev_stage_images=[]
-            )
-            
-            if not all(images):
-                self._update_progress("일부 이미지 생성 실패, 계속 진행...", 50)
-            else:
-                self._update_progress("이미지 생성 완료", 50)
-            
-            self.orch.stage_images.append(images)
-            
-            # 4. 영상 3개 생성
-            self._update_progress("영상 3개 생성 중...", 55)
-            videos = self.orch.media.generate_stage_videos(
-                stage_no=1,
-                scene_texts=scene_texts,
-                stage_images=images
-            )
-            
-            valid_videos = [v for v in videos if v and os.path.exists(v)]
-            if len(valid_videos) < 3:
-                return {'success': False, 'error': f'영상 생성 실패 ({len(valid_videos)}/3)'}
-            
-            self._update_progress("영상 생성 완료", 70)
-            
-            # 5. 영상 병합 (23초)
-            self._update_progress("영상 병합 중...", 75)
-            merged_video = self.orch.merger.video.merge_scenes_to_stage(1, videos)
-            
-            if not merged_video:
-                return {'success': False, 'error': '영상 병합 실패'}
-            
-            self._update_progress("영상 병합 완료", 85)
-            
-            # 6. TTS 생성
-            self._update_progress("TTS 생성 중...", 88)
-            tts_path = self.orch.media.generate_stage_tts(story, 1)
-            
-            if not tts_path:
-                self._update_progress("TTS 생성 실패 (영상만 계속)", 90)
-            else:
-                self._update_progress("TTS 생성 완료", 90)
-            
-            # 7. 영상+TTS 합성
-            self._update_progress("영상+TTS 합성 중...", 92)
-            final_path = self.orch.merger.muxer.mux_stage(1)
-            
-            if not final_path:
-                self._update_progress("합성 실패, 영상만 저장", 95)
-                import shutil
-                final_path = self.orch.file_mgr.get_stage_final_path(1)
-                if merged_video and os.path.exists(merged_video):
-                    shutil.copy(merged_video, final_path)
-            
-            # 자막 추가
-            self.orch.subtitle_mgr.add_stage_subtitle(story, duration=23.0)
-            
-            self._update_progress("1막 완료!", 100)
-            
-            return {
-                'success': True,
-                'story_text': story,
-                'video_path': final_path,
-                'images': images
-            }
+            result = self.orch.run_stage(stage_no, produce_story, user_choice=user_choice,
+                                         on_progress=self._update_progress)
+            if not result['success']:
+                self.orch.state.set_job_status("error")
+                return result
+            
+            self.orch.state.set_job_status(f"stage{stage_no}_complete")
+            self.orch.state.flush()  # 막 경계: 지연 저장된 상태 기록
+            self._update_progress(f"{stage_no}막 완료!", 100)
+            return result
             
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
-            print(f"Error in run_stage_1: {e}")
+            print(f"Error in stage {stage_no}: {e}")
+            self.orch.state.set_job_status("error")
             print(error_trace)
             return {
                 'success': False,
@@ -195,6 +200,72 @@ class OrchestratorAPI:
                 'error_trace': error_trace
             }
     
+    def _split_scenes(self, story: str) -> List[str]:
+        """스토리 3분할 (실패 시 StepFailed)"""
+        scene_texts = self.orch.story_helper.split_story_into_scenes(story)
+        if len(scene_texts) != 3:
+            raise StepFailed(f'장면 분할 실패 (3개 필요, {len(scene_texts)}개 생성)')
+        return scene_texts
+    
+    def run_stage_1(self) -> dict:
+        """
+        1막 실행 (자동 생성, 사용자 입력 불필요)
+        
+        Returns:
+            {
+                'success': bool,
+                'story_text': str,
+                'video_path': str,
+                'images': list[str]
+            }
+        """
+        self._update_progress("1막 디렉토리 생성 중...", 5)
+        self.orch.file_mgr.ensure_all_directories()
+        
+        def produce_story():
+            story = self.orch.story_helper.generate_stage_story(1, "")
+            if not story:
+                raise StepFailed('스토리 생성 실패')
+            return story, self._split_scenes(story), {}
+        
+        return self._run_stage(1, produce_story)
+    
+    # ============== 1막 사전 생성 풀 ==============
+    
+    @staticmethod
+    def prerender_stage_1(art_style: str, bundle_dir: str,
+                          config_path: str = "config/default_config.yaml") -> Optional[dict]:
+        """
+        1막을 별도 출력 디렉토리(bundle_dir)에서 미리 생성 (StagePool producer)
+        최종 렌더는 예약하지 않음 → 번들에는 미리보기 산출물만 남음
+        
+        Returns:
+            Orchestrator.export_stage_bundle 결과 또는 None (실패)
+        """
+        api = OrchestratorAPI(config_path, art_style=art_style,
+                              job_id=f"pool_{os.path.basename(bundle_dir).split('.')[0]}",
+                              output_base=bundle_dir)
+        api.orch.background_render = False
+        api.orch.media.video_priority = "speculative"  # 웹 사용자 영상 생성이 먼저
+        result = api.run_stage_1()
+        api.orch.state.flush()
+        if not result.get('success'):
+            print(f"⚠️ 1막 사전 생성 실패: {result.get('error')}")
+            return None
+        return api.orch.export_stage_bundle(1)
+    
+    def adopt_stage_1(self, bundle: dict) -> bool:
+        """미리 만든 1막 번들을 이 작업으로 가져옴 (이후 run_stage_1은 캐시만 사용)"""
+        try:
+            adopted = self.orch.adopt_stage_bundle(1, bundle)
+        except Exception as e:
+            print(f"⚠️ 1막 번들 적용 실패: {e}")
+            adopted = False
+        if adopted:
+            self.orch.state.record_event("stage_pool_adopted", stage=1)
+            self.orch.state.flush()
+        return adopted
+    
     def run_stage_with_choice(self, stage_no: int, user_choice: str) -> dict:
         """
         2~5막 실행 (사용자 선택 반영)
@@ -211,10 +282,8 @@ class OrchestratorAPI:
                 'images': list[str]
             }
         """
-        try:
-            self._update_progress(f"{stage_no}막 스토리 생성 중...", 10)
-            
-            history = " ".join(self.orch.stage_stories) if self.orch.stage_stories else ""
+        def produce_story():
+            history = " ".join(self.orch.stage_stories[:stage_no - 1])
             
             # Guardian: 입력 검증
             validated_text = self.orch.guardian.validate_and_sanitize(
@@ -226,91 +295,11 @@ class OrchestratorAPI:
                 validated_text, stage_no, history
             )
             story = story_data["full_script"]
-            
             if not story:
-                return {'success': False, 'error': '스토리 생성 실패'}
-            
-            self.orch.stage_stories.append(story)
-            self._update_progress(f"스토리 생성 완료", 20)
-            
-            # 2. 스토리 3분할
-            self._update_progress("스토리 3분할 중...", 25)
-            scene_texts = self.orch.story_helper.split_story_into_scenes(story)
-            
-            if len(scene_texts) != 3:
-                return {'success': False, 'error': f'장면 분할 실패'}
-            
-            # 3. 이미지 생성
-            self._update_progress("이미지 생성 중...", 30)
-            prev_images = self._get_previous_stage_images(stage_no)
-            
-            images = self.orch.media.generate_stage_images(
-                stage_no=stage_no,
-                scene_texts=scene_texts,
-                prev_stage_images=prev_images
-            )
-            
-            self.orch.stage_images.append(images)
-            self._update_progress("이미지 생성 완료", 50)
-            
-            # 4. 영상 생성
-            self._update_progress("영상 생성 중...", 55)
-            videos = self.orch.media.generate_stage_videos(
-                stage_no=stage_no,
-                scene_texts=scene_texts,
-                stage_images=images
-            )
-            
-            valid_videos = [v for v in videos if v and os.path.exists(v)]
-            if len(valid_videos) < 3:
-                return {'success': False, 'error': '영상 생성 실패'}
-            
-            self._update_progress("영상 생성 완료", 70)
-            
-            # 5. 영상 병합
-            self._update_progress("영상 병합 중...", 75)
-            merged_video = self.orch.merger.video.merge_scenes_to_stage(stage_no, videos)
-            
-            if not merged_video:
-                return {'success': False, 'error': '영상 병합 실패'}
-            
-            self._update_progress("영상 병합 완료", 85)
-            
-            # 6. TTS 생성
-            self._update_progress("TTS 생성 중...", 88)
-            tts_path = self.orch.media.generate_stage_tts(story, stage_no)
-            
-            # 7. 영상+TTS 합성
-            self._update_progress("영상+TTS 합성 중...", 92)
-            final_path = self.orch.merger.muxer.mux_stage(stage_no)
-            
-            if not final_path:
-                import shutil
-                final_path = self.orch.file_mgr.get_stage_final_path(stage_no)
-                if merged_video and os.path.exists(merged_video):
-                    shutil.copy(merged_video, final_path)
-            
-            self.orch.subtitle_mgr.add_stage_subtitle(story, duration=23.0)
-            
-            self._update_progress(f"{stage_no}막 완료!", 100)
-            
-            return {
-                'success': True,
-                'story_text': story,
-                'video_path': final_path,
-                'images': images
-            }
-            
-        except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
-            print(f"Error in run_stage_with_choice: {e}")
-            print(error_trace)
-            return {
-                'success': False,
-                'error': str(e),
-                'error_trace': error_trace
-            }
+                raise StepFailed('스토리 생성 실패')
+            return story, self._split_scenes(story), {}
+        
+        return self._run_stage(stage_no, produce_story, user_choice=user_choice)
     
     def run_stage_5(self, user_choice: str = "") -> dict:
         """
@@ -328,28 +317,19 @@ class OrchestratorAPI:
                 'moral_lesson': str
             }
         """
-        try:
-            self._update_progress("5막(결말) 스토리 생성 중...", 10)
-            
-            # 1. Epilogue Director로 결말 생성
+        def produce_story():
+            # Epilogue Director로 결말 생성
             epilogue_data = self.orch.epilogue_director.generate_ending(
-                all_stories=self.orch.stage_stories,
+                all_stories=self.orch.stage_stories[:4],
                 user_choices=[user_choice] if user_choice else []
             )
-            
             story = epilogue_data["ending_story"]
             moral_lesson = epilogue_data.get("moral_lesson", "")
-            
             if not story:
-                return {'success': False, 'error': '결말 스토리 생성 실패'}
+                raise StepFailed('결말 스토리 생성 실패')
+            print(f"   📖 교훈: {moral_lesson}")
             
-            self.orch.stage_stories.append(story)
-            self._update_progress(f"결말 생성 완료: {moral_lesson}", 20)
-            
-            # 2. 스토리 3분할
-            self._update_progress("결말 스토리 3분할 중...", 25)
             scene_texts = self.orch.story_helper.split_story_into_scenes(story)
-            
             if len(scene_texts) != 3:
                 # 분할 실패 시 강제로 3등분 시도
                 lines = story.split('.')
@@ -360,75 +340,49 @@ class OrchestratorAPI:
                 ][:3]
                 # 부족하면 마지막 것 복사
                 while len(scene_texts) < 3:
-                     scene_texts.append(scene_texts[-1])
-            
-            # 3. 이미지 생성
-            self._update_progress("결말 이미지 생성 중...", 30)
-            prev_images = self._get_previous_stage_images(5)
-            
-            images = self.orch.media.generate_stage_images(
-                stage_no=5,
-                scene_texts=scene_texts,
-                prev_stage_images=prev_images
-            )
-            
-            self.orch.stage_images.append(images)
-            self._update_progress("이미지 생성 완료", 50)
-            
-            # 4. 영상 생성
-            self._update_progress("결말 영상 생성 중...", 55)
-            videos = self.orch.media.generate_stage_videos(
-                stage_no=5,
-                scene_texts=scene_texts,
-                stage_images=images
-            )
-            
-            valid_videos = [v for v in videos if v and os.path.exists(v)]
-            if len(valid_videos) < 3:
-                return {'success': False, 'error': '영상 생성 실패'}
-            
-            self._update_progress("영상 생성 완료", 70)
-            
-            # 5. 영상 병합
-            self._update_progress("영상 병합 중...", 75)
-            merged_video = self.orch.merger.video.merge_scenes_to_stage(5, videos)
-            
-            if not merged_video:
-                return {'success': False, 'error': '영상 병합 실패'}
-            
-            self._update_progress("영상 병합 완료", 85)
-            
-            # 6. TTS 생성
-            self._update_progress("TTS 생성 중...", 88)
-            tts_path = self.orch.media.generate_stage_tts(story, 5)
-            
-            # 7. 영상+TTS 합성
-            self._update_progress("영상+TTS 합성 중...", 92)
-            final_path = self.orch.merger.muxer.mux_stage(5)
-            
-            if not final_path:
-                import shutil
-                final_path = self.orch.file_mgr.get_stage_final_path(5)
-                if merged_video and os.path.exists(merged_video):
-                    shutil.copy(merged_video, final_path)
-            
-            # 자막 및 교훈 저장
-            self.orch.subtitle_mgr.add_stage_subtitle(story, duration=23.0)
-            
-            self._update_progress("5막 완료!", 100)
-            
-            return {
-                'success': True,
-                'story_text': story,
-                'video_path': final_path,
-                'images': images,
-                'moral_lesson': moral_lesson
+                    scene_texts.append(scene_texts[-1])
+            return story, scene_texts, {'moral_lesson': moral_lesson}
+        
+        result = self._run_stage(5, produce_story, user_choice=user_choice)
+        if result['success']:
+            result['moral_lesson'] = result['extra'].get('moral_lesson', '')
+        return result
+    
+    def regenerate_scene(self, stage_no: int, scene_idx: int, target: str = "video",
+                         prompt_tweak: str = "") -> dict:
+        """
+        완성된 막의 장면 하나만 다시 생성 (다른 장면 클립과 TTS 재사용)
+        
+        Args:
+            target: "video" (기존 이미지로 영상만) | "image" (이미지부터)
+            prompt_tweak: 프롬프트에 덧붙일 사용자 요청 (선택)
+        
+        Returns:
+            {
+                'success': bool,
+                'video_path': str,          # 다시 합성된 막 영상
+                'scene_video_path': str,
+                'image_path': str,
+                'final_invalidated': bool   # 최종 영상을 다시 마무리해야 하는지
             }
+        """
+        try:
+            self._update_progress(f"{stage_no}막 장면 {scene_idx} 다시 생성 준비 중...", 5)
+            result = self.orch.regenerate_scene(
+                stage_no, scene_idx,
+                regenerate_image=(target == "image"),
+                prompt_tweak=prompt_tweak or "",
+                on_progress=self._update_progress
+            )
+            if result['success']:
+                self.orch.state.flush()
+                self._update_progress(f"{stage_no}막 장면 {scene_idx} 다시 생성 완료!", 100)
+            return result
             
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
-            print(f"Error in run_stage_5: {e}")
+            print(f"Error in regenerate_scene: {e}")
             print(error_trace)
             return {
                 'success': False,
@@ -436,20 +390,6 @@ class OrchestratorAPI:
                 'error_trace': error_trace
             }
     
-    def _get_previous_stage_images(self, stage_no: int) -> list:
-        """이전 막의 이미지 반환"""
-        if stage_no == 1:
-            return []
-        
-        prev_idx = stage_no - 2
-        if prev_idx >= 0 and prev_idx < len(self.orch.stage_images):
-            prev_images = self.orch.stage_images[prev_idx]
-            valid = [img for img in prev_images if img and os.path.exists(img)]
-            if valid:
-                return valid
-        
-        return self.orch.file_mgr.get_stage_images(stage_no - 1)
-    
     def finalize_complete_video(self) -> dict:
         """
         5개 막을 하나의 최종 영상으로 병합
@@ -471,7 +411,10 @@ class OrchestratorAPI:
             self._update_progress("5개 막 영상 병합 중...", 20)
             
             # 최종 병합 실행 (MergeManager.process_final 호출)
-            result = self.orch.merger.process_final(srt_path=srt_path)
+            result = self.orch.merger.process_final(
+                srt_path=srt_path,
+                on_progress=self._progress_range("5개 막 영상 병합 중", 20, 95)
+            )
             
             if result:
                 final_video_path = self.orch.file_mgr.get_final_video_path()
@@ -482,6 +425,25 @@ class OrchestratorAPI:
                 except:
                     duration = 0.0
                 
+                self.orch.manifest.record_final(final_video_path, total_duration=duration)
+                
+                # 저장소 게시 (s3 백엔드면 업로드, local이면 그대로)
+                self.orch.file_mgr.publish(final_video_path)
+                self.orch.file_mgr.publish(self.orch.file_mgr.get_final_tts_path())
+                if self.orch.config.get_abr_ladder_config().get("enabled"):
+                    self.orch.file_mgr.publish_dir(self.orch.file_mgr.get_final_hls_dir())
+                
+                # 작업별 보관 + 중간 산출물 정리 + 디스크 한도 적용
+                job_id = self.orch.state.job_id
+                archive_dir = self.orch.retention.on_job_finalized(
+                    job_id, manifest=self.orch.manifest,
+                    tale_title=self.orch.manifest.meta.get('tale_title', ''),
+                    total_duration=duration
+                )
+                for path in self.orch.retention.get_archived_files(job_id):
+                    self.orch.file_mgr.publish(path)
+                
+                self.orch.state.set_job_status("complete")
                 self._update_progress("최종 영상 완성!", 100)
                 
                 print(f"\n{'='*60}")
@@ -490,13 +452,28 @@ class OrchestratorAPI:
                 print(f"   길이: {duration:.2f}초")
                 print(f"{'='*60}\n")
                 
-                return {
+                result = {
                     'success': True,
                     'final_video_path': final_video_path,
                     'final_video_url': f"/final/{os.path.basename(final_video_path)}",
                     'total_duration': duration,
                     'message': '전체 영상 병합 완료'
                 }
+                
+                # 보관본 URL (다음 작업이 output/final을 덮어써도 유지)
+                if archive_dir:
+                    result['archive_video_url'] = "/" + self.orch.file_mgr.get_storage_key(
+                        os.path.join(archive_dir, os.path.basename(final_video_path))
+                    )
+                
+                # HLS 다중 화질 사다리가 있으면 master 플레이리스트 URL 추가
+                hls_master = self.orch.file_mgr.get_final_hls_master_path()
+                if self.orch.config.get_abr_ladder_config().get("enabled") and os.path.exists(hls_master):
+                    result['hls_master_url'] = "/final/" + os.path.relpath(
+                        hls_master, os.path.dirname(final_video_path)
+                    ).replace(os.sep, "/")
+                
+                return result
             else:
                 return {
                     'success': False,
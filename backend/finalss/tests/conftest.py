@@ -0,0 +1,205 @@
+# ==================================================================================
+# tests/conftest.py - 공용 픽스처 (API 없이 막 파이프라인을 돌리는 오케스트레이터)
+# ==================================================================================
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeMedia:
+    """이미지/영상/TTS 대신 작은 파일을 만드는 MediaGenerator 대역"""
+
+    def __init__(self, root: str, delay: float = 0.0, fail_videos_stage: int = 0):
+        self.root = root
+        self.delay = delay
+        self.fail_videos_stage = fail_videos_stage
+        self.calls = []
+        self.artifacts = SimpleNamespace(is_valid=lambda path, kind: bool(path) and os.path.exists(path),
+                                         record=lambda path, kind: bool(path) and os.path.exists(path))
+
+    def _write(self, name: str) -> str:
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(name.encode("utf-8"))
+        return path
+
+    def generate_stage_images(self, stage_no, scene_texts, prev_stage_images=None):
+        self.calls.append(("images", stage_no, list(prev_stage_images or [])))
+        return [self._write(f"stage{stage_no}/scene{i}.png") for i in range(1, 4)]
+
+    def prepare_motion_prompts(self, stage_no, scene_texts):
+        return [f"motion {i}" for i in range(1, 4)]
+
+    def adopt_stage_media(self, stage_no, scene_texts, images, videos, prev_stage_images=None):
+        return True
+
+    def generate_stage_tts(self, story, stage_no):
+        return self._write(f"stage{stage_no}/tts.mp3")
+
+    def generate_stage_videos(self, stage_no, scene_texts, stage_images, prev_stage_images=None,
+                              on_progress=None):
+        self.calls.append(("videos", stage_no, list(scene_texts)))
+        if self.delay:
+            threading.Event().wait(self.delay)
+        if stage_no == self.fail_videos_stage:
+            return [None, None, None]
+        return [self._write(f"stage{stage_no}/scene{i}.mp4") for i in range(1, 4)]
+
+    def regenerate_scene(self, stage_no, scene_idx, scene_texts, prev_stage_images=None,
+                         regenerate_image=False, prompt_tweak=""):
+        self.calls.append(("regenerate", stage_no, scene_idx))
+        return self._write(f"stage{stage_no}/scene{scene_idx}.mp4")
+
+
+class FakeMerger:
+    def __init__(self, media: FakeMedia):
+        self.video = SimpleNamespace(
+            merge_scenes_to_stage=lambda stage_no, videos, on_progress=None:
+                media._write(f"stage{stage_no}/merged.mp4"))
+        self.muxer = SimpleNamespace(
+            mux_stage=lambda stage_no: media._write(f"stage{stage_no}/final.mp4"))
+
+    def schedule_final_render(self, stage_no):
+        pass
+
+
+class FakeState:
+    def __init__(self):
+        self.events = []
+
+    def record_event(self, event_type, **data):
+        self.events.append((event_type, data))
+
+    def set_current_step(self, step, stage_no):
+        pass
+
+    def record_artifact(self, path, step, stage_no, sha256=""):
+        pass
+
+    def set_history(self, history):
+        pass
+
+    def save_progress(self):
+        pass
+
+    def flush(self):
+        pass
+
+
+class FakeFileManager:
+    def __init__(self, root: str):
+        self.root = root
+
+    def publish(self, path):
+        pass
+
+    def get_stage_final_path(self, stage_no):
+        return os.path.join(self.root, f"stage{stage_no}", "final.mp4")
+
+    def get_stage_image_path(self, stage_no, scene):
+        return os.path.join(self.root, f"stage{stage_no}", f"scene{scene}.png")
+
+    def get_stage_video_path(self, stage_no, scene):
+        return os.path.join(self.root, f"stage{stage_no}", f"scene{scene}.mp4")
+
+    def get_stage_merged_video_path(self, stage_no, tier="preview"):
+        return os.path.join(self.root, f"stage{stage_no}", "merged.mp4")
+
+    def get_stage_tts_path(self, stage_no):
+        return os.path.join(self.root, f"stage{stage_no}", "tts.mp3")
+
+    def get_stage_images(self, stage_no):
+        return []
+
+    def ensure_all_directories(self):
+        os.makedirs(self.root, exist_ok=True)
+
+
+class FakeStoryHelper:
+    """tag: 작업마다 다른 LLM 출력 흉내 (같은 입력이어도 작업별로 다른 스토리)"""
+
+    def __init__(self, tag: str = ""):
+        self.tag = tag
+
+    def generate_stage_story(self, stage_no, history=""):
+        return f"{stage_no}막 이야기{self.tag} (앞 이야기 {len(history)}자)"
+
+    def split_story_into_scenes(self, story):
+        return [f"{story} - 장면 {i}" for i in range(1, 4)]
+
+
+@pytest.fixture
+def make_orchestrator(tmp_path):
+    """
+    설정/API 없이 run_stage를 실행할 수 있는 Orchestrator
+    매니페스트와 자막은 실제 클래스, 미디어/병합/상태는 대역
+    """
+    from orchestrator import Orchestrator
+    from managers.job_manifest import JobManifest
+    from managers.subtitle_manager import SubtitleManager
+
+    def _make(video_delay: float = 0.0, fail_videos_stage: int = 0,
+              name: str = "", branches=None) -> Orchestrator:
+        """name: 작업별 하위 디렉토리 + 스토리 구분 (여러 작업), branches: 공유 분기 저장소"""
+        root = tmp_path / name if name else tmp_path
+        tag = f" [{name}]" if name else ""
+        orch = Orchestrator.__new__(Orchestrator)
+        orch.art_style = "pixar"
+        orch.config = SimpleNamespace(
+            get_pipeline_config=lambda: {"max_workers": 3, "step_retries": 0, "retry_delay": 0.0},
+            get_stage_info=lambda stage_no: {},
+            get_blocked_words=lambda: [],
+        )
+        orch.file_mgr = FakeFileManager(str(root))
+        orch.state = FakeState()
+        orch.manifest = JobManifest(str(root / "job_manifest.json"))
+        orch.media = FakeMedia(str(root), delay=video_delay, fail_videos_stage=fail_videos_stage)
+        orch.merger = FakeMerger(orch.media)
+        orch.subtitle_mgr = SubtitleManager(str(root / "subtitles.srt"))
+        orch.story_helper = FakeStoryHelper(tag)
+        orch.story_manager = SimpleNamespace(
+            get_next_options=lambda stage_no, history="": [f"{stage_no}막 선택 {i}" for i in range(1, 4)])
+        orch.guardian = SimpleNamespace(validate_and_sanitize=lambda text, stage_no, words: text)
+        orch.scenario_agent = SimpleNamespace(
+            generate_3_scene_story=lambda text, stage_no, history:
+                {"full_script": f"{stage_no}막 이야기{tag}: {text} (앞 이야기 {len(history)}자)"})
+        orch.branches = branches
+        orch.background_render = False
+        orch.stage_stories = []
+        orch.stage_images = []
+        orch._stage_lock = threading.RLock()
+        return orch
+
+    return _make
+
+
+@pytest.fixture
+def make_retention(tmp_path):
+    """최종 영상이 있는 상태의 RetentionManager (용량 한도 없음)"""
+    from managers.retention_manager import RetentionManager
+
+    def _make(**retention) -> RetentionManager:
+        final_video = os.path.join(str(tmp_path), "final", "final.mp4")
+        os.makedirs(os.path.dirname(final_video), exist_ok=True)
+        with open(final_video, "wb") as f:
+            f.write(b"final")
+        config = SimpleNamespace(
+            get_retention_config=lambda: {"enabled": True, "max_disk_gb": 0, **retention},
+        )
+        file_mgr = SimpleNamespace(
+            get_library_dir=lambda: os.path.join(str(tmp_path), "library"),
+            get_library_index_path=lambda: os.path.join(str(tmp_path), "library", "index.json"),
+            get_final_video_path=lambda: final_video,
+            get_final_tts_path=lambda: None,
+            get_final_story_path=lambda: None,
+        )
+        return RetentionManager(config, file_mgr)
+
+    return _make
@@ -0,0 +1,44 @@
+# ==================================================================================
+# tests/test_artifact_manifest.py - 산출물 검증 (검증 실패 vs 검증 불가)
+# ==================================================================================
+
+import os
+import stat
+
+from managers.artifact_manifest import ArtifactManifest
+from managers.media_info import MediaInfoService
+
+
+def _fake_ffprobe(tmp_path, body: str) -> str:
+    """ffprobe 대신 실행할 셸 스크립트"""
+    path = tmp_path / "ffprobe"
+    path.write_text(f"#!/bin/sh\n{body}\n", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def _clip(tmp_path) -> str:
+    path = tmp_path / "scene1.mp4"
+    path.write_bytes(b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 64)
+    return str(path)
+
+
+def test_probe_timeout_keeps_file(tmp_path):
+    """ffprobe 시간 초과는 손상이 아님 → 파일 유지 (기록은 하지 않고 다음에 다시 검증)"""
+    media_info = MediaInfoService(ffprobe_bin=_fake_ffprobe(tmp_path, "sleep 5"), timeout=0.2)
+    artifacts = ArtifactManifest(str(tmp_path / "artifacts.json"), media_info)
+    clip = _clip(tmp_path)
+
+    assert artifacts.is_valid(clip, "video")
+    assert os.path.exists(clip)
+    assert artifacts.get(clip) is None
+
+
+def test_probe_without_streams_discards_file(tmp_path):
+    """ffprobe가 읽었는데 스트림/길이가 없으면 손상 → 삭제"""
+    media_info = MediaInfoService(ffprobe_bin=_fake_ffprobe(tmp_path, "echo '{\"format\": {}, \"streams\": []}'"))
+    artifacts = ArtifactManifest(str(tmp_path / "artifacts.json"), media_info)
+    clip = _clip(tmp_path)
+
+    assert not artifacts.is_valid(clip, "video")
+    assert not os.path.exists(clip)
@@ -0,0 +1,26 @@
+# ==================================================================================
+# tests/test_branch_store.py - 작업 간 공유 분기 재사용
+# ==================================================================================
+
+from types import SimpleNamespace
+
+from managers.branch_store import BranchStore
+
+
+def test_same_choices_share_stage_2_branch(make_orchestrator, tmp_path):
+    """같은 동화/스타일의 두 작업: 1막 뿌리 분기를 공유하므로 같은 선택의 2막도 적중"""
+    store = BranchStore(SimpleNamespace(get_media_fingerprint=lambda: "fp"),
+                        SimpleNamespace(get_branch_dir=lambda: str(tmp_path / "branches")))
+    first = make_orchestrator(name="job_a", branches=store)
+    second = make_orchestrator(name="job_b", branches=store)
+
+    for orch in (first, second):
+        orch.manifest.set_meta(tale_title="흥부와 놀부")
+        assert orch.run_stage(1, orch._story_producer(1, None))["success"]
+        choice = "흥부가 제비 다리를 고쳐 준다"
+        assert orch.run_stage(2, orch._story_producer(2, choice), user_choice=choice)["success"]
+
+    assert second.stage_stories == first.stage_stories
+    assert second.media.calls == []
+    assert [e[1]["stage"] for e in second.state.events if e[0] == "branch_reused"] == [1, 2]
+    assert store.stats()["2"]["hits"] == 1
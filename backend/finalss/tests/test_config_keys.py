@@ -0,0 +1,29 @@
+# ==================================================================================
+# tests/test_config_keys.py - API 키 로드 (.env) 및 워커별 키 회전
+# ==================================================================================
+
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from managers import config_manager
+
+
+def test_key_offset_before_config_reads_env_file(tmp_path, monkeypatch):
+    """배치 워커 초기화(set_api_key_offset)가 ConfigManager보다 먼저 불려도 .env의 키를 사용"""
+    env_path = tmp_path / ".env"
+    env_path.write_text("GOOGLE_API_KEYS=a,b,c\nELEVENLABS_API_KEY=e\n", encoding="utf-8")
+    for name in ("GOOGLE_API_KEYS", "GOOGLE_API_KEY", "ELEVENLABS_API_KEYS", "ELEVENLABS_API_KEY"):
+        monkeypatch.setenv(name, "")  # 테스트 후 원래 상태로 복원되도록 기록
+        monkeypatch.delenv(name)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_manager, "_ENV_PATH", str(env_path))
+    monkeypatch.setattr(config_manager, "_env_loaded", False)
+    monkeypatch.setattr(config_manager, "_api_keys", None)
+
+    config_manager.set_api_key_offset(1)
+
+    assert os.getenv("GOOGLE_API_KEYS") == "a,b,c"
+    assert config_manager._get_api_keys() == (("b", "c", "a"), ("e",))
@@ -0,0 +1,114 @@
+# ==================================================================================
+# tests/test_final_render.py - 최종 화질 합성 (FFmpeg 풀) + 최종 병합 화질 통일
+# ==================================================================================
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from managers.merge_manager import AVMuxer
+from utils.ffmpeg_runner import FFmpegResult
+
+
+class FakeRunner:
+    """ffmpeg 대신 출력 파일만 만드는 FFmpegRunner 대역"""
+    final_timeout = 0
+
+    def __init__(self):
+        self.calls = []
+
+    def run(self, cmd, duration=None, on_progress=None, timeout=None, label="", priority="normal"):
+        self.calls.append({"cmd": cmd, "priority": priority, "label": label})
+        with open(cmd[-1], "wb") as f:
+            f.write(label.encode("utf-8"))
+        return FFmpegResult(returncode=0)
+
+
+def _write(path, data=b"data"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+@pytest.fixture
+def muxer(tmp_path):
+    root = str(tmp_path)
+    profiles = {
+        "preview": {"codec": "libx264", "preset": "ultrafast", "crf": 28, "height": 480, "audio_bitrate": "96k"},
+        "final": {"codec": "libx264", "preset": "slow", "crf": 20, "height": 0, "audio_bitrate": "192k"},
+    }
+    config = SimpleNamespace(
+        get_encoding_profile=lambda name: dict(profiles[name]),
+        get_video_config=lambda: {"fps": 24},
+        get_final_render_config=lambda: {"enabled": True},
+        get_abr_ladder_config=lambda: {"enabled": False},
+    )
+    suffix = {"final": "_hq", "preview": ""}
+    file_mgr = SimpleNamespace(
+        get_build_graph_path=lambda: os.path.join(root, "build_graph.json"),
+        get_stage_merged_video_path=lambda n, tier="preview": os.path.join(root, f"stage{n}_merged{suffix[tier]}.mp4"),
+        get_stage_final_path=lambda n, tier="preview": os.path.join(root, f"stage{n}_final{suffix[tier]}.mp4"),
+        get_stage_tts_path=lambda n: os.path.join(root, f"stage{n}_tts.mp3"),
+        get_final_video_path=lambda: os.path.join(root, "final", "final.mp4"),
+        get_temp_dir=lambda: os.path.join(root, "temp"),
+    )
+    clip = SimpleNamespace(duration=8.0, has_video=True, video=SimpleNamespace(height=720))
+    media_info = SimpleNamespace(
+        probe=lambda path: clip,
+        probe_many=lambda paths: {p: clip for p in paths},
+        get_durations=lambda paths: {p: 8.0 for p in paths},
+        get_duration=lambda path: 8.0,
+    )
+    artifacts = SimpleNamespace(
+        is_valid=lambda path, kind: bool(path) and os.path.exists(path),
+        record=lambda path, kind: os.path.exists(path),
+        get=lambda path: None,
+        get_duration=lambda path: 8.0,
+    )
+    return AVMuxer(config, file_mgr, media_info, FakeRunner(), artifacts)
+
+
+def test_final_mux_runs_in_ffmpeg_pool_at_idle_priority(muxer):
+    """최종 화질 합성은 moviepy가 아니라 FFmpeg 풀에서 지정한 우선순위로 실행"""
+    fm = muxer.file_mgr
+    _write(fm.get_stage_merged_video_path(1, tier="final"))
+    _write(fm.get_stage_tts_path(1))
+
+    output = muxer.mux_stage(1, profile="final", priority="idle")
+
+    assert output == fm.get_stage_final_path(1, tier="final")
+    assert os.path.exists(output)
+    (call,) = muxer.runner.calls
+    assert call["priority"] == "idle"
+    assert call["cmd"][call["cmd"].index("-preset") + 1] == "slow"
+
+
+def test_final_concat_uses_one_tier_for_all_stages(muxer):
+    """한 막이라도 최종 화질본이 없으면 모든 막을 미리보기본으로 맞춰 스트림 복사"""
+    fm = muxer.file_mgr
+    for n in (1, 2):
+        _write(fm.get_stage_final_path(n))
+    _write(fm.get_stage_final_path(1, tier="final"))
+
+    assert muxer.build_final_video(num_stages=2)
+
+    cmd = muxer.runner.calls[-1]["cmd"]
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    inputs = muxer.builds._nodes[os.path.abspath(fm.get_final_video_path())]["inputs"]
+    assert sorted(inputs) == sorted(os.path.abspath(fm.get_stage_final_path(n)) for n in (1, 2))
+
+
+def test_final_concat_reencodes_mixed_tiers(muxer):
+    """어느 화질로도 통일할 수 없으면 스트림 복사 대신 재인코딩"""
+    fm = muxer.file_mgr
+    _write(fm.get_stage_final_path(1, tier="final"))
+    _write(fm.get_stage_final_path(2))
+
+    assert muxer.build_final_video(num_stages=2)
+
+    cmd = muxer.runner.calls[-1]["cmd"]
+    assert "-c" not in cmd
+    assert "scale=-2:720" in cmd[cmd.index("-vf") + 1]
+    assert cmd[cmd.index("-c:a") + 1] == "aac"
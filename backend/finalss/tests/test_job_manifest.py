@@ -0,0 +1,27 @@
+# ==================================================================================
+# tests/test_job_manifest.py - 작업별 매니페스트 (같은 출력 디렉토리를 쓰는 웹 작업)
+# ==================================================================================
+
+from types import SimpleNamespace
+
+from managers.file_manager import FileManager
+from managers.job_manifest import JobManifest
+
+
+def test_concurrent_jobs_keep_separate_manifests(tmp_path):
+    file_mgr = FileManager(SimpleNamespace(get_path=lambda key: str(tmp_path)))
+
+    first = JobManifest(file_mgr.get_manifest_file_path("job_a"))
+    first.reset(job_id="job_a", art_style="pixar")
+    first.set_story(1, "A 이야기", ["a1", "a2", "a3"])
+    second = JobManifest(file_mgr.get_manifest_file_path("job_b"))
+    second.reset(job_id="job_b", art_style="ghibli")
+
+    reloaded = JobManifest(file_mgr.get_manifest_file_path("job_a"))
+    assert reloaded.load()
+    assert reloaded.job_id == "job_a"
+    assert reloaded.get_stage(1).story == "A 이야기"
+    saved = [JobManifest(p) for p in file_mgr.get_job_manifest_paths()]
+    assert sorted(m.job_id for m in saved if m.load()) == ["job_a", "job_b"]
+    # job_id 없는 실행(CLI, 배치 동화별 디렉토리)은 기존 위치 그대로
+    assert file_mgr.get_manifest_file_path() == str(tmp_path / "job_manifest.json")
@@ -0,0 +1,72 @@
+# ==================================================================================
+# tests/test_orchestrator_stages.py - 막 파이프라인 (run_stage) 실행
+# ==================================================================================
+
+import time
+
+
+def test_run_stage_fresh_stage_completes(make_orchestrator):
+    """새 막: 스토리 → 이미지/모션/TTS → 영상 → 병합 → 합성 → 자막까지 성공"""
+    orch = make_orchestrator()
+
+    result = orch.run_stage(1, orch._story_producer(1, None))
+
+    assert result["success"], result
+    assert result["video_path"].endswith("final.mp4")
+    assert len(result["images"]) == 3
+    # 영상 단계가 스토리의 장면 텍스트를 받음
+    videos_call = [c for c in orch.media.calls if c[0] == "videos"][0]
+    assert videos_call[2] == orch.manifest.get_stage(1).scene_texts
+    # finish 단계가 스토리로 자막을 추가
+    assert [s["text"] for s in orch.subtitle_mgr.subtitles] == [orch.stage_stories[0]]
+    assert orch.manifest.completed_stages() == [1]
+
+
+def test_run_stage_resume_skips_finished_steps(make_orchestrator):
+    """같은 막을 다시 실행하면 매니페스트의 산출물을 재사용하고 자막은 한 번만"""
+    orch = make_orchestrator()
+    assert orch.run_stage(1, orch._story_producer(1, None))["success"]
+    orch.media.calls.clear()
+
+    result = orch.run_stage(1, orch._story_producer(1, None))
+
+    assert result["success"], result
+    assert orch.media.calls == []
+    assert len(orch.subtitle_mgr.subtitles) == 1
+
+
+def test_overlapped_stages_run_in_order(make_orchestrator):
+    """자동 선택 모드: 막이 겹쳐 실행되어도 스토리 맥락/자막은 막 순서대로"""
+    orch = make_orchestrator(video_delay=0.3)
+    picked = []
+
+    def choose(stage_no, options):
+        picked.append(stage_no)
+        return options[0]
+
+    start = time.perf_counter()
+    assert orch._run_stages_overlapped(choose)
+    elapsed = time.perf_counter() - start
+
+    assert picked == [2, 3, 4, 5]
+    assert orch.manifest.completed_stages() == [1, 2, 3, 4, 5]
+    assert [s["text"] for s in orch.subtitle_mgr.subtitles] == orch.stage_stories
+    # 각 막은 앞 막들이 모두 들어간 히스토리로 생성됨
+    for stage_no in range(2, 6):
+        history = " ".join(orch.stage_stories[:stage_no - 1])
+        assert f"(앞 이야기 {len(history)}자)" in orch.stage_stories[stage_no - 1]
+    # 다음 막 이미지는 앞 막 이미지를 레퍼런스로 사용
+    image_calls = {c[1]: c[2] for c in orch.media.calls if c[0] == "images"}
+    assert image_calls[3] == orch.stage_images[1]
+    # 영상 생성(막당 0.3초)이 겹쳐서 순차 실행(1.5초)보다 빠름
+    assert elapsed < 1.2
+
+
+def test_overlapped_stages_stop_after_failure(make_orchestrator):
+    """앞 막이 실패하면 뒤 막은 마무리하지 않음"""
+    orch = make_orchestrator(fail_videos_stage=3)
+
+    assert not orch._run_stages_overlapped(lambda stage_no, options: options[0])
+
+    assert orch.manifest.completed_stages() == [1, 2]
+    assert len(orch.subtitle_mgr.subtitles) == 2
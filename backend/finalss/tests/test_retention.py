@@ -0,0 +1,57 @@
+# ==================================================================================
+# tests/test_retention.py - 작업 완료 후 중간 산출물 정리
+# ==================================================================================
+
+import os
+
+from managers.job_manifest import JobManifest
+
+
+def _write(path, data=b"data"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _make_job(tmp_path, job_id, stage_dir):
+    """장면 이미지/클립, 병합 클립, 막 TTS를 기록한 작업 매니페스트"""
+    root = tmp_path / stage_dir
+    manifest = JobManifest(str(tmp_path / "jobs" / job_id / "job_manifest.json"))
+    manifest.reset(job_id=job_id)
+    manifest.set_story(1, "이야기", ["a", "b", "c"])
+    manifest.record_artifact(1, "images", [_write(str(root / f"scene{i}.png")) for i in range(1, 4)])
+    manifest.record_artifact(1, "videos", [_write(str(root / f"scene{i}.mp4")) for i in range(1, 4)])
+    manifest.record_artifact(1, "merge", _write(str(root / "merged.mp4")))
+    manifest.record_artifact(1, "tts", _write(str(root / "tts.mp3")))
+    return manifest
+
+
+def test_finalize_drops_only_own_merged_clips(tmp_path, make_retention):
+    """완료한 작업의 병합 클립만 삭제, 장면 클립/TTS와 다른 작업/임시 파일은 유지"""
+    retention = make_retention()
+    job_a = _make_job(tmp_path, "job_a", "a")
+    job_b = _make_job(tmp_path, "job_b", "b")
+    concat_list = _write(str(tmp_path / "temp" / "final_concat.txt"))
+
+    retention.on_job_finalized("job_a", manifest=job_a)
+
+    assert not os.path.exists(job_a.stages[1].artifacts["merge"])
+    assert all(os.path.exists(p) for p in job_a.stages[1].artifacts["videos"])
+    assert os.path.exists(job_a.stages[1].artifacts["tts"])
+    assert job_b.get_artifact(1, "merge") is not None
+    assert os.path.exists(concat_list)
+
+
+def test_finalize_skips_files_rewritten_by_another_job(tmp_path, make_retention):
+    """같은 경로를 다른 작업이 덮어썼으면 (해시 불일치) 삭제하지 않음"""
+    retention = make_retention(drop_scene_sources=True)
+    job_a = _make_job(tmp_path, "job_a", "shared")
+    job_b = _make_job(tmp_path, "job_b", "shared")
+    clip = _write(job_b.stages[1].artifacts["videos"][0], b"job b clip")
+    job_b.record_artifact(1, "videos", job_b.stages[1].artifacts["videos"])
+
+    retention.on_job_finalized("job_a", manifest=job_a)
+
+    assert os.path.exists(clip)
+    assert not os.path.exists(job_a.stages[1].artifacts["tts"])
@@ -0,0 +1,14 @@
+# ==================================================================================
+# tests/test_startup.py - 콜드 스타트 (bench_startup.py와 같은 측정, 새 프로세스)
+# ==================================================================================
+
+import bench_startup
+
+
+def test_cold_import_keeps_heavy_modules_lazy():
+    """import orchestrator_api 만으로는 google.genai / moviepy / pydub / elevenlabs를 로드하지 않음"""
+    result = bench_startup.measure(runs=1)[0]
+
+    assert result["import_s"] > 0
+    assert result["heavy_roots"] == []
+    assert result["heavy_loaded"] == []
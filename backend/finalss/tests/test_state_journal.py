@@ -0,0 +1,51 @@
+# ==================================================================================
+# tests/test_state_journal.py - 작업별 상태 저널과 아카이브 한도
+# ==================================================================================
+
+from types import SimpleNamespace
+
+from managers.file_manager import FileManager
+from managers.state_journal import StateJournal
+from managers.state_manager import StateManager
+
+
+def _job_state(file_mgr: FileManager, job_id: str) -> StateManager:
+    return StateManager(
+        state_file=file_mgr.get_state_file_path(job_id),
+        progress_file=file_mgr.get_progress_file_path(job_id),
+        journal_file=file_mgr.get_journal_file_path(job_id),
+    )
+
+
+def test_compacting_one_job_keeps_other_job_events(tmp_path):
+    """같은 출력 디렉토리의 두 작업: A의 스냅샷 압축이 B의 미반영 이벤트를 가져가지 않음"""
+    file_mgr = FileManager(SimpleNamespace(get_path=lambda key: str(tmp_path)))
+    job_a, job_b = _job_state(file_mgr, "job_a"), _job_state(file_mgr, "job_b")
+
+    job_a.record_event("progress", message="A 1")
+    job_a.record_event("progress", message="A 2")
+    job_b.record_event("progress", message="B 1")
+    job_a.save_progress()
+
+    assert job_a.journal.read() == []
+    reloaded = _job_state(file_mgr, "job_b")
+    assert [e["message"] for e in reloaded.journal.read()] == ["B 1"]
+    assert [e["message"] for e in reloaded.get_events("progress")] == ["B 1"]
+
+
+def test_archive_rotates_at_size_limit(tmp_path):
+    """압축 아카이브가 한도를 넘으면 이전 세대 하나만 남기고 교체"""
+    journal = StateJournal(str(tmp_path / "state.journal.jsonl"), max_archive_bytes=1024)
+
+    for i in range(200):
+        journal.append("progress", message=f"이벤트 {i}")
+        journal.compact(journal.last_seq)
+
+    archive = tmp_path / "state.journal.archive.jsonl"
+    rotated = tmp_path / "state.journal.archive.jsonl.1"
+    assert rotated.exists()
+    assert rotated.stat().st_size <= 1024 + 200  # 한도를 넘긴 마지막 한 번의 압축분까지
+    assert not archive.exists() or archive.stat().st_size <= 1024
+    kept = journal.read_archive()
+    assert kept[-1]["message"] == "이벤트 199"
+    assert len(kept) < 200
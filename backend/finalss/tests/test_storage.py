@@ -0,0 +1,59 @@
+# ==================================================================================
+# tests/test_storage.py - 산출물 저장소 백엔드 (로컬 / S3 호환)
+# ==================================================================================
+
+import os
+import uuid
+
+import pytest
+
+from managers.storage import LocalStorage, StorageBackend, create_storage
+
+
+def _round_trip(storage: StorageBackend, tmp_path, key: str) -> None:
+    """게시 → 존재 확인 → 가져오기 → 삭제"""
+    source = tmp_path / "src" / "stage_1_final.mp4"
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_bytes(b"stage video")
+
+    assert storage.put_file(str(source), key) == key
+    assert storage.exists(key)
+    assert storage.get_url(key)
+
+    fetched = tmp_path / "fetched" / "stage_1_final.mp4"
+    assert storage.get_file(key, str(fetched)) == str(fetched)
+    assert fetched.read_bytes() == b"stage video"
+
+    storage.delete(key)
+    assert not storage.exists(key)
+    assert storage.get_file(key, str(tmp_path / "missing.mp4")) is None
+
+
+def test_backend_requires_all_methods():
+    """인터페이스 메서드를 다 구현하지 않은 백엔드는 만들 수 없음"""
+    class PartialStorage(StorageBackend):
+        def put_file(self, local_path, key):
+            return key
+
+    with pytest.raises(TypeError):
+        PartialStorage()
+
+
+def test_local_round_trip(tmp_path):
+    storage = LocalStorage(str(tmp_path / "output"))
+
+    _round_trip(storage, tmp_path, "stages/stage_1_final.mp4")
+
+    assert storage.get_url("stages/stage_1_final.mp4") == "/stages/stage_1_final.mp4"
+
+
+def test_s3_round_trip(tmp_path):
+    """S3 호환 서버(MinIO 등)가 S3_ENDPOINT_URL/S3_BUCKET으로 지정된 경우만 실행"""
+    pytest.importorskip("boto3")
+    if not os.getenv("S3_ENDPOINT_URL") or not os.getenv("S3_BUCKET"):
+        pytest.skip("S3_ENDPOINT_URL/S3_BUCKET 미설정")
+
+    storage = create_storage({"backend": "s3", "s3": {"prefix": f"test-{uuid.uuid4().hex[:8]}"}},
+                             str(tmp_path / "output"))
+
+    _round_trip(storage, tmp_path, "stages/stage_1_final.mp4")
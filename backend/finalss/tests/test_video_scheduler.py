@@ -0,0 +1,67 @@
+# ==================================================================================
+# tests/test_video_scheduler.py - 프로세스 간 영상 생성 우선순위 (공유 대기열)
+# ==================================================================================
+
+import threading
+import time
+
+from managers.video_scheduler import VideoScheduler
+
+
+def _make_scheduler(tmp_path, **kwargs) -> VideoScheduler:
+    """같은 공유 DB를 쓰는 스케줄러 (테스트에서는 프로세스 대신 인스턴스로 구분)"""
+    return VideoScheduler(shared_db=str(tmp_path / "video_scheduler.db"),
+                          poll_interval=0.05, **kwargs)
+
+
+def _start_batch(scheduler, started: threading.Event, done: threading.Event) -> threading.Thread:
+    def run():
+        with scheduler.slot("job_batch", "batch"):
+            started.set()
+        done.set()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_batch_waits_while_foreign_interactive_runs(tmp_path):
+    """다른 프로세스의 웹 작업이 영상 생성 중이면 배치 요청은 시작하지 않고, 끝나면 시작"""
+    web = _make_scheduler(tmp_path)
+    batch = _make_scheduler(tmp_path)
+    started, done = threading.Event(), threading.Event()
+    try:
+        with web.slot("job_web", "interactive"):
+            _start_batch(batch, started, done)
+            assert not started.wait(0.5)
+            assert batch.stats()["classes"]["batch"]["waiting"] == 1
+
+        assert started.wait(2.0)
+        assert done.wait(2.0)
+    finally:
+        web._board.close()
+        batch._board.close()
+
+
+def test_stale_owner_is_ignored(tmp_path):
+    """하트비트가 끊긴 프로세스(비정상 종료)의 요청은 배치 요청을 막지 않음"""
+    crashed = _make_scheduler(tmp_path, lease_ttl=0.3)
+    batch = _make_scheduler(tmp_path, lease_ttl=0.3)
+    started, done = threading.Event(), threading.Event()
+    try:
+        crashed._board._stopped.set()  # 하트비트 중단
+        with crashed._cond:
+            crashed._waiting.append(_ticket("job_web"))
+            crashed._publish()
+
+        _start_batch(batch, started, done)
+        assert not started.wait(0.1)  # 아직 살아 있는 것으로 보임
+        assert started.wait(3.0)
+    finally:
+        crashed._board.close()
+        batch._board.close()
+
+
+def _ticket(job_id):
+    from managers.video_scheduler import VideoTicket
+    return VideoTicket(job_id=job_id, priority="interactive", keys=(0,), seq=1,
+                       enqueued_at=time.time())
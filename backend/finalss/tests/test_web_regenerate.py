@@ -0,0 +1,53 @@
+# ==================================================================================
+# tests/test_web_regenerate.py - 완성된 동화의 장면 재생성 엔드포인트
+# ==================================================================================
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "..", "web_endpoint"))
+
+
+def test_regenerate_scene_after_finalize(make_orchestrator, make_retention):
+    """최종 영상 완성 + 중간 산출물 정리 후에도 장면을 다시 만들고, 최종 영상은 다시 마무리 대상"""
+    import main
+    from orchestrator_api import OrchestratorAPI
+
+    orch = make_orchestrator()
+    assert orch.run_stage(1, orch._story_producer(1, None))["success"]
+    final_video = orch.media._write("final/final.mp4")
+    orch.manifest.record_final(final_video)
+    make_retention().on_job_finalized("job_web", manifest=orch.manifest)
+
+    api = OrchestratorAPI.__new__(OrchestratorAPI)
+    api.orch = orch
+    api.job_id = "job_web"
+    api.progress_callback = None
+    main.orchestrators["job_web"] = api
+    main.jobs["job_web"] = {
+        "status": "complete", "current_stage": 1, "progress": 100,
+        "final_video_path": final_video, "final_video_url": "/final/final.mp4",
+    }
+    try:
+        response = TestClient(main.app).post(
+            "/api/story/job_web/stage/1/scene/2/regenerate", json={"target": "video"})
+
+        assert response.status_code == 200, response.text
+        job = main.jobs["job_web"]
+        assert "regenerate_error" not in job, job.get("regenerate_error")
+        assert job["regenerated_scenes"] == [{"stage": 1, "scene": 2}]
+        assert job["status"] == "stage5_complete"
+        assert "final_video_path" not in job
+        assert ("regenerate", 1, 2) in orch.media.calls
+        assert orch.manifest.final == {}
+    finally:
+        main.jobs.pop("job_web", None)
+        main.orchestrators.pop("job_web", None)
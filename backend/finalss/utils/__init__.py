@@ -4,8 +4,22 @@
 
 from .retry_handler import RetryHandler
 from .user_interaction import UserInteraction
+from .ffmpeg_runner import FFmpegRunner, FFmpegJob, FFmpegResult, get_ffmpeg_runner
+from .atomic_io import AtomicOutput, atomic_write_json, atomic_write_text, link_or_copy
+from .preload import HEAVY_MODULES, preload_modules, preload_in_background
 
 __all__ = [
     "RetryHandler",
     "UserInteraction",
+    "FFmpegRunner",
+    "FFmpegJob",
+    "FFmpegResult",
+    "get_ffmpeg_runner",
+    "AtomicOutput",
+    "atomic_write_json",
+    "atomic_write_text",
+    "link_or_copy",
+    "HEAVY_MODULES",
+    "preload_modules",
+    "preload_in_background",
 ]
\ No newline at end of file
@@ -0,0 +1,95 @@
+# ==================================================================================
+# utils/atomic_io.py - 원자적 파일 쓰기 (임시 파일 + rename)
+# ==================================================================================
+
+import os
+import json
+import shutil
+import tempfile
+from typing import Any
+
+
+def atomic_write_text(path: str, text: str, encoding: str = "utf-8") -> None:
+    """
+    텍스트 파일 원자적 쓰기
+    같은 디렉토리의 임시 파일에 쓰고 fsync 후 os.replace로 교체하므로
+    쓰는 도중 프로세스가 죽어도 기존 파일은 온전히 남는다.
+    """
+    dir_path = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dir_path, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=dir_path
+    )
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data: Any, indent: int = None) -> None:
+    """JSON 파일 원자적 쓰기"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=indent))
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    영상/오디오는 하드 링크 (같은 파일시스템이면 추가 용량 없음), 실패하면 복사
+    - 영상/오디오 원본은 AtomicOutput(os.replace)으로만 다시 쓰이므로 링크된 사본은 그대로 유지
+    - 이미지/텍스트처럼 제자리에서 덮어쓸 수 있는 파일은 복사
+    """
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        if os.path.splitext(src)[1].lower() not in (".mp4", ".mp3"):
+            raise OSError("copy")
+        os.link(src, dst)
+    except OSError:
+        tmp = dst + ".part"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+
+
+class AtomicOutput:
+    """
+    외부 도구(ffmpeg, moviepy, SDK의 save 등)가 쓰는 출력 파일용 임시 경로
+    - tmp_path에 쓰고 commit()해야 최종 경로로 교체됨
+    - commit 없이 블록을 빠져나가면(실패/예외) 임시 파일 삭제
+    - 확장자는 유지 (ffmpeg 등이 확장자로 포맷을 판단하므로)
+
+    with AtomicOutput(path) as out:
+        write(out.tmp_path)
+        if ok:
+            out.commit()
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        root, ext = os.path.splitext(path)
+        self.tmp_path = f"{root}.part-{os.getpid()}-{id(self):x}{ext}"
+        self.committed = False
+
+    def __enter__(self) -> "AtomicOutput":
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        return self
+
+    def commit(self) -> str:
+        """임시 파일을 최종 경로로 교체 (비어 있으면 실패)"""
+        if not os.path.exists(self.tmp_path) or os.path.getsize(self.tmp_path) == 0:
+            raise OSError(f"출력 파일이 비어 있음: {self.tmp_path}")
+        os.replace(self.tmp_path, self.path)
+        self.committed = True
+        return self.path
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.committed and os.path.exists(self.tmp_path):
+            try:
+                os.remove(self.tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,310 @@
+# ==================================================================================
+# utils/ffmpeg_runner.py - CPU 코어 기반 FFmpeg 실행 풀 (스레드 배분 + 진행률)
+# ==================================================================================
+
+import os
+import sys
+import time
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+ProgressCallback = Callable[[float], None]
+
+
+def _available_cores() -> int:
+    """현재 프로세스가 사용할 수 있는 CPU 코어 수"""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+@dataclass
+class FFmpegResult:
+    """FFmpeg 실행 결과"""
+    returncode: int
+    stderr: str = ""
+    elapsed: float = 0.0
+    cancelled: bool = False
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.cancelled and not self.timed_out
+
+
+class FFmpegJob:
+    """
+    제출된 FFmpeg 작업 핸들
+    - wait(): 완료까지 대기 후 FFmpegResult 반환
+    - cancel(): 대기 중이면 취소, 실행 중이면 프로세스 종료
+    """
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.future: Optional[Future] = None
+        self.process: Optional[subprocess.Popen] = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+        with self._lock:
+            if self.process is not None and self.process.poll() is None:
+                self.process.kill()
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def wait(self, timeout: float = None) -> FFmpegResult:
+        if self.future is None:
+            return FFmpegResult(returncode=-1, cancelled=True)
+        if self.future.cancelled():
+            return FFmpegResult(returncode=-1, cancelled=True)
+        return self.future.result(timeout=timeout)
+
+
+class FFmpegRunner:
+    """
+    FFmpeg 프로세스 실행 풀
+    - 동시 인코딩 수를 CPU 코어 수에 맞춰 제한 (과다 구독 방지)
+    - 작업마다 -threads 값 배분
+    - 비동기 실행 (submit → FFmpegJob), 취소/타임아웃 지원
+    - -progress pipe:1 출력을 파싱해 진행률(0.0~1.0) 콜백 호출
+    """
+
+    def __init__(self, max_concurrent: int = 0, threads_per_job: int = 0,
+                 timeout: float = 600.0, final_timeout: float = 0.0,
+                 ffmpeg_bin: str = "ffmpeg"):
+        """
+        Args:
+            max_concurrent: 동시 인코딩 수 (0 = 코어 수 기반 자동)
+            threads_per_job: 작업당 -threads 값 (0 = 코어 / 동시 작업 수)
+            timeout: 작업당 기본 제한 시간 (초, 0 = 무제한)
+            final_timeout: 최종 화질 렌더/최종 병합/ABR 사다리용 제한 시간 (초, 0 = 무제한)
+            ffmpeg_bin: ffmpeg 실행 파일
+        """
+        cores = _available_cores()
+        self.max_concurrent = max_concurrent or max(1, cores // 2)
+        self.threads_per_job = threads_per_job or max(1, cores // self.max_concurrent)
+        self.timeout = timeout
+        self.final_timeout = final_timeout
+        self.ffmpeg_bin = ffmpeg_bin
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent * 2,
+            thread_name_prefix="ffmpeg"
+        )
+        self._active: Dict[int, FFmpegJob] = {}
+        self._active_lock = threading.Lock()
+
+        print(f"⚙️ FFmpeg 풀: 동시 {self.max_concurrent}개 x {self.threads_per_job}스레드 (코어 {cores}개)")
+
+    @classmethod
+    def from_config(cls, config_dict: dict) -> "FFmpegRunner":
+        """ConfigManager의 media.ffmpeg 설정으로부터 생성"""
+        return cls(
+            max_concurrent=config_dict.get("max_concurrent", 0),
+            threads_per_job=config_dict.get("threads_per_job", 0),
+            timeout=config_dict.get("timeout", 600),
+            final_timeout=config_dict.get("final_timeout", 0),
+            ffmpeg_bin=config_dict.get("binary", "ffmpeg"),
+        )
+
+    # ============== 실행 ==============
+
+    def submit(self, cmd: List[str], duration: float = None,
+               on_progress: ProgressCallback = None, timeout: float = None,
+               label: str = "", priority: str = "normal") -> FFmpegJob:
+        """
+        FFmpeg 명령 비동기 제출
+
+        Args:
+            cmd: ["ffmpeg", ..., output_path] 형태의 명령
+            duration: 예상 출력 길이 (초). 있으면 진행률 계산에 사용
+            on_progress: 진행률 콜백 (0.0~1.0)
+            timeout: 제한 시간 (None이면 기본값, 0이면 무제한)
+            label: 로그용 이름
+            priority: "normal" | "idle" (idle = OS 최저 우선순위로 실행)
+        """
+        job = FFmpegJob(label=label)
+        job.future = self._executor.submit(
+            self._execute, job, list(cmd), duration, on_progress,
+            self.timeout if timeout is None else timeout, priority
+        )
+        return job
+
+    def run(self, cmd: List[str], duration: float = None,
+            on_progress: ProgressCallback = None, timeout: float = None,
+            label: str = "", priority: str = "normal") -> FFmpegResult:
+        """FFmpeg 명령 동기 실행 (submit + wait)"""
+        return self.submit(cmd, duration, on_progress, timeout, label, priority).wait()
+
+    @contextmanager
+    def slot(self) -> Iterator[int]:
+        """
+        FFmpeg를 직접 띄우는 외부 라이브러리(moviepy 등)용 실행 슬롯
+        동시 인코딩 수 제한을 공유하고, 사용할 스레드 수를 반환
+        """
+        self._slots.acquire()
+        try:
+            yield self.threads_per_job
+        finally:
+            self._slots.release()
+
+    def cancel_all(self) -> None:
+        """실행/대기 중인 모든 작업 취소"""
+        with self._active_lock:
+            jobs = list(self._active.values())
+        for job in jobs:
+            job.cancel()
+
+    # ============== 내부 ==============
+
+    def _prepare_cmd(self, cmd: List[str]) -> List[str]:
+        """진행률 출력(-progress pipe:1)과 스레드 수(-threads)를 명령에 주입"""
+        if cmd and os.path.basename(cmd[0]) in ("ffmpeg", "ffmpeg.exe"):
+            cmd = [self.ffmpeg_bin] + cmd[1:]
+        prepared = [cmd[0], "-nostats", "-progress", "pipe:1"] + cmd[1:-1]
+        if "-threads" not in cmd:
+            prepared += ["-threads", str(self.threads_per_job)]
+        prepared.append(cmd[-1])
+        return prepared
+
+    @staticmethod
+    def _priority_kwargs(priority: str) -> dict:
+        """Popen 우선순위 옵션 (idle → Windows IDLE_PRIORITY_CLASS / POSIX nice 19)"""
+        if priority != "idle":
+            return {}
+        if sys.platform == "win32":
+            return {"creationflags": getattr(subprocess, "IDLE_PRIORITY_CLASS", 0)}
+        return {"preexec_fn": lambda: os.nice(19)}
+
+    def _execute(self, job: FFmpegJob, cmd: List[str], duration: Optional[float],
+                 on_progress: Optional[ProgressCallback], timeout: float,
+                 priority: str = "normal") -> FFmpegResult:
+        with self._slots:
+            if job.cancelled:
+                return FFmpegResult(returncode=-1, cancelled=True)
+
+            start = time.time()
+            stderr_tail: deque = deque(maxlen=50)
+            timed_out = threading.Event()
+
+            try:
+                proc = subprocess.Popen(
+                    self._prepare_cmd(cmd),
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    **self._priority_kwargs(priority),
+                )
+            except OSError as e:
+                return FFmpegResult(returncode=-1, stderr=str(e))
+
+            with job._lock:
+                job.process = proc
+            with self._active_lock:
+                self._active[id(job)] = job
+
+            # stderr는 별도 스레드에서 소비 (파이프 버퍼 가득 참으로 인한 교착 방지)
+            def _drain_stderr():
+                for line in proc.stderr:
+                    stderr_tail.append(line)
+
+            stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+            stderr_thread.start()
+
+            timer = None
+            if timeout:
+                def _on_timeout():
+                    timed_out.set()
+                    if proc.poll() is None:
+                        proc.kill()
+                timer = threading.Timer(timeout, _on_timeout)
+                timer.daemon = True
+                timer.start()
+
+            try:
+                self._read_progress(proc, duration, on_progress)
+                proc.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                stderr_thread.join(timeout=5)
+                with self._active_lock:
+                    self._active.pop(id(job), None)
+
+            result = FFmpegResult(
+                returncode=proc.returncode,
+                stderr="".join(stderr_tail),
+                elapsed=time.time() - start,
+                cancelled=job.cancelled,
+                timed_out=timed_out.is_set(),
+            )
+            if result.timed_out:
+                print(f"      ⏱️ FFmpeg 시간 초과 ({timeout:.0f}초): {job.label}")
+            elif result.cancelled:
+                print(f"      🛑 FFmpeg 취소됨: {job.label}")
+            return result
+
+    @staticmethod
+    def _read_progress(proc: subprocess.Popen, duration: Optional[float],
+                       on_progress: Optional[ProgressCallback]) -> None:
+        """-progress 출력 (key=value 블록) 파싱"""
+        out_time = 0.0
+        for line in proc.stdout:
+            key, _, value = line.strip().partition("=")
+            if key in ("out_time_us", "out_time_ms"):
+                # ffmpeg는 out_time_ms도 마이크로초 단위로 출력함
+                try:
+                    out_time = int(value) / 1_000_000
+                except ValueError:
+                    pass
+            elif key == "progress" and on_progress:
+                if value == "end":
+                    fraction = 1.0
+                elif duration and duration > 0:
+                    fraction = min(max(out_time / duration, 0.0), 0.99)
+                else:
+                    continue
+                try:
+                    on_progress(fraction)
+                except Exception as e:
+                    print(f"      ⚠️ 진행률 콜백 오류: {e}")
+
+
+# ============== 프로세스 공용 인스턴스 ==============
+
+_default_runner: Optional[FFmpegRunner] = None
+_default_lock = threading.Lock()
+
+
+def get_ffmpeg_runner(config_dict: dict = None) -> FFmpegRunner:
+    """
+    프로세스 전역에서 공유하는 FFmpegRunner 반환
+    (여러 작업이 동시에 실행돼도 코어 예산을 함께 사용하도록)
+    처음 호출 시 전달된 설정으로 생성됨
+    """
+    global _default_runner
+    if _default_runner is None:
+        with _default_lock:
+            if _default_runner is None:
+                _default_runner = FFmpegRunner.from_config(config_dict or {})
+    return _default_runner
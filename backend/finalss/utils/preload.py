@@ -0,0 +1,57 @@
+# ==================================================================================
+# utils/preload.py - 무거운 의존성 지연 로드 / 서버 시작 시 미리 로드
+# ==================================================================================
+
+import time
+import importlib
+import threading
+from typing import Dict, Iterable, Optional
+
+
+# 실제 사용 시점에 import하는 무거운 모듈 (import 비용이 큰 순)
+HEAVY_MODULES = (
+    "google.genai",
+    "google.genai.types",
+    "moviepy.video.io.VideoFileClip",    # numpy, imageio, proglog 포함
+    "moviepy.audio.io.AudioFileClip",
+    "moviepy.video.fx.all",
+    "pydub",
+    "elevenlabs.client",
+)
+
+
+def preload_modules(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, Optional[float]]:
+    """
+    모듈을 미리 import하고 모듈별 소요 시간(초) 반환
+    설치되지 않은 선택 모듈은 None (실제 사용 시점에 기존처럼 처리)
+    """
+    timings: Dict[str, Optional[float]] = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            timings[name] = None
+            continue
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def preload_in_background(modules: Iterable[str] = HEAVY_MODULES) -> threading.Thread:
+    """
+    백그라운드 스레드에서 미리 로드 (서버는 바로 요청을 받고, 첫 작업은 import를 기다리지 않음)
+    import lock 때문에 같은 모듈을 요청 처리 중에 쓰면 로드가 끝날 때까지만 대기
+    """
+    modules = tuple(modules)
+
+    def _run() -> None:
+        start = time.perf_counter()
+        timings = preload_modules(modules)
+        loaded = [name for name, t in timings.items() if t is not None]
+        missing = [name for name, t in timings.items() if t is None]
+        print(f"📦 의존성 미리 로드 완료: {len(loaded)}개, {time.perf_counter() - start:.2f}초"
+              + (f" (미설치: {', '.join(missing)})" if missing else ""))
+
+    thread = threading.Thread(target=_run, name="preload-modules", daemon=True)
+    thread.start()
+    return thread
@@ -1,9 +1,11 @@
 from fastapi import FastAPI, BackgroundTasks, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, RedirectResponse
 from pydantic import BaseModel
 import sys
 import os
+import uuid
 import traceback
 from typing import Optional
 
@@ -40,6 +42,76 @@ class ChoiceSubmitRequest(BaseModel):
     stage_no: int
     choice: str
 
+class SceneRegenerateRequest(BaseModel):
+    target: str = "video"              # "video" (기존 이미지로 영상만) | "image" (이미지부터)
+    prompt_tweak: Optional[str] = None  # 프롬프트에 덧붙일 요청 (예: "더 밝은 분위기로")
+
+@app.on_event("startup")
+async def watch_config():
+    """설정 파일 변경 감시 (재시작 없이 새 작업부터 반영)"""
+    from managers import start_config_watcher
+    reload_config = file_mgr.config.get_hot_reload_config()
+    if reload_config["enabled"]:
+        start_config_watcher(str(file_mgr.config.config_path), reload_config["interval"])
+
+@app.on_event("startup")
+async def preload_dependencies():
+    """무거운 의존성을 백그라운드에서 미리 로드 (첫 작업 요청이 import를 기다리지 않도록)"""
+    if file_mgr.config.get_startup_config()["preload"]:
+        from utils import preload_in_background
+        preload_in_background()
+
+@app.on_event("startup")
+async def start_stage_pool():
+    """1막 사전 생성 풀 채우기 시작 (API 사용량이 늘어나므로 설정으로 끌 수 있음)"""
+    if stage_pool is not None:
+        stage_pool.start(file_mgr.config.get_stage_pool_config()["check_interval"])
+
+@app.on_event("startup")
+async def rehydrate_jobs():
+    """서버 재시작 시 디스크의 작업별 매니페스트로부터 작업 상태 복원"""
+    from orchestrator_api import OrchestratorAPI
+    try:
+        saved_jobs = OrchestratorAPI.load_saved_jobs()
+    except Exception as e:
+        print(f"⚠️ 작업 복원 실패: {e}")
+        traceback.print_exc()
+        return
+    
+    for saved in saved_jobs:
+        job_id = saved["job_id"]
+        if job_id in jobs:
+            continue
+        try:
+            orchestrators[job_id] = OrchestratorAPI(art_style=saved["art_style"], job_id=job_id)
+            
+            completed = saved["completed_stages"]
+            job = {
+                "status": f"stage{completed[-1]}_complete" if completed else "error",
+                "current_stage": completed[-1] if completed else 1,
+                "progress": 100 if completed else 0,
+                "tale_title": saved["tale_title"],
+                "art_style": saved["art_style"],
+                "error": None if completed else "서버 재시작으로 중단됨 (1막 다시 실행 필요)",
+                "current_message": "이전 작업 복원됨",
+            }
+            if saved["video_path"]:
+                job["video_url"] = f"/stages/{os.path.basename(saved['video_path'])}"
+                job["video_file_path"] = saved["video_path"]
+                job["story_text"] = saved["story_text"]
+            if saved["moral_lesson"]:
+                job["moral_lesson"] = saved["moral_lesson"]
+            if saved["final_video_path"]:
+                job["status"] = "complete"
+                job["final_video_path"] = saved["final_video_path"]
+                job["final_video_url"] = f"/final/{os.path.basename(saved['final_video_path'])}"
+            
+            jobs[job_id] = job
+            print(f"♻️ Job {job_id}: 작업 복원 (완료된 막: {completed})")
+        except Exception as e:
+            print(f"⚠️ Job {job_id}: 작업 복원 실패: {e}")
+            traceback.print_exc()
+
 @app.get("/")
 async def root():
     return {"message": "Story Generation API is running", "version": "1.0.0"}
@@ -47,11 +119,14 @@ async def root():
 @app.post("/api/story/start")
 async def start_story(request: StoryStartRequest, background_tasks: BackgroundTasks):
     """스토리 생성 시작 (1막 자동 생성)"""
-    job_id = f"job_{len(jobs) + 1}"
+    # 서버 재시작 후에도 이전 작업 ID와 겹치지 않도록 고유 ID 사용
+    job_id = f"job_{uuid.uuid4().hex[:12]}"
     
     # Orchestrator 인스턴스 생성 및 저장 (스토리 히스토리 유지를 위해)
     from orchestrator_api import OrchestratorAPI
-    orchestrators[job_id] = OrchestratorAPI(art_style=request.art_style)
+    orchestrators[job_id] = OrchestratorAPI(art_style=request.art_style, job_id=job_id)
+    orchestrators[job_id].orch.manifest.set_meta(tale_title=request.tale_title)
+    orchestrators[job_id].orch.state.bind_job(job_id, tale_title=request.tale_title)
     print(f"✅ Job {job_id}: Orchestrator 인스턴스 생성 및 저장")
     
     jobs[job_id] = {
@@ -75,7 +150,53 @@ async def get_status(job_id: str):
     if job_id not in jobs:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return jobs[job_id]
+    if jobs[job_id].get("status") == "complete":
+        retention.touch(job_id)  # 보관본 LRU 갱신
+    # 영상 생성 대기열 순번 / 예상 시작 시간 (대기 중인 장면이 있을 때 position, eta_s 포함)
+    return {**jobs[job_id], "video_queue": video_scheduler.job_status(job_id)}
+
+@app.post("/api/story/pin/{job_id}")
+async def pin_story(job_id: str, pinned: bool = True):
+    """내 책장에 저장 (고정된 동화는 디스크 한도로 삭제되지 않음)"""
+    if not retention.pin(job_id, pinned):
+        raise HTTPException(status_code=404, detail="보관된 동화가 없습니다 (최종 영상 완성 후 저장 가능)")
+    if job_id in jobs:
+        jobs[job_id]["pinned"] = pinned
+    return {"job_id": job_id, "pinned": pinned}
+
+@app.get("/api/storage/usage")
+async def get_storage_usage():
+    """디스크 사용량 (전체 + 작업별 보관 용량)"""
+    return retention.usage()
+
+@app.get("/api/branches/stats")
+async def get_branch_stats():
+    """공유 분기 저장소 적중률 (막 번호별)"""
+    if not file_mgr.config.get_branch_store_config()["enabled"]:
+        return {"enabled": False}
+    return {"enabled": True, "depths": get_branch_store(file_mgr.config, file_mgr).stats()}
+
+@app.get("/api/video/queue")
+async def get_video_queue():
+    """영상 생성 스케줄러 상태 (우선순위별 대기/실행 수, 키별 실행 수)"""
+    return video_scheduler.stats()
+
+@app.get("/api/rate_limits")
+async def get_rate_limits():
+    """API 키(해시) x 모델별 요청 속도 한도 (429로 학습한 값 포함), 최근 1분 사용량, 대기 시간"""
+    return get_rate_limiter(file_mgr.config).stats()
+
+@app.get("/api/models/stats")
+async def get_model_stats():
+    """텍스트 모델별 지연 시간(p50/p95)과 대체 모델 전환 상태, 작업별 모델 사용 횟수"""
+    return get_model_router(file_mgr.config).stats()
+
+@app.get("/api/pool/stats")
+async def get_pool_stats():
+    """1막 사전 생성 풀 상태 (스타일별 준비된 번들 수, 배정 적중률)"""
+    if stage_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, "styles": stage_pool.stats()}
 
 @app.post("/api/story/choice")
 async def submit_choice(request: ChoiceSubmitRequest, background_tasks: BackgroundTasks):
@@ -188,6 +309,17 @@ def run_orchestrator(job_id: str, request: StoryStartRequest):
         
         orch_api.set_progress_callback(progress_callback)
         
+        # 미리 만든 1막이 있으면 가져옴 → 아래 run_stage_1은 저장된 산출물만 확인하고 끝남
+        # 같은 동화/스타일의 1막 공유 분기가 있으면 그쪽을 사용 (뒤 막 분기도 함께 적중하도록)
+        use_pool = stage_pool is not None and not orch_api.orch.has_root_branch()
+        bundle = stage_pool.take(request.art_style) if use_pool else None
+        if bundle is not None:
+            try:
+                if orch_api.adopt_stage_1(bundle):
+                    jobs[job_id]["stage_pool_hit"] = True
+            finally:
+                stage_pool.release(bundle)
+        
         # 1막 실행
         print(f"🚀 1막 워크플로우 실행 중...")
         result = orch_api.run_stage_1()
@@ -202,6 +334,7 @@ def run_orchestrator(job_id: str, request: StoryStartRequest):
             jobs[job_id]["video_url"] = f"/stages/{video_filename}"
             jobs[job_id]["story_text"] = result['story_text']
             jobs[job_id]["video_file_path"] = video_path
+            jobs[job_id].pop("pending_scenes", None)
             jobs[job_id]["current_message"] = "1막 완료!"
             
             print(f"\n{'='*60}")
@@ -219,6 +352,9 @@ def run_orchestrator(job_id: str, request: StoryStartRequest):
             
             if 'error_trace' in result:
                 jobs[job_id]["error_trace"] = result['error_trace']
+            if 'pending_scenes' in result:
+                # 같은 선택으로 다시 실행하면 이 장면만 생성 (완료된 장면은 보관됨)
+                jobs[job_id]["pending_scenes"] = result['pending_scenes']
             
             print(f"\n{'='*60}")
             print(f"❌ Job {job_id}: 1막 실패")
@@ -279,6 +415,7 @@ def run_stage(job_id: str, stage_no: int, user_choice: str):
             jobs[job_id]["video_url"] = f"/stages/{video_filename}"
             jobs[job_id]["story_text"] = result['story_text']
             jobs[job_id]["video_file_path"] = video_path
+            jobs[job_id].pop("pending_scenes", None)
             jobs[job_id]["current_message"] = f"{stage_no}막 완료!"
             
             if 'moral_lesson' in result:
@@ -296,6 +433,9 @@ def run_stage(job_id: str, stage_no: int, user_choice: str):
             
             if 'error_trace' in result:
                 jobs[job_id]["error_trace"] = result['error_trace']
+            if 'pending_scenes' in result:
+                # 같은 선택으로 다시 실행하면 이 장면만 생성 (완료된 장면은 보관됨)
+                jobs[job_id]["pending_scenes"] = result['pending_scenes']
             
             print(f"\n{'='*60}")
             print(f"❌ Job {job_id}: {stage_no}막 실패")
@@ -370,6 +510,10 @@ def run_finalize(job_id: str):
             jobs[job_id]["final_video_url"] = f"/final/{final_video_filename}"
             jobs[job_id]["final_video_path"] = final_video_path
             jobs[job_id]["total_duration"] = result.get('total_duration', 0.0)
+            if result.get('hls_master_url'):
+                jobs[job_id]["final_hls_url"] = result['hls_master_url']
+            if result.get('archive_video_url'):
+                jobs[job_id]["archive_video_url"] = result['archive_video_url']
             jobs[job_id]["current_message"] = "전체 영상 완성!"
             
             print(f"\n{'='*60}")
@@ -402,21 +546,145 @@ def run_finalize(job_id: str):
         traceback.print_exc()
 
 
+@app.post("/api/story/{job_id}/stage/{stage_no}/scene/{scene_no}/regenerate")
+async def regenerate_scene(job_id: str, stage_no: int, scene_no: int, background_tasks: BackgroundTasks,
+                           request: Optional[SceneRegenerateRequest] = None):
+    """장면 하나만 다시 생성 (다른 장면 영상과 TTS는 재사용, 막 영상만 다시 합성)"""
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job_id not in orchestrators:
+        raise HTTPException(status_code=404, detail="Orchestrator not found")
+    if not 1 <= stage_no <= 5 or not 1 <= scene_no <= 3:
+        raise HTTPException(status_code=400, detail="막 번호는 1~5, 장면 번호는 1~3")
+    
+    request = request or SceneRegenerateRequest()
+    if request.target not in ("video", "image"):
+        raise HTTPException(status_code=400, detail="target은 video 또는 image")
+    
+    job = jobs[job_id]
+    if job.get("regenerating") or job["status"] == "finalizing" or job["status"].endswith("_processing"):
+        raise HTTPException(status_code=409, detail="진행 중인 작업이 끝난 뒤 다시 시도하세요")
+    
+    job["regenerating"] = {"stage": stage_no, "scene": scene_no, "target": request.target}
+    job.pop("regenerate_error", None)
+    job["progress"] = 0
+    job["current_message"] = f"{stage_no}막 장면 {scene_no} 다시 생성 중..."
+    
+    background_tasks.add_task(run_regenerate_scene, job_id, stage_no, scene_no,
+                              request.target, request.prompt_tweak or "")
+    
+    return {"success": True, "status": "regenerating", "stage_no": stage_no, "scene_no": scene_no}
+
+def run_regenerate_scene(job_id: str, stage_no: int, scene_no: int, target: str, prompt_tweak: str):
+    """장면 재생성 실행"""
+    job = jobs[job_id]
+    try:
+        orch_api = orchestrators[job_id]
+        
+        def progress_callback(message: str, progress: int):
+            job["progress"] = progress
+            job["current_message"] = message
+            print(f"[Job {job_id}] {progress}% - {message}")
+        
+        orch_api.set_progress_callback(progress_callback)
+        result = orch_api.regenerate_scene(stage_no, scene_no, target=target, prompt_tweak=prompt_tweak)
+        
+        if result['success']:
+            video_path = result['video_path']
+            if stage_no == job.get("current_stage"):
+                job["video_url"] = f"/stages/{os.path.basename(video_path)}"
+                job["video_file_path"] = video_path
+            job.setdefault("regenerated_scenes", []).append({"stage": stage_no, "scene": scene_no})
+            if result['final_invalidated'] and job["status"] == "complete":
+                # 바뀐 막을 반영하려면 최종 병합을 다시 실행해야 함
+                job["status"] = "stage5_complete"
+                for key in ("final_video_url", "final_video_path", "final_hls_url", "archive_video_url"):
+                    job.pop(key, None)
+            job["current_message"] = f"{stage_no}막 장면 {scene_no} 다시 생성 완료!"
+            print(f"✅ Job {job_id}: {stage_no}막 장면 {scene_no} 다시 생성 완료")
+        else:
+            job["regenerate_error"] = result.get('error', '알 수 없는 오류')
+            job["current_message"] = f"장면 재생성 실패: {result.get('error')}"
+            print(f"❌ Job {job_id}: {stage_no}막 장면 {scene_no} 재생성 실패: {result.get('error')}")
+            
+    except Exception as e:
+        job["regenerate_error"] = str(e)
+        job["current_message"] = f"장면 재생성 시스템 오류: {str(e)}"
+        traceback.print_exc()
+    finally:
+        job.pop("regenerating", None)
+
+
+# 산출물 저장소 (local: StaticFiles 직접 제공, s3: 서명 URL로 리다이렉트)
+from orchestrator_api import OrchestratorAPI
+from managers import (
+    get_retention_manager, get_stage_pool, get_branch_store, get_video_scheduler, get_rate_limiter,
+    get_model_router,
+)
+file_mgr = OrchestratorAPI.create_file_manager()
+storage = file_mgr.storage
+retention = get_retention_manager(file_mgr.config, file_mgr)
+video_scheduler = get_video_scheduler(file_mgr.config)
+
+# 1막 사전 생성 풀 (art_style별로 미리 만든 1막을 새 작업에 바로 배정)
+stage_pool = (get_stage_pool(file_mgr.config, file_mgr, OrchestratorAPI.prerender_stage_1)
+              if file_mgr.config.get_stage_pool_config()["enabled"] else None)
+
+
+def _redirect_to_storage(subdir: str, local_dir: str, path: str):
+    """저장소 서명 URL로 리다이렉트 (HLS 플레이리스트는 상대 경로 유지를 위해 직접 제공)"""
+    local_file = os.path.abspath(os.path.join(local_dir, path))
+    if not local_file.startswith(os.path.abspath(local_dir) + os.sep):
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    
+    key = f"{subdir}/{path}"
+    if path.endswith(".m3u8"):
+        # 플레이리스트 안의 세그먼트 경로가 다시 이 라우트를 거쳐 각각 서명되도록
+        if not os.path.exists(local_file) and storage.get_file(key, local_file) is None:
+            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+        return FileResponse(local_file, media_type="application/vnd.apple.mpegurl")
+    
+    if not storage.exists(key):
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    return RedirectResponse(storage.get_url(key), status_code=307)
+
+
 # 정적 파일 제공 (생성된 영상 파일용)
 output_path = os.path.join(os.path.dirname(__file__), '..', 'finalss', 'output','stages')
-if os.path.exists(output_path):
-    app.mount("/stages", StaticFiles(directory=output_path), name="stages")
-    print(f"✅ 영상 파일 서빙 경로: {output_path}")
-else:
-    print(f"⚠️ 영상 출력 폴더가 없습니다: {output_path}")
-
 # 최종 영상 파일 제공
 final_output_path = os.path.join(os.path.dirname(__file__), '..', 'finalss', 'output', 'final')
-if os.path.exists(final_output_path):
-    app.mount("/final", StaticFiles(directory=final_output_path), name="final")
-    print(f"✅ 최종 영상 서빙 경로: {final_output_path}")
+# 완성된 동화 보관본 제공
+library_path = file_mgr.get_library_dir()
+
+if storage.serves_locally:
+    if os.path.exists(output_path):
+        app.mount("/stages", StaticFiles(directory=output_path), name="stages")
+        print(f"✅ 영상 파일 서빙 경로: {output_path}")
+    else:
+        print(f"⚠️ 영상 출력 폴더가 없습니다: {output_path}")
+    
+    if os.path.exists(final_output_path):
+        app.mount("/final", StaticFiles(directory=final_output_path), name="final")
+        print(f"✅ 최종 영상 서빙 경로: {final_output_path}")
+    else:
+        print(f"⚠️ 최종 영상 출력 폴더가 없습니다: {final_output_path}")
+    
+    os.makedirs(library_path, exist_ok=True)
+    app.mount("/library", StaticFiles(directory=library_path), name="library")
 else:
-    print(f"⚠️ 최종 영상 출력 폴더가 없습니다: {final_output_path}")
+    @app.get("/stages/{path:path}")
+    async def serve_stage_file(path: str):
+        return _redirect_to_storage("stages", output_path, path)
+    
+    @app.get("/final/{path:path}")
+    async def serve_final_file(path: str):
+        return _redirect_to_storage("final", final_output_path, path)
+    
+    @app.get("/library/{path:path}")
+    async def serve_library_file(path: str):
+        return _redirect_to_storage("library", library_path, path)
+    
+    print(f"✅ 영상 파일 제공: 저장소 서명 URL 리다이렉트 ({type(storage).__name__})")
 
 if __name__ == "__main__":
     import uvicorn